@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# run 하나의 chart(CPU/RAM/disk/net ...)를 공통 시간 grid 위의 2-D 배열로 정렬한다.
+# - 결과: grid (n,), Y (n_metrics, n), names
+# - method="interp": 선형 보간, method="hold": 직전 샘플 유지(step-hold)
+# - fill="nan": 각 chart 범위 밖은 NaN, fill="edge": 양끝 값 유지(np.interp 기본 동작)
+# 정렬 후에는 stability / phase 통계 / 상관 등을 metric 축 하나로 한 번에 계산할 수 있다.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from netdata_io import DEFAULT_TZ, load_run_charts
+
+
+Charts = Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]]
+
+
+def native_step(ts: Sequence[np.ndarray]) -> float:
+    # 가장 촘촘한 chart의 median 간격
+    steps = []
+    for t in ts:
+        t = np.asarray(t, dtype=float)
+        t = t[np.isfinite(t)]
+        if len(t) >= 2:
+            d = np.diff(np.unique(t))
+            if len(d):
+                steps.append(float(np.median(d)))
+    return min(steps) if steps else 1.0
+
+
+def make_grid(ts: Sequence[np.ndarray], step: Optional[float] = None,
+              start: Optional[float] = None, end: Optional[float] = None,
+              span: str = "union") -> np.ndarray:
+    # span="union": 모든 chart를 포함하는 범위, "intersection": 모든 chart가 겹치는 범위
+    ts = [np.asarray(t, dtype=float) for t in ts if len(t)]
+    if not ts:
+        return np.empty(0)
+    step = float(step) if step else native_step(ts)
+    lows = [float(np.nanmin(t)) for t in ts]
+    highs = [float(np.nanmax(t)) for t in ts]
+    lo = min(lows) if span == "union" else max(lows)
+    hi = max(highs) if span == "union" else min(highs)
+    if start is not None:
+        lo = float(start)
+    if end is not None:
+        hi = float(end)
+    if hi < lo:
+        return np.empty(0)
+    n = int(np.floor((hi - lo) / step + 1e-9)) + 1
+    return lo + step * np.arange(n)
+
+
+def resample(t: np.ndarray, Y: np.ndarray, grid: np.ndarray,
+             method: str = "interp", fill: str = "nan") -> np.ndarray:
+    # Y: (n,) 또는 (m, n) -> (m, len(grid))
+    t = np.asarray(t, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    grid = np.asarray(grid, dtype=float)
+    m = Y.shape[0]
+    out = np.full((m, len(grid)), np.nan)
+
+    ok_t = np.isfinite(t)
+    if not ok_t.all():
+        t, Y = t[ok_t], Y[:, ok_t]
+    if len(t) == 0 or len(grid) == 0:
+        return out
+    order = np.argsort(t, kind="stable")
+    t, Y = t[order], Y[:, order]
+
+    if method == "hold":
+        i = np.searchsorted(t, grid, side="right") - 1
+        inside = i >= 0
+        if fill == "edge":
+            i = np.clip(i, 0, len(t) - 1)
+            inside = np.ones_like(inside)
+        out[:, inside] = Y[:, i[inside]]
+        if fill == "nan":
+            out[:, grid > t[-1]] = np.nan
+        return out
+
+    if method != "interp":
+        raise ValueError(f"unknown method: {method}")
+
+    # 보간에는 finite 점이 2개 이상 필요하다 (미만이면 NaN)
+    if np.isfinite(Y).all():
+        # 모든 metric이 같은 보간 index/weight를 공유 -> 한 번에 계산
+        if len(t) >= 2:
+            i1 = np.clip(np.searchsorted(t, grid, side="right"), 1, len(t) - 1)
+            i0 = i1 - 1
+            dt = t[i1] - t[i0]
+            w = np.where(dt > 0, (grid - t[i0]) / np.where(dt > 0, dt, 1.0), 0.0)
+            w = np.clip(w, 0.0, 1.0)
+            out[:, :] = Y[:, i0] * (1.0 - w) + Y[:, i1] * w
+    else:
+        # NaN 위치가 metric마다 다르면 metric별로 finite 점만 사용
+        for j in range(m):
+            ok = np.isfinite(Y[j])
+            if ok.sum() >= 2:
+                out[j] = np.interp(grid, t[ok], Y[j, ok])
+
+    if fill == "nan":
+        out[:, (grid < t[0]) | (grid > t[-1])] = np.nan
+    return out
+
+
+def align_charts(charts: Charts, step: Optional[float] = None,
+                 start: Optional[float] = None, end: Optional[float] = None,
+                 method: str = "interp", fill: str = "nan",
+                 span: str = "union") -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    grid = make_grid([t for t, _ in charts.values()], step=step, start=start, end=end, span=span)
+    names: List[str] = []
+    blocks = []
+    for _, (t, series) in charts.items():
+        keys = list(series)
+        if not keys:
+            continue
+        blocks.append(resample(t, np.vstack([series[k] for k in keys]), grid, method=method, fill=fill))
+        names.extend(keys)
+    Y = np.vstack(blocks) if blocks else np.empty((0, len(grid)))
+    return grid, Y, names
+
+
+def load_aligned_run(run_dir: Path, assume_tz: str = DEFAULT_TZ,
+                     start_epoch: Optional[float] = None,
+                     step: Optional[float] = None, method: str = "interp",
+                     fill: str = "nan") -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    charts = load_run_charts(run_dir, assume_tz=assume_tz, start_epoch=start_epoch)
+    return align_charts(charts, step=step, method=method, fill=fill)
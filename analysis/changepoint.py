@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# metric 시계열 자체에서 "실제 자원 사용 구간"을 찾아 log marker(START/END)와 비교한다.
+#
+# 1) run의 chart들을 공통 grid로 정렬 (align.load_aligned_run, fill="edge")
+# 2) metric별로 noise sigma(1차 차분 MAD 기반)로 나눠 z-scale
+# 3) PELT(평균 변화, Gaussian cost)로 다변량 change-point 검출
+#      penalty = beta * n_metrics * log(n)
+# 4) activity metric(cpu / disk util / disk write) 중 하나라도 기준 level보다
+#    k sigma 이상 높은 segment를 active로 보고, 처음~마지막 active segment를 activity window로 본다.
+#    기준 level: 가장 조용한 segment (또는 --reference-step 의 idle 평균)
+#
+# 결과: detected_start/end, START/END 대비 offset, log duration 대비 차이
+#
+# 사용:
+#   python3 analysis/changepoint.py --step step15_rollout_restart_tinyllama_http
+#   python3 analysis/changepoint.py --step step15_rollout_restart_tinyllama_http --run 3 --reference-step step13_tinyllama_idle
+#   -> results/<step>/changepoints.csv
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from align import load_aligned_run
+from netdata_io import DEFAULT_TZ
+from phases import log_window, parse_markers
+from run_table import netdata_run_dir, raw_run_means, run_ids
+
+
+ACTIVITY_METRICS = ["cpu", "disk_util", "disk_write"]
+
+
+def noise_sigma(y: np.ndarray) -> float:
+    # 1차 차분의 MAD -> level 변화에 덜 민감한 noise 추정
+    y = y[np.isfinite(y)]
+    if len(y) < 3:
+        return float("nan")
+    d = np.diff(y)
+    s = 1.4826 * float(np.median(np.abs(d - np.median(d)))) / np.sqrt(2.0)
+    if s <= 0:
+        s = float(np.std(y))
+    return s if s > 0 else float("nan")
+
+
+def pelt(X: np.ndarray, pen: float, min_size: int = 2) -> List[int]:
+    # X: (d, n). 반환: segment 경계 index [0, c1, ..., n]
+    # cost(s, t) = sum_d sum_{s<=i<t} (x_di - mean_d(s:t))^2 를 누적합으로 O(1)에 계산
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    d, n = X.shape
+    if n < 2 * min_size:
+        return [0, n]
+    S1 = np.concatenate([np.zeros((d, 1)), np.cumsum(X, axis=1)], axis=1)
+    S2 = np.concatenate([[0.0], np.cumsum((X ** 2).sum(axis=0))])
+
+    F = np.full(n + 1, np.inf)
+    F[0] = -pen
+    last = np.zeros(n + 1, dtype=int)
+    # dead[s]: 후보 s를 버려도 되는 시점. t에서 pruning 조건을 만족해도
+    # (t, T) 구간이 min_size 이상인 T부터만 t가 s를 대신할 수 있다.
+    dead = np.full(n + 1, n + 1)
+    R = np.array([0], dtype=int)
+
+    for t in range(min_size, n + 1):
+        R = R[dead[R] > t]
+        cand = R[t - R >= min_size]
+        L = (t - cand).astype(float)
+        seg1 = S1[:, t][:, None] - S1[:, cand]
+        cost = (S2[t] - S2[cand]) - (seg1 ** 2).sum(axis=0) / L
+        vals = F[cand] + cost + pen
+        k = int(np.argmin(vals))
+        F[t] = vals[k]
+        last[t] = cand[k]
+        # pruning: 이후에도 최적이 될 수 없는 후보
+        pruned = cand[(F[cand] + cost) > F[t]]
+        dead[pruned] = np.minimum(dead[pruned], t + min_size)
+        R = np.append(R, t - min_size + 1)
+
+    bounds = [n]
+    while bounds[-1] > 0:
+        bounds.append(int(last[bounds[-1]]))
+    return bounds[::-1]
+
+
+def activity_window(t: np.ndarray, Z: np.ndarray, names: Sequence[str], bounds: Sequence[int],
+                    ref: Optional[Dict[str, float]] = None, k: float = 3.0) -> Tuple[float, float, int]:
+    # Z: z-scale 된 (d, n). ref: metric -> 기준 level (z 단위), 없으면 가장 조용한 segment
+    rows = [i for i, nm in enumerate(names) if nm in ACTIVITY_METRICS]
+    if not rows:
+        rows = list(range(len(names)))
+    seg_means = np.array([Z[rows, a:b].mean(axis=1) for a, b in zip(bounds[:-1], bounds[1:])])  # (n_seg, d')
+
+    if ref is not None and all(names[i] in ref for i in rows):
+        base = np.array([ref[names[i]] for i in rows])
+    else:
+        base = seg_means[int(np.argmin(seg_means.sum(axis=1)))]
+
+    active = ((seg_means - base[None, :]) > k).any(axis=1)
+    if not active.any():
+        return float("nan"), float("nan"), 0
+    idx = np.flatnonzero(active)
+    a, b = bounds[idx[0]], bounds[idx[-1] + 1]
+    return float(t[a]), float(t[b - 1]), int(len(idx))
+
+
+def reference_levels(repo_root: Path, step: str) -> Dict[str, float]:
+    # idle step의 run 평균 (원 단위); z 변환은 run마다 한다.
+    df = raw_run_means(repo_root, step)
+    if df is None:
+        return {}
+    return {c[: -len("_mean")]: float(df[c].mean()) for c in df.columns if c.endswith("_mean")}
+
+
+def detect_run(log_path: Path, run_dir: Path, assume_tz: str = DEFAULT_TZ, beta: float = 2.0,
+               k: float = 3.0, min_size: int = 2, ref_raw: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    markers = parse_markers(log_path) if log_path.exists() else {}
+    start, end = log_window(markers)
+
+    grid, Y, names = load_aligned_run(run_dir, assume_tz=assume_tz,
+                                      start_epoch=start if np.isfinite(start) else None, fill="edge")
+    # 값이 없거나 변화가 없는 metric은 제외
+    sig = np.array([noise_sigma(y) for y in Y])
+    keep = np.isfinite(sig) & np.isfinite(Y).all(axis=1)
+    Y, sig, names = Y[keep], sig[keep], [nm for nm, kp in zip(names, keep) if kp]
+
+    out: Dict[str, float] = {
+        "START_EPOCH": start, "END_EPOCH": end, "log_duration_s": end - start,
+        "n_samples": len(grid), "n_metrics": len(names),
+    }
+    if len(names) == 0 or len(grid) < 2 * min_size:
+        return out
+
+    Z = Y / sig[:, None]
+    bounds = pelt(Z, pen=beta * len(names) * np.log(len(grid)), min_size=min_size)
+    ref = None
+    if ref_raw:
+        ref = {nm: ref_raw[nm] / s for nm, s in zip(names, sig) if nm in ref_raw}
+    d_start, d_end, n_active = activity_window(grid, Z, names, bounds, ref=ref, k=k)
+
+    out.update({
+        "n_segments": len(bounds) - 1,
+        "n_active_segments": n_active,
+        "changepoints": " ".join(f"{grid[b]:.0f}" for b in bounds[1:-1]),
+        "detected_start": d_start,
+        "detected_end": d_end,
+        "active_duration_s": d_end - d_start,
+        "start_offset_s": d_start - start,
+        "end_offset_s": d_end - end,
+    })
+    out["duration_error_s"] = out["log_duration_s"] - out["active_duration_s"]
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", required=True)
+    ap.add_argument("--run", default=None, help="default: all runs")
+    ap.add_argument("--timezone", default=DEFAULT_TZ)
+    ap.add_argument("--beta", type=float, default=2.0, help="penalty = beta * n_metrics * log(n)")
+    ap.add_argument("--k", type=float, default=3.0, help="active if segment mean > reference + k sigma")
+    ap.add_argument("--min-size", type=int, default=2)
+    ap.add_argument("--reference-step", default=None, help="idle step used as reference level")
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    ref_raw = reference_levels(repo_root, args.reference_step) if args.reference_step else None
+    runs = [int(args.run)] if args.run else run_ids(repo_root, args.step)
+
+    rows = []
+    for i in runs:
+        run_dir = netdata_run_dir(repo_root, args.step, i)
+        if run_dir is None:
+            print(f"Skip run_{i}: no netdata csv")
+            continue
+        log_path = repo_root / "logs" / "redacted" / args.step / f"run_{i}.log"
+        row = {"step": args.step, "run": i}
+        row.update(detect_run(log_path, run_dir, args.timezone, args.beta, args.k, args.min_size, ref_raw))
+        rows.append(row)
+
+    if not rows:
+        raise SystemExit(f"no runs for {args.step}")
+
+    df = pd.DataFrame(rows)
+    result_dir = repo_root / "results" / args.step
+    result_dir.mkdir(parents=True, exist_ok=True)
+    out_path = result_dir / ("changepoints.csv" if not args.run else f"run_{args.run}/changepoints.csv")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(out_path, index=False)
+    print("Saved:", out_path)
+
+    cols = [c for c in ("start_offset_s", "end_offset_s", "duration_error_s") if c in df.columns]
+    if cols:
+        print("\n=== Marker vs activity window (s) ===")
+        print(df[cols].agg(["median", "mean", "min", "max"]).round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# node 시계 -> master 시계 보정 (scripts/utils/clock_offset.py 결과)
+#
+# 입력: <run_dir>/clock_offset.csv  (node, phase, time, offset_sec, rtt_sec, ..., drift_ppm)
+#   offset = node 시계 - master 시계. run 시작/끝 두 번 잰 값을 시간에 대해 선형 보간한다 (drift 반영).
+#   구간 밖은 가장 가까운 측정값을 그대로 쓴다. 측정값이 없는 node는 보정하지 않는다.
+#   master 시각 = node 시각 - offset(node 시각)
+#
+# nodes.py 등 node별 CSV 로더는 correct_times()를 거쳐 master 시각으로 맞춘다.
+#
+# 사용:
+#   python3 analysis/clock.py --step step12_apply_tinyllama_http
+#   -> results/<step>/clock_offset.csv   (run x node: offset_start/end_ms, drift_ppm, rtt_ms)
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from run_table import netdata_bases, run_dirs
+
+
+def load_offsets(run_dir: Path) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    # node -> (측정 시각(master epoch), offset 초), 시각순
+    p = run_dir / "clock_offset.csv"
+    if not p.exists() or p.stat().st_size == 0:
+        return {}
+    df = pd.read_csv(p, dtype={"node": str})
+    df = df.dropna(subset=["time", "offset_sec"])
+    out = {}
+    for node, g in df.groupby("node", sort=False):
+        g = g.sort_values("time")
+        out[node] = (g["time"].to_numpy(dtype=float), g["offset_sec"].to_numpy(dtype=float))
+    return out
+
+
+def offset_at(ref: Tuple[np.ndarray, np.ndarray], t: np.ndarray) -> np.ndarray:
+    tm, off = ref
+    if len(tm) == 1:
+        return np.full(len(t), off[0])
+    # 측정 시각은 master 기준이라 node 시각에서 offset을 한 번 빼서 보간 위치를 잡는다.
+    return np.interp(np.asarray(t, dtype=float) - np.median(off), tm, off)
+
+
+def correct_times(t: np.ndarray, offsets: Dict[str, Tuple[np.ndarray, np.ndarray]], node: str) -> np.ndarray:
+    t = np.asarray(t, dtype=float)
+    if node not in offsets:
+        return t
+    return t - offset_at(offsets[node], t)
+
+
+def run_offset_rows(run_dir: Path) -> List[Dict[str, object]]:
+    p = run_dir / "clock_offset.csv"
+    if not p.exists() or p.stat().st_size == 0:
+        return []
+    df = pd.read_csv(p, dtype={"node": str})
+    rows = []
+    for node, g in df.groupby("node", sort=False):
+        start, end = g[g["phase"] == "start"], g[g["phase"] == "end"]
+        row: Dict[str, object] = {"node": node, "method": g["method"].iloc[-1]}
+        row["offset_start_ms"] = float(start["offset_sec"].iloc[-1]) * 1000 if len(start) else np.nan
+        row["offset_end_ms"] = float(end["offset_sec"].iloc[-1]) * 1000 if len(end) else np.nan
+        row["drift_ppm"] = float(end["drift_ppm"].iloc[-1]) if len(end) and "drift_ppm" in end else np.nan
+        row["rtt_ms"] = float(g["rtt_sec"].max()) * 1000 if g["rtt_sec"].notna().any() else np.nan
+        rows.append(row)
+    return rows
+
+
+def clock_run_dirs(repo_root: Path, step: str) -> Dict[int, Path]:
+    # step11처럼 netdata가 아닌 data/network/<step>/run_<i>/ 에 남긴 경우도 찾는다.
+    found: Dict[int, Path] = {}
+    for base in netdata_bases(repo_root, step) + [repo_root / "data" / "network" / step]:
+        for rd in run_dirs(base):
+            if (rd / "clock_offset.csv").exists():
+                found.setdefault(int(rd.name.split("_")[1]), rd)
+    return dict(sorted(found.items()))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", nargs="+", required=True)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    for step in args.step:
+        rows = []
+        for i, rd in clock_run_dirs(repo_root, step).items():
+            rows += [{"step": step, "run": i, **r} for r in run_offset_rows(rd)]
+        if not rows:
+            print("Skip (no clock_offset.csv):", step)
+            continue
+        df = pd.DataFrame(rows)
+        out_path = repo_root / "results" / step / "clock_offset.csv"
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out_path, index=False)
+        print("Saved:", out_path)
+        print(df.groupby("node")[["offset_start_ms", "drift_ppm", "rtt_ms"]].median().round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
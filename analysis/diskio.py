@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# lifecycle phase별 disk write 비용 (bytes / IOPS / latency)
+#
+# 입력 (run마다, 있는 쪽을 쓴다)
+# 1) diskstats_<dev>.csv : scripts/utils/diskstats_sampler.py가 남긴 /proc/diskstats 누적 counter
+#    phase 경계 시각에서 counter를 선형 보간해 차분한다.
+#      write_bytes      = Δsectors_written * 512
+#      write_iops       = Δwrites / duration
+#      write_kib_per_io = write_bytes / Δwrites / 1024     (평균 request 크기)
+#      write_latency_ms = Δms_writing / Δwrites             (request당 평균 대기+처리 시간)
+#      util_pct         = Δms_io / (duration * 1000) * 100
+#      queue_depth      = Δweighted_ms / (duration * 1000)  (평균 in-flight request 수)
+# 2) netdata disk_io_*.csv (KiB/s, 5초 평균): write_bytes만 사다리꼴 적분으로 구한다 (IOPS/latency는 NaN).
+#
+# idle step(overhead.DEFAULT_REFERENCE)의 disk_write 평균을 같은 길이만큼 빼서
+#   excess_write_bytes = write_bytes - idle_write_kibps * 1024 * duration
+#   write_amp          = write_bytes / (idle_write_kibps * 1024 * duration)
+# 도 같이 남긴다 (k3s datastore(sqlite/etcd) fsync가 idle 대비 얼마나 쓰기를 늘리는지).
+#
+# 사용:
+#   python3 analysis/diskio.py --step step04_apply_deployment step06_scale_up_down step07_rollout_restart step10_delete_deployment
+#   -> results/<step>/run_<i>/diskio_phases.csv
+#      results/<step>/diskio_phases.csv          (모든 run)
+#      results/_summary/diskio/write_cost.csv    (step/phase별 median, write_bytes 내림차순)
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from netdata_io import DEFAULT_TZ, load_run_charts
+from overhead import DEFAULT_REFERENCE, baseline_samples
+from phases import Phase, build_phases, parse_markers, phase_stats
+from run_table import netdata_bases, run_ids
+
+
+SECTOR_BYTES = 512
+
+COUNTERS = [
+    "reads", "reads_merged", "sectors_read", "ms_reading",
+    "writes", "writes_merged", "sectors_written", "ms_writing",
+    "in_progress", "ms_io", "weighted_ms",
+]
+# in_progress는 누적값이 아니라 순간값
+GAUGES = {"in_progress"}
+
+IO_COLS = [
+    "write_bytes", "read_bytes", "writes", "reads",
+    "write_iops", "read_iops", "write_kib_per_io",
+    "write_latency_ms", "read_latency_ms", "util_pct", "queue_depth",
+]
+
+
+def diskstats_file(run_dir: Path, device: Optional[str] = None) -> Optional[Path]:
+    pattern = f"diskstats_{device}.csv" if device else "diskstats_*.csv"
+    files = sorted(p for p in run_dir.glob(pattern) if p.stat().st_size > 0)
+    return files[0] if files else None
+
+
+def read_diskstats(p: Path, device: Optional[str] = None) -> pd.DataFrame:
+    df = pd.read_csv(p)
+    if "device" in df.columns:
+        dev = device or str(df["device"].iloc[0])
+        df = df[df["device"].astype(str) == dev]
+    df = df.copy()
+    df["time"] = pd.to_numeric(df["time"], errors="coerce")
+    df = df.dropna(subset=["time"]).sort_values("time").drop_duplicates("time").reset_index(drop=True)
+    for c in COUNTERS:
+        if c not in df.columns:
+            continue
+        x = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+        if c in GAUGES or len(x) < 2:
+            df[c] = x
+            continue
+        # counter가 줄어들면(wrap / device 재등록) 0부터 다시 센 것으로 보고 이어 붙인다.
+        d = np.diff(x)
+        d = np.where(d < 0, x[1:], d)
+        df[c] = x[0] + np.concatenate([[0.0], np.cumsum(d)])
+    return df
+
+
+def counters_at(df: pd.DataFrame, at: np.ndarray) -> Dict[str, np.ndarray]:
+    # 누적 counter를 시각 at에서 선형 보간. 샘플 범위 밖은 NaN.
+    t = df["time"].to_numpy(dtype=float)
+    at = np.asarray(at, dtype=float)
+    inside = (at >= t[0]) & (at <= t[-1]) if len(t) else np.zeros(len(at), dtype=bool)
+    out = {}
+    for c in COUNTERS:
+        if c in df.columns and c not in GAUGES:
+            v = np.interp(at, t, df[c].to_numpy(dtype=float)) if len(t) else np.full(len(at), np.nan)
+            out[c] = np.where(inside, v, np.nan)
+    return out
+
+
+def phase_io_diskstats(df: pd.DataFrame, phases: Sequence[Phase]) -> pd.DataFrame:
+    starts = np.array([ph[2] for ph in phases], dtype=float)
+    ends = np.array([ph[3] for ph in phases], dtype=float)
+    c0, c1 = counters_at(df, starts), counters_at(df, ends)
+    d = {c: c1[c] - c0[c] for c in c0}
+    dur = ends - starts
+    nan = np.full(len(phases), np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        writes, reads = d.get("writes", nan), d.get("reads", nan)
+        write_bytes = d.get("sectors_written", nan) * SECTOR_BYTES
+        out = pd.DataFrame({
+            "phase": [ph[0] for ph in phases],
+            "kind": [ph[1] for ph in phases],
+            "start_epoch": starts,
+            "end_epoch": ends,
+            "duration_s": dur,
+            "source": "diskstats",
+            "write_bytes": write_bytes,
+            "read_bytes": d.get("sectors_read", nan) * SECTOR_BYTES,
+            "writes": writes,
+            "reads": reads,
+            "write_iops": np.where(dur > 0, writes / dur, np.nan),
+            "read_iops": np.where(dur > 0, reads / dur, np.nan),
+            "write_kib_per_io": np.where(writes > 0, write_bytes / writes / 1024, np.nan),
+            "write_latency_ms": np.where(writes > 0, d.get("ms_writing", nan) / writes, np.nan),
+            "read_latency_ms": np.where(reads > 0, d.get("ms_reading", nan) / reads, np.nan),
+            "util_pct": np.where(dur > 0, d.get("ms_io", nan) / (dur * 1000) * 100, np.nan),
+            "queue_depth": np.where(dur > 0, d.get("weighted_ms", nan) / (dur * 1000), np.nan),
+        })
+    return out
+
+
+def phase_io_netdata(run_dir: Path, phases: Sequence[Phase], assume_tz: str = DEFAULT_TZ,
+                     start_epoch: Optional[float] = None) -> Optional[pd.DataFrame]:
+    charts = load_run_charts(run_dir, assume_tz=assume_tz, start_epoch=start_epoch)
+    if "disk_io" not in charts:
+        return None
+    t, series = charts["disk_io"]
+    names = list(series)
+    st = phase_stats(t, np.vstack([series[m] for m in names]), names, phases)
+    out = st[["phase", "kind", "start_epoch", "end_epoch", "duration_s"]].copy()
+    out["source"] = "netdata"
+    for c in IO_COLS:
+        out[c] = np.nan
+    # KiB/s 적분 -> KiB
+    out["write_bytes"] = st["disk_write_auc"] * 1024
+    out["read_bytes"] = st["disk_read_auc"] * 1024
+    return out
+
+
+def run_phase_io(log_path: Path, run_dir: Path, assume_tz: str = DEFAULT_TZ,
+                 device: Optional[str] = None) -> pd.DataFrame:
+    markers = parse_markers(log_path)
+    if not markers:
+        raise RuntimeError(f"no *_EPOCH markers in {log_path}")
+    phases = build_phases(markers)
+
+    p = diskstats_file(run_dir, device)
+    if p is not None:
+        df = read_diskstats(p, device)
+        if len(df) >= 2:
+            return phase_io_diskstats(df, phases)
+    out = phase_io_netdata(run_dir, phases, assume_tz, markers.get("START_EPOCH"))
+    if out is None:
+        raise RuntimeError(f"no diskstats / disk_io csv in {run_dir}")
+    return out
+
+
+def io_run_dir(repo_root: Path, step: str, run: int) -> Optional[Path]:
+    # netdata_run_dir와 같은 순서로 찾되 diskstats만 있는 run도 받는다.
+    for base in netdata_bases(repo_root, step):
+        rd = base / f"run_{run}"
+        if rd.is_dir() and (any(rd.glob("diskstats_*.csv")) or any(rd.glob("disk_io_*.csv"))):
+            return rd
+    return None
+
+
+def add_idle_excess(df: pd.DataFrame, idle_write_kibps: float) -> pd.DataFrame:
+    df = df.copy()
+    idle = idle_write_kibps * 1024 * df["duration_s"]
+    df["idle_write_kibps"] = idle_write_kibps
+    df["excess_write_bytes"] = df["write_bytes"] - idle
+    with np.errstate(invalid="ignore", divide="ignore"):
+        df["write_amp"] = np.where(idle > 0, df["write_bytes"] / idle, np.nan)
+    return df
+
+
+def idle_write_rate(repo_root: Path, step: str, reference: Optional[str]) -> float:
+    ref = reference or DEFAULT_REFERENCE.get(step)
+    if not ref:
+        return float("nan")
+    x = baseline_samples(repo_root, ref).get("disk_write")
+    if x is None or not np.isfinite(x).any():
+        return float("nan")
+    return float(np.nanmedian(x))
+
+
+def write_cost(per_run: pd.DataFrame) -> pd.DataFrame:
+    # step/phase별 run median. 같은 phase 이름이 run마다 반복되는 것만 의미가 있다.
+    cols = [c for c in ["duration_s", "write_bytes", "excess_write_bytes", "write_amp", "write_iops",
+                        "write_kib_per_io", "write_latency_ms", "util_pct", "queue_depth"] if c in per_run.columns]
+    g = per_run.groupby(["step", "phase", "kind"], sort=False)
+    out = g[cols].median()
+    out.insert(0, "n_runs", g["run"].nunique())
+    out.insert(1, "source", g["source"].agg(lambda s: "+".join(sorted(set(s)))))
+    out["write_mib"] = out["write_bytes"] / (1024 * 1024)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["write_kibps"] = out["write_bytes"] / 1024 / out["duration_s"]
+    return out.reset_index().sort_values("write_bytes", ascending=False, na_position="last")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", nargs="+", required=True)
+    ap.add_argument("--run", default=None, help="default: all runs")
+    ap.add_argument("--timezone", default=DEFAULT_TZ)
+    ap.add_argument("--device", default=None, help="diskstats device (default: first diskstats_*.csv)")
+    ap.add_argument("--reference", default=None, help="idle step for excess/amp (default: overhead.DEFAULT_REFERENCE)")
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    all_rows: List[pd.DataFrame] = []
+    for step in args.step:
+        idle = idle_write_rate(repo_root, step, args.reference)
+        runs = [int(args.run)] if args.run else run_ids(repo_root, step)
+        per_step: List[pd.DataFrame] = []
+        for i in runs:
+            run_dir = io_run_dir(repo_root, step, i)
+            log_path = repo_root / "logs" / "redacted" / step / f"run_{i}.log"
+            if run_dir is None or not log_path.exists():
+                print(f"Skip {step} run_{i}: no diskstats/disk_io csv or log")
+                continue
+            try:
+                df = run_phase_io(log_path, run_dir, args.timezone, args.device)
+            except RuntimeError as e:
+                print(f"Skip {step} run_{i}: {e}")
+                continue
+            df = add_idle_excess(df, idle)
+            df.insert(0, "run", i)
+            df.insert(0, "step", step)
+            out_dir = repo_root / "results" / step / f"run_{i}"
+            out_dir.mkdir(parents=True, exist_ok=True)
+            df.to_csv(out_dir / "diskio_phases.csv", index=False)
+            per_step.append(df)
+
+        if not per_step:
+            print("Skip (no runs):", step)
+            continue
+        step_df = pd.concat(per_step, ignore_index=True)
+        if not args.run:
+            out_path = repo_root / "results" / step / "diskio_phases.csv"
+            step_df.to_csv(out_path, index=False)
+            print("Saved:", out_path)
+        all_rows.append(step_df)
+
+    if not all_rows:
+        raise SystemExit("no runs")
+    cost = write_cost(pd.concat(all_rows, ignore_index=True))
+    out_dir = repo_root / "results" / "_summary" / "diskio"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / "write_cost.csv"
+    cost.to_csv(out_path, index=False)
+    print("Saved:", out_path)
+
+    show = [c for c in ["step", "phase", "n_runs", "write_mib", "write_iops", "write_latency_ms", "write_amp"] if c in cost.columns]
+    print("\n=== Write cost per phase (median over runs) ===")
+    print(cost[cost["kind"] == "span"][show].round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# campaign(scripts/utils/campaign.py) run 순서에 따른 시간 drift 추정 / 제거
+# - logs/redacted/_campaign/<name>/schedule.csv 의 SEQ(campaign 전체 순번)와 step별 run 통계를 합친다.
+# - metric마다 y = step 평균(step dummy) + slope * (SEQ - mean SEQ) 를 최소제곱으로 맞춘다.
+#   (step을 섞어서 돌렸으므로 slope는 step 차이와 분리된 공통 drift)
+# - slope의 SE / t / p(정규 근사), 전체 campaign 동안의 drift 크기(slope * SEQ 범위)를 기록하고
+#   run 값에서 slope * (SEQ - mean SEQ)를 뺀 detrended 값을 남긴다.
+# - (step, run) 번호만으로 합치면 campaign 밖에서 다시 돌린 run이 섞일 수 있으므로, 각 row의 START_EPOCH
+#   (stats 컬럼, 없으면 run log)가 schedule의 [start_epoch, end_epoch] 안에 있는지 확인한다.
+#   벗어난 row는 버린다 (--on-mismatch raise면 중단). START_EPOCH를 못 찾은 row는 경고만 하고 남긴다.
+#
+# 사용:
+#   python3 analysis/drift.py --campaign nginx_events
+#   python3 analysis/drift.py --campaign nginx_events --cols T_total cpu_mean
+#   python3 analysis/drift.py --campaign nginx_events --on-mismatch raise
+#   -> results/_summary/drift/<campaign>/drift_fit.csv
+#   -> results/_summary/drift/<campaign>/detrended.csv
+from __future__ import annotations
+
+import argparse
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from phases import parse_markers
+from run_table import load_step_table, raw_run_means
+
+
+DRIFT_COLS = [
+    "T_ready", "T_total",
+    "cpu_mean", "ram_mean", "disk_util_mean",
+    "disk_read_mean", "disk_write_mean",
+]
+
+# schedule의 start_epoch / end_epoch는 정수 초로 잘려 있다.
+EPOCH_SLACK_SEC = 1.0
+
+
+def load_schedule(repo_root: Path, campaign: str) -> pd.DataFrame:
+    p = repo_root / "logs" / "redacted" / "_campaign" / campaign / "schedule.csv"
+    if not p.exists():
+        raise SystemExit(f"[ERROR] schedule not found: {p}")
+    df = pd.read_csv(p)
+    df = df[df["status"] == "done"].copy()
+    df["run"] = df["run"].astype(int)
+    cols = ["seq", "block", "step", "run", "start_epoch", "end_epoch"] + (["log"] if "log" in df.columns else [])
+    return df[cols]
+
+
+def step_metrics(repo_root: Path, step: str) -> Optional[pd.DataFrame]:
+    # stats 테이블 값을 우선하고, 없는 컬럼은 raw netdata run 평균으로 채운다.
+    table = load_step_table(repo_root / "results", step)
+    raw = raw_run_means(repo_root, step)
+    if table is None:
+        return raw
+    if raw is None or "run" not in table.columns:
+        return table
+    table = table.dropna(subset=["run"]).astype({"run": int})
+    extra = [c for c in raw.columns if c not in table.columns]
+    return table.merge(raw[["run"] + extra], on="run", how="left") if extra else table
+
+
+def campaign_table(repo_root: Path, sched: pd.DataFrame) -> pd.DataFrame:
+    parts = []
+    for step, g in sched.groupby("step", sort=False):
+        m = step_metrics(repo_root, step)
+        if m is None or "run" not in m.columns:
+            print("Skip (no run table):", step)
+            continue
+        m = m.dropna(subset=["run"]).astype({"run": int})
+        m = m.drop(columns=[c for c in ("seq", "block", "step", "start_epoch", "end_epoch", "log") if c in m.columns])
+        parts.append(g.merge(m, on="run", how="inner"))
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True).sort_values("seq").reset_index(drop=True)
+
+
+def run_start_epoch(repo_root: Path, row: pd.Series) -> float:
+    # stats 테이블의 START_EPOCH, 없으면 schedule의 log(없으면 기본 경로) marker
+    v = pd.to_numeric(row.get("START_EPOCH"), errors="coerce")
+    if pd.notna(v):
+        return float(v)
+    log = row.get("log")
+    p = repo_root / log if isinstance(log, str) and log else (
+        repo_root / "logs" / "redacted" / row["step"] / f"run_{row['run']}.log")
+    if not p.exists():
+        return float("nan")
+    return parse_markers(p).get("START_EPOCH", float("nan"))
+
+
+def check_epochs(repo_root: Path, df: pd.DataFrame, on_mismatch: str = "drop") -> pd.DataFrame:
+    # START_EPOCH가 schedule 구간 밖인 row (campaign 밖에서 같은 run 번호로 다시 돌린 결과) 제거
+    start = np.array([run_start_epoch(repo_root, r) for _, r in df.iterrows()], dtype=float)
+    lo = pd.to_numeric(df["start_epoch"], errors="coerce").to_numpy(dtype=float) - EPOCH_SLACK_SEC
+    hi = pd.to_numeric(df["end_epoch"], errors="coerce").to_numpy(dtype=float) + EPOCH_SLACK_SEC
+    unknown = ~np.isfinite(start) | ~np.isfinite(lo) | ~np.isfinite(hi)
+    bad = ~unknown & ((start < lo) | (start > hi))
+    for r in df[unknown].itertuples():
+        print(f"[WARN] {r.step} run_{r.run} (seq {r.seq}): START_EPOCH unknown, not checked")
+    if bad.any():
+        msgs = [f"{r.step} run_{r.run} (seq {r.seq}): START_EPOCH={s:.0f} not in [{r.start_epoch}, {r.end_epoch}]"
+                for r, s in zip(df[bad].itertuples(), start[bad])]
+        if on_mismatch == "raise":
+            raise SystemExit("[ERROR] run data does not match the campaign schedule:\n  " + "\n  ".join(msgs))
+        for m in msgs:
+            print(f"[drop] {m}")
+    return df[~bad].reset_index(drop=True)
+
+
+def fit_drift(df: pd.DataFrame, col: str) -> Optional[Dict[str, float]]:
+    d = df[["step", "seq", col]].dropna()
+    steps = sorted(d["step"].unique())
+    n, k = len(d), len(steps) + 1
+    if n <= k:
+        return None
+    x = d["seq"].to_numpy(dtype=float)
+    xc = x - x.mean()
+    design = np.column_stack([(d["step"].to_numpy() == s).astype(float) for s in steps] + [xc])
+    y = d[col].to_numpy(dtype=float)
+    coef, _, rank, _ = np.linalg.lstsq(design, y, rcond=None)
+    if rank < k:
+        return None
+    resid = y - design @ coef
+    sigma2 = float(resid @ resid) / (n - k)
+    cov = sigma2 * np.linalg.inv(design.T @ design)
+    slope, se = float(coef[-1]), float(math.sqrt(cov[-1, -1]))
+    t = slope / se if se > 0 else float("inf")
+    level = float(np.mean(coef[:-1]))
+    span = slope * float(x.max() - x.min())
+    return {
+        "metric": col,
+        "n": n,
+        "n_steps": len(steps),
+        "slope_per_run": slope,
+        "slope_se": se,
+        "t": t,
+        "p": math.erfc(abs(t) / math.sqrt(2.0)) if math.isfinite(t) else 0.0,
+        "drift_over_campaign": span,
+        "drift_pct_of_level": 100.0 * span / level if level else float("nan"),
+        "seq_mean": float(x.mean()),
+    }
+
+
+def detrend(df: pd.DataFrame, fits: Sequence[Dict[str, float]]) -> pd.DataFrame:
+    out = df[["seq", "block", "step", "run"]].copy()
+    for f in fits:
+        col = f["metric"]
+        out[col] = df[col]
+        out[f"{col}_detrended"] = df[col] - f["slope_per_run"] * (df["seq"] - f["seq_mean"])
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--campaign", required=True)
+    ap.add_argument("--cols", nargs="*", default=None, help=f"default: {' '.join(DRIFT_COLS)}")
+    ap.add_argument("--on-mismatch", choices=["drop", "raise"], default="drop",
+                    help="rows whose START_EPOCH is outside the schedule window")
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    sched = load_schedule(repo_root, args.campaign)
+    df = campaign_table(repo_root, sched)
+    if not df.empty:
+        df = check_epochs(repo_root, df, args.on_mismatch)
+    if df.empty:
+        raise SystemExit(f"[ERROR] no run data for campaign {args.campaign}")
+
+    cols = [c for c in (args.cols or DRIFT_COLS) if c in df.columns]
+    fits: List[Dict[str, float]] = []
+    for col in cols:
+        f = fit_drift(df, col)
+        if f is None:
+            print(f"Skip (too few runs): {col}")
+            continue
+        fits.append(f)
+        print(f"  {col:>16}: slope={f['slope_per_run']:+.4g}/run (t={f['t']:+.2f}, p={f['p']:.3f}), "
+              f"over campaign {f['drift_pct_of_level']:+.1f}%")
+    if not fits:
+        raise SystemExit("[ERROR] nothing to fit")
+
+    out_dir = repo_root / "results" / "_summary" / "drift" / args.campaign
+    out_dir.mkdir(parents=True, exist_ok=True)
+    fit_path = out_dir / "drift_fit.csv"
+    pd.DataFrame(fits).drop(columns=["seq_mean"]).to_csv(fit_path, index=False)
+    print("Saved:", fit_path)
+    det_path = out_dir / "detrended.csv"
+    detrend(df, fits).to_csv(det_path, index=False)
+    print("Saved:", det_path)
+
+
+if __name__ == "__main__":
+    main()
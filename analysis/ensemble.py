@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# step의 모든 run을 "START 이후 경과 초" 축으로 정렬해 ensemble envelope을 만든다.
+# - run별 chart를 상대 시간 grid 위로 resample -> (n_runs, n_metrics, n_grid) 배열
+# - run 축으로 median / p10 / p90 / n_valid 를 한 번에 계산
+# - results/<step>/ensemble.npz (float32, 압축) + results/<step>/fig3_ensemble.png
+# - step을 여러 개 주면 results/_summary/ensemble/<a>__vs__<b>.png 에 envelope을 겹쳐 그린다.
+#
+# 사용:
+#   python3 analysis/ensemble.py --step step02_start_master step04_apply_deployment
+from __future__ import annotations
+
+import argparse
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from align import native_step, resample
+from netdata_io import DEFAULT_TZ, load_run_charts
+from phases import parse_markers
+from run_table import netdata_run_dir, run_ids
+
+
+LABELS = {
+    "cpu": "CPU (%)",
+    "ram": "RAM used (MB)",
+    "disk_util": "Disk util (%)",
+    "disk_read": "Disk read (KiB/s)",
+    "disk_write": "Disk write (KiB/s)",
+    "net_rx": "Net rx (kbit/s)",
+    "net_tx": "Net tx (kbit/s)",
+    "cpu_norm": "CPU @max clock (%)",
+    "cpu_freq": "CPU clock (MHz)",
+    "temp": "Temp (°C)",
+    "throttled": "Throttled (0/1)",
+}
+
+Ensemble = Dict[str, np.ndarray]
+
+
+def load_relative_runs(repo_root: Path, step: str, assume_tz: str = DEFAULT_TZ) -> List[Tuple[int, Dict[str, Tuple[np.ndarray, np.ndarray]]]]:
+    # run -> {metric: (t_rel, y)}
+    out = []
+    for i in run_ids(repo_root, step):
+        run_dir = netdata_run_dir(repo_root, step, i)
+        if run_dir is None:
+            continue
+        log_path = repo_root / "logs" / "redacted" / step / f"run_{i}.log"
+        markers = parse_markers(log_path) if log_path.exists() else {}
+        start = markers.get("START_EPOCH")
+        charts = load_run_charts(run_dir, assume_tz=assume_tz, start_epoch=start)
+        if not charts:
+            continue
+        if start is None:
+            # marker가 없으면 가장 이른 샘플을 0초로 본다.
+            start = min(float(t[0]) for t, _ in charts.values() if len(t))
+        series = {m: (t - start, y) for t, ys in charts.values() for m, y in ys.items()}
+        out.append((i, series))
+    return out
+
+
+def build_ensemble(runs: List[Tuple[int, Dict[str, Tuple[np.ndarray, np.ndarray]]]],
+                   step_s: Optional[float] = None, span: str = "union",
+                   quantiles: Tuple[float, float, float] = (10, 50, 90)) -> Ensemble:
+    names: List[str] = []
+    for _, series in runs:
+        names.extend(m for m in series if m not in names)
+    ts = [t for _, series in runs for t, _ in series.values() if len(t)]
+    if not ts:
+        raise RuntimeError("no samples")
+
+    dt = float(step_s) if step_s else native_step(ts)
+    lo = max(0.0, min(float(t.min()) for t in ts))
+    ends = [max(float(t.max()) for t, _ in series.values() if len(t)) for _, series in runs]
+    hi = max(ends) if span == "union" else min(ends)
+    grid = lo + dt * np.arange(int(np.floor((hi - lo) / dt + 1e-9)) + 1)
+
+    # (n_runs, n_metrics, n_grid); run에 없는 metric / 범위 밖은 NaN
+    cube = np.full((len(runs), len(names), len(grid)), np.nan)
+    for r, (_, series) in enumerate(runs):
+        for j, m in enumerate(names):
+            if m in series:
+                t, y = series[m]
+                cube[r, j] = resample(t, y, grid, method="interp", fill="nan")[0]
+
+    n_valid = np.isfinite(cube).sum(axis=0)
+    with warnings.catch_warnings():
+        # 모든 run이 NaN인 칸은 NaN으로 남긴다.
+        warnings.filterwarnings("ignore", message="All-NaN slice")
+        q = np.nanpercentile(cube, quantiles, axis=0)  # (3, n_metrics, n_grid)
+    return {
+        "t_rel": grid,
+        "names": np.array(names),
+        "runs": np.array([i for i, _ in runs]),
+        "p10": q[0], "median": q[1], "p90": q[2],
+        "n_valid": n_valid,
+        "cube": cube,
+    }
+
+
+def save_ensemble(ens: Ensemble, path: Path) -> None:
+    # envelope만 float32로 압축 저장 (run별 cube는 저장하지 않음)
+    np.savez_compressed(
+        path,
+        t_rel=ens["t_rel"].astype(np.float32),
+        names=ens["names"],
+        runs=ens["runs"],
+        p10=ens["p10"].astype(np.float32),
+        median=ens["median"].astype(np.float32),
+        p90=ens["p90"].astype(np.float32),
+        n_valid=ens["n_valid"].astype(np.int16),
+    )
+
+
+def load_ensemble(path: Path) -> Ensemble:
+    with np.load(path, allow_pickle=False) as z:
+        return {k: z[k] for k in z.files}
+
+
+def plot_ensemble(ens_by_step: Dict[str, Ensemble], out_path: Path, show_runs: bool = True) -> None:
+    names: List[str] = []
+    for ens in ens_by_step.values():
+        names.extend(str(m) for m in ens["names"] if str(m) not in names)
+
+    fig, axes = plt.subplots(len(names), 1, figsize=(12, 2.6 * len(names)), sharex=True, squeeze=False)
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    for k, (step, ens) in enumerate(ens_by_step.items()):
+        c = colors[k % len(colors)]
+        t = ens["t_rel"]
+        for j, m in enumerate(str(x) for x in ens["names"]):
+            ax = axes[names.index(m), 0]
+            if show_runs and "cube" in ens:
+                for y in ens["cube"][:, j]:
+                    ax.plot(t, y, color=c, alpha=0.15, linewidth=0.7)
+            ax.fill_between(t, ens["p10"][j], ens["p90"][j], color=c, alpha=0.25, linewidth=0)
+            ax.plot(t, ens["median"][j], color=c, linewidth=1.6,
+                    label=f"{step} (n={len(ens['runs'])})" if j == 0 else None)
+    for j, m in enumerate(names):
+        axes[j, 0].set_ylabel(LABELS.get(m, m))
+        axes[j, 0].grid(True, alpha=0.3)
+    axes[-1, 0].set_xlabel("seconds since START")
+    axes[0, 0].legend(loc="upper right", fontsize=8)
+    title = " vs ".join(ens_by_step) if len(ens_by_step) > 1 else next(iter(ens_by_step))
+    fig.suptitle(f"[{title}] median and p10–p90 across runs", fontsize=11, fontweight="bold")
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
+    plt.close(fig)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", nargs="+", required=True)
+    ap.add_argument("--timezone", default=DEFAULT_TZ)
+    ap.add_argument("--grid-step", type=float, default=None, help="seconds; default = native sampling step")
+    ap.add_argument("--span", choices=["union", "intersection"], default="union")
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    ens_by_step: Dict[str, Ensemble] = {}
+    for step in args.step:
+        runs = load_relative_runs(repo_root, step, args.timezone)
+        if not runs:
+            print("Skip (no runs):", step)
+            continue
+        ens = build_ensemble(runs, step_s=args.grid_step, span=args.span)
+        out_dir = repo_root / "results" / step
+        out_dir.mkdir(parents=True, exist_ok=True)
+        save_ensemble(ens, out_dir / "ensemble.npz")
+        plot_ensemble({step: ens}, out_dir / "fig3_ensemble.png")
+        print("Saved:", out_dir / "ensemble.npz")
+        print("Saved:", out_dir / "fig3_ensemble.png")
+        ens_by_step[step] = ens
+
+    if len(ens_by_step) > 1:
+        out_dir = repo_root / "results" / "_summary" / "ensemble"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / ("__vs__".join(ens_by_step) + ".png")
+        plot_ensemble(ens_by_step, out_path, show_runs=False)
+        print("Saved:", out_path)
+
+
+if __name__ == "__main__":
+    main()
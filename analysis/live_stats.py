@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# 수집 중에 netdata를 주기적으로 읽어 streaming accumulator를 갱신하고
+# live_stats.csv를 계속 덮어쓴다 (전체 series를 저장하지 않음).
+#
+# - 표준 라이브러리만 사용 (numpy/pandas 없는 node 위, runner.py의 live_stats sampler로도 돈다)
+# - chart 선택 / 대표 series 규칙은 netdata_io와 동일 (cpu = 100 - idle, disk/net 절댓값),
+#   여기서는 샘플 하나의 {dimension: 값} dict에서 고른다 (scripts/utils/cooldown.py의 metric_value와 같은 방식)
+# - --phase-file: 파일 내용(한 줄)을 현재 phase 이름으로 사용. run_experiment.sh에서
+#     echo READY > "$PHASE_FILE" 처럼 바꾸면 이후 샘플은 새 phase accumulator로 들어간다.
+#   TOTAL 행은 phase accumulator들을 시간순으로 merge 한 결과다.
+# - SIGINT/SIGTERM 또는 --duration 경과 시 마지막으로 한 번 더 쓰고 종료
+#
+# 사용:
+#   python3 analysis/live_stats.py --step step17_infer_load_1rps_tinyllama_http --run 3 --duration 600
+#   python3 analysis/live_stats.py --step <step> --run 3 --phase-file <file> --out-dir <dir>   (runner.py, LIVE_STATS=1)
+#   -> results/<step>/run_<i>/live_stats.csv (--out-dir가 있으면 그 아래)
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import signal
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from functools import reduce
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from streaming import SeriesAccumulator
+
+
+Dims = Dict[str, float]
+Picker = Callable[[Dims], Dict[str, Optional[float]]]
+
+
+def _match(dims: Dims, patterns: List[str]) -> Optional[str]:
+    for pat in patterns:
+        for k in dims:
+            if pat in k.lower():
+                return k
+    return None
+
+
+def _pair(dims: Dims, a: List[str], b: List[str]) -> Tuple[Optional[float], Optional[float]]:
+    # 두 dimension 절댓값 (이름으로 못 찾으면 앞 두 개, 하나뿐이면 둘 다 그 값)
+    ka, kb = _match(dims, a), _match(dims, b)
+    if ka is None or kb is None:
+        keys = list(dims)
+        if not keys:
+            return None, None
+        ka, kb = keys[0], keys[1] if len(keys) >= 2 else keys[0]
+    return abs(dims[ka]), abs(dims[kb])
+
+
+def cpu_value(dims: Dims) -> Dict[str, Optional[float]]:
+    lower = {k.lower(): v for k, v in dims.items()}
+    return {"cpu": 100.0 - lower["idle"] if "idle" in lower else (sum(dims.values()) if dims else None)}
+
+
+def ram_value(dims: Dims) -> Dict[str, Optional[float]]:
+    lower = {k.lower(): v for k, v in dims.items()}
+    return {"ram": lower["used"] if "used" in lower else (max(dims.values()) if dims else None)}
+
+
+def disk_util_value(dims: Dims) -> Dict[str, Optional[float]]:
+    k = _match(dims, ["util", "utilization", "busy"]) or next(iter(dims), None)
+    return {"disk_util": dims[k] if k is not None else None}
+
+
+def disk_io_values(dims: Dims) -> Dict[str, Optional[float]]:
+    # netdata disk.<dev>: reads(+), writes(-) KiB/s, dimension 하나면 write는 0
+    if len(dims) == 1:
+        return {"disk_read": abs(next(iter(dims.values()))), "disk_write": 0.0}
+    r, w = _pair(dims, ["read"], ["write"])
+    return {"disk_read": r, "disk_write": w}
+
+
+def net_values(dims: Dims) -> Dict[str, Optional[float]]:
+    # netdata net.<iface>: received(+), sent(-) kilobits/s
+    rx, tx = _pair(dims, ["received", "recv", "rx"], ["sent", "send", "tx"])
+    return {"net_rx": rx, "net_tx": tx}
+
+
+# (env var, 기본 chart, metric 추출)
+CHARTS: List[Tuple[str, str, Picker]] = [
+    ("NETDATA_CHART_CPU", "system.cpu", cpu_value),
+    ("NETDATA_CHART_RAM", "system.ram", ram_value),
+    ("NETDATA_CHART_DISK_UTIL", "disk_util.mmcblk0", disk_util_value),
+    ("NETDATA_CHART_DISK_IO", "disk.mmcblk0", disk_io_values),
+    ("NETDATA_CHART_NET", "net.eth0", net_values),
+]
+
+
+def fetch_chart(url: str, chart: str, after: int, timeout: float) -> List[Tuple[float, Dims]]:
+    # [(time, {dimension: 값})], 시간 오름차순 (값이 null인 dimension은 뺀다)
+    qs = urllib.parse.urlencode({"chart": chart, "after": after, "format": "json", "options": "seconds"})
+    with urllib.request.urlopen(f"{url.rstrip('/')}/api/v1/data?{qs}", timeout=timeout) as r:
+        js = json.loads(r.read().decode("utf-8"))
+    labels = js.get("labels") or []
+    out = []
+    for row in js.get("data") or []:
+        if not row or row[0] is None:
+            continue
+        dims = {k: float(v) for k, v in zip(labels[1:], row[1:]) if v is not None}
+        out.append((float(row[0]), dims))
+    out.sort(key=lambda x: x[0])
+    return out
+
+
+def read_phase(phase_file: Optional[Path], default: str) -> str:
+    if phase_file is None or not phase_file.exists():
+        return default
+    s = phase_file.read_text(encoding="utf-8", errors="ignore").strip()
+    return s.splitlines()[-1].strip() if s else default
+
+
+def stats_rows(acc: Dict[str, Dict[str, SeriesAccumulator]], step: str, run: str) -> List[Dict[str, object]]:
+    rows = []
+    metrics: List[str] = []
+    for per in acc.values():
+        metrics.extend(m for m in per if m not in metrics)
+
+    def row(phase: str, per: Dict[str, SeriesAccumulator]) -> Dict[str, object]:
+        out: Dict[str, object] = {"step": step, "run": run, "phase": phase}
+        firsts = [a.first_t for a in per.values() if a.n]
+        lasts = [a.last_t for a in per.values() if a.n]
+        out["start_epoch"] = min(firsts) if firsts else math.nan
+        out["end_epoch"] = max(lasts) if lasts else math.nan
+        for m in metrics:
+            out.update((per.get(m) or SeriesAccumulator()).row(m))
+        return out
+
+    for phase, per in acc.items():
+        rows.append(row(phase, per))
+    if len(acc) > 1:
+        total = {m: reduce(lambda x, y: x.merge(y), [per[m] for per in acc.values() if m in per]) for m in metrics}
+        rows.append(row("TOTAL", total))
+    return rows
+
+
+def write_atomic(rows: List[Dict[str, object]], path: Path) -> None:
+    fields: List[str] = []
+    for r in rows:
+        fields.extend(k for k in r if k not in fields)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        w.writerows(rows)
+    os.replace(tmp, path)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", required=True)
+    ap.add_argument("--run", required=True)
+    ap.add_argument("--netdata-url", default=os.environ.get("NETDATA_URL", "http://127.0.0.1:19999"))
+    ap.add_argument("--interval", type=float, default=5.0)
+    ap.add_argument("--duration", type=float, default=0.0, help="0 = until SIGINT/SIGTERM")
+    ap.add_argument("--phase-file", default=None)
+    ap.add_argument("--phase", default="RUN", help="phase name when --phase-file is empty/missing")
+    ap.add_argument("--timeout", type=float, default=3.0)
+    ap.add_argument("--out-dir", default=None, help="default: results/<step>/run_<i>")
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    result_dir = Path(args.out_dir) if args.out_dir else repo_root / "results" / args.step / f"run_{args.run}"
+    result_dir.mkdir(parents=True, exist_ok=True)
+    out_path = result_dir / "live_stats.csv"
+    phase_file = Path(args.phase_file) if args.phase_file else None
+
+    charts = [(os.environ.get(env, default), fn) for env, default, fn in CHARTS]
+    last_t: Dict[str, float] = {}
+    acc: Dict[str, Dict[str, SeriesAccumulator]] = {}
+
+    stop = {"flag": False}
+
+    def on_signal(signum, frame):
+        stop["flag"] = True
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    t_end = time.time() + args.duration if args.duration > 0 else None
+    # 첫 poll은 interval 3개 분량을 가져오고, 이후에는 새 샘플만 반영한다.
+    lookback = -int(max(3 * args.interval, 10))
+
+    while True:
+        phase = read_phase(phase_file, args.phase)
+        per = acc.setdefault(phase, {})
+        for chart, fn in charts:
+            try:
+                samples = fetch_chart(args.netdata_url, chart, lookback, args.timeout)
+            except (urllib.error.URLError, OSError, ValueError):
+                continue
+            samples = [(t, d) for t, d in samples if t > last_t.get(chart, -math.inf)]
+            if not samples:
+                continue
+            for t, dims in samples:
+                for m, y in fn(dims).items():
+                    if y is not None:
+                        per.setdefault(m, SeriesAccumulator()).update(t, y)
+            last_t[chart] = samples[-1][0]
+
+        if acc:
+            write_atomic(stats_rows(acc, args.step, args.run), out_path)
+
+        if stop["flag"] or (t_end is not None and time.time() >= t_end):
+            break
+        # SIGTERM 뒤 바로 마지막 write로 가도록 잘게 잔다
+        wake = time.monotonic() + args.interval
+        while not stop["flag"] and time.monotonic() < wake:
+            time.sleep(min(0.2, wake - time.monotonic()))
+
+    print("Saved:", out_path)
+
+
+if __name__ == "__main__":
+    main()
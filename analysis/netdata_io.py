@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# netdata CSV 공통 로더
+# - time 컬럼: epoch(s/ms/us) 또는 datetime 문자열(tz 없으면 assume_tz로 간주) 모두 허용
+# - 결과는 epoch seconds(float) "time" 컬럼 + 숫자형 값 컬럼, 시간순 정렬
+# - chart별 대표 series 선택 규칙은 plot_step16과 동일
+# - scripts/utils/thermal_sampler.py의 thermal_temp / cpu_freq / cpu_throttled CSV도 같은 형식으로 읽고,
+#   cpu_freq가 있으면 system_cpu에 주파수 정규화 CPU(cpu_norm)를 덧붙인다.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_TZ = "Asia/Seoul"
+
+
+def to_epoch_seconds(s: pd.Series, assume_tz: str = DEFAULT_TZ, start_epoch: Optional[float] = None) -> pd.Series:
+    t_num = pd.to_numeric(s, errors="coerce")
+    if int(t_num.notna().sum()) > 0:
+        t = t_num.astype(float)
+
+        med = float(t.dropna().median())
+        if med > 1e14:      # likely microseconds since epoch
+            t = t / 1e6
+        elif med > 1e11:    # likely milliseconds since epoch
+            t = t / 1e3
+
+        # 상대 시간(after=-N 형태)으로 export 된 경우
+        if start_epoch is not None:
+            mx = float(t.dropna().max()) if int(t.dropna().shape[0]) > 0 else float("nan")
+            if np.isfinite(mx) and mx < 1e7:
+                t = t + float(start_epoch)
+
+        return t
+
+    dt = pd.to_datetime(s, errors="coerce")
+    if int(dt.notna().sum()) == 0:
+        raise RuntimeError("cannot parse time column: neither numeric nor datetime")
+
+    if dt.dt.tz is None:
+        dt = dt.dt.tz_localize(assume_tz)
+
+    # datetime64 해상도(ns/us/s)에 의존하지 않도록 epoch 기준 차이로 계산
+    dt_utc_naive = dt.dt.tz_convert("UTC").dt.tz_localize(None)
+    return (dt_utc_naive - pd.Timestamp("1970-01-01")).dt.total_seconds().astype(float)
+
+
+def read_netdata_csv(p: Path, assume_tz: str = DEFAULT_TZ, start_epoch: Optional[float] = None) -> pd.DataFrame:
+    df = pd.read_csv(p, comment="#")
+    if df.shape[1] < 2:
+        raise RuntimeError(f"unexpected csv format: {p}")
+
+    df.columns = [str(c).strip() for c in df.columns]
+    time_col = "time" if "time" in df.columns else df.columns[0]
+
+    df[time_col] = to_epoch_seconds(df[time_col], assume_tz=assume_tz, start_epoch=start_epoch)
+    df = df.dropna(subset=[time_col]).sort_values(time_col)
+    df = df.rename(columns={time_col: "time"}).reset_index(drop=True)
+
+    for c in df.columns:
+        if c == "time":
+            continue
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    return df
+
+
+def value_cols(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if c not in ("time", "dt")]
+
+
+def first_matching(df: pd.DataFrame, patterns: List[str]) -> Optional[str]:
+    cols = value_cols(df)
+    for pat in patterns:
+        for c in cols:
+            if pat in c.lower():
+                return c
+    return None
+
+
+def cpu_series(df: pd.DataFrame) -> np.ndarray:
+    cols = value_cols(df)
+    lower = {c.lower(): c for c in cols}
+    if "idle" in lower:
+        return (100.0 - df[lower["idle"]]).to_numpy(dtype=float)
+    return df[cols].sum(axis=1, skipna=True).to_numpy(dtype=float)
+
+
+def ram_series(df: pd.DataFrame) -> np.ndarray:
+    cols = value_cols(df)
+    lower = {c.lower(): c for c in cols}
+    if "used" in lower:
+        return df[lower["used"]].to_numpy(dtype=float)
+    return df[cols].max(axis=1, skipna=True).to_numpy(dtype=float)
+
+
+def disk_util_series(df: pd.DataFrame) -> np.ndarray:
+    c = first_matching(df, ["util", "utilization", "busy"])
+    if c is None:
+        cols = value_cols(df)
+        if not cols:
+            raise RuntimeError("no disk columns")
+        c = cols[0]
+    return df[c].to_numpy(dtype=float)
+
+
+def disk_io_series(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    # netdata disk.<dev>: reads(+), writes(-) KiB/s -> 절댓값
+    cols = value_cols(df)
+    r_c = first_matching(df, ["read"])
+    w_c = first_matching(df, ["write"])
+    if r_c is None or w_c is None:
+        if len(cols) >= 2:
+            r_c, w_c = cols[0], cols[1]
+        elif len(cols) == 1:
+            r = df[cols[0]].abs().to_numpy(dtype=float)
+            return r, np.zeros_like(r)
+        else:
+            raise RuntimeError("no disk io columns")
+    return df[r_c].abs().to_numpy(dtype=float), df[w_c].abs().to_numpy(dtype=float)
+
+
+def net_rx_tx(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    # netdata net.<iface>: received(+), sent(-) kilobits/s -> 절댓값
+    rx_c = first_matching(df, ["received", "recv", "rx"])
+    tx_c = first_matching(df, ["sent", "send", "tx"])
+    cols = value_cols(df)
+    if rx_c is None or tx_c is None:
+        if len(cols) >= 2:
+            rx_c, tx_c = cols[0], cols[1]
+        elif len(cols) == 1:
+            rx_c, tx_c = cols[0], cols[0]
+        else:
+            raise RuntimeError("no net columns")
+    return df[rx_c].abs().to_numpy(dtype=float), df[tx_c].abs().to_numpy(dtype=float)
+
+
+def temp_series(df: pd.DataFrame) -> np.ndarray:
+    # thermal_temp.csv: zone별 °C -> 가장 뜨거운 zone
+    cols = value_cols(df)
+    if not cols:
+        raise RuntimeError("no thermal columns")
+    return df[cols].max(axis=1, skipna=True).to_numpy(dtype=float)
+
+
+def cpu_freq_series(df: pd.DataFrame) -> Tuple[np.ndarray, float]:
+    # cpu_freq.csv: cpu0..cpuN MHz (+ max = cpuinfo_max_freq) -> (core 평균 MHz, 최대 MHz)
+    cols = [c for c in value_cols(df) if c.lower() != "max"]
+    if not cols:
+        raise RuntimeError("no cpufreq columns")
+    f = df[cols].mean(axis=1, skipna=True).to_numpy(dtype=float)
+    if "max" in df.columns and df["max"].notna().any():
+        f_max = float(df["max"].max())
+    else:
+        f_max = float(np.nanmax(df[cols].to_numpy(dtype=float)))
+    return f, f_max
+
+
+def throttled_series(df: pd.DataFrame) -> np.ndarray:
+    # cpu_throttled.csv: 현재 clock이 깎인 상태(throttled / freq_capped / soft_temp_limit) 중 하나라도 1이면 1
+    cols = [c for c in ("throttled", "freq_capped", "soft_temp_limit") if c in df.columns]
+    if not cols:
+        raise RuntimeError("no throttle columns")
+    return (df[cols].fillna(0).to_numpy(dtype=float) > 0).any(axis=1).astype(float)
+
+
+def _first_file(run_dir: Path, pattern: str) -> Optional[Path]:
+    files = sorted(p for p in run_dir.glob(pattern) if p.stat().st_size > 0)
+    return files[0] if files else None
+
+
+def load_run_charts(
+    run_dir: Path,
+    assume_tz: str = DEFAULT_TZ,
+    start_epoch: Optional[float] = None,
+) -> Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+    # chart -> (time, {metric: values}); 없는 chart는 건너뛴다.
+    out: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]] = {}
+
+    p = _first_file(run_dir, "system_cpu.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        out["system_cpu"] = (df["time"].to_numpy(dtype=float), {"cpu": cpu_series(df)})
+
+    p = _first_file(run_dir, "cpu_freq.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        f, f_max = cpu_freq_series(df)
+        t_f = df["time"].to_numpy(dtype=float)
+        out["cpu_freq"] = (t_f, {"cpu_freq": f})
+        # 주파수 정규화 CPU: cpu % * (현재 clock / 최대 clock) = 최대 clock 기준으로 환산한 사용률
+        ok = np.isfinite(f)
+        if "system_cpu" in out and int(ok.sum()) > 0 and f_max > 0:
+            t_c, ys = out["system_cpu"]
+            ratio = np.interp(t_c, t_f[ok], f[ok] / f_max)
+            ys["cpu_norm"] = ys["cpu"] * ratio
+
+    p = _first_file(run_dir, "system_ram.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        out["system_ram"] = (df["time"].to_numpy(dtype=float), {"ram": ram_series(df)})
+
+    p = _first_file(run_dir, "disk_util_*.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        out["disk_util"] = (df["time"].to_numpy(dtype=float), {"disk_util": disk_util_series(df)})
+
+    p = _first_file(run_dir, "disk_io_*.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        r, w = disk_io_series(df)
+        out["disk_io"] = (df["time"].to_numpy(dtype=float), {"disk_read": r, "disk_write": w})
+
+    p = _first_file(run_dir, "thermal_temp.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        out["thermal"] = (df["time"].to_numpy(dtype=float), {"temp": temp_series(df)})
+
+    p = _first_file(run_dir, "cpu_throttled.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        out["throttled"] = (df["time"].to_numpy(dtype=float), {"throttled": throttled_series(df)})
+
+    p = _first_file(run_dir, "net_*.csv")
+    if p is not None:
+        df = read_netdata_csv(p, assume_tz, start_epoch)
+        rx, tx = net_rx_tx(df)
+        out["net"] = (df["time"].to_numpy(dtype=float), {"net_rx": rx, "net_tx": tx})
+
+    return out
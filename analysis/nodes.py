@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# node별 / cluster 합계 통계 (master + worker)
+#
+# 입력: data/netdata/<step>/run_<i>/<node>/*.csv, nodes.csv  (scripts/utils/nodes_export.py)
+#       [START, END] 구간 (logs/redacted/<step>/run_<i>.log)
+#       clock_offset.csv가 있으면 node 시각을 master 시각으로 보정한 뒤 쓴다 (analysis/clock.py)
+# node별: cpu / ram / disk_util / disk_read / disk_write / net_rx / net_tx 의 mean, peak, auc
+# cluster: node series를 공통 grid로 정렬한 뒤
+#   ram, disk_read, disk_write, net_rx, net_tx : node 합
+#   cpu_cores  : Σ cpu% / 100 * cores   (사용 중인 core 수, nodes.csv의 cores가 없으면 1 core로 본다)
+#   cpu        : cpu_cores / Σ cores * 100   (cluster 전체 core 대비 %)
+#   disk_util  : node 중 최대 (가장 바쁜 disk)
+#   한 node라도 값이 없는 grid 점은 NaN (합이 작게 나오지 않도록)
+#
+# 사용:
+#   python3 analysis/nodes.py --step step12_apply_tinyllama_http step17_infer_load_1rps_tinyllama_http
+#   -> results/<step>/nodes.csv      (run x node)
+#      results/<step>/cluster.csv    (run별 cluster 합계)
+#      results/_summary/nodes/node_summary.csv   (step x node median, node=cluster 포함)
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from align import make_grid, resample
+from clock import correct_times, load_offsets
+from netdata_io import DEFAULT_TZ, load_run_charts
+from phases import log_window, parse_markers, phase_stats
+from run_table import netdata_bases, run_ids
+
+
+SUM_METRICS = ["ram", "disk_read", "disk_write", "net_rx", "net_tx"]
+GRID_STEP = 5.0
+
+
+def node_dirs(run_dir: Path) -> List[Path]:
+    return sorted(p for p in run_dir.iterdir() if p.is_dir() and any(p.glob("system_*.csv")))
+
+
+def nodes_run_dir(repo_root: Path, step: str, run: int) -> Optional[Path]:
+    for base in netdata_bases(repo_root, step):
+        rd = base / f"run_{run}"
+        if rd.is_dir() and node_dirs(rd):
+            return rd
+    return None
+
+
+def node_info(run_dir: Path) -> Dict[str, Dict[str, object]]:
+    p = run_dir / "nodes.csv"
+    if not p.exists() or p.stat().st_size == 0:
+        return {}
+    df = pd.read_csv(p, dtype={"node": str})
+    return {r["node"]: {"role": r.get("role", ""), "cores": r.get("cores", np.nan)} for _, r in df.iterrows()}
+
+
+def window_stats(t: np.ndarray, Y: np.ndarray, names: List[str], start: float, end: float) -> Dict[str, float]:
+    st = phase_stats(t, Y, names, [("TOTAL", "span", start, end)])
+    cols = [c for c in st.columns if c.endswith(("_mean", "_peak", "_auc"))]
+    return {c: float(st.iloc[0][c]) for c in cols}
+
+
+def load_nodes(run_dir: Path, start: float, assume_tz: str) -> Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    # node -> {metric: (t, y)}, t는 master 시계 기준
+    offsets = load_offsets(run_dir)
+    out = {}
+    for nd in node_dirs(run_dir):
+        charts = load_run_charts(nd, assume_tz=assume_tz, start_epoch=start)
+        out[nd.name] = {m: (correct_times(t, offsets, nd.name), y) for t, ys in charts.values() for m, y in ys.items()}
+    return out
+
+
+def cluster_series(nodes: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]], cores: Dict[str, float],
+                   start: float, end: float) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    grid = make_grid([t for series in nodes.values() for t, _ in series.values()], step=GRID_STEP, start=start, end=end)
+    on_grid = {n: {m: resample(t, y, grid)[0] for m, (t, y) in s.items()} for n, s in nodes.items()}
+
+    out: Dict[str, np.ndarray] = {}
+    for m in SUM_METRICS:
+        ys = [s[m] for s in on_grid.values() if m in s]
+        if len(ys) == len(on_grid):
+            out[m] = np.sum(ys, axis=0)
+    if all("cpu" in s for s in on_grid.values()):
+        c = {n: cores.get(n) if cores.get(n) and np.isfinite(cores[n]) else 1.0 for n in on_grid}
+        out["cpu_cores"] = np.sum([on_grid[n]["cpu"] / 100.0 * c[n] for n in on_grid], axis=0)
+        out["cpu"] = out["cpu_cores"] / sum(c.values()) * 100.0
+    ys = [s["disk_util"] for s in on_grid.values() if "disk_util" in s]
+    if ys:
+        out["disk_util"] = np.max(ys, axis=0)
+    return grid, out
+
+
+def run_node_stats(run_dir: Path, start: float, end: float,
+                   assume_tz: str = DEFAULT_TZ) -> Tuple[List[Dict[str, object]], Dict[str, object]]:
+    nodes = load_nodes(run_dir, start, assume_tz)
+    info = node_info(run_dir)
+    rows = []
+    for name, series in nodes.items():
+        row: Dict[str, object] = {"node": name, "role": info.get(name, {}).get("role", ""),
+                                  "cores": info.get(name, {}).get("cores", np.nan)}
+        for m, (t, y) in series.items():
+            row.update(window_stats(t, y[None, :], [m], start, end))
+        rows.append(row)
+
+    cores = {n: float(info.get(n, {}).get("cores", np.nan) or np.nan) for n in nodes}
+    grid, series = cluster_series(nodes, cores, start, end)
+    cluster: Dict[str, object] = {"n_nodes": len(nodes)}
+    if series:
+        names = list(series)
+        cluster.update(window_stats(grid, np.vstack([series[m] for m in names]), names, start, end))
+    return rows, cluster
+
+
+def summarize(per_node: pd.DataFrame, cluster: pd.DataFrame) -> pd.DataFrame:
+    both = pd.concat([per_node, cluster.assign(node="cluster")], ignore_index=True)
+    cols = [c for c in both.columns if c.endswith(("_mean", "_peak"))]
+    g = both.groupby(["step", "node"], sort=False)
+    out = g[cols].median()
+    out.insert(0, "n_runs", g.size())
+    return out.reset_index()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", nargs="+", required=True)
+    ap.add_argument("--timezone", default=DEFAULT_TZ)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    all_nodes: List[pd.DataFrame] = []
+    all_cluster: List[pd.DataFrame] = []
+    for step in args.step:
+        node_rows, cluster_rows = [], []
+        for i in run_ids(repo_root, step):
+            run_dir = nodes_run_dir(repo_root, step, i)
+            log_path = repo_root / "logs" / "redacted" / step / f"run_{i}.log"
+            if run_dir is None or not log_path.exists():
+                print(f"Skip {step} run_{i}: no node csv or log")
+                continue
+            start, end = log_window(parse_markers(log_path))
+            if not (np.isfinite(start) and np.isfinite(end) and end > start):
+                print(f"Skip {step} run_{i}: no START/END in log")
+                continue
+            rows, cluster = run_node_stats(run_dir, start, end, args.timezone)
+            node_rows += [{"step": step, "run": i, **r} for r in rows]
+            cluster_rows.append({"step": step, "run": i, **cluster})
+        if not node_rows:
+            print("Skip (no runs):", step)
+            continue
+        nodes_df, cluster_df = pd.DataFrame(node_rows), pd.DataFrame(cluster_rows)
+        for name, df in (("nodes.csv", nodes_df), ("cluster.csv", cluster_df)):
+            out_path = repo_root / "results" / step / name
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_csv(out_path, index=False)
+            print("Saved:", out_path)
+        all_nodes.append(nodes_df)
+        all_cluster.append(cluster_df)
+
+    if not all_nodes:
+        raise SystemExit("no runs")
+    summary = summarize(pd.concat(all_nodes, ignore_index=True), pd.concat(all_cluster, ignore_index=True))
+    out_dir = repo_root / "results" / "_summary" / "nodes"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / "node_summary.csv"
+    summary.to_csv(out_path, index=False)
+    print("Saved:", out_path)
+    show = [c for c in ["step", "node", "n_runs", "cpu_mean", "cpu_peak", "ram_mean", "disk_write_mean", "net_rx_mean"]
+            if c in summary.columns]
+    print(summary[show].round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# idle step을 기준(baseline)으로 뺀 "작업 자체의 비용" 계산
+#
+# baseline: idle step run별 평균값(cpu %, ram MB, disk util %, disk KiB/s)의 분포
+#   step01_system_idle / step03_cluster_idle / step05_deployment_idle / step13_tinyllama_idle
+# event run의 phase마다
+#   excess = auc - baseline_mean * duration
+#   duration = cpu_auc / cpu_mean (auc가 실제로 적분된 구간 길이)
+# CPU는 core·s로 환산한다 (netdata system.cpu 100% = 전체 core 사용).
+#
+# 95% CI는 bootstrap으로 구한다.
+# - run별 CI   : baseline run만 재표본 (baseline 불확실성)
+# - step별 CI  : event run과 baseline run을 함께 재표본
+#
+# 사용:
+#   python3 analysis/overhead.py
+#   python3 analysis/overhead.py --steps step04_apply_deployment --baseline step03_cluster_idle
+#   -> results/_summary/overhead/{baselines,overhead_runs,overhead_summary}.csv
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from resampling import bootstrap, bootstrap_indices, percentile_ci
+from run_table import METRICS, load_step_table, raw_run_means
+
+
+BASELINE_STEPS = [
+    "step01_system_idle",
+    "step03_cluster_idle",
+    "step05_deployment_idle",
+    "step13_tinyllama_idle",
+]
+
+# event step -> 직전 상태에 해당하는 idle step
+DEFAULT_REFERENCE = {
+    "step02_start_master": "step01_system_idle",
+    "step04_apply_deployment": "step03_cluster_idle",
+    "step06_scale_up_down": "step05_deployment_idle",
+    "step07_rollout_restart": "step05_deployment_idle",
+    "step08_cordon_uncordon": "step05_deployment_idle",
+    "step09_stop_final_idle": "step01_system_idle",
+    "step10_delete_deployment": "step05_deployment_idle",
+    "step12_apply_tinyllama_http": "step03_cluster_idle",
+    "step14_scale_up_down_tinyllama_http": "step13_tinyllama_idle",
+    "step15_rollout_restart_tinyllama_http": "step13_tinyllama_idle",
+    "step16_delete_tinyllama_http_deployment": "step13_tinyllama_idle",
+    "step17_infer_load_1rps_tinyllama_http": "step13_tinyllama_idle",
+}
+
+# metric -> excess 단위
+UNITS = {
+    "cpu": "core*s",
+    "ram": "MB*s",
+    "disk_util": "%*s",
+    "disk_read": "KiB",
+    "disk_write": "KiB",
+}
+
+# "A_CORDON_cpu_auc", "cpu_down_auc", "cpu_auc"
+AUC_RE = re.compile(r"^(?P<pre>(?:[A-Z][A-Z0-9]*_)*)(?P<metric>" + "|".join(METRICS) + r")(?P<suf>_[a-z]+)?_auc$")
+
+
+def baseline_samples(repo_root: Path, step: str) -> Dict[str, np.ndarray]:
+    # metric -> run별 평균값 배열
+    out: Dict[str, np.ndarray] = {}
+    for df in (load_step_table(repo_root / "results", step), None):
+        if df is None:
+            # stats 테이블에 없는 metric만 raw CSV에서 보충
+            if all(m in out for m in METRICS):
+                break
+            df = raw_run_means(repo_root, step)
+            if df is None:
+                break
+        for m in METRICS:
+            c = f"{m}_mean"
+            if m in out or c not in df.columns:
+                continue
+            v = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+            v = v[np.isfinite(v)]
+            if len(v):
+                out[m] = v
+    return out
+
+
+def event_phases(df: pd.DataFrame) -> List[Tuple[str, str, str, str]]:
+    # (phase, metric, mean_col, auc_col)
+    out = []
+    for c in df.columns:
+        m = AUC_RE.match(c)
+        if not m:
+            continue
+        pre, metric, suf = m.group("pre"), m.group("metric"), m.group("suf") or ""
+        mean_col = f"{pre}{metric}{suf}_mean"
+        if mean_col not in df.columns:
+            continue
+        phase = "_".join(x for x in (pre.rstrip("_"), suf.lstrip("_")) if x) or "all"
+        out.append((phase, metric, mean_col, c))
+    return out
+
+
+def phase_duration(df: pd.DataFrame, mean_col: str, auc_col: str, metric: str) -> np.ndarray:
+    # cpu_auc / cpu_mean 을 우선 사용 (disk read 등은 0인 경우가 많아 비율이 정의되지 않음)
+    def ratio(mc: str, ac: str) -> np.ndarray:
+        mean = pd.to_numeric(df[mc], errors="coerce").to_numpy(dtype=float)
+        auc = pd.to_numeric(df[ac], errors="coerce").to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(mean > 0, auc / mean, np.nan)
+
+    cpu_mean = mean_col.replace(metric, "cpu", 1)
+    cpu_auc = auc_col.replace(metric, "cpu", 1)
+    own = ratio(mean_col, auc_col)
+    if cpu_mean in df.columns and cpu_auc in df.columns:
+        d = ratio(cpu_mean, cpu_auc)
+        return np.where(np.isfinite(d), d, own)
+    return own
+
+
+def excess_for_step(repo_root: Path, step: str, base_step: str, base: Dict[str, np.ndarray],
+                    cores: int, n_boot: int, alpha: float, rng: np.random.Generator) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    df = load_step_table(repo_root / "results", step)
+    if df is None or df.empty:
+        print("Skip (no stats):", step)
+        return pd.DataFrame(), pd.DataFrame()
+
+    runs = df["run"].to_numpy() if "run" in df.columns else np.arange(1, len(df) + 1)
+    run_rows, step_rows = [], []
+
+    for phase, metric, mean_col, auc_col in event_phases(df):
+        b = base.get(metric)
+        if b is None:
+            continue
+        scale = cores / 100.0 if metric == "cpu" else 1.0
+        auc = pd.to_numeric(df[auc_col], errors="coerce").to_numpy(dtype=float)
+        dur = phase_duration(df, mean_col, auc_col, metric)
+        # 시간 역순 CSV로 계산된 음수 auc 등은 제외
+        ok = np.isfinite(auc) & np.isfinite(dur) & (dur > 0)
+        if (np.isfinite(auc) & ~ok).any():
+            print(f"Skip {int((np.isfinite(auc) & ~ok).sum())} run(s) with invalid duration: {step} {phase} {metric}")
+        if not ok.any():
+            continue
+        auc, dur, r = auc[ok], dur[ok], runs[ok]
+
+        # run별: baseline 평균만 재표본 -> (n_boot, n_runs)
+        b_boot = bootstrap(b, "mean", n_boot, rng)
+        ex = (auc - b.mean() * dur) * scale
+        ex_boot = (auc[None, :] - b_boot[:, None] * dur[None, :]) * scale
+        lo, hi = percentile_ci(ex_boot, alpha)
+        for i in range(len(auc)):
+            run_rows.append({
+                "step": step, "run": r[i], "baseline": base_step, "phase": phase, "metric": metric,
+                "unit": UNITS[metric], "duration_s": dur[i],
+                "excess": ex[i], "ci_lo": lo[i], "ci_hi": hi[i],
+                "excess_rate": ex[i] / dur[i] if dur[i] > 0 else np.nan,
+            })
+
+        # step별: event run과 baseline run을 함께 재표본
+        e_idx = bootstrap_indices(len(auc), n_boot, rng)
+        step_boot = ((auc[e_idx] - b_boot[:, None] * dur[e_idx]) * scale).mean(axis=1)
+        s_lo, s_hi = percentile_ci(step_boot, alpha)
+        step_rows.append({
+            "step": step, "baseline": base_step, "phase": phase, "metric": metric,
+            "unit": UNITS[metric], "n_runs": len(auc), "n_baseline_runs": len(b),
+            "duration_mean_s": float(dur.mean()),
+            "excess_mean": float(ex.mean()), "ci_lo": float(s_lo), "ci_hi": float(s_hi),
+            "excess_std": float(ex.std(ddof=1)) if len(ex) > 1 else np.nan,
+        })
+
+    return pd.DataFrame(run_rows), pd.DataFrame(step_rows)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--steps", nargs="*", default=None, help="default: all steps in DEFAULT_REFERENCE")
+    ap.add_argument("--baseline", default=None, help="force one idle step as reference for all steps")
+    ap.add_argument("--cores", type=int, default=4)
+    ap.add_argument("--n-boot", type=int, default=10000)
+    ap.add_argument("--alpha", type=float, default=0.05)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    out_dir = repo_root / "results" / "_summary" / "overhead"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+
+    # baseline 분포
+    bases: Dict[str, Dict[str, np.ndarray]] = {}
+    rows = []
+    for s in BASELINE_STEPS + ([args.baseline] if args.baseline and args.baseline not in BASELINE_STEPS else []):
+        bases[s] = baseline_samples(repo_root, s)
+        for m, v in bases[s].items():
+            lo, hi = percentile_ci(bootstrap(v, "mean", args.n_boot, rng), args.alpha)
+            rows.append({
+                "baseline": s, "metric": m, "n_runs": len(v),
+                "mean": float(v.mean()), "std": float(v.std(ddof=1)) if len(v) > 1 else np.nan,
+                "ci_lo": float(lo), "ci_hi": float(hi),
+            })
+    pd.DataFrame(rows).to_csv(out_dir / "baselines.csv", index=False)
+    print("Saved:", out_dir / "baselines.csv")
+
+    steps = args.steps or list(DEFAULT_REFERENCE)
+    per_run, per_step = [], []
+    for step in steps:
+        base_step: Optional[str] = args.baseline or DEFAULT_REFERENCE.get(step)
+        if base_step is None:
+            print("Skip (no baseline mapping):", step)
+            continue
+        r, s = excess_for_step(repo_root, step, base_step, bases[base_step], args.cores,
+                               args.n_boot, args.alpha, rng)
+        per_run.append(r)
+        per_step.append(s)
+
+    runs_df = pd.concat(per_run, ignore_index=True) if per_run else pd.DataFrame()
+    steps_df = pd.concat(per_step, ignore_index=True) if per_step else pd.DataFrame()
+    runs_df.to_csv(out_dir / "overhead_runs.csv", index=False)
+    steps_df.to_csv(out_dir / "overhead_summary.csv", index=False)
+    print("Saved:", out_dir / "overhead_runs.csv")
+    print("Saved:", out_dir / "overhead_summary.csv")
+
+    if not steps_df.empty:
+        print("\n=== Excess over idle baseline (mean [95% CI]) ===")
+        for _, row in steps_df.iterrows():
+            print(f"{row['step']:<42} {row['phase']:<10} {row['metric']:<10} "
+                  f"{row['excess_mean']:>12.1f} [{row['ci_lo']:.1f}, {row['ci_hi']:.1f}] {row['unit']}")
+
+
+if __name__ == "__main__":
+    main()
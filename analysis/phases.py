@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# run log의 *_EPOCH marker로 시계열을 phase 단위로 자르고
+# phase x metric 통계(mean / peak / AUC / duration)를 한 번에 계산한다.
+#
+# phase 종류
+# - span    : X_START_EPOCH ~ X_END_EPOCH 쌍 (START/END 쌍은 TOTAL)
+# - segment : 시간순으로 정렬한 marker 사이의 연속 구간 (예: START->READY, READY->END)
+#
+# step08처럼 "SEG_A=cordon" 블록 아래 START_EPOCH 등이 반복되면
+# "A_CORDON_START_EPOCH"처럼 블록 prefix를 붙여 구분한다.
+#
+# marker 시각: X_EPOCH_NS(wall clock ns, scripts/utils/marker.sh / runner.py)가 있으면 정수 X_EPOCH 대신 쓴다.
+# 예전 log(정수 X_EPOCH만 있음)는 그대로 읽힌다. X_MONO_NS는 T_* 계산용이라 marker로는 쓰지 않는다.
+#
+# 사용:
+#   python3 analysis/phases.py --step step17_infer_load_1rps_tinyllama_http --run 3
+#   -> results/<step>/run_<i>/phases.csv
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from align import load_aligned_run
+from netdata_io import DEFAULT_TZ
+
+
+EPOCH_RE = re.compile(r"^\s*(?:export\s+)?([A-Z][A-Z0-9_]*_EPOCH)\s*(?:=|\s)\s*(-?\d+(?:\.\d+)?)\s*$")
+EPOCH_NS_RE = re.compile(r"^\s*(?:export\s+)?([A-Z][A-Z0-9_]*_EPOCH)_NS\s*=\s*(\d+)\s*$")
+SEG_RE = re.compile(r"^\s*SEG_([A-Z0-9]+)\s*=\s*(\S+)\s*$")
+
+Phase = Tuple[str, str, float, float]  # (name, kind, start, end)
+
+
+def precise_kv(kv: Dict[str, str]) -> Dict[str, str]:
+    # read_kv_log 류 dict: X_EPOCH_NS가 있으면 X_EPOCH를 소수 초 문자열로 바꾼다 (없으면 그대로).
+    for k, v in list(kv.items()):
+        if k.endswith("_EPOCH_NS") and v.strip().isdigit():
+            kv[k[: -len("_NS")]] = f"{int(v) / 1e9:.6f}"
+    return kv
+
+
+def parse_markers(log_path: Path) -> Dict[str, float]:
+    # 같은 key가 여러 번 나오면 마지막 값을 쓴다 (read_kv_log와 동일), *_EPOCH_NS가 정수 *_EPOCH보다 우선
+    markers: Dict[str, float] = {}
+    precise: Dict[str, float] = {}
+    prefix = ""
+    for line in log_path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        m = SEG_RE.match(line)
+        if m:
+            prefix = f"{m.group(1)}_{m.group(2).upper()}_"
+            continue
+        m = EPOCH_NS_RE.match(line)
+        if m:
+            precise[prefix + m.group(1)] = int(m.group(2)) / 1e9
+            continue
+        m = EPOCH_RE.match(line)
+        if m:
+            markers[prefix + m.group(1)] = float(m.group(2))
+    markers.update(precise)
+    return markers
+
+
+def marker_base(key: str) -> str:
+    return key[: -len("_EPOCH")] if key.endswith("_EPOCH") else key
+
+
+def log_window(markers: Dict[str, float]) -> Tuple[float, float]:
+    # START/END가 없으면 *_START / *_END 중 가장 이른 시작, 가장 늦은 끝
+    starts = [v for k, v in markers.items() if marker_base(k) == "START" or marker_base(k).endswith("_START")]
+    ends = [v for k, v in markers.items() if marker_base(k) == "END" or marker_base(k).endswith("_END")]
+    s = markers.get("START_EPOCH", min(starts) if starts else float("nan"))
+    e = markers.get("END_EPOCH", max(ends) if ends else float("nan"))
+    return s, e
+
+
+def build_phases(markers: Dict[str, float]) -> List[Phase]:
+    phases: List[Phase] = []
+
+    for key, start in markers.items():
+        base = marker_base(key)
+        if base == "START":
+            stem, end_key = "TOTAL", "END_EPOCH"
+        elif base.endswith("_START"):
+            stem = base[: -len("_START")]
+            end_key = f"{stem}_END_EPOCH"
+        else:
+            continue
+        end = markers.get(end_key)
+        if end is not None and end >= start:
+            phases.append((stem, "span", start, end))
+
+    # 같은 시각의 marker는 하나의 경계로 묶는다.
+    order = sorted(markers.items(), key=lambda kv: kv[1])
+    bounds: List[Tuple[float, str]] = []
+    for key, v in order:
+        if bounds and bounds[-1][0] == v:
+            bounds[-1] = (v, bounds[-1][1] + "+" + marker_base(key))
+        else:
+            bounds.append((v, marker_base(key)))
+    for (a, na), (b, nb) in zip(bounds[:-1], bounds[1:]):
+        phases.append((f"{na}->{nb}", "segment", a, b))
+
+    return phases
+
+
+def phase_stats(t: np.ndarray, Y: np.ndarray, names: Sequence[str], phases: Sequence[Phase]) -> pd.DataFrame:
+    # t: (n,) 오름차순 epoch seconds, Y: (n_metrics, n)
+    # phase 구간은 [start, end] 양끝 포함 (clip_df와 동일)
+    t = np.asarray(t, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    m, n = Y.shape
+    p = len(phases)
+
+    starts = np.array([ph[2] for ph in phases], dtype=float)
+    ends = np.array([ph[3] for ph in phases], dtype=float)
+
+    # 모든 phase 경계를 searchsorted 한 번으로 찾는다.
+    # side="right"(end 포함)는 nextafter(end)의 side="left"와 같다.
+    bounds = np.searchsorted(t, np.concatenate([starts, np.nextafter(ends, np.inf)]), side="left")
+    lo, hi = bounds[:p], bounds[p:]
+    n_samples = np.maximum(hi - lo, 0)
+
+    finite = np.isfinite(Y)
+    y0 = np.where(finite, Y, 0.0)
+    zero = np.zeros((m, 1))
+    csum = np.concatenate([zero, np.cumsum(y0, axis=1)], axis=1)
+    ccnt = np.concatenate([zero, np.cumsum(finite, axis=1)], axis=1)
+
+    # 구간 [k, k+1] 사다리꼴 면적, 한쪽이라도 NaN이면 0으로 건너뛴다.
+    if n >= 2:
+        trap = 0.5 * (Y[:, :-1] + Y[:, 1:]) * np.diff(t)[None, :]
+        trap = np.where(np.isfinite(trap), trap, 0.0)
+        ctrap = np.concatenate([zero, np.cumsum(trap, axis=1)], axis=1)
+    else:
+        ctrap = np.zeros((m, max(n, 1)))
+
+    hi_c = np.minimum(hi, n)
+    lo_c = np.minimum(lo, n)
+    count = np.maximum(ccnt[:, hi_c] - ccnt[:, lo_c], 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, (csum[:, hi_c] - csum[:, lo_c]) / count, np.nan)
+
+    last = np.clip(hi_c - 1, 0, max(n - 1, 0))
+    first = np.clip(lo_c, 0, max(n - 1, 0))
+    auc = np.where((n_samples >= 2)[None, :], ctrap[:, last] - ctrap[:, first], np.nan)
+
+    # peak: [lo, hi) 최대값을 reduceat 한 번으로. 끝에 -inf 열을 붙여 hi == n도 유효 index로 만든다.
+    yp = np.concatenate([np.where(finite, Y, -np.inf), np.full((m, 1), -np.inf)], axis=1)
+    idx = np.column_stack([lo_c, hi_c]).ravel()
+    peak = np.maximum.reduceat(yp, idx, axis=1)[:, ::2] if p else np.empty((m, 0))
+    peak = np.where((count > 0) & np.isfinite(peak), peak, np.nan)
+
+    out = pd.DataFrame({
+        "phase": [ph[0] for ph in phases],
+        "kind": [ph[1] for ph in phases],
+        "start_epoch": starts,
+        "end_epoch": ends,
+        "duration_s": ends - starts,
+        "n_samples": n_samples,
+    })
+    for j, name in enumerate(names):
+        out[f"{name}_mean"] = mean[j]
+        out[f"{name}_peak"] = peak[j]
+        out[f"{name}_auc"] = auc[j]
+    return out
+
+
+def window_mask(t: np.ndarray, start: float, end: float) -> np.ndarray:
+    # [start, end] 양끝 포함 (phase_stats와 같은 구간)
+    t = np.asarray(t, dtype=float)
+    return (t >= start) & (t <= end)
+
+
+def series_phase_stats(series: Mapping[str, Tuple[np.ndarray, np.ndarray]], phases: Sequence[Phase]) -> pd.DataFrame:
+    # chart마다 sample 시각이 다를 때: 공통 grid로 보간하지 않고 series별로 phase_stats를 구해 컬럼을 붙인다.
+    # series: name -> (epoch seconds, 값), 결과 컬럼: phase 정보 + {name}_n / _mean / _peak / _auc
+    out = pd.DataFrame({
+        "phase": [ph[0] for ph in phases],
+        "kind": [ph[1] for ph in phases],
+        "start_epoch": [ph[2] for ph in phases],
+        "end_epoch": [ph[3] for ph in phases],
+        "duration_s": [ph[3] - ph[2] for ph in phases],
+    })
+    for name, (t, y) in series.items():
+        t = np.asarray(t, dtype=float)
+        y = np.asarray(y, dtype=float)
+        order = np.argsort(t, kind="stable")
+        st = phase_stats(t[order], y[order][None, :], [name], phases)
+        out[f"{name}_n"] = st["n_samples"].to_numpy()
+        for s in ("mean", "peak", "auc"):
+            out[f"{name}_{s}"] = st[f"{name}_{s}"].to_numpy()
+    return out
+
+
+def run_phase_stats(log_path: Path, run_dir: Path, assume_tz: str = DEFAULT_TZ) -> pd.DataFrame:
+    markers = parse_markers(log_path)
+    if not markers:
+        raise RuntimeError(f"no *_EPOCH markers in {log_path}")
+    phases = build_phases(markers)
+    start = markers.get("START_EPOCH", min(markers.values()))
+
+    # 모든 chart를 공통 grid로 정렬한 뒤 한 번에 계산
+    grid, Y, names = load_aligned_run(run_dir, assume_tz=assume_tz, start_epoch=start)
+    if not names:
+        raise RuntimeError(f"no netdata csv in {run_dir}")
+    return phase_stats(grid, Y, names, phases)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", required=True)
+    ap.add_argument("--run", required=True)
+    ap.add_argument("--timezone", default=DEFAULT_TZ)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    run = f"run_{args.run}"
+    log_path = repo_root / "logs" / "redacted" / args.step / f"{run}.log"
+    run_dir = repo_root / "data" / "netdata" / args.step / run
+    result_dir = repo_root / "results" / args.step / run
+    result_dir.mkdir(parents=True, exist_ok=True)
+
+    df = run_phase_stats(log_path, run_dir, assume_tz=args.timezone)
+    df.insert(0, "run", args.run)
+    df.insert(0, "step", args.step)
+    df.to_csv(result_dir / "phases.csv", index=False)
+    print("Saved:", result_dir / "phases.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from run_table import write_summary
+
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
     if "time" not in df.columns:
@@ -98,7 +100,7 @@ def main(step_dir="data/netdata/step01_system_idle", out_dir="results/step01_sys
         })
 
     df = pd.DataFrame(rows)
-    df.to_csv(out / "summary_step01.csv", index=False)
+    df = write_summary(df, out / "summary_step01.csv", out.name)
 
     def save_box(col: str, title: str, fname: str):
         fig = plt.figure(figsize=(7, 4))
@@ -1,21 +1,22 @@
 import sys
 from pathlib import Path
-import re
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import parse_markers, series_phase_stats
+from run_table import write_summary
 
-EPOCH_RE = re.compile(r'^(START_EPOCH|READY_EPOCH|END_EPOCH)=(\d+)\s*$')
 
 def parse_epochs(log_path: Path):
+    # 정수 *_EPOCH 또는 소수 초 *_EPOCH_NS (parse_markers)
     epochs = {"START_EPOCH": None, "READY_EPOCH": None, "END_EPOCH": None}
     if not log_path.exists():
         return epochs
-    for line in log_path.read_text(encoding="utf-8", errors="ignore").splitlines():
-        m = EPOCH_RE.match(line.strip())
-        if m:
-            epochs[m.group(1)] = int(m.group(2))
+    markers = parse_markers(log_path)
+    for k in epochs:
+        if k in markers:
+            epochs[k] = markers[k]
     return epochs
 
 
@@ -31,11 +32,9 @@ def load_df(p: Path) -> pd.DataFrame:
     return df.sort_values("dt").reset_index(drop=True)
 
 
-def auc(series: pd.Series, dt: pd.Series) -> float:
-    # numpy trapz deprecated 대응
-    t = (dt - dt.iloc[0]).dt.total_seconds().to_numpy()
-    y = series.to_numpy(dtype=float)
-    return float(np.trapezoid(y, t))
+def epoch_s(dt: pd.Series) -> np.ndarray:
+    # load_df의 dt(naive, epoch 기준) -> epoch seconds
+    return (dt - pd.Timestamp(0)).dt.total_seconds().to_numpy()
 
 
 def pick_cpu_total(cpu: pd.DataFrame) -> pd.Series:
@@ -88,14 +87,6 @@ def pick_reads_writes(dio: pd.DataFrame):
     return r, w
 
 
-def clip_by_epochs(df: pd.DataFrame, start_epoch: int, end_epoch: int) -> pd.DataFrame:
-    t0 = pd.to_datetime(start_epoch, unit="s")
-    t1 = pd.to_datetime(end_epoch, unit="s")
-    m = (df["dt"] >= t0) & (df["dt"] <= t1)
-    out = df.loc[m].copy()
-    return out if len(out) >= 3 else df
-
-
 def save_stats_csv(path: Path, d: dict):
     df = pd.DataFrame([d])
     df.to_csv(path, index=False)
@@ -145,15 +136,19 @@ def main(step_dir="data/netdata/step02_start_master",
         if start_e is None or end_e is None:
             raise ValueError(f"missing START/END in log: {logs/run.name}.log")
 
-        cpu_s = clip_by_epochs(cpu, start_e, end_e)
-        ram_s = clip_by_epochs(ram, start_e, end_e)
-        du_s  = clip_by_epochs(du,  start_e, end_e)
-        dio_s = clip_by_epochs(dio, start_e, end_e)
-
-        cpu_total_s = pick_cpu_total(cpu_s)
-        ram_used_s  = pick_ram_used(ram_s)
-        disk_util_s = pick_disk_util(du_s)
-        reads_s, writes_s = pick_reads_writes(dio_s)
+        # START..END(양끝 포함) 통계, 구간 안 sample이 3개 미만인 chart는 전체 구간으로
+        series = {
+            "cpu": (epoch_s(cpu["dt"]), cpu_total),
+            "ram": (epoch_s(ram["dt"]), ram_used),
+            "disk_util": (epoch_s(du["dt"]), disk_util),
+            "disk_read": (epoch_s(dio["dt"]), reads),
+            "disk_write": (epoch_s(dio["dt"]), writes),
+        }
+        st = series_phase_stats(series, [("TOTAL", "span", start_e, end_e)]).iloc[0].to_dict()
+        for name, (t, y) in series.items():
+            if st[f"{name}_n"] < 3:
+                whole = [("TOTAL", "span", float(np.min(t)), float(np.max(t)))]
+                st.update(series_phase_stats({name: (t, y)}, whole).iloc[0].to_dict())
 
         run_out = out / run.name
         run_out.mkdir(parents=True, exist_ok=True)
@@ -212,27 +207,10 @@ def main(step_dir="data/netdata/step02_start_master",
             "end_epoch": end_e,
             "t_ready_sec": t_ready_sec,
             "t_total_sec": t_total_sec,
-
-            "cpu_mean": float(cpu_total_s.mean()),
-            "cpu_peak": float(cpu_total_s.max()),
-            "cpu_auc":  auc(cpu_total_s, cpu_s["dt"]),
-
-            "ram_mean": float(ram_used_s.mean()),
-            "ram_peak": float(ram_used_s.max()),
-            "ram_auc":  auc(ram_used_s, ram_s["dt"]),
-
-            "disk_util_mean": float(disk_util_s.mean()),
-            "disk_util_peak": float(disk_util_s.max()),
-            "disk_util_auc":  auc(disk_util_s, du_s["dt"]),
-
-            "disk_read_mean": float(reads_s.mean()),
-            "disk_read_peak": float(reads_s.max()),
-            "disk_read_auc":  auc(reads_s, dio_s["dt"]),
-
-            "disk_write_mean": float(writes_s.mean()),
-            "disk_write_peak": float(writes_s.max()),
-            "disk_write_auc":  auc(writes_s, dio_s["dt"]),
         }
+        for name in series:
+            for s in ("mean", "peak", "auc"):
+                stats[f"{name}_{s}"] = float(st[f"{name}_{s}"])
         save_stats_csv(run_out / "stats.csv", stats)
 
         rows_summary.append(stats)
@@ -240,7 +218,7 @@ def main(step_dir="data/netdata/step02_start_master",
     df = pd.DataFrame(rows_summary).sort_values(
         "run", key=lambda s: s.str.split("_").str[1].astype(int)
     )
-    df.to_csv(out / "summary_step02.csv", index=False)
+    df = write_summary(df, out / "summary_step02.csv", out.name)
 
     def save_box(col: str, title: str, fname: str):
         fig = plt.figure(figsize=(7, 4))
@@ -5,6 +5,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import precise_kv
+from run_table import write_summary
+
 def parse_kv_log(p: Path) -> dict:
     kv = {}
     for line in p.read_text().splitlines():
@@ -13,7 +16,7 @@ def parse_kv_log(p: Path) -> dict:
             continue
         k, v = line.split("=", 1)
         kv[k.strip()] = v.strip()
-    return kv
+    return precise_kv(kv)
 
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
@@ -76,9 +79,9 @@ def main():
             raise FileNotFoundError(f"missing log: {log_path}")
 
         kv = parse_kv_log(log_path)
-        start_epoch = int(kv["START_EPOCH"])
-        end_epoch   = int(kv["END_EPOCH"])
-        ready_epoch = int(kv["READY_EPOCH"]) if kv.get("READY_EPOCH", "").isdigit() else None
+        start_epoch = float(kv["START_EPOCH"])
+        end_epoch   = float(kv["END_EPOCH"])
+        ready_epoch = float(kv["READY_EPOCH"]) if kv.get("READY_EPOCH", "").replace(".", "", 1).isdigit() else None
 
         t_total = end_epoch - start_epoch
         t_ready = (ready_epoch - start_epoch) if ready_epoch is not None else ""
@@ -193,7 +196,7 @@ def main():
         all_rows.append(row)
 
     df = pd.DataFrame(all_rows).sort_values("run")
-    df.to_csv(out_root / "summary.csv", index=False)
+    df = write_summary(df, out_root / "summary.csv", step)
 
     if len(df) >= 10:
         cols = [c for c in [
@@ -5,6 +5,11 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import parse_markers, precise_kv
+from pod_startup import run_pod_phases
+from run_table import write_summary
+from stability import settle_stats
+
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
     if "time" not in df.columns:
@@ -36,7 +41,7 @@ def read_kv_log(p: Path) -> dict:
         if "=" in line:
             k, v = line.split("=", 1)
             d[k.strip()] = v.strip()
-    return d
+    return precise_kv(d)
 
 def add_markers(ax, start_dt, ready_dt, end_dt):
     ax.axvline(start_dt, linestyle="--")
@@ -64,9 +69,9 @@ def main(step: str):
 
         log_path = log_dir / f"{run_id}.log"
         meta = read_kv_log(log_path)
-        start_epoch = int(meta["START_EPOCH"])
-        ready_epoch = int(meta.get("READY_EPOCH", "") or 0) if "READY_EPOCH" in meta else None
-        end_epoch = int(meta["END_EPOCH"])
+        start_epoch = float(meta["START_EPOCH"])
+        ready_epoch = float(meta.get("READY_EPOCH", "") or 0) if "READY_EPOCH" in meta else None
+        end_epoch = float(meta["END_EPOCH"])
         t_ready = float(meta.get("T_ready", "nan")) if "T_ready" in meta else float("nan")
         t_total = float(meta.get("T_total", "nan")) if "T_total" in meta else float("nan")
 
@@ -130,7 +135,7 @@ def main(step: str):
             "step": step_name,
             "run": i,
             "START_EPOCH": start_epoch,
-            "READY_EPOCH": int(ready_epoch) if ready_epoch else "",
+            "READY_EPOCH": ready_epoch if ready_epoch else "",
             "END_EPOCH": end_epoch,
             "T_ready": t_ready,
             "T_total": t_total,
@@ -171,13 +176,22 @@ def main(step: str):
         else:
             row.update({"disk_io_write_mean": np.nan, "disk_io_write_peak": np.nan, "disk_io_write_auc": np.nan})
 
+        # START 이후 CPU/RAM이 다시 머무는 시점 (export 구간 START..END 안에서)
+        row.update(settle_stats({
+            "cpu": ((cpu["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy(), cpu_total.to_numpy()),
+            "ram": ((ram["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy(), ram_used.to_numpy()),
+        }, after=start_epoch))
+
+        # T_ready 단계 분해 (pod_timeline.csv가 있는 run만)
+        row.update(run_pod_phases(run, parse_markers(log_path)))
+
         pd.DataFrame([row]).to_csv(run_out / "stats.csv", index=False)
         (run_out / "redacted.log").write_text(log_path.read_text())
 
         rows.append(row)
 
     df = pd.DataFrame(rows).sort_values("run")
-    df.to_csv(out_dir / "summary.csv", index=False)
+    df = write_summary(df, out_dir / "summary.csv", step_name)
 
     if len(df) >= 10:
         cols = [c for c in ["T_total", "cpu_mean", "cpu_peak", "cpu_auc", "ram_mean", "disk_util_mean"] if c in df.columns]
@@ -6,6 +6,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import precise_kv
+from run_table import write_summary
+
 
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
@@ -41,7 +44,7 @@ def read_kv_log(p: Path) -> Dict[str, str]:
         if "=" in line:
             k, v = line.split("=", 1)
             kv[k.strip()] = v.strip()
-    return kv
+    return precise_kv(kv)
 
 
 def safe_load(path: Path) -> Optional[pd.DataFrame]:
@@ -78,9 +81,9 @@ def main():
         run_i = int(kv.get("RUN", logp.stem.split("_")[1]))
         run_name = f"run_{run_i}"
 
-        start = int(kv["START_EPOCH"])
-        end = int(kv["END_EPOCH"])
-        ready = int(kv["READY_EPOCH"]) if kv.get("READY_EPOCH", "") not in ("", "None") else None
+        start = float(kv["START_EPOCH"])
+        end = float(kv["END_EPOCH"])
+        ready = float(kv["READY_EPOCH"]) if kv.get("READY_EPOCH", "") not in ("", "None") else None
         t_ready = float(kv["T_ready"]) if kv.get("T_ready", "") not in ("", "None") else np.nan
         t_total = float(kv["T_total"]) if kv.get("T_total", "") not in ("", "None") else float(end - start)
 
@@ -194,7 +197,7 @@ def main():
         rows.append(row)
 
     df = pd.DataFrame(rows).sort_values("run")
-    df.to_csv(out_dir / "summary.csv", index=False)
+    df = write_summary(df, out_dir / "summary.csv", step)
 
     cols = [
         ("T_total", "T_total"),
@@ -6,6 +6,10 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import precise_kv, series_phase_stats
+from run_table import write_summary
+from stability import settle_stats
+
 
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
@@ -18,12 +22,6 @@ def load_df(p: Path) -> pd.DataFrame:
     return df.sort_values("dt")
 
 
-def auc(series: pd.Series, dt: pd.Series) -> float:
-    t = (dt - dt.iloc[0]).dt.total_seconds().to_numpy()
-    y = series.to_numpy(dtype=float)
-    return float(np.trapz(y, t))
-
-
 def pick_ram_used(ram: pd.DataFrame) -> pd.Series:
     if "used" in ram.columns:
         return ram["used"].astype(float)
@@ -39,13 +37,7 @@ def read_kv_log(p: Path) -> Dict[str, str]:
         if "=" in line:
             k, v = line.split("=", 1)
             kv[k.strip()] = v.strip()
-    return kv
-
-
-def cut_window(df: pd.DataFrame, start_epoch: int, end_epoch: int) -> pd.DataFrame:
-    s = pd.to_datetime(start_epoch, unit="s")
-    e = pd.to_datetime(end_epoch, unit="s")
-    return df[(df["dt"] >= s) & (df["dt"] <= e)].copy()
+    return precise_kv(kv)
 
 
 def vline(ax, epoch: int, label: str):
@@ -76,10 +68,10 @@ def main():
         run_i = int(kv.get("RUN", logp.stem.split("_")[1]))
         run_name = f"run_{run_i}"
 
-        ds = int(kv["DOWN_START_EPOCH"])
-        de = int(kv["DOWN_END_EPOCH"])
-        us = int(kv["UP_START_EPOCH"])
-        ue = int(kv["UP_END_EPOCH"])
+        ds = float(kv["DOWN_START_EPOCH"])
+        de = float(kv["DOWN_END_EPOCH"])
+        us = float(kv["UP_START_EPOCH"])
+        ue = float(kv["UP_END_EPOCH"])
 
         t_down = float(kv.get("T_down", de - ds))
         t_up = float(kv.get("T_up", ue - us))
@@ -104,26 +96,18 @@ def main():
             reads = dio["reads"].astype(float).abs()
             writes = dio["writes"].astype(float).abs()
 
-        cpu_down = cut_window(pd.DataFrame({"dt": cpu["dt"], "v": cpu_total}), ds, de)
-        cpu_up   = cut_window(pd.DataFrame({"dt": cpu["dt"], "v": cpu_total}), us, ue)
-
-        ram_down = cut_window(pd.DataFrame({"dt": ram["dt"], "v": ram_used}), ds, de)
-        ram_up   = cut_window(pd.DataFrame({"dt": ram["dt"], "v": ram_used}), us, ue)
-
-        du_down = du_up = None
+        # DOWN(DOWN_START..DOWN_END) / UP(UP_START..UP_END) 구간 통계, 구간은 양끝 포함
+        series = {
+            "cpu": ((cpu["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy(), cpu_total.to_numpy()),
+            "ram": ((ram["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy(), ram_used.to_numpy()),
+        }
         if du is not None and disk_util is not None:
-            tmp = pd.DataFrame({"dt": du["dt"], "v": disk_util})
-            du_down = cut_window(tmp, ds, de)
-            du_up   = cut_window(tmp, us, ue)
-
-        dio_r_down = dio_r_up = dio_w_down = dio_w_up = None
+            series["disk_util"] = ((du["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy(), disk_util.to_numpy())
         if dio is not None and reads is not None and writes is not None:
-            tmp_r = pd.DataFrame({"dt": dio["dt"], "v": reads})
-            tmp_w = pd.DataFrame({"dt": dio["dt"], "v": writes})
-            dio_r_down = cut_window(tmp_r, ds, de)
-            dio_r_up   = cut_window(tmp_r, us, ue)
-            dio_w_down = cut_window(tmp_w, ds, de)
-            dio_w_up   = cut_window(tmp_w, us, ue)
+            t_dio = (dio["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy()
+            series["io_read"] = (t_dio, reads.to_numpy())
+            series["io_write"] = (t_dio, writes.to_numpy())
+        ph = series_phase_stats(series, [("down", "span", ds, de), ("up", "span", us, ue)]).set_index("phase")
 
         run_out = out_dir / run_name
         run_out.mkdir(parents=True, exist_ok=True)
@@ -158,15 +142,6 @@ def main():
         fig.savefig(run_out / "fig1_timeseries.png", dpi=200)
         plt.close(fig)
 
-        def stats_block(prefix: str, win: pd.DataFrame) -> Dict[str, Any]:
-            if win is None or len(win) == 0:
-                return {f"{prefix}_mean": np.nan, f"{prefix}_peak": np.nan, f"{prefix}_auc": np.nan}
-            return {
-                f"{prefix}_mean": float(win["v"].mean()),
-                f"{prefix}_peak": float(win["v"].max()),
-                f"{prefix}_auc":  auc(win["v"], win["dt"]),
-            }
-
         row: Dict[str, Any] = {
             "step": step,
             "run": run_i,
@@ -179,24 +154,21 @@ def main():
             "T_total": t_total,
         }
 
-        row.update(stats_block("cpu_down", cpu_down))
-        row.update(stats_block("cpu_up", cpu_up))
-        row.update(stats_block("ram_down", ram_down))
-        row.update(stats_block("ram_up", ram_up))
-
-        row.update(stats_block("disk_util_down", du_down))
-        row.update(stats_block("disk_util_up", du_up))
+        for name in ("cpu", "ram", "disk_util", "io_read", "io_write"):
+            for phase in ("down", "up"):
+                for st in ("mean", "peak", "auc"):
+                    row[f"{name}_{phase}_{st}"] = float(ph.loc[phase, f"{name}_{st}"]) if name in series else np.nan
 
-        row.update(stats_block("io_read_down", dio_r_down))
-        row.update(stats_block("io_read_up", dio_r_up))
-        row.update(stats_block("io_write_down", dio_w_down))
-        row.update(stats_block("io_write_up", dio_w_up))
+        # 각 구간 시작 이후 CPU/RAM이 다시 머무는 시점 (down은 UP_START 전까지)
+        cpu_ram = {k: series[k] for k in ("cpu", "ram")}
+        row.update(settle_stats(cpu_ram, after=ds, before=us, prefix="down_"))
+        row.update(settle_stats(cpu_ram, after=us, prefix="up_"))
 
         pd.DataFrame([row]).to_csv(run_out / "stats.csv", index=False)
         rows.append(row)
 
     df = pd.DataFrame(rows).sort_values("run")
-    df.to_csv(out_dir / "summary.csv", index=False)
+    df = write_summary(df, out_dir / "summary.csv", step)
 
     fig_cols = [
         ("T_down", "T_down"),
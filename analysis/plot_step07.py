@@ -6,6 +6,10 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import precise_kv
+from run_table import write_summary
+from stability import settle_stats
+
 
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
@@ -39,7 +43,7 @@ def read_kv_log(p: Path) -> Dict[str, str]:
         if "=" in line:
             k, v = line.split("=", 1)
             kv[k.strip()] = v.strip()
-    return kv
+    return precise_kv(kv)
 
 
 def vline(ax, epoch: int, label: str):
@@ -70,8 +74,8 @@ def main():
         run_i = int(kv.get("RUN", logp.stem.split("_")[1]))
         run_name = f"run_{run_i}"
 
-        start = int(kv["START_EPOCH"])
-        end = int(kv["END_EPOCH"])
+        start = float(kv["START_EPOCH"])
+        end = float(kv["END_EPOCH"])
         t_total = float(kv.get("T_total", end - start))
 
         run_data = data_dir / run_name
@@ -170,11 +174,17 @@ def main():
                 "disk_io_write_mean": np.nan, "disk_io_write_peak": np.nan, "disk_io_write_auc": np.nan,
             })
 
+        # START 이후 CPU/RAM이 다시 머무는 시점 (export 구간 START..END 안에서)
+        row.update(settle_stats({
+            "cpu": ((cpu["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy(), cpu_total.to_numpy()),
+            "ram": ((ram["dt"] - pd.Timestamp(0)).dt.total_seconds().to_numpy(), ram_used.to_numpy()),
+        }, after=start))
+
         pd.DataFrame([row]).to_csv(run_out / "stats.csv", index=False)
         rows.append(row)
 
     df = pd.DataFrame(rows).sort_values("run")
-    df.to_csv(out_dir / "summary.csv", index=False)
+    df = write_summary(df, out_dir / "summary.csv", step)
 
     cols = ["T_total", "cpu_mean", "cpu_peak", "ram_mean", "ram_peak", "disk_util_mean", "disk_util_peak"]
     cols = [c for c in cols if c in df.columns and df[c].notna().any()]
@@ -6,6 +6,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import parse_markers, series_phase_stats
+from run_table import write_summary
+
 
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
@@ -18,10 +21,9 @@ def load_df(p: Path) -> pd.DataFrame:
     return df.sort_values("dt")
 
 
-def auc(series: pd.Series, dt: pd.Series) -> float:
-    t = (dt - dt.iloc[0]).dt.total_seconds().to_numpy()
-    y = series.to_numpy(dtype=float)
-    return float(np.trapz(y, t))
+def epoch_s(dt: pd.Series) -> np.ndarray:
+    # load_df의 dt(naive, epoch 기준) -> epoch seconds
+    return (dt - pd.Timestamp(0)).dt.total_seconds().to_numpy()
 
 
 def pick_ram_used(ram: pd.DataFrame) -> pd.Series:
@@ -33,24 +35,6 @@ def pick_ram_used(ram: pd.DataFrame) -> pd.Series:
     return ram[cols[0]].astype(float)
 
 
-def parse_run_log(text: str) -> Dict[str, Dict[str, str]]:
-    segs: Dict[str, Dict[str, str]] = {}
-    cur = None
-    for line in text.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith("SEG_") and "=" in line:
-            k, v = line.split("=", 1)
-            cur = k.strip()  # e.g., SEG_A
-            segs[cur] = {"name": v.strip()}
-            continue
-        if "=" in line and cur is not None:
-            k, v = line.split("=", 1)
-            segs[cur][k.strip()] = v.strip()
-    return segs
-
-
 def vline(ax, epoch: int, label: str):
     dt = pd.to_datetime(epoch, unit="s")
     ax.axvline(dt, linestyle="--", linewidth=1)
@@ -85,7 +69,8 @@ def main():
     for logp in run_logs:
         run_i = int(logp.stem.split("_")[1])
         run_name = f"run_{run_i}"
-        segs = parse_run_log(logp.read_text())
+        # SEG_A=cordon 블록의 START_EPOCH -> A_CORDON_START_EPOCH (*_EPOCH_NS 우선)
+        markers = parse_markers(logp)
 
         segA = data_dir / run_name / "segA_cordon"
         segB = data_dir / run_name / "segB_pending"
@@ -93,7 +78,10 @@ def main():
 
         fig, ax = plt.subplots(4, 1, figsize=(12, 9), sharex=True)
 
-        def plot_one(seg_key: str, seg_dir: Path, start: int, ready: str, end: int, tag: str):
+        def plot_one(seg_dir: Path, tag: str, whole: bool = False):
+            start = markers[f"{tag}_START_EPOCH"]
+            ready = markers.get(f"{tag}_READY_EPOCH")
+            end = markers[f"{tag}_END_EPOCH"]
             cpu, ram, du, dio = collect_metrics(seg_dir)
             cpu_total = cpu["user"].astype(float) + cpu["system"].astype(float) + cpu.get("iowait", 0).astype(float)
             ram_used  = pick_ram_used(ram)
@@ -110,56 +98,43 @@ def main():
 
             for a in ax:
                 vline(a, start, f"{tag}_START")
-                if ready:
-                    vline(a, int(ready), f"{tag}_READY")
+                if ready is not None:
+                    vline(a, ready, f"{tag}_READY")
                 vline(a, end,   f"{tag}_END")
 
-            return {
+            series = {
+                "cpu": (epoch_s(cpu["dt"]), cpu_total),
+                "ram": (epoch_s(ram["dt"]), ram_used),
+                "disk_util": (epoch_s(du["dt"]), disk_util),
+            }
+            if reads is not None and writes is not None:
+                series["io_read"] = (epoch_s(dio["dt"]), reads)
+                series["io_write"] = (epoch_s(dio["dt"]), writes)
+            # whole: segment csv 전체 (A는 cordon 전후 WINDOW_SEC 윈도우로 export, START==END인 경우가 많음)
+            if whole:
+                ts = np.concatenate([t for t, _ in series.values()])
+                lo, hi = float(np.min(ts)), float(np.max(ts))
+            else:
+                lo, hi = start, end
+            st = series_phase_stats(series, [(tag, "span", lo, hi)]).iloc[0]
+
+            out = {
                 f"{tag}_START_EPOCH": start,
-                f"{tag}_READY_EPOCH": ready,
+                f"{tag}_READY_EPOCH": ready if ready is not None else "",
                 f"{tag}_END_EPOCH": end,
-                f"{tag}_T_ready": (int(ready) - start) if ready else "",
+                f"{tag}_T_ready": (ready - start) if ready is not None else "",
                 f"{tag}_T_total": (end - start),
-
-                f"{tag}_cpu_mean": float(cpu_total.mean()),
-                f"{tag}_cpu_peak": float(cpu_total.max()),
-                f"{tag}_cpu_auc":  auc(cpu_total, cpu["dt"]),
-
-                f"{tag}_ram_mean": float(ram_used.mean()),
-                f"{tag}_ram_peak": float(ram_used.max()),
-                f"{tag}_ram_auc":  auc(ram_used, ram["dt"]),
-
-                f"{tag}_disk_util_mean": float(disk_util.mean()),
-                f"{tag}_disk_util_peak": float(disk_util.max()),
-                f"{tag}_disk_util_auc":  auc(disk_util, du["dt"]),
-
-                f"{tag}_io_read_mean": float(reads.mean()) if reads is not None else np.nan,
-                f"{tag}_io_read_peak": float(reads.max()) if reads is not None else np.nan,
-                f"{tag}_io_read_auc":  auc(reads, dio["dt"]) if reads is not None else np.nan,
-
-                f"{tag}_io_write_mean": float(writes.mean()) if writes is not None else np.nan,
-                f"{tag}_io_write_peak": float(writes.max()) if writes is not None else np.nan,
-                f"{tag}_io_write_auc":  auc(writes, dio["dt"]) if writes is not None else np.nan,
             }
-
-        def get_epoch(seg_key: str, field: str) -> str:
-            return segs.get(seg_key, {}).get(field, "")
-
-        A_start = int(get_epoch("SEG_A", "START_EPOCH"))
-        A_end   = int(get_epoch("SEG_A", "END_EPOCH"))
-
-        B_start = int(get_epoch("SEG_B", "START_EPOCH"))
-        B_ready = get_epoch("SEG_B", "READY_EPOCH")
-        B_end   = int(get_epoch("SEG_B", "END_EPOCH"))
-
-        C_start = int(get_epoch("SEG_C", "START_EPOCH"))
-        C_end   = int(get_epoch("SEG_C", "END_EPOCH"))
+            for name in ("cpu", "ram", "disk_util", "io_read", "io_write"):
+                for s in ("mean", "peak", "auc"):
+                    out[f"{tag}_{name}_{s}"] = float(st[f"{name}_{s}"]) if name in series else np.nan
+            return out
 
         row: Dict[str, Any] = {"step": step, "run": run_i}
 
-        row.update(plot_one("SEG_A", segA, A_start, "", B_start-1 if False else A_end, "A_CORDON"))  # end는 A_end
-        row.update(plot_one("SEG_B", segB, B_start, B_ready, B_end, "B_PENDING"))
-        row.update(plot_one("SEG_C", segC, C_start, "", C_end, "C_UNCORDON"))
+        row.update(plot_one(segA, "A_CORDON", whole=True))
+        row.update(plot_one(segB, "B_PENDING"))
+        row.update(plot_one(segC, "C_UNCORDON"))
 
         ax[0].set_ylabel("CPU %")
         ax[1].set_ylabel("RAM used (MB)")
@@ -185,7 +160,7 @@ def main():
         rows.append(row)
 
     df = pd.DataFrame(rows).sort_values("run")
-    df.to_csv(out_dir / "summary.csv", index=False)
+    df = write_summary(df, out_dir / "summary.csv", step)
 
     cols = [c for c in df.columns if c.endswith("_T_total") or c.endswith("_cpu_mean") or c.endswith("_ram_mean")]
     cols = [c for c in cols if df[c].notna().any()]
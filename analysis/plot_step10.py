@@ -4,6 +4,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from phases import precise_kv
+from run_table import write_summary
+
 def load_df(p: Path) -> pd.DataFrame:
     df = pd.read_csv(p)
     if "time" not in df.columns:
@@ -35,7 +38,7 @@ def parse_kv_log(p: Path) -> dict:
             continue
         k, v = line.split("=", 1)
         d[k.strip()] = v.strip()
-    return d
+    return precise_kv(d)
 
 def main():
     ap = argparse.ArgumentParser()
@@ -58,8 +61,8 @@ def main():
         run_name = f"run_{run}"
         kv = parse_kv_log(logp)
 
-        START = int(kv["START_EPOCH"])
-        END   = int(kv["END_EPOCH"])
+        START = float(kv["START_EPOCH"])
+        END   = float(kv["END_EPOCH"])
         T_total = float(kv.get("T_total",""))
 
         rd = data_dir / run_name
@@ -131,7 +134,7 @@ def main():
         rows.append(row)
 
     df = pd.DataFrame(rows).sort_values("run")
-    df.to_csv(out_dir / "summary.csv", index=False)
+    df = write_summary(df, out_dir / "summary.csv", step)
 
     metrics = ["T_total","cpu_mean","cpu_peak","ram_mean","ram_peak","disk_util_mean"]
     metrics = [m for m in metrics if m in df.columns]
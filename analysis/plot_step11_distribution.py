@@ -3,6 +3,8 @@ from pathlib import Path
 import numpy as np
 import matplotlib.pyplot as plt
 
+from run_table import quarantined_runs
+
 STEP = "step11_network"
 
 METRICS = [
@@ -20,10 +22,14 @@ def main():
         print(f"[ERR] missing {allrows}. Run make_step11_allrows.py first.")
         return
 
+    # quality.csv에서 ok=False인 run 제외
+    bad = quarantined_runs(Path("results"), STEP)
     data = {}
     with allrows.open() as f:
         r = csv.DictReader(f)
         for row in r:
+            if row.get("run", "").isdigit() and int(row["run"]) in bad:
+                continue
             w = row["worker"]
             data.setdefault(w, {})
             for m, _ in METRICS:
@@ -7,8 +7,15 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.gridspec import GridSpec
 import warnings
+from pathlib import Path
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+from netdata_io import read_netdata_csv
+from phases import parse_markers, window_mask
+from pod_startup import run_pod_phases
+from run_table import write_summary
+from stability import settle_stats
+
 STEP = "step12_apply_tinyllama_http"
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_BASE = os.path.join(BASE_DIR, "data", "netdata", STEP)
@@ -19,45 +26,30 @@ LOG_BASE = os.path.join(BASE_DIR, "logs", "redacted", STEP)
 def load_epoch(log_path, key):
     if not os.path.exists(log_path):
         return None
+    # {key}_NS(소수 초 wall clock)가 있으면 우선, 없으면 정수 {key}
+    found = None
     with open(log_path) as f:
         for line in f:
-            m = re.match(rf"^{key}=(\d+)", line.strip())
+            m = re.match(rf"^{key}_NS=(\d+)", line.strip())
             if m:
-                return int(m.group(1))
-    return None
+                return int(m.group(1)) / 1e9
+            m = re.match(rf"^{key}=(\d+)", line.strip())
+            if m and found is None:
+                found = int(m.group(1))
+    return found
 
 
 def _read_csv_with_time(csv_path):
+    # time 컬럼은 netdata_io.read_netdata_csv가 epoch seconds(s/ms/us/datetime 문자열 모두)로 바꾼다.
     if not os.path.exists(csv_path):
         return None, None
-
     try:
-        df = pd.read_csv(csv_path, comment="#")
-    except pd.errors.EmptyDataError:
+        df = read_netdata_csv(Path(csv_path))
+    except (pd.errors.EmptyDataError, RuntimeError):
         return None, None
-
-    df.columns = [c.strip().strip('"') for c in df.columns]
-    time_col = df.columns[0]
-
-    s = df[time_col].astype(str)
-    df[time_col] = pd.to_numeric(s, errors="coerce")
-
-    if df[time_col].isna().all():
-        dt = pd.to_datetime(s, errors="coerce")
-        df[time_col] = dt.astype("int64") / 1e9
-
-    df = df.dropna(subset=[time_col])
     if df.empty:
         return None, None
-
-    df = df.sort_values(by=time_col)
-
-    t = df[time_col].values.astype(float)
-
-    if len(t) > 0 and np.nanmedian(t) > 1e12:
-        t = t / 1000.0
-
-    return df, t
+    return df, df["time"].to_numpy(dtype=float)
 
 
 def load_cpu(csv_path):
@@ -220,7 +212,7 @@ def plot_run(run_id):
         ax.set_ylabel(ylabel, fontsize=9)
         if t is not None and v is not None and len(t) > 0 and len(v) > 0:
             x = t - float(start)
-            mask = (x >= -5) & (x <= (end - start + 5))
+            mask = window_mask(t, start - 5, end + 5)
             x2 = x[mask]
             v2 = v[mask]
             if len(x2) > 0 and len(v2) > 0:
@@ -240,7 +232,7 @@ def plot_run(run_id):
 
     if t_net is not None and v_rx is not None and v_tx is not None and len(t_net) > 0:
         x = t_net - float(start)
-        mask = (x >= -5) & (x <= (end - start + 5))
+        mask = window_mask(t_net, start - 5, end + 5)
         x2 = x[mask]
         rx_kb = (v_rx / 1000.0)[mask]
         tx_kb = (v_tx / 1000.0)[mask]
@@ -265,7 +257,7 @@ def plot_run(run_id):
 
     t_ready_val = (ready - start) if ready else np.nan
     fig.suptitle(
-        f"[{STEP}]  run_{run_id}    T_ready={t_ready_val}s    T_total={end - start}s",
+        f"[{STEP}]  run_{run_id}    T_ready={t_ready_val:g}s    T_total={end - start:g}s",
         fontsize=11,
         fontweight="bold",
         y=0.99,
@@ -305,6 +297,13 @@ def plot_run(run_id):
         net_rx_peak_kbps=rx_peak,
         net_tx_peak_kbps=tx_peak,
     )
+    # T_ready 단계 분해 (scheduling / image / container / model load + readinessProbe / endpoint)
+    # SERVE_PROBE=1 run이면 실제 serving 시각과 Ready / READY 차이(ready_gap_*, script_gap)도 들어간다.
+    stats.update(run_pod_phases(Path(data_dir), parse_markers(Path(log_path))))
+    # START 이후 (model load로 올라간) CPU/RAM이 머무는 시점, LOAD_START(부하 test) 전까지
+    if t_cpu is not None and t_ram is not None:
+        stats.update(settle_stats({"cpu": (t_cpu, v_cpu), "ram": (t_ram, v_ram)},
+                                  after=start, before=load_s if load_s is not None else np.inf))
     pd.DataFrame([stats]).to_csv(os.path.join(result_dir, "stats.csv"), index=False)
     return stats
 
@@ -316,9 +315,9 @@ def main():
         df = pd.DataFrame(all_stats)
         out = os.path.join(RESULT_BASE, "summary.csv")
         os.makedirs(RESULT_BASE, exist_ok=True)
-        df.to_csv(out, index=False)
+        df = write_summary(df, Path(out), STEP)
         print(f"\nSummary → {out}")
-        cols = ["run", "T_ready", "T_total", "cpu_peak", "ram_peak", "net_rx_peak_kbps"]
+        cols = ["run", "T_ready", "T_startup", "probe_share", "ready_gap_models", "T_total", "cpu_peak", "ram_peak", "net_rx_peak_kbps"]
         cols = [c for c in cols if c in df.columns]
         print(df[cols].to_string(index=False))
 
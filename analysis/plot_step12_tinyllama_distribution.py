@@ -4,6 +4,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
+from pathlib import Path
+
+from run_table import drop_quarantined
 
 STEP = "step12_apply_tinyllama_http"
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -21,8 +24,11 @@ def load_summary():
                 per_run.append(df)
         if not per_run:
             return None
-        return pd.concat(per_run, ignore_index=True)
-    return pd.read_csv(path)
+        df = pd.concat(per_run, ignore_index=True)
+    else:
+        df = pd.read_csv(path)
+    # quality.csv에서 ok=False인 run 제외 (summary.csv는 write_summary로 이미 빠져 있음)
+    return drop_quarantined(df, Path(BASE_DIR) / "results", STEP)
 
 
 def violin_or_box(ax, data, label, color):
@@ -4,6 +4,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
+from pathlib import Path
+
+from run_table import drop_quarantined
 
 STEP = "step14_scale_up_down_tinyllama_http"
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -13,15 +16,18 @@ RESULT_BASE = os.path.join(BASE_DIR, "results", STEP)
 def load_summary():
     path = os.path.join(RESULT_BASE, "summary.csv")
     if os.path.exists(path):
-        return pd.read_csv(path)
-    per_run = []
-    for i in range(1, 11):
-        p = os.path.join(RESULT_BASE, f"run_{i}", "stats.csv")
-        if os.path.exists(p):
-            per_run.append(pd.read_csv(p))
-    if not per_run:
-        return None
-    return pd.concat(per_run, ignore_index=True)
+        df = pd.read_csv(path)
+    else:
+        per_run = []
+        for i in range(1, 11):
+            p = os.path.join(RESULT_BASE, f"run_{i}", "stats.csv")
+            if os.path.exists(p):
+                per_run.append(pd.read_csv(p))
+        if not per_run:
+            return None
+        df = pd.concat(per_run, ignore_index=True)
+    # quality.csv에서 ok=False인 run 제외 (summary.csv는 write_summary로 이미 빠져 있음)
+    return drop_quarantined(df, Path(BASE_DIR) / "results", STEP)
 
 
 def violin_or_box(ax, data, label, color):
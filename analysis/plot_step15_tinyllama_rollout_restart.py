@@ -8,6 +8,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from phases import precise_kv
+from stability import settle_stats
+
 
 def read_kv_log(path: Path) -> dict:
     d = {}
@@ -15,7 +18,7 @@ def read_kv_log(path: Path) -> dict:
         if "=" in line:
             k, v = line.split("=", 1)
             d[k.strip()] = v.strip()
-    return d
+    return precise_kv(d)
 
 
 def read_netdata_csv(path: Path) -> pd.DataFrame:
@@ -103,17 +106,17 @@ def main() -> None:
     result_dir.mkdir(parents=True, exist_ok=True)
 
     kv = read_kv_log(log_file)
-    start_epoch = int(kv.get("START_EPOCH", "0"))
+    start_epoch = float(kv.get("START_EPOCH", "0"))
     ready_epoch = kv.get("READY_EPOCH", "NA")
     load_start_epoch = kv.get("LOAD_START_EPOCH", "NA")
     load_end_epoch = kv.get("LOAD_END_EPOCH", "NA")
-    end_epoch = int(kv.get("END_EPOCH", str(start_epoch)))
+    end_epoch = float(kv.get("END_EPOCH", str(start_epoch)))
 
     def parse_epoch(v):
         if v in (None, "", "NA"):
             return None
         try:
-            return int(v)
+            return float(v)
         except Exception:
             return None
 
@@ -235,6 +238,8 @@ def main() -> None:
         "req_latency_mean_ms": req_latency_mean,
         "req_latency_p95_ms": req_latency_p95,
         "req_latency_max_ms": req_latency_max,
+        # START(rollout restart) 이후 CPU/RAM이 다시 머무는 시점 (cpu_t/ram_t는 START 기준 초)
+        **settle_stats({"cpu": (cpu_t, cpu_y), "ram": (ram_t, ram_y)}, after=0.0),
     }])
 
     stats.to_csv(result_dir / "stats.csv", index=False)
@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from run_table import write_summary
+
 
 def main() -> None:
     ap = argparse.ArgumentParser()
@@ -33,7 +35,7 @@ def main() -> None:
         raise SystemExit("No stats.csv found. Run per-run plot first.")
 
     summary = pd.DataFrame(rows).sort_values("run_id")
-    summary.to_csv(step_dir / "summary.csv", index=False)
+    summary = write_summary(summary, step_dir / "summary.csv", step)
 
     metrics = [
         ("t_ready_sec", "T_ready (sec)"),
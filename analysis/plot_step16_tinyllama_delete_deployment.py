@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import argparse
-import re
 from pathlib import Path
 from typing import Optional, Tuple, List
 
@@ -10,21 +9,22 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from align import resample
+from phases import parse_markers, series_phase_stats, window_mask
+from stability import plateau_time_seconds, stable_time_seconds
+
 
 DEFAULT_TZ = "Asia/Seoul"
 
 
 def parse_epochs(log_path: Path) -> dict:
-    txt = log_path.read_text(errors="ignore")
-    keys = ["START_EPOCH", "DELETE_COMPLETE_EPOCH", "END_EPOCH"]
+    # *_EPOCH_NS(소수 초)가 있으면 우선 (phases.parse_markers)
+    markers = parse_markers(log_path)
     out = {}
-    for k in keys:
-        m = re.search(rf"{k}\s*=\s*(\d+)", txt)
-        if not m:
-            m = re.search(rf"{k}\s+(\d+)", txt)
-        if not m:
+    for k in ["START_EPOCH", "DELETE_COMPLETE_EPOCH", "END_EPOCH"]:
+        if k not in markers:
             raise RuntimeError(f"{k} not found in {log_path}")
-        out[k] = int(m.group(1))
+        out[k] = markers[k]
     return out
 
 
@@ -86,18 +86,6 @@ def read_netdata_csv(p: Path, assume_tz: str, start_epoch: Optional[int]) -> pd.
     return df
 
 
-def clip_df(df: pd.DataFrame, start: int, end: int, label: str) -> pd.DataFrame:
-    out = df[(df["time"] >= float(start)) & (df["time"] <= float(end))].copy()
-    if out.empty:
-        tmin = float(df["time"].min()) if not df.empty else float("nan")
-        tmax = float(df["time"].max()) if not df.empty else float("nan")
-        raise RuntimeError(
-            f"{label}: no points in [START_EPOCH, END_EPOCH]. "
-            f"start={start}, end={end}, csv_time_min={tmin}, csv_time_max={tmax}"
-        )
-    return out
-
-
 def first_matching(df: pd.DataFrame, patterns: List[str]) -> Optional[str]:
     cols = [c for c in df.columns if c != "time"]
     for pat in patterns:
@@ -149,77 +137,6 @@ def net_rx_tx(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
     return df[rx_c], df[tx_c]
 
 
-def auc(t: np.ndarray, y: np.ndarray) -> float:
-    if len(t) < 2:
-        return float("nan")
-    if hasattr(np, "trapezoid"):
-        return float(np.trapezoid(y, t))
-    return float(np.trapz(y, t))
-
-
-def plateau_time_seconds(t_rel: np.ndarray, y: np.ndarray, tail_points: int = 12, tol_ratio: float = 0.05) -> float:
-    if len(y) < max(3, tail_points):
-        return float("nan")
-    tail = y[-tail_points:]
-    p = float(np.nanmedian(tail))
-    y0 = float(y[0])
-    if not np.isfinite(p) or not np.isfinite(y0):
-        return float("nan")
-    span = abs(y0 - p)
-    tol = tol_ratio * span
-    thr = p + tol
-    for i in range(len(y)):
-        if np.isfinite(y[i]) and y[i] <= thr:
-            return float(t_rel[i])
-    return float("nan")
-
-
-def _interp_to_base(t_base: np.ndarray, t_other: np.ndarray, y_other: np.ndarray) -> np.ndarray:
-    m = np.isfinite(t_other) & np.isfinite(y_other)
-    if int(m.sum()) < 2:
-        return np.full_like(t_base, np.nan, dtype=float)
-    to = t_other[m].astype(float)
-    yo = y_other[m].astype(float)
-    idx = np.argsort(to)
-    to = to[idx]
-    yo = yo[idx]
-    return np.interp(t_base.astype(float), to, yo)
-
-
-def stable_time_seconds(t_rel: np.ndarray, ys: List[np.ndarray], tail_points: int = 12, tol_ratio: float = 0.05, consec: int = 3) -> float:
-    if len(t_rel) < max(consec + 1, tail_points):
-        return float("nan")
-
-    plates = []
-    spans = []
-    for y in ys:
-        if len(y) < max(consec + 1, tail_points):
-            return float("nan")
-        p = float(np.nanmedian(y[-tail_points:]))
-        y0 = float(y[0])
-        if not np.isfinite(p) or not np.isfinite(y0):
-            return float("nan")
-        plates.append(p)
-        spans.append(abs(y0 - p))
-
-    tols = [tol_ratio * s for s in spans]
-
-    for i in range(len(t_rel) - consec + 1):
-        ok = True
-        for j, y in enumerate(ys):
-            thr = plates[j] + tols[j]
-            window = y[i:i+consec]
-            if not np.all(np.isfinite(window)):
-                ok = False
-                break
-            if np.any(window > thr):
-                ok = False
-                break
-        if ok:
-            return float(t_rel[i])
-    return float("nan")
-
-
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--step", required=True)
@@ -242,18 +159,29 @@ def main():
     delete_done = epochs["DELETE_COMPLETE_EPOCH"]
     end = epochs["END_EPOCH"]
 
-    cpu_df = clip_df(read_netdata_csv(data_dir / "system_cpu.csv", tz, start), start, end, "system_cpu.csv")
-    ram_df = clip_df(read_netdata_csv(data_dir / "system_ram.csv", tz, start), start, end, "system_ram.csv")
+    cpu_df = read_netdata_csv(data_dir / "system_cpu.csv", tz, start)
+    ram_df = read_netdata_csv(data_dir / "system_ram.csv", tz, start)
 
     disk_files = sorted(data_dir.glob("disk_util_*.csv"))
     if not disk_files:
         raise RuntimeError("disk_util csv not found")
-    disk_df = clip_df(read_netdata_csv(disk_files[0], tz, start), start, end, disk_files[0].name)
+    disk_df = read_netdata_csv(disk_files[0], tz, start)
 
     net_files = sorted(data_dir.glob("net_*.csv"))
     if not net_files:
         raise RuntimeError("net csv not found")
-    net_df = clip_df(read_netdata_csv(net_files[0], tz, start), start, end, net_files[0].name)
+    net_df = read_netdata_csv(net_files[0], tz, start)
+
+    # [START_EPOCH, END_EPOCH] 양끝 포함 (phases.phase_stats와 같은 구간)
+    for label, df in [("system_cpu.csv", cpu_df), ("system_ram.csv", ram_df),
+                      (disk_files[0].name, disk_df), (net_files[0].name, net_df)]:
+        if not window_mask(df["time"].to_numpy(dtype=float), start, end).any():
+            tmin = float(df["time"].min()) if not df.empty else float("nan")
+            tmax = float(df["time"].max()) if not df.empty else float("nan")
+            raise RuntimeError(
+                f"{label}: no points in [START_EPOCH, END_EPOCH]. "
+                f"start={start}, end={end}, csv_time_min={tmin}, csv_time_max={tmax}"
+            )
 
     cpu_y = cpu_series(cpu_df).to_numpy(dtype=float)
     ram_y = ram_series(ram_df).to_numpy(dtype=float)
@@ -267,6 +195,21 @@ def main():
     t_disk = disk_df["time"].to_numpy(dtype=float)
     t_net = net_df["time"].to_numpy(dtype=float)
 
+    st = series_phase_stats({
+        "cpu": (t_cpu, cpu_y), "ram": (t_ram, ram_y), "disk": (t_disk, disk_y),
+        "net_rx": (t_net, rx_y), "net_tx": (t_net, tx_y),
+    }, [("TOTAL", "span", start, end)]).iloc[0]
+
+    # 그림 / 회복 시점은 구간 안 sample만
+    m = window_mask(t_cpu, start, end)
+    t_cpu, cpu_y = t_cpu[m], cpu_y[m]
+    m = window_mask(t_ram, start, end)
+    t_ram, ram_y = t_ram[m], ram_y[m]
+    m = window_mask(t_disk, start, end)
+    t_disk, disk_y = t_disk[m], disk_y[m]
+    m = window_mask(t_net, start, end)
+    t_net, rx_y, tx_y = t_net[m], rx_y[m], tx_y[m]
+
     t_rel_cpu = t_cpu - float(start)
     t_rel_ram = t_ram - float(start)
     t_rel_disk = t_disk - float(start)
@@ -305,26 +248,9 @@ def main():
     fig.savefig(result_dir / "fig1_timeseries.png", dpi=150)
     plt.close(fig)
 
-    cpu_mean = float(np.nanmean(cpu_y))
-    cpu_peak = float(np.nanmax(cpu_y))
-    cpu_auc = auc(t_rel_cpu, cpu_y)
-
-    ram_mean = float(np.nanmean(ram_y))
-    ram_peak = float(np.nanmax(ram_y))
-    ram_auc = auc(t_rel_ram, ram_y)
-
-    disk_mean = float(np.nanmean(disk_y))
-    disk_peak = float(np.nanmax(disk_y))
-    disk_auc = auc(t_rel_disk, disk_y)
-
-    rx_peak = float(np.nanmax(rx_y))
-    tx_peak = float(np.nanmax(tx_y))
-    rx_auc = auc(t_rel_net, rx_y)
-    tx_auc = auc(t_rel_net, tx_y)
-
     mem_release_latency = plateau_time_seconds(t_rel_ram, ram_y, tail_points=12, tol_ratio=0.05)
 
-    ram_on_cpu = _interp_to_base(t_rel_cpu, t_rel_ram, ram_y)
+    ram_on_cpu = resample(t_rel_ram, ram_y, t_rel_cpu, method="interp", fill="edge")[0]
     idle_recovery_time = stable_time_seconds(
         t_rel_cpu,
         ys=[cpu_y, ram_on_cpu],
@@ -335,24 +261,24 @@ def main():
 
     stats = pd.DataFrame([{
         "run": int(run),
-        "START_EPOCH": int(start),
-        "DELETE_COMPLETE_EPOCH": int(delete_done),
-        "END_EPOCH": int(end),
+        "START_EPOCH": start,
+        "DELETE_COMPLETE_EPOCH": delete_done,
+        "END_EPOCH": end,
         "T_delete": float(t_delete),
         "T_total": float(t_total),
-        "cpu_mean": cpu_mean,
-        "cpu_peak": cpu_peak,
-        "cpu_auc": cpu_auc,
-        "ram_mean": ram_mean,
-        "ram_peak": ram_peak,
-        "ram_auc": ram_auc,
-        "disk_mean": disk_mean,
-        "disk_peak": disk_peak,
-        "disk_auc": disk_auc,
-        "net_rx_peak": rx_peak,
-        "net_tx_peak": tx_peak,
-        "net_rx_auc": rx_auc,
-        "net_tx_auc": tx_auc,
+        "cpu_mean": float(st["cpu_mean"]),
+        "cpu_peak": float(st["cpu_peak"]),
+        "cpu_auc": float(st["cpu_auc"]),
+        "ram_mean": float(st["ram_mean"]),
+        "ram_peak": float(st["ram_peak"]),
+        "ram_auc": float(st["ram_auc"]),
+        "disk_mean": float(st["disk_mean"]),
+        "disk_peak": float(st["disk_peak"]),
+        "disk_auc": float(st["disk_auc"]),
+        "net_rx_peak": float(st["net_rx_peak"]),
+        "net_tx_peak": float(st["net_tx_peak"]),
+        "net_rx_auc": float(st["net_rx_auc"]),
+        "net_tx_auc": float(st["net_tx_auc"]),
         "mem_release_latency_s": float(mem_release_latency),
         "idle_recovery_time_s": float(idle_recovery_time),
     }])
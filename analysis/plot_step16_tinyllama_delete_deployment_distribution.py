@@ -6,6 +6,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from run_table import write_summary
+
 
 def main():
     ap = argparse.ArgumentParser()
@@ -30,7 +32,7 @@ def main():
         raise RuntimeError("no stats.csv found")
 
     summary = pd.DataFrame(rows).sort_values("run")
-    summary.to_csv(step_result_dir / "summary.csv", index=False)
+    summary = write_summary(summary, step_result_dir / "summary.csv", step)
 
     metrics = [
         ("T_delete", "resource release duration (s)"),
@@ -4,51 +4,14 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from pathlib import Path
+
+from netdata_io import cpu_series, disk_util_series, net_rx_tx, ram_series, read_netdata_csv
+from phases import parse_markers, series_phase_stats
+
 def repo_root_from_here() -> str:
     return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-def read_kv_log(path: str) -> dict:
-    d = {}
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or "=" not in line:
-                continue
-            k, v = line.split("=", 1)
-            d[k.strip()] = v.strip()
-    return d
-
-def read_netdata_csv(path: str) -> pd.DataFrame:
-    return pd.read_csv(path, comment="#")
-
-def time_col(df: pd.DataFrame) -> str:
-    for c in df.columns:
-        if c.lower() in ("time", "timestamp"):
-            return c
-    return df.columns[0]
-
-def pick_col(df: pd.DataFrame, keywords):
-    tcol = time_col(df)
-    value_cols = [c for c in df.columns if c != tcol]
-    for kw in keywords:
-        for c in value_cols:
-            if kw in c.lower():
-                return c
-    return value_cols[0] if value_cols else None
-
-def auc(t: np.ndarray, y: np.ndarray) -> float:
-    if len(t) < 2:
-        return float("nan")
-    return float(np.trapz(y, t))
-
-def parse_time_series(series: pd.Series) -> np.ndarray:
-    if pd.api.types.is_numeric_dtype(series):
-        return series.to_numpy(dtype=float)
-    dt = pd.to_datetime(series)
-    if dt.dt.tz is None:
-        dt = dt.dt.tz_localize('Asia/Seoul')
-    return (dt.astype('int64') / 1e9).to_numpy(dtype=float)
-
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--step", required=True)
@@ -65,13 +28,13 @@ def main() -> None:
     out_dir = os.path.join(root, "results", step, f"run_{run}")
     os.makedirs(out_dir, exist_ok=True)
 
-    meta = read_kv_log(log_file)
+    markers = parse_markers(Path(log_file))
 
-    start_epoch = int(meta["START_EPOCH"])
-    ready_epoch = int(meta["READY_EPOCH"])
-    load_start = int(meta["LOAD_START_EPOCH"])
-    load_end = int(meta["LOAD_END_EPOCH"])
-    end_epoch = int(meta["END_EPOCH"])
+    start_epoch = markers["START_EPOCH"]
+    ready_epoch = markers["READY_EPOCH"]
+    load_start = markers["LOAD_START_EPOCH"]
+    load_end = markers["LOAD_END_EPOCH"]
+    end_epoch = markers["END_EPOCH"]
 
     req = pd.read_csv(req_csv)
     req["ttft_sec"] = pd.to_numeric(req["ttft_sec"], errors="coerce")
@@ -82,36 +45,25 @@ def main() -> None:
     total_mean = float(req["total_sec"].mean(skipna=True))
     queue_mean = float(req["queue_delay_sec"].mean(skipna=True))
 
-    cpu = read_netdata_csv(os.path.join(net_dir, "system_cpu.csv"))
-    ram = read_netdata_csv(os.path.join(net_dir, "system_ram.csv"))
-    disk = read_netdata_csv(os.path.join(net_dir, "disk_util_mmcblk0.csv"))
-    net = read_netdata_csv(os.path.join(net_dir, "net_eth0.csv"))
-
-    t_cpu_col = time_col(cpu)
-    t_cpu = parse_time_series(cpu[t_cpu_col])
-    cpu_cols = [c for c in cpu.columns if c != t_cpu_col]
-    idle_cols = [c for c in cpu_cols if "idle" in c.lower()]
-    if idle_cols:
-        cpu_used = 100.0 - cpu[idle_cols[0]].to_numpy(dtype=float)
-    else:
-        cpu_used = cpu[cpu_cols].sum(axis=1).to_numpy(dtype=float)
-
-    t_ram_col = time_col(ram)
-    t_ram = parse_time_series(ram[t_ram_col])
-    ram_used_col = pick_col(ram, ["used"])
-    ram_used = ram[ram_used_col].to_numpy(dtype=float)
-
-    t_disk_col = time_col(disk)
-    t_disk = parse_time_series(disk[t_disk_col])
-    disk_col = pick_col(disk, ["util", "utilization"])
-    disk_util = disk[disk_col].to_numpy(dtype=float)
-
-    t_net_col = time_col(net)
-    t_net = parse_time_series(net[t_net_col])
-    rx_col = pick_col(net, ["received", "recv", "rx"])
-    tx_col = pick_col(net, ["sent", "send", "tx"])
-    net_rx = net[rx_col].to_numpy(dtype=float)
-    net_tx = net[tx_col].to_numpy(dtype=float)
+    # time은 read_netdata_csv가 epoch seconds로 바꾼다 (datetime64 해상도와 무관).
+    cpu = read_netdata_csv(Path(net_dir) / "system_cpu.csv")
+    ram = read_netdata_csv(Path(net_dir) / "system_ram.csv")
+    disk = read_netdata_csv(Path(net_dir) / "disk_util_mmcblk0.csv")
+    net = read_netdata_csv(Path(net_dir) / "net_eth0.csv")
+
+    t_cpu, cpu_used = cpu["time"].to_numpy(dtype=float), cpu_series(cpu)
+    t_ram, ram_used = ram["time"].to_numpy(dtype=float), ram_series(ram)
+    t_disk, disk_util = disk["time"].to_numpy(dtype=float), disk_util_series(disk)
+    t_net = net["time"].to_numpy(dtype=float)
+    net_rx, net_tx = net_rx_tx(net)
+
+    # TOTAL(START..END) = 기존 컬럼, LOAD(LOAD_START..LOAD_END) = load_* 컬럼
+    metrics = ["cpu", "ram", "disk", "net_rx", "net_tx"]
+    ph = series_phase_stats({
+        "cpu": (t_cpu, cpu_used), "ram": (t_ram, ram_used), "disk": (t_disk, disk_util),
+        "net_rx": (t_net, net_rx), "net_tx": (t_net, net_tx),
+    }, [("TOTAL", "span", start_epoch, end_epoch), ("LOAD", "span", load_start, load_end)]).set_index("phase")
+    total, load = ph.loc["TOTAL"], ph.loc["LOAD"]
 
     stats = pd.DataFrame([{
         "run": run,
@@ -123,19 +75,20 @@ def main() -> None:
         "ttft_mean": ttft_mean,
         "total_mean": total_mean,
         "queue_mean": queue_mean,
-        "cpu_mean": float(np.nanmean(cpu_used)),
-        "cpu_peak": float(np.nanmax(cpu_used)),
-        "cpu_auc": auc(t_cpu, cpu_used),
-        "ram_mean": float(np.nanmean(ram_used)),
-        "ram_peak": float(np.nanmax(ram_used)),
-        "ram_auc": auc(t_ram, ram_used),
-        "disk_mean": float(np.nanmean(disk_util)),
-        "disk_peak": float(np.nanmax(disk_util)),
-        "disk_auc": auc(t_disk, disk_util),
-        "net_rx_peak": float(np.nanmax(net_rx)),
-        "net_tx_peak": float(np.nanmax(net_tx)),
-        "net_rx_auc": auc(t_net, net_rx),
-        "net_tx_auc": auc(t_net, net_tx),
+        "cpu_mean": float(total["cpu_mean"]),
+        "cpu_peak": float(total["cpu_peak"]),
+        "cpu_auc": float(total["cpu_auc"]),
+        "ram_mean": float(total["ram_mean"]),
+        "ram_peak": float(total["ram_peak"]),
+        "ram_auc": float(total["ram_auc"]),
+        "disk_mean": float(total["disk_mean"]),
+        "disk_peak": float(total["disk_peak"]),
+        "disk_auc": float(total["disk_auc"]),
+        "net_rx_peak": float(total["net_rx_peak"]),
+        "net_tx_peak": float(total["net_tx_peak"]),
+        "net_rx_auc": float(total["net_rx_auc"]),
+        "net_tx_auc": float(total["net_tx_auc"]),
+        **{f"load_{m}_{s}": float(load[f"{m}_{s}"]) for m in metrics for s in ("mean", "peak", "auc")},
     }])
     stats.to_csv(os.path.join(out_dir, "stats.csv"), index=False)
 
@@ -2,6 +2,9 @@
 import argparse, os
 import pandas as pd
 import matplotlib.pyplot as plt
+from pathlib import Path
+
+from run_table import write_summary
 
 def repo_root_from_here() -> str:
     return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -30,7 +33,7 @@ def main() -> None:
     os.makedirs(out_step, exist_ok=True)
 
     summary = pd.DataFrame(rows).sort_values("run")
-    summary.to_csv(os.path.join(out_step, "summary.csv"), index=False)
+    summary = write_summary(summary, Path(out_step) / "summary.csv", step)
 
     metrics = ["ttft_mean", "total_mean", "cpu_peak", "ram_peak", "disk_peak", "net_rx_peak"]
     fig, axes = plt.subplots(2, 3, figsize=(14, 7))
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# T_ready를 pod 기동 단계로 나눈다 (scripts/utils/pod_timeline.py 결과)
+#
+# 입력: data/netdata/<step>/run_<i>/pod_timeline.csv, clock_offset.csv (있으면 node 시각을 master 시각으로 보정)
+#       logs/redacted/<step>/run_<i>.log 의 START / READY
+#       (+ k8s_watch.py POD_SCHEDULED / POD_RUNNING / POD_READY marker가 있고 pod가 하나면 소수 초 값으로 대신 씀)
+# 여러 replica면 Ready가 가장 늦은 pod(rollout 완료를 결정한 pod)를 본다.
+#
+#   T_schedule    : START -> PodScheduled                  (API 요청, controller, scheduler)
+#   T_image       : PodScheduled -> Pulled event           (image 확인/pull, imagePullPolicy: Never면 존재 확인만)
+#   T_container   : Pulled -> container startedAt          (sandbox / container 생성, 시작)
+#   T_startup     : startedAt -> Ready condition           (app 기동(model load) + readinessProbe 대기)
+#     T_probe_delay : min(initialDelaySeconds, T_startup)  (kubelet이 probe를 아직 보내지 않은 시간)
+#     T_probe_wait  : T_startup - T_probe_delay            (첫 probe 이후 성공까지, 실패 probe 주기 포함)
+#   T_endpoint    : Ready -> READY                         (endpoint 반영 + script의 HTTP/rollout polling)
+#   probe_failures   : readiness probe 실패 event 횟수 (Unhealthy count 합)
+#   probe_lag_max    : Ready가 실제 serving 가능 시점보다 늦었을 수 있는 최대 시간
+#                      실패가 없으면 T_startup 전체(첫 probe 전에 이미 떴을 수 있음), 있으면 min(periodSeconds, T_probe_wait)
+#   probe_share      : probe_lag_max / T_ready
+# API 시각은 대부분 초 단위라 각 구간은 ±1초 오차가 있다.
+#
+# scripts/utils/serve_probe.py marker(SERVE_*)가 log에 있으면 kubelet과 별개로 잰 실제 serving 시각과 비교한다.
+# 여러 pod면 SERVES_*(모든 새 pod가 응답) 를 쓴다. pod_timeline.csv가 없는 step(step14)도 이 컬럼만 남긴다.
+#   T_serve_listen / T_serve_models / T_serve_completion : START -> 첫 TCP 연결 / /v1/models 200 / completion 200
+#   ready_gap_models     : Ready(Kubernetes) - /v1/models 200   (readinessProbe 주기 때문에 늦게 Ready가 된 시간)
+#   ready_gap_completion : Ready(Kubernetes) - completion 200   (음수면 Ready 후에도 completion은 아직 안 됨)
+#   script_gap           : READY(script) - completion 200       (script HTTP polling 간격 등)
+#   Ready 시각: pod_timeline.csv > PODS_READY / POD_READY (k8s_watch) > SCALE_UP_ROLLOUT (step14 rollout status 종료)
+#
+# 사용:
+#   python3 analysis/pod_startup.py --step step12_apply_tinyllama_http step04_apply_deployment
+#   python3 analysis/pod_startup.py --step step14_scale_up_down_tinyllama_http   (SERVE_PROBE=1 run의 serve_gap만)
+#   -> results/<step>/pod_startup.csv
+#      results/_summary/pod_startup/pod_startup_summary.csv   (step별 median)
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from clock import correct_times, load_offsets
+from phases import parse_markers
+from run_table import netdata_bases, run_ids
+
+
+PHASE_COLS = [
+    "T_schedule", "T_image", "T_container", "T_startup", "T_probe_delay", "T_probe_wait", "T_endpoint",
+    "probe_failures", "probe_period_sec", "probe_initial_delay_sec", "probe_lag_max", "probe_share", "n_pods",
+]
+SERVE_COLS = [
+    "T_serve_listen", "T_serve_models", "T_serve_completion", "ready_gap_models", "ready_gap_completion", "script_gap",
+]
+PROBE_RE = re.compile(r"(\w+)=(\d+)")
+# readinessProbe 기본값 (Kubernetes)
+PROBE_DEFAULTS = {"initialDelaySeconds": 0, "periodSeconds": 10}
+
+
+def load_timeline(run_dir: Path) -> pd.DataFrame:
+    p = run_dir / "pod_timeline.csv"
+    if not p.exists() or p.stat().st_size == 0:
+        return pd.DataFrame()
+    df = pd.read_csv(p, dtype={"pod": str, "node": str, "key": str, "clock": str, "detail": str})
+    df["time"] = pd.to_numeric(df["time"], errors="coerce")
+    offsets = load_offsets(run_dir)
+    for node, g in df[df["clock"] == "node"].groupby("node"):
+        df.loc[g.index, "time"] = correct_times(g["time"].to_numpy(dtype=float), offsets, node)
+    return df
+
+
+def _first(g: pd.DataFrame, key: str) -> float:
+    t = g.loc[g["key"] == key, "time"].dropna()
+    return float(t.min()) if len(t) else np.nan
+
+
+def pod_times(g: pd.DataFrame) -> Dict[str, float]:
+    ready = g[(g["key"] == "COND_Ready") & (g["detail"] == "True")]["time"].dropna()
+    started = g.loc[g["key"] == "CONTAINER_STARTED", "time"].dropna()
+    probe = dict(PROBE_DEFAULTS)
+    for d in g.loc[g["key"] == "PROBE_READINESS", "detail"].dropna():
+        probe.update({k: int(v) for k, v in PROBE_RE.findall(d)})
+    unhealthy = g[(g["key"] == "EV_Unhealthy") & g["detail"].fillna("").str.startswith("Readiness probe")]
+    sched = _first(g, "EV_Scheduled")
+    return {
+        "scheduled": sched if np.isfinite(sched) else _first(g, "COND_PodScheduled"),
+        "pulled": _first(g, "EV_Pulled"),
+        # container가 여럿이면 마지막으로 뜬 container가 Ready를 결정한다.
+        "started": float(started.max()) if len(started) else _first(g, "EV_Started"),
+        "ready": float(ready.max()) if len(ready) else np.nan,
+        "probe_failures": float(pd.to_numeric(unhealthy["count"], errors="coerce").fillna(1).sum()),
+        "probe_period_sec": float(probe["periodSeconds"]),
+        "probe_initial_delay_sec": float(probe["initialDelaySeconds"]),
+    }
+
+
+def serve_gap(markers: Dict[str, float], k8s_ready: float = np.nan) -> Dict[str, float]:
+    # serve_probe.py marker가 없으면 빈 dict
+    def serve(kind: str) -> float:
+        return markers.get(f"SERVES_{kind}_EPOCH", markers.get(f"SERVE_{kind}_EPOCH", np.nan))
+
+    if not any(np.isfinite(serve(k)) for k in ("LISTEN", "MODELS", "COMPLETION")):
+        return {}
+    if not np.isfinite(k8s_ready):
+        for key in ("PODS_READY_EPOCH", "POD_READY_EPOCH", "SCALE_UP_ROLLOUT_EPOCH"):
+            if np.isfinite(markers.get(key, np.nan)):
+                k8s_ready = markers[key]
+                break
+    start = markers.get("START_EPOCH", np.nan)
+    out = {
+        "T_serve_listen": serve("LISTEN") - start,
+        "T_serve_models": serve("MODELS") - start,
+        "T_serve_completion": serve("COMPLETION") - start,
+        "ready_gap_models": k8s_ready - serve("MODELS"),
+        "ready_gap_completion": k8s_ready - serve("COMPLETION"),
+        "script_gap": markers.get("READY_EPOCH", np.nan) - serve("COMPLETION"),
+    }
+    return {k: float(out[k]) for k in SERVE_COLS}
+
+
+def run_pod_phases(run_dir: Path, markers: Dict[str, float]) -> Dict[str, float]:
+    # markers: phases.parse_markers 결과. pod_timeline.csv가 없으면 serve_gap만 (없으면 빈 dict, stats.csv 컬럼을 늘리지 않음)
+    tl = load_timeline(run_dir)
+    if tl.empty:
+        return serve_gap(markers)
+    pods = {pod: pod_times(g) for pod, g in tl.groupby("pod", sort=False)}
+    pt = max(pods.values(), key=lambda p: p["ready"] if np.isfinite(p["ready"]) else -np.inf)
+    if len(pods) == 1:
+        for name, key in (("scheduled", "POD_SCHEDULED_EPOCH"), ("started", "POD_RUNNING_EPOCH"), ("ready", "POD_READY_EPOCH")):
+            if np.isfinite(markers.get(key, np.nan)):
+                pt[name] = markers[key]
+
+    start, ready_epoch = markers.get("START_EPOCH", np.nan), markers.get("READY_EPOCH", np.nan)
+    created_from = pt["pulled"] if np.isfinite(pt["pulled"]) else pt["scheduled"]
+    out = {
+        "T_schedule": pt["scheduled"] - start,
+        "T_image": pt["pulled"] - pt["scheduled"],
+        "T_container": pt["started"] - created_from,
+        "T_startup": pt["ready"] - pt["started"],
+        "T_endpoint": ready_epoch - pt["ready"],
+        "probe_failures": pt["probe_failures"],
+        "probe_period_sec": pt["probe_period_sec"],
+        "probe_initial_delay_sec": pt["probe_initial_delay_sec"],
+        "n_pods": float(len(pods)),
+    }
+    out["T_probe_delay"] = min(pt["probe_initial_delay_sec"], out["T_startup"]) \
+        if np.isfinite(out["T_startup"]) else np.nan
+    out["T_probe_wait"] = out["T_startup"] - out["T_probe_delay"]
+    if pt["probe_failures"] > 0:
+        out["probe_lag_max"] = min(pt["probe_period_sec"], out["T_probe_wait"])
+    else:
+        out["probe_lag_max"] = out["T_startup"]
+    t_ready = ready_epoch - start
+    out["probe_share"] = out["probe_lag_max"] / t_ready if t_ready > 0 else np.nan
+    return {**{k: float(out[k]) for k in PHASE_COLS}, **serve_gap(markers, pt["ready"])}
+
+
+def pod_run_dir(repo_root: Path, step: str, run: int) -> Optional[Path]:
+    for base in netdata_bases(repo_root, step):
+        rd = base / f"run_{run}"
+        if (rd / "pod_timeline.csv").exists():
+            return rd
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", nargs="+", required=True)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    summary: List[pd.DataFrame] = []
+    for step in args.step:
+        rows = []
+        for i in run_ids(repo_root, step):
+            run_dir = pod_run_dir(repo_root, step, i)
+            log_path = repo_root / "logs" / "redacted" / step / f"run_{i}.log"
+            if not log_path.exists():
+                continue
+            markers = parse_markers(log_path)
+            row = run_pod_phases(run_dir, markers) if run_dir is not None else serve_gap(markers)
+            if row:
+                t_ready = markers.get("READY_EPOCH", np.nan) - markers.get("START_EPOCH", np.nan)
+                rows.append({"step": step, "run": i, "T_ready": t_ready, **row})
+        if not rows:
+            print("Skip (no pod_timeline.csv / serve_probe marker):", step)
+            continue
+        df = pd.DataFrame(rows)
+        out_path = repo_root / "results" / step / "pod_startup.csv"
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out_path, index=False)
+        print("Saved:", out_path)
+        g = df.drop(columns=["run"]).groupby("step")
+        s = g.median()
+        s.insert(0, "n_runs", g.size())
+        summary.append(s.reset_index())
+
+    if not summary:
+        raise SystemExit("no runs")
+    out = pd.concat(summary, ignore_index=True)
+    out_dir = repo_root / "results" / "_summary" / "pod_startup"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out.to_csv(out_dir / "pod_startup_summary.csv", index=False)
+    print("Saved:", out_dir / "pod_startup_summary.csv")
+    show = ["step", "n_runs", "T_ready", "T_schedule", "T_image", "T_container", "T_startup", "T_probe_delay",
+            "T_probe_wait", "T_endpoint", "probe_share", "T_serve_models", "ready_gap_models", "script_gap"]
+    print(out[[c for c in show if c in out.columns]].round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
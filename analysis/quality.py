@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# run 품질 검사 (quality gate)
+# 실패한 run은 results/<step>/quality.csv에 ok=False + reason으로 기록되고,
+# run_table.load_step_table / run_ids를 쓰는 요약(overhead, resampling, ensemble, changepoint ...)에서 빠진다.
+#
+# 검사 항목
+# - no_markers       : log에 START/END marker가 없음 / END < START
+#                      (step의 어떤 run에도 marker가 없으면(idle step 등) CSV 범위만 본다)
+# - short_window     : [START, END] 안의 샘플이 3개 미만 (clip_by_epochs가 전체 frame으로 fallback 하는 경우)
+# - missing_samples  : 창 안의 샘플 수가 기대값(창 길이 / 샘플 간격)의 min_coverage 미만
+# - gap              : 창 안에서 샘플 간격이 max_gap_steps 배 이상 벌어짐
+# - clock_skew       : CSV 시간 범위가 marker 창을 덮지 못함 (시작/끝이 skew_steps 간격 이상 어긋남)
+# - outlier:<col>    : step 안에서 robust z (0.6745 * |x - median| / MAD)가 z_max 초과
+#                      이면서 median 대비 min_rel_dev 이상 차이 (분산이 아주 작은 컬럼의 미세한 차이는 제외)
+#
+# 사용:
+#   python3 analysis/quality.py --step step04_apply_deployment
+#   python3 analysis/quality.py --all
+#   -> results/<step>/quality.csv
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from netdata_io import DEFAULT_TZ, load_run_charts
+from phases import log_window, parse_markers
+from run_table import load_step_table, netdata_run_dir, run_ids
+
+
+# peak는 idle에서도 순간 spike가 잦아 기본 검사에서 제외
+OUTLIER_COLS = [
+    "T_ready", "T_total",
+    "cpu_mean", "cpu_auc",
+    "ram_mean", "ram_auc",
+    "disk_util_mean", "disk_util_auc",
+]
+
+
+def robust_z(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    ok = np.isfinite(x)
+    z = np.full(len(x), np.nan)
+    if ok.sum() < 5:
+        return z
+    med = np.median(x[ok])
+    mad = np.median(np.abs(x[ok] - med))
+    if mad <= 0:
+        return z
+    z[ok] = 0.6745 * (x[ok] - med) / mad
+    return z
+
+
+def outlier_reasons(df: pd.DataFrame, cols: Sequence[str], z_max: float,
+                    min_rel_dev: float = 0.05) -> Dict[int, List[str]]:
+    out: Dict[int, List[str]] = {}
+    if "run" not in df.columns:
+        return out
+    runs = df["run"].to_numpy()
+    for c in cols:
+        if c not in df.columns:
+            continue
+        x = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+        z = robust_z(x)
+        med = np.nanmedian(x) if np.isfinite(x).any() else np.nan
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rel = np.abs(x - med) / abs(med) if med else np.full(len(x), np.inf)
+        for r, zi, ri in zip(runs, z, rel):
+            if np.isfinite(zi) and abs(zi) > z_max and ri >= min_rel_dev and not pd.isna(r):
+                out.setdefault(int(r), []).append(f"outlier:{c}(z={zi:+.1f})")
+    return out
+
+
+def window_reasons(log_path: Path, run_dir: Optional[Path], assume_tz: str = DEFAULT_TZ,
+                   sample_step: float = 5.0, min_coverage: float = 0.8,
+                   max_gap_steps: float = 3.0, skew_steps: float = 2.0,
+                   require_markers: bool = True) -> List[str]:
+    markers = parse_markers(log_path) if log_path.exists() else {}
+    start, end = log_window(markers)
+    if not (np.isfinite(start) and np.isfinite(end)) or end < start:
+        if require_markers:
+            return ["no_markers"]
+        if run_dir is None:
+            return []
+        # marker가 없는 step: CSV 전체 범위를 창으로 본다 (skew 검사는 의미 없음)
+        charts = load_run_charts(run_dir, assume_tz=assume_tz)
+        ts = [t for t, _ in charts.values() if len(t)]
+        if not ts:
+            return ["missing_samples"]
+        start, end = min(float(t[0]) for t in ts), max(float(t[-1]) for t in ts)
+        skew_steps = np.inf
+    elif run_dir is None:
+        return []
+    else:
+        charts = load_run_charts(run_dir, assume_tz=assume_tz, start_epoch=start)
+
+    reasons: List[str] = []
+    expected = max(1, int((end - start) // sample_step) + 1)
+    for chart, (t, _) in charts.items():
+        if len(t) == 0:
+            reasons.append(f"missing_samples:{chart}(0/{expected})")
+            continue
+        inside = t[(t >= start) & (t <= end)]
+        if len(inside) < 3:
+            reasons.append(f"short_window:{chart}({len(inside)})")
+        elif len(inside) < min_coverage * expected:
+            reasons.append(f"missing_samples:{chart}({len(inside)}/{expected})")
+        if len(inside) >= 2:
+            gap = float(np.diff(inside).max())
+            if gap >= max_gap_steps * sample_step:
+                reasons.append(f"gap:{chart}({gap:.0f}s)")
+        # export 구간은 [START, END]이므로 양 끝이 그만큼 어긋나면 시계/시간대 문제로 본다.
+        d0, d1 = float(t[0]) - start, float(t[-1]) - end
+        if d0 > skew_steps * sample_step or -d1 > skew_steps * sample_step:
+            reasons.append(f"clock_skew:{chart}({d0:+.0f}s,{d1:+.0f}s)")
+    return reasons
+
+
+def check_step(repo_root: Path, step: str, assume_tz: str = DEFAULT_TZ, z_max: float = 3.5,
+               cols: Sequence[str] = OUTLIER_COLS, min_rel_dev: float = 0.05, **window_kw) -> pd.DataFrame:
+    # 판정 자체는 격리 전 전체 run으로 한다.
+    table = load_step_table(repo_root / "results", step, quarantine=False)
+    reasons = outlier_reasons(table, cols, z_max, min_rel_dev) if table is not None else {}
+
+    runs = set(run_ids(repo_root, step, quarantine=False))
+    if table is not None and "run" in table.columns:
+        runs.update(int(r) for r in table["run"].dropna())
+
+    log_dir = repo_root / "logs" / "redacted" / step
+    has_markers = any(parse_markers(p) for p in log_dir.glob("run_*.log"))
+
+    rows = []
+    for i in sorted(runs):
+        log_path = log_dir / f"run_{i}.log"
+        run_dir = netdata_run_dir(repo_root, step, i)
+        rs = []
+        if log_path.exists() or run_dir is not None:
+            rs.extend(window_reasons(log_path, run_dir, assume_tz, require_markers=has_markers, **window_kw))
+        rs.extend(reasons.get(i, []))
+        rows.append({"step": step, "run": i, "ok": not rs, "reason": ";".join(rs)})
+    return pd.DataFrame(rows, columns=["step", "run", "ok", "reason"])
+
+
+def all_steps(repo_root: Path) -> List[str]:
+    return sorted(p.name for p in (repo_root / "results").glob("step*") if p.is_dir() and "_bak_" not in p.name)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", nargs="*", default=None)
+    ap.add_argument("--all", action="store_true")
+    ap.add_argument("--timezone", default=DEFAULT_TZ)
+    ap.add_argument("--z-max", type=float, default=3.5)
+    ap.add_argument("--min-rel-dev", type=float, default=0.05)
+    ap.add_argument("--cols", nargs="*", default=None, help=f"default: {' '.join(OUTLIER_COLS)}")
+    ap.add_argument("--sample-step", type=float, default=5.0)
+    ap.add_argument("--min-coverage", type=float, default=0.8)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    steps = all_steps(repo_root) if args.all else (args.step or [])
+    if not steps:
+        ap.error("--step or --all is required")
+
+    for step in steps:
+        df = check_step(repo_root, step, args.timezone, args.z_max, args.cols or OUTLIER_COLS,
+                        args.min_rel_dev, sample_step=args.sample_step, min_coverage=args.min_coverage)
+        if df.empty:
+            print("Skip (no runs):", step)
+            continue
+        out_path = repo_root / "results" / step / "quality.csv"
+        df.to_csv(out_path, index=False)
+        bad = df[~df["ok"]]
+        print(f"Saved: {out_path} ({len(df) - len(bad)}/{len(df)} ok)")
+        for _, r in bad.iterrows():
+            print(f"  run_{r['run']}: {r['reason']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# run 간 비교용 bootstrap / permutation 통계 (NumPy batched)
+# - 재표본은 (n_boot, n) index 행렬 하나로 한 번에 뽑고, 통계량은 axis=1로 계산한다.
+# - permutation test도 (n_perm, n) 순열 행렬 하나로 계산한다.
+# - effect size: Hedges' g, Cliff's delta
+#
+# 사용 (두 step의 stats 컬럼 비교):
+#   python3 analysis/resampling.py --a step07_rollout_restart --b step15_rollout_restart_tinyllama_http
+#   python3 analysis/resampling.py --a step07_rollout_restart --b step15_rollout_restart_tinyllama_http --cols T_ready cpu_mean
+#   -> results/_summary/compare/<a>__vs__<b>.csv
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from run_table import load_step_table
+
+
+Stat = Union[str, Callable[[np.ndarray], np.ndarray]]
+
+# (n_boot, n) -> (n_boot,)
+STATS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "mean": lambda X: X.mean(axis=1),
+    "median": lambda X: np.median(X, axis=1),
+    "std": lambda X: X.std(axis=1, ddof=1),
+}
+
+# 비교에서 제외할 컬럼 (식별자 / 절대 시각)
+SKIP_COLS = ("step", "run")
+
+
+def _stat(stat: Stat) -> Callable[[np.ndarray], np.ndarray]:
+    if callable(stat):
+        return stat
+    if stat not in STATS:
+        raise ValueError(f"unknown stat: {stat}")
+    return STATS[stat]
+
+
+def finite(x: Sequence[float]) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    return x[np.isfinite(x)]
+
+
+def bootstrap_indices(n: int, n_boot: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.integers(0, n, size=(n_boot, n))
+
+
+def bootstrap(x: Sequence[float], stat: Stat = "mean", n_boot: int = 10000,
+              rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    # (n_boot,) 재표본 통계량
+    rng = rng or np.random.default_rng()
+    x = finite(x)
+    if len(x) == 0:
+        return np.full(n_boot, np.nan)
+    return _stat(stat)(x[bootstrap_indices(len(x), n_boot, rng)])
+
+
+def percentile_ci(boot: np.ndarray, alpha: float = 0.05, axis: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    lo, hi = np.percentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=axis)
+    return lo, hi
+
+
+def bootstrap_ci(x: Sequence[float], stat: Stat = "mean", n_boot: int = 10000, alpha: float = 0.05,
+                 rng: Optional[np.random.Generator] = None) -> Tuple[float, float]:
+    lo, hi = percentile_ci(bootstrap(x, stat, n_boot, rng), alpha)
+    return float(lo), float(hi)
+
+
+def bootstrap_diff(a: Sequence[float], b: Sequence[float], stat: Stat = "mean", n_boot: int = 10000,
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    # stat(b) - stat(a), 두 그룹을 각각 독립적으로 재표본
+    rng = rng or np.random.default_rng()
+    return bootstrap(b, stat, n_boot, rng) - bootstrap(a, stat, n_boot, rng)
+
+
+def permutation_test(a: Sequence[float], b: Sequence[float], stat: Stat = "mean", n_perm: int = 10000,
+                     rng: Optional[np.random.Generator] = None) -> float:
+    # 양측 p-value, H0: 두 그룹이 같은 분포 (label 교환 가능)
+    rng = rng or np.random.default_rng()
+    a, b = finite(a), finite(b)
+    na, nb = len(a), len(b)
+    if na == 0 or nb == 0:
+        return float("nan")
+    f = _stat(stat)
+    pooled = np.concatenate([a, b])
+    obs = float(f(b[None, :])[0] - f(a[None, :])[0])
+
+    perm = pooled[rng.random((n_perm, na + nb)).argsort(axis=1)]
+    d = f(perm[:, na:]) - f(perm[:, :na])
+    # 관측값 자신을 포함 (+1) -> p가 0이 되지 않음
+    extreme = int((np.abs(d) >= abs(obs) - 1e-12).sum())
+    return (extreme + 1) / (n_perm + 1)
+
+
+def hedges_g(a: Sequence[float], b: Sequence[float]) -> float:
+    # (mean(b) - mean(a)) / pooled sd, 소표본 보정 포함
+    a, b = finite(a), finite(b)
+    na, nb = len(a), len(b)
+    if na < 2 or nb < 2:
+        return float("nan")
+    sp = np.sqrt(((na - 1) * a.var(ddof=1) + (nb - 1) * b.var(ddof=1)) / (na + nb - 2))
+    if sp == 0:
+        return float("nan")
+    j = 1.0 - 3.0 / (4.0 * (na + nb) - 9.0)
+    return float(j * (b.mean() - a.mean()) / sp)
+
+
+def cliffs_delta(a: Sequence[float], b: Sequence[float]) -> float:
+    # P(b > a) - P(b < a), 모든 쌍을 broadcasting으로 비교
+    a, b = finite(a), finite(b)
+    if len(a) == 0 or len(b) == 0:
+        return float("nan")
+    return float(np.sign(b[:, None] - a[None, :]).mean())
+
+
+def compare(a: Sequence[float], b: Sequence[float], stat: Stat = "mean", n_boot: int = 10000,
+            n_perm: int = 10000, alpha: float = 0.05,
+            rng: Optional[np.random.Generator] = None) -> Dict[str, float]:
+    rng = rng or np.random.default_rng()
+    a, b = finite(a), finite(b)
+    f = _stat(stat)
+    out = {
+        "n_a": len(a), "n_b": len(b),
+        "a": float(f(a[None, :])[0]) if len(a) else np.nan,
+        "b": float(f(b[None, :])[0]) if len(b) else np.nan,
+    }
+    out["diff"] = out["b"] - out["a"]
+    if len(a) and len(b):
+        lo, hi = percentile_ci(bootstrap_diff(a, b, stat, n_boot, rng), alpha)
+        out["diff_ci_lo"], out["diff_ci_hi"] = float(lo), float(hi)
+    else:
+        out["diff_ci_lo"] = out["diff_ci_hi"] = np.nan
+    out["p_perm"] = permutation_test(a, b, stat, n_perm, rng)
+    out["hedges_g"] = hedges_g(a, b)
+    out["cliffs_delta"] = cliffs_delta(a, b)
+    return out
+
+
+def numeric_cols(df: pd.DataFrame) -> List[str]:
+    cols = []
+    for c in df.columns:
+        if c in SKIP_COLS or c.endswith("_EPOCH") or c.endswith("_epoch") or c.endswith("_col"):
+            continue
+        if pd.api.types.is_numeric_dtype(df[c]):
+            cols.append(c)
+    return cols
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--a", required=True, help="reference step")
+    ap.add_argument("--b", required=True, help="compared step (diff = b - a)")
+    ap.add_argument("--cols", nargs="*", default=None, help="default: numeric columns in both steps")
+    ap.add_argument("--stat", default="mean", choices=sorted(STATS))
+    ap.add_argument("--n-boot", type=int, default=10000)
+    ap.add_argument("--n-perm", type=int, default=10000)
+    ap.add_argument("--alpha", type=float, default=0.05)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    results_root = repo_root / "results"
+    da = load_step_table(results_root, args.a)
+    db = load_step_table(results_root, args.b)
+    if da is None or db is None:
+        raise SystemExit(f"no stats table: {args.a if da is None else args.b}")
+
+    cols = args.cols or [c for c in numeric_cols(da) if c in set(numeric_cols(db))]
+    missing = [c for c in cols if c not in da.columns or c not in db.columns]
+    if missing:
+        print("Skip (missing column):", ", ".join(missing))
+    cols = [c for c in cols if c not in missing]
+
+    rng = np.random.default_rng(args.seed)
+    t0 = time.perf_counter()
+    rows = []
+    for c in cols:
+        a = pd.to_numeric(da[c], errors="coerce")
+        b = pd.to_numeric(db[c], errors="coerce")
+        row = {"column": c, "stat": args.stat}
+        row.update(compare(a, b, args.stat, args.n_boot, args.n_perm, args.alpha, rng))
+        rows.append(row)
+    elapsed = time.perf_counter() - t0
+
+    out_dir = results_root / "_summary" / "compare"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{args.a}__vs__{args.b}.csv"
+    df = pd.DataFrame(rows)
+    df.to_csv(out_path, index=False)
+    print("Saved:", out_path)
+
+    if not df.empty:
+        print(f"\n=== {args.b} - {args.a} ({args.stat}, {args.n_boot} boot / {args.n_perm} perm, {elapsed * 1e3:.0f} ms) ===")
+        print(df.drop(columns=["stat"]).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# step별 run 통계 테이블 공통 로더
+# - results/<step>/summary.csv 또는 summary_<stepNN>.csv, 없으면 run_*/stats.csv를 모은다.
+# - step마다 다른 컬럼 이름을 공통 이름으로 맞춘다.
+#     disk_io_read_* / io_read_*  -> disk_read_*   (write도 동일)
+#     disk_mean/peak/auc          -> disk_util_*
+#     t_total_sec / run_id        -> T_total / run
+# - stats 테이블이 없는 step(예: step13)은 raw netdata CSV에서 run별 평균을 계산한다.
+# - results/<step>/quality.csv (analysis/quality.py)에서 ok=False 인 run은 기본으로 제외한다.
+# - plot_step*.py는 write_summary로 summary를 쓴다: quarantine된 run은 빼고 reason 컬럼을 붙이며,
+#   빠진 run은 <summary>_quarantined.csv에 남긴다 (quarantine=False로 읽으면 다시 합쳐진다).
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from netdata_io import DEFAULT_TZ, load_run_charts
+
+
+METRICS = ["cpu", "ram", "disk_util", "disk_read", "disk_write"]
+
+_RENAMES = [
+    (re.compile(r"(^|_)(?:disk_io|io)_(read|write)_"), r"\1disk_\2_"),
+    (re.compile(r"(^|_)disk_(mean|peak|auc)$"), r"\1disk_util_\2"),
+]
+_PLAIN = {
+    "run_id": "run",
+    "t_total_sec": "T_total",
+    "t_ready_sec": "T_ready",
+}
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    cols = []
+    for c in df.columns:
+        c = _PLAIN.get(str(c), str(c))
+        for pat, rep in _RENAMES:
+            c = pat.sub(rep, c)
+        cols.append(c)
+    df = df.copy()
+    df.columns = cols
+    if "run" in df.columns:
+        # "run_3", "3.0", 3 -> 3
+        run = pd.to_numeric(df["run"].astype(str).str.replace("run_", "", regex=False), errors="coerce")
+        df["run"] = run.round().astype("Int64")
+    return df
+
+
+def step_number(step: str) -> str:
+    m = re.match(r"step(\d+)", step)
+    return m.group(1) if m else ""
+
+
+def run_dirs(base: Path) -> List[Path]:
+    dirs = [p for p in base.glob("run_*") if p.is_dir() and p.name.split("_")[1].isdigit()]
+    return sorted(dirs, key=lambda p: int(p.name.split("_")[1]))
+
+
+def quarantined_runs(results_root: Path, step: str) -> Set[int]:
+    p = results_root / step / "quality.csv"
+    if not p.exists() or p.stat().st_size == 0:
+        return set()
+    q = pd.read_csv(p)
+    bad = q[~q["ok"].astype(str).str.lower().isin(["true", "1"])]
+    return set(int(r) for r in bad["run"])
+
+
+def quarantine_reasons(results_root: Path, step: str) -> Dict[int, str]:
+    p = results_root / step / "quality.csv"
+    if not p.exists() or p.stat().st_size == 0:
+        return {}
+    q = pd.read_csv(p, keep_default_na=False)
+    return {int(r): str(s) for r, s in zip(q["run"], q.get("reason", [""] * len(q)))}
+
+
+def run_numbers(df: pd.DataFrame) -> pd.Series:
+    # run / run_id 컬럼 ("run_3", "3.0", 3) -> 3, 없으면 NA
+    col = "run" if "run" in df.columns else "run_id" if "run_id" in df.columns else None
+    if col is None:
+        return pd.Series(pd.NA, index=df.index, dtype="Int64")
+    run = pd.to_numeric(df[col].astype(str).str.replace("run_", "", regex=False), errors="coerce")
+    return run.round().astype("Int64")
+
+
+def split_quarantined(df: pd.DataFrame, results_root: Path, step: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    # (남은 run, 빠진 run)
+    bad = quarantined_runs(results_root, step)
+    drop = run_numbers(df).isin(bad).fillna(False).to_numpy(dtype=bool)
+    return df[~drop].reset_index(drop=True), df[drop].reset_index(drop=True)
+
+
+def drop_quarantined(df: pd.DataFrame, results_root: Path, step: str) -> pd.DataFrame:
+    return split_quarantined(df, results_root, step)[0]
+
+
+def quarantined_path(summary_path: Path) -> Path:
+    return summary_path.with_name(f"{summary_path.stem}_quarantined.csv")
+
+
+def write_summary(df: pd.DataFrame, path: Path, step: str, results_root: Optional[Path] = None) -> pd.DataFrame:
+    # path = results/<step>/summary*.csv. 반환값(남은 run)으로 fig2를 그린다.
+    results_root = results_root if results_root is not None else path.parent.parent
+    reasons = quarantine_reasons(results_root, step)
+    df = df.copy()
+    df["reason"] = [reasons.get(int(r), "") if pd.notna(r) else "" for r in run_numbers(df)]
+    kept, dropped = split_quarantined(df, results_root, step)
+    kept.to_csv(path, index=False)
+    qp = quarantined_path(path)
+    if len(dropped):
+        dropped.to_csv(qp, index=False)
+        for r, s in zip(run_numbers(dropped), dropped["reason"]):
+            print(f"[quarantine] {step} run_{r}: {s}")
+    elif qp.exists():
+        qp.unlink()
+    return kept
+
+
+def load_step_table(results_root: Path, step: str, quarantine: bool = True) -> Optional[pd.DataFrame]:
+    df = _load_step_table(results_root, step)
+    if df is not None and quarantine:
+        df = drop_quarantined(df, results_root, step)
+    return df
+
+
+def _load_step_table(results_root: Path, step: str) -> Optional[pd.DataFrame]:
+    base = results_root / step
+    # summary가 여러 버전이면 컬럼이 가장 많은 것(예: step02의 summary_step02.csv)을 쓴다.
+    tables = []
+    for p in (base / "summary.csv", base / f"summary_step{step_number(step)}.csv"):
+        if p.exists() and p.stat().st_size > 0:
+            # write_summary가 뺀 run도 다시 붙인다 (quarantine은 load_step_table에서)
+            qp = quarantined_path(p)
+            parts = [pd.read_csv(p)] + ([pd.read_csv(qp)] if qp.exists() and qp.stat().st_size > 0 else [])
+            df = pd.concat(parts, ignore_index=True).drop(columns=["reason"], errors="ignore")
+            order = np.argsort(run_numbers(df).to_numpy(dtype=float, na_value=np.inf), kind="stable")
+            tables.append(df.iloc[order].reset_index(drop=True))
+    if tables:
+        return normalize_columns(max(tables, key=lambda df: df.shape[1]))
+
+    per_run = []
+    for rd in run_dirs(base):
+        p = rd / "stats.csv"
+        if p.exists() and p.stat().st_size > 0:
+            df = pd.read_csv(p)
+            if "run" not in df.columns and "run_id" not in df.columns:
+                df.insert(0, "run", rd.name)
+            per_run.append(df)
+    if not per_run:
+        return None
+    return normalize_columns(pd.concat(per_run, ignore_index=True))
+
+
+def netdata_bases(repo_root: Path, step: str) -> List[Path]:
+    # data/netdata/<step> 가 없으면 results/<step>/run_N 에 복사된 CSV를 쓴다.
+    return [repo_root / "data" / "netdata" / step, repo_root / "results" / step]
+
+
+def netdata_run_dir(repo_root: Path, step: str, run: int) -> Optional[Path]:
+    for base in netdata_bases(repo_root, step):
+        rd = base / f"run_{run}"
+        if rd.is_dir() and any(rd.glob("system_*.csv")):
+            return rd
+    return None
+
+
+def run_ids(repo_root: Path, step: str, quarantine: bool = True) -> List[int]:
+    ids = set()
+    for base in netdata_bases(repo_root, step):
+        ids.update(int(rd.name.split("_")[1]) for rd in run_dirs(base))
+    if quarantine:
+        ids -= quarantined_runs(repo_root / "results", step)
+    return sorted(ids)
+
+
+def raw_run_means(repo_root: Path, step: str, assume_tz: str = DEFAULT_TZ) -> Optional[pd.DataFrame]:
+    bad = quarantined_runs(repo_root / "results", step)
+    rows = []
+    for base in netdata_bases(repo_root, step):
+        for rd in run_dirs(base):
+            if int(rd.name.split("_")[1]) in bad:
+                continue
+            charts = load_run_charts(rd, assume_tz=assume_tz)
+            if not charts:
+                continue
+            row: Dict[str, float] = {"run": int(rd.name.split("_")[1])}
+            for _, (_, series) in charts.items():
+                for k, y in series.items():
+                    if int(np.isfinite(y).sum()) > 0:
+                        row[f"{k}_mean"] = float(np.nanmean(y))
+            rows.append(row)
+        if rows:
+            break
+    if not rows:
+        return None
+    return pd.DataFrame(rows)
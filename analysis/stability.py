@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# 회복/안정화 시점 검출 (step 공통)
+# - plateau: tail 구간 median을 plateau로 보고, 시작값과의 차이(span)의 tol_ratio 이내로
+#   처음 내려오는 시점
+# - stable: 여러 series가 동시에 각자의 threshold 이하로 consec 샘플 연속 유지되는 첫 시점
+# - settle: 여러 series가 모두 tail median ± tol_ratio * (최대 이탈폭) 안에 들어와 끝까지 머무는 첫 시점
+#   (위/아래 양쪽. 부하가 올라갔다 내려오는 04/06/07, RAM이 올라가 머무는 12/15의 event 통계용)
+# 사용: plot_step16 (plateau/stable), plot_step04/06/07/12/15 (settle_stats)
+# Python loop 대신 (n_series, n_samples) 2-D 배열에서 한 번에 계산한다.
+from __future__ import annotations
+
+import warnings
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def plateau_thresholds(ys: Sequence[np.ndarray], tail_points: int = 12, tol_ratio: float = 0.05) -> np.ndarray:
+    # series별 threshold = tail median + tol_ratio * |y[0] - tail median|
+    # 계산 불가(비어 있음/NaN)면 NaN
+    thr = np.full(len(ys), np.nan, dtype=float)
+    for j, y in enumerate(ys):
+        y = np.asarray(y, dtype=float)
+        if len(y) == 0:
+            continue
+        tail = y[-tail_points:]
+        if not np.isfinite(tail).any():
+            continue
+        p = float(np.nanmedian(tail))
+        y0 = float(y[0])
+        if np.isfinite(p) and np.isfinite(y0):
+            thr[j] = p + tol_ratio * abs(y0 - p)
+    return thr
+
+
+def stack_series(ys: Sequence[np.ndarray], n: int, fill: np.ndarray) -> np.ndarray:
+    # 길이가 n이 되도록 자르거나 fill[j]로 채워 (len(ys), n) 배열로 만든다.
+    out = np.empty((len(ys), n), dtype=float)
+    for j, y in enumerate(ys):
+        y = np.asarray(y, dtype=float)[:n]
+        out[j, :len(y)] = y
+        out[j, len(y):] = fill[j]
+    return out
+
+
+def first_window_index(ok: np.ndarray, consec: int) -> int:
+    # ok(1-D bool)에서 consec개 연속 True가 시작되는 첫 index, 없으면 -1
+    # 누적합 차이로 모든 window의 True 개수를 O(n)에 구한다.
+    n = ok.shape[0]
+    if consec <= 0:
+        return 0
+    if n < consec:
+        return -1
+    c = np.concatenate(([0], np.cumsum(ok, dtype=np.int64)))
+    full = (c[consec:] - c[:-consec]) == consec
+    if not full.any():
+        return -1
+    return int(np.argmax(full))
+
+
+def first_stable_index(Y: np.ndarray, thr: np.ndarray, consec: int) -> int:
+    # Y: (n_series, n_samples), thr: (n_series,)
+    # 모든 series가 finite 이고 thr 이하인 샘플이 consec개 연속되는 첫 index
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    thr = np.asarray(thr, dtype=float).reshape(-1, 1)
+    with np.errstate(invalid="ignore"):
+        ok = (np.isfinite(Y) & ~(Y > thr)).all(axis=0)
+    return first_window_index(ok, consec)
+
+
+def plateau_time_seconds(t_rel: np.ndarray, y: np.ndarray, tail_points: int = 12, tol_ratio: float = 0.05) -> float:
+    y = np.asarray(y, dtype=float)
+    if len(y) < max(3, tail_points):
+        return float("nan")
+    thr = plateau_thresholds([y], tail_points=tail_points, tol_ratio=tol_ratio)[0]
+    if not np.isfinite(thr):
+        return float("nan")
+    with np.errstate(invalid="ignore"):
+        hit = np.isfinite(y) & (y <= thr)
+    if not hit.any():
+        return float("nan")
+    return float(np.asarray(t_rel)[int(np.argmax(hit))])
+
+
+def stable_time_seconds(t_rel: np.ndarray, ys: List[np.ndarray], tail_points: int = 12, tol_ratio: float = 0.05, consec: int = 3) -> float:
+    n = len(t_rel)
+    need = max(consec + 1, tail_points)
+    if n < need:
+        return float("nan")
+    if any(len(y) < need for y in ys):
+        return float("nan")
+
+    thr = plateau_thresholds(ys, tail_points=tail_points, tol_ratio=tol_ratio)
+    if not np.isfinite(thr).all():
+        return float("nan")
+
+    # series가 t_rel보다 짧으면 남는 칸을 threshold 값으로 채워 조건에 영향이 없게 한다.
+    Y = stack_series(ys, n, fill=thr)
+    i = first_stable_index(Y, thr, consec)
+    if i < 0:
+        return float("nan")
+    return float(np.asarray(t_rel)[i])
+
+
+def settle_time_seconds(t_rel: np.ndarray, ys: List[np.ndarray], tail_points: int = 12, tol_ratio: float = 0.05, consec: int = 3) -> float:
+    # ys는 모두 t_rel과 같은 길이. 짧은 window면 tail을 n//3까지 줄인다 (5초 평균 기준 step04 run은 1분 미만).
+    n = len(t_rel)
+    tail = max(3, min(tail_points, n // 3))
+    if not ys or n < tail + consec:
+        return float("nan")
+    Y = np.vstack([np.asarray(y, dtype=float)[:n] for y in ys])
+    if Y.shape[1] < n:
+        return float("nan")
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        p = np.nanmedian(Y[:, -tail:], axis=1, keepdims=True)
+        band = tol_ratio * np.nanmax(np.abs(Y - p), axis=1, keepdims=True)
+        ok = (np.isfinite(Y) & (np.abs(Y - p) <= band)).all(axis=0)
+    if not np.isfinite(p).all():
+        return float("nan")
+    # 마지막으로 band를 벗어난 다음 샘플부터 끝까지 band 안 (consec개 이상 남아야 인정)
+    out = np.flatnonzero(~ok)
+    i = int(out[-1]) + 1 if len(out) else 0
+    if n - i < consec:
+        return float("nan")
+    return float(np.asarray(t_rel)[i])
+
+
+def settle_stats(series: Dict[str, Tuple[np.ndarray, np.ndarray]], after: float, before: float = np.inf,
+                 prefix: str = "", tail_points: int = 12, tol_ratio: float = 0.05, consec: int = 3) -> Dict[str, float]:
+    # series: name -> (epoch 초 배열, 값 배열). [after, before) 구간만 보고 after 기준 초로 돌려준다.
+    # -> {prefix}{name}_settle_sec (series별), {prefix}settle_sec (모든 series가 함께 settle, 첫 series 시각에 보간)
+    out: Dict[str, float] = {}
+    win: List[Tuple[np.ndarray, np.ndarray]] = []
+    for name, (t, y) in series.items():
+        t = np.asarray(t, dtype=float)
+        y = np.asarray(y, dtype=float)
+        m = np.isfinite(t) & np.isfinite(y) & (t >= after) & (t < before)
+        win.append((t[m] - after, y[m]))
+        out[f"{prefix}{name}_settle_sec"] = settle_time_seconds(win[-1][0], [win[-1][1]], tail_points, tol_ratio, consec)
+    t0 = win[0][0] if win else np.empty(0)
+    ys = [np.interp(t0, t, y, left=np.nan, right=np.nan) if len(t) else np.full(len(t0), np.nan) for t, y in win]
+    out[f"{prefix}settle_sec"] = settle_time_seconds(t0, ys, tail_points, tol_ratio, consec)
+    return out
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# 샘플이 들어올 때마다 갱신하는 O(1) 메모리 통계 accumulator
+# - AUC       : 직전 샘플과의 사다리꼴 (np.trapezoid와 동일)
+# - mean/var  : Welford
+# - min/max
+# - quantile  : P² (Jain & Chlamtac, 1985), marker 5개
+# 전체 series를 저장하지 않으므로 긴 soak run이나 node 위 요약에 쓸 수 있다.
+#
+# merge(a, b): b가 a 뒤에 이어지는 구간(phase)이라고 보고 합친다.
+#   mean/var/min/max/n 은 정확히 합쳐지고, AUC는 a의 마지막 ~ b의 첫 샘플 사이 사다리꼴을 더해
+#   두 구간을 이어서 accumulate 한 것과 같아진다. quantile은 개수 가중 평균(근사)이다.
+from __future__ import annotations
+
+import copy
+import math
+from typing import Dict, List, Optional, Sequence
+
+
+class P2Quantile:
+    def __init__(self, p: float):
+        self.p = p
+        self.n = 0
+        self.q: List[float] = []            # marker 높이
+        self.pos = [1, 2, 3, 4, 5]          # marker 위치 (1-based)
+        self.want = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.dwant = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float) -> None:
+        self.n += 1
+        if self.n <= 5:
+            self.q.append(x)
+            if self.n == 5:
+                self.q.sort()
+            return
+
+        q, pos = self.q, self.pos
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while k < 3 and x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            self.want[i] += self.dwant[i]
+
+        # 가운데 marker 3개를 원하는 위치 쪽으로 조정 (parabolic, 실패 시 linear)
+        for i in (1, 2, 3):
+            d = self.want[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = q[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + s) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - s) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if not (q[i - 1] < qp < q[i + 1]):
+                    qp = q[i] + s * (q[i + s] - q[i]) / (pos[i + s] - pos[i])
+                q[i] = qp
+                pos[i] += s
+
+    def value(self) -> float:
+        if self.n == 0:
+            return float("nan")
+        if self.n <= 5:
+            # 샘플이 적으면 정확한 값 (선형 보간)
+            xs = sorted(self.q)
+            h = (len(xs) - 1) * self.p
+            lo = int(math.floor(h))
+            hi = min(lo + 1, len(xs) - 1)
+            return xs[lo] + (h - lo) * (xs[hi] - xs[lo])
+        return self.q[2]
+
+
+class SeriesAccumulator:
+    def __init__(self, quantiles: Sequence[float] = (0.5, 0.95)):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.auc = 0.0
+        self.first_t: Optional[float] = None
+        self.first_y: Optional[float] = None
+        self.last_t: Optional[float] = None
+        self.last_y: Optional[float] = None
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def update(self, t: float, y: float) -> None:
+        # NaN 값은 건너뛰고, 시간은 증가하는 순서로 들어온다고 가정
+        if y is None or not math.isfinite(y):
+            return
+        if self.last_t is not None:
+            self.auc += 0.5 * (self.last_y + y) * (t - self.last_t)
+        else:
+            self.first_t, self.first_y = t, y
+        self.last_t, self.last_y = t, y
+
+        self.n += 1
+        d = y - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (y - self.mean)
+        self.min = min(self.min, y)
+        self.max = max(self.max, y)
+        for q in self.quantiles.values():
+            q.update(y)
+
+    @property
+    def var(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    def merge(self, other: "SeriesAccumulator") -> "SeriesAccumulator":
+        out = SeriesAccumulator(tuple(self.quantiles))
+        if self.n == 0 or other.n == 0:
+            return copy.deepcopy(other if self.n == 0 else self)
+
+        a, b = (self, other) if self.first_t <= other.first_t else (other, self)
+        n = a.n + b.n
+        d = b.mean - a.mean
+        out.n = n
+        out.mean = a.mean + d * b.n / n
+        out.m2 = a.m2 + b.m2 + d * d * a.n * b.n / n
+        out.min = min(a.min, b.min)
+        out.max = max(a.max, b.max)
+        out.auc = a.auc + b.auc + 0.5 * (a.last_y + b.first_y) * (b.first_t - a.last_t)
+        out.first_t, out.first_y = a.first_t, a.first_y
+        out.last_t, out.last_y = b.last_t, b.last_y
+
+        # P²는 정확한 merge가 없으므로 개수 가중 평균으로 근사
+        for p, q in out.quantiles.items():
+            qa, qb = a.quantiles.get(p), b.quantiles.get(p)
+            if qa is None or qb is None:
+                continue
+            q.n = n
+            if n <= 5:
+                # 원본 샘플이 아직 남아 있으면 정확히 합친다.
+                q.q = sorted(qa.q + qb.q) if n == 5 else qa.q + qb.q
+                continue
+            q.q = [(x * a.n + y * b.n) / n for x, y in zip(_markers(qa), _markers(qb))]
+            q.want = [1 + (n - 1) * dw for dw in q.dwant]
+            pos = [int(round(w)) for w in q.want]
+            for i in range(1, 5):
+                pos[i] = min(max(pos[i], pos[i - 1] + 1), n - (4 - i))
+            q.pos = pos
+        return out
+
+    def row(self, name: str) -> Dict[str, float]:
+        # stats.csv와 같은 컬럼 이름 (<name>_mean/_peak/_auc) + 추가 통계
+        out = {
+            f"{name}_mean": self.mean if self.n else float("nan"),
+            f"{name}_peak": self.max if self.n else float("nan"),
+            f"{name}_auc": self.auc if self.n >= 2 else float("nan"),
+            f"{name}_min": self.min if self.n else float("nan"),
+            f"{name}_std": math.sqrt(self.var) if self.n > 1 else float("nan"),
+            f"{name}_n": self.n,
+        }
+        for p, q in self.quantiles.items():
+            out[f"{name}_p{int(round(p * 100))}"] = q.value()
+        return out
+
+
+def _markers(q: P2Quantile) -> List[float]:
+    # 샘플이 5개 미만이면 정확한 분위수로 marker를 채운다.
+    if q.n >= 5:
+        return list(q.q)
+    v = q.value()
+    xs = sorted(q.q)
+    return [xs[0], v, v, v, xs[-1]]
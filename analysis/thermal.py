@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# run별 온도 / CPU clock / throttle 통계 (ARM board에서 CPU %를 clock과 같이 보기 위함)
+#
+# 입력: data/netdata/<step>/run_<i>/ 의 thermal_temp.csv, cpu_freq.csv, cpu_throttled.csv
+#       (scripts/utils/thermal_sampler.py) + system_cpu.csv, [START, END] 구간만 사용
+# run별 컬럼
+#   temp_max / temp_mean           : 가장 뜨거운 thermal zone의 최대 / 평균 (°C)
+#   freq_mean_mhz / freq_min_mhz   : core 평균 clock (MHz), freq_ratio_mean = 평균 clock / cpuinfo_max_freq
+#   throttled_sec / throttled_pct  : throttled / freq_capped / soft_temp_limit 중 하나라도 켜진 시간 (sample-and-hold)
+#   under_voltage_sec              : under-voltage 상태였던 시간
+#   cpu_mean / cpu_norm_mean       : CPU % / 최대 clock 기준으로 환산한 CPU % (cpu * clock / max clock)
+#                                    clock이 다른 run끼리는 cpu_norm_mean을 비교한다.
+#
+# 사용:
+#   python3 analysis/thermal.py --step step17_infer_load_1rps_tinyllama_http
+#   python3 analysis/thermal.py --step step04_apply_deployment step06_scale_up_down step07_rollout_restart
+#   -> results/<step>/thermal.csv
+#      results/_summary/thermal/thermal_summary.csv   (step별 median)
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from netdata_io import DEFAULT_TZ, cpu_freq_series, load_run_charts, read_netdata_csv
+from phases import log_window, parse_markers
+from run_table import netdata_bases, run_ids
+
+
+THERMAL_COLS = [
+    "temp_max", "temp_mean", "freq_mean_mhz", "freq_min_mhz", "freq_ratio_mean",
+    "throttled_sec", "throttled_pct", "under_voltage_sec", "cpu_mean", "cpu_norm_mean",
+]
+
+
+def thermal_run_dir(repo_root: Path, step: str, run: int) -> Optional[Path]:
+    for base in netdata_bases(repo_root, step):
+        rd = base / f"run_{run}"
+        if rd.is_dir() and any((rd / f).exists() for f in ("thermal_temp.csv", "cpu_freq.csv", "cpu_throttled.csv")):
+            return rd
+    return None
+
+
+def held_seconds(t: np.ndarray, flag: np.ndarray, start: float, end: float) -> float:
+    # 샘플 값이 다음 샘플까지 유지된다고 보고 [start, end] 안에서 flag=1인 시간을 더한다.
+    if len(t) == 0:
+        return float("nan")
+    edges = np.clip(np.append(t, end), start, end)
+    dt = np.diff(edges)
+    return float(np.sum(dt * (np.nan_to_num(flag) > 0)))
+
+
+def window_values(t: np.ndarray, y: np.ndarray, start: float, end: float) -> np.ndarray:
+    m = (t >= start) & (t <= end) & np.isfinite(y)
+    return y[m]
+
+
+def run_thermal_stats(run_dir: Path, start: float, end: float, assume_tz: str = DEFAULT_TZ) -> Dict[str, float]:
+    charts = load_run_charts(run_dir, assume_tz=assume_tz, start_epoch=start)
+    row: Dict[str, float] = {c: float("nan") for c in THERMAL_COLS}
+
+    if "thermal" in charts:
+        t, ys = charts["thermal"]
+        y = window_values(t, ys["temp"], start, end)
+        if len(y):
+            row["temp_max"], row["temp_mean"] = float(y.max()), float(y.mean())
+
+    if "cpu_freq" in charts:
+        t, ys = charts["cpu_freq"]
+        y = window_values(t, ys["cpu_freq"], start, end)
+        if len(y):
+            row["freq_mean_mhz"], row["freq_min_mhz"] = float(y.mean()), float(y.min())
+            _, f_max = cpu_freq_series(read_netdata_csv(run_dir / "cpu_freq.csv", assume_tz, start))
+            if np.isfinite(f_max) and f_max > 0:
+                row["freq_ratio_mean"] = row["freq_mean_mhz"] / f_max
+
+    p = run_dir / "cpu_throttled.csv"
+    if p.exists() and p.stat().st_size > 0:
+        df = read_netdata_csv(p, assume_tz, start)
+        df = df[df["time"] <= end]
+        t = df["time"].to_numpy(dtype=float)
+        cols = [c for c in ("throttled", "freq_capped", "soft_temp_limit") if c in df.columns]
+        row["throttled_sec"] = held_seconds(t, (df[cols].fillna(0).to_numpy() > 0).any(axis=1), start, end)
+        row["throttled_pct"] = 100.0 * row["throttled_sec"] / (end - start) if end > start else float("nan")
+        if "under_voltage" in df.columns:
+            row["under_voltage_sec"] = held_seconds(t, df["under_voltage"].to_numpy(dtype=float), start, end)
+
+    if "system_cpu" in charts:
+        t, ys = charts["system_cpu"]
+        for k, col in (("cpu", "cpu_mean"), ("cpu_norm", "cpu_norm_mean")):
+            if k in ys:
+                y = window_values(t, ys[k], start, end)
+                if len(y):
+                    row[col] = float(y.mean())
+    return row
+
+
+def summarize(per_run: pd.DataFrame) -> pd.DataFrame:
+    cols = [c for c in THERMAL_COLS if c in per_run.columns]
+    g = per_run.groupby("step", sort=False)
+    out = g[cols].median()
+    out.insert(0, "n_runs", g.size())
+    return out.reset_index()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--step", nargs="+", required=True)
+    ap.add_argument("--timezone", default=DEFAULT_TZ)
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    all_rows: List[pd.DataFrame] = []
+    for step in args.step:
+        rows = []
+        for i in run_ids(repo_root, step):
+            run_dir = thermal_run_dir(repo_root, step, i)
+            log_path = repo_root / "logs" / "redacted" / step / f"run_{i}.log"
+            if run_dir is None or not log_path.exists():
+                print(f"Skip {step} run_{i}: no thermal csv or log")
+                continue
+            start, end = log_window(parse_markers(log_path))
+            if not (np.isfinite(start) and np.isfinite(end) and end > start):
+                print(f"Skip {step} run_{i}: no START/END in log")
+                continue
+            rows.append({"step": step, "run": i, **run_thermal_stats(run_dir, start, end, args.timezone)})
+        if not rows:
+            print("Skip (no runs):", step)
+            continue
+        df = pd.DataFrame(rows)
+        out_path = repo_root / "results" / step / "thermal.csv"
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out_path, index=False)
+        print("Saved:", out_path)
+        all_rows.append(df)
+
+    if not all_rows:
+        raise SystemExit("no runs")
+    summary = summarize(pd.concat(all_rows, ignore_index=True))
+    out_dir = repo_root / "results" / "_summary" / "thermal"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / "thermal_summary.csv"
+    summary.to_csv(out_path, index=False)
+    print("Saved:", out_path)
+    print(summary.round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,1017 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from typing import Optional
+import anyio
+import bisect
+import codecs
+import gc
 import os
 import glob
+import queue
+import signal
+import threading
 import time
 
 app = FastAPI()
 
-LLM = None
 MODEL_USED = None
 
+MODELS_DIR = os.getenv("MODELS_DIR", "/models")
+MODEL_RSS_BUDGET_MB = float(os.getenv("MODEL_RSS_BUDGET_MB", "0"))
+
+# 같은 노드의 여러 replica가 hostPath GGUF의 page cache를 공유하려면
+# mmap on / mlock off 여야 한다. (mlock은 페이지를 프로세스에 고정)
+USE_MMAP = os.getenv("USE_MMAP", "1") != "0"
+USE_MLOCK = os.getenv("USE_MLOCK", "0") == "1"
+
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "1"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "20"))
+
+# terminationGracePeriodSeconds(기본 30s)보다 짧아야 SIGKILL 전에 drain이 끝난다.
+DRAIN_TIMEOUT_SEC = float(os.getenv("DRAIN_TIMEOUT_SEC", "25"))
+
+# sampling 기본값은 llama_cpp Llama.create_completion과 같게 두고, 두 경로(단일/batch)에 같은 값을 넘긴다.
+REPEAT_LAST_N = 64
+
+
 class InferReq(BaseModel):
     prompt: str
     n_predict: int = 32
     temperature: float = 0.1
+    top_k: int = 40
+    top_p: float = 0.95
+    min_p: float = 0.05
+    repeat_penalty: float = 1.0
+    stream: bool = False
+    model: Optional[str] = None
+
+
+class ChatReq(BaseModel):
+    # steps 12~17 client(OpenAI 호환 /v1/chat/completions)가 보내는 필드만 받는다.
+    messages: list
+    model: Optional[str] = None
+    max_tokens: int = 32
+    temperature: float = 0.1
+
+
+class Histogram:
+    # bucket 배열은 생성 시 한 번만 할당하고 observe는 정수 증가만 한다.
+    def __init__(self, name: str, help_text: str, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, v: float):
+        self.counts[bisect.bisect_left(self.buckets, v)] += 1
+        self.count += 1
+        self.sum += v
+
+    def render(self, out: list):
+        out.append(f"# HELP {self.name} {self.help_text}")
+        out.append(f"# TYPE {self.name} histogram")
+        acc = 0
+        for le, c in zip(self.buckets, self.counts):
+            acc += c
+            out.append(f'{self.name}_bucket{{le="{le}"}} {acc}')
+        out.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        out.append(f"{self.name}_sum {self.sum}")
+        out.append(f"{self.name}_count {self.count}")
+
+
+TIME_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0)
+LOAD_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests_ok = 0
+        self.requests_error = 0
+        self.inflight = 0
+        self.prompt_tokens = 0
+        self.eval_tokens = 0
+        self.model_load_seconds = float("nan")
+        self.model_over_budget = 0
+        self.prompt_eval = Histogram("tinyllama_prompt_eval_seconds", "prompt evaluation (prefill) time per request", TIME_BUCKETS)
+        self.decode = Histogram("tinyllama_decode_seconds", "token generation time per request", TIME_BUCKETS)
+        self.request = Histogram("tinyllama_request_seconds", "end-to-end request time incl. queueing", TIME_BUCKETS)
+        self.model_load = Histogram("tinyllama_model_load_duration_seconds", "model load latency", LOAD_BUCKETS)
+        self.model_evict = Histogram("tinyllama_model_evict_duration_seconds", "model eviction latency", LOAD_BUCKETS)
+
+    def begin(self):
+        with self.lock:
+            self.inflight += 1
+
+    def end(self, ok: bool, n_prompt: int, n_eval: int, t_prompt: float, t_decode: float, t_total: float):
+        with self.lock:
+            self.inflight -= 1
+            if not ok:
+                self.requests_error += 1
+                return
+            self.requests_ok += 1
+            self.prompt_tokens += n_prompt
+            self.eval_tokens += n_eval
+            self.prompt_eval.observe(t_prompt)
+            self.decode.observe(t_decode)
+            self.request.observe(t_total)
+
+    def model_event(self, kind: str, seconds: float):
+        with self.lock:
+            if kind == "load":
+                self.model_load_seconds = seconds
+                self.model_load.observe(seconds)
+            elif kind == "over_budget":
+                self.model_over_budget += 1
+            else:
+                self.model_evict.observe(seconds)
+
+    def render(self, queue_depth: int, rss_bytes: int, models_loaded: int, context_bytes: int, smaps: dict) -> str:
+        out = []
+        with self.lock:
+            out.append("# TYPE tinyllama_requests_total counter")
+            out.append(f'tinyllama_requests_total{{status="ok"}} {self.requests_ok}')
+            out.append(f'tinyllama_requests_total{{status="error"}} {self.requests_error}')
+            out.append("# TYPE tinyllama_inflight_requests gauge")
+            out.append(f"tinyllama_inflight_requests {self.inflight}")
+            out.append("# TYPE tinyllama_queue_depth gauge")
+            out.append(f"tinyllama_queue_depth {queue_depth}")
+            out.append("# TYPE tinyllama_prompt_tokens_total counter")
+            out.append(f"tinyllama_prompt_tokens_total {self.prompt_tokens}")
+            out.append("# TYPE tinyllama_eval_tokens_total counter")
+            out.append(f"tinyllama_eval_tokens_total {self.eval_tokens}")
+            self.prompt_eval.render(out)
+            self.decode.render(out)
+            self.request.render(out)
+            out.append("# TYPE tinyllama_model_load_seconds gauge")
+            out.append(f"tinyllama_model_load_seconds {self.model_load_seconds}")
+            self.model_load.render(out)
+            self.model_evict.render(out)
+            out.append("# TYPE tinyllama_model_over_budget_total counter")
+            out.append(f"tinyllama_model_over_budget_total {self.model_over_budget}")
+        out.append("# TYPE tinyllama_models_loaded gauge")
+        out.append(f"tinyllama_models_loaded {models_loaded}")
+        out.append("# TYPE tinyllama_batch_context_bytes gauge")
+        out.append(f"tinyllama_batch_context_bytes {context_bytes}")
+        out.append("# TYPE process_resident_memory_bytes gauge")
+        out.append(f"process_resident_memory_bytes {rss_bytes}")
+        if smaps:
+            out.append("# TYPE process_smaps_bytes gauge")
+            for k in ("Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"):
+                out.append(f'process_smaps_bytes{{field="{k}"}} {smaps.get(k, 0)}')
+        return "\n".join(out) + "\n"
+
+
+METRICS = Metrics()
+
+
+class DrainState:
+    # SIGTERM 이후 새 요청은 503으로 거절하고, in-flight 요청이 끝나거나
+    # deadline에 도달할 때까지 기다린 뒤 프로세스를 내린다.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.draining = False
+        self.drain_start_epoch = None
+        self.drain_end_epoch = None
+        self.inflight = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.completed_during_drain = 0
+        self.abandoned = 0
+
+    def enter(self) -> bool:
+        with self.lock:
+            if self.draining:
+                self.rejected += 1
+                return False
+            self.inflight += 1
+            self.accepted += 1
+            return True
+
+    def leave(self):
+        with self.lock:
+            self.inflight -= 1
+            if self.draining:
+                self.completed_during_drain += 1
+            if self.inflight == 0:
+                self.idle.notify_all()
+
+    def start(self) -> bool:
+        with self.lock:
+            if self.draining:
+                return False
+            self.draining = True
+            self.drain_start_epoch = time.time()
+            inflight = self.inflight
+        print(f"DRAIN_START_EPOCH={self.drain_start_epoch:.3f} INFLIGHT={inflight}", flush=True)
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            while self.inflight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.idle.wait(remaining)
+            self.abandoned = self.inflight
+            self.drain_end_epoch = time.time()
+            done = self.inflight == 0
+        print(f"DRAIN_END_EPOCH={self.drain_end_epoch:.3f} ABANDONED={self.abandoned}", flush=True)
+        return done
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "draining": self.draining,
+                "drain_timeout_sec": DRAIN_TIMEOUT_SEC,
+                "drain_start_epoch": self.drain_start_epoch,
+                "drain_end_epoch": self.drain_end_epoch,
+                "inflight": self.inflight,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "completed_during_drain": self.completed_during_drain,
+                "abandoned": self.abandoned,
+            }
+
+    def render(self) -> str:
+        d = self.snapshot()
+        out = [
+            "# TYPE tinyllama_draining gauge",
+            f"tinyllama_draining {int(d['draining'])}",
+            "# TYPE tinyllama_drain_rejected_total counter",
+            f"tinyllama_drain_rejected_total {d['rejected']}",
+            "# TYPE tinyllama_drain_completed_total counter",
+            f"tinyllama_drain_completed_total {d['completed_during_drain']}",
+            "# TYPE tinyllama_drain_abandoned gauge",
+            f"tinyllama_drain_abandoned {d['abandoned']}",
+        ]
+        return "\n".join(out) + "\n"
+
+
+DRAIN = DrainState()
+
+
+def read_rss_bytes() -> int:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def parse_smaps_fields(lines) -> dict:
+    out = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 3 and parts[0].endswith(":") and parts[2] == "kB":
+            out[parts[0][:-1]] = int(parts[1]) * 1024
+    return out
+
+def read_smaps_rollup() -> dict:
+    # Rss = Shared_* + Private_*, Pss는 공유 페이지를 공유 프로세스 수로 나눈 값
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            return parse_smaps_fields(f)
+    except OSError:
+        return {}
+
+def read_mapping_smaps(paths) -> dict:
+    # /proc/self/smaps에서 주어진 파일(=GGUF)의 mapping만 합산한다.
+    want = set(paths)
+    out = {p: {} for p in want}
+    cur = None
+    try:
+        with open("/proc/self/smaps", "r") as f:
+            for line in f:
+                # header는 "start-end perms offset dev inode [path]". path에 공백이 있을 수 있어 5번만 자른다.
+                parts = line.rstrip("\n").split(None, 5)
+                if parts and "-" in parts[0] and not parts[0].endswith(":"):
+                    path = parts[5] if len(parts) >= 6 else ""
+                    cur = out[path] if path in want else None
+                    continue
+                if cur is None:
+                    continue
+                for k, v in parse_smaps_fields([line]).items():
+                    cur[k] = cur.get(k, 0) + v
+    except OSError:
+        pass
+    return out
 
 def pick_model_path() -> str:
     env = os.getenv("MODEL_PATH", "").strip()
     if env:
         return env
-    cand = sorted(glob.glob("/models/*.gguf"))
+    cand = sorted(glob.glob(os.path.join(MODELS_DIR, "*.gguf")))
     if not cand:
         return ""
     return cand[0]
 
-def init_llm():
-    global LLM, MODEL_USED
-    if LLM is not None:
-        return
-    model_path = pick_model_path()
-    MODEL_USED = model_path or "(none)"
-    if not model_path or not os.path.isfile(model_path):
-        return
+def model_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
 
+def load_llm(model_path: str):
     from llama_cpp import Llama
 
     n_ctx = int(os.getenv("N_CTX", "2048"))
     n_threads = int(os.getenv("N_THREADS", "4"))
     n_batch = int(os.getenv("N_BATCH", "128"))
 
-    LLM = Llama(
+    # batch 모드의 decode는 BatchScheduler의 multi-sequence context에서만 한다.
+    # Llama 자체 context는 tokenize/detokenize에만 쓰므로 n_batch 크기로 줄여 KV cache를 두 번 잡지 않는다.
+    batching = BATCH_MAX_SIZE > 1
+    llm = Llama(
         model_path=model_path,
-        n_ctx=n_ctx,
+        n_ctx=n_batch if batching else n_ctx,
         n_threads=n_threads,
         n_batch=n_batch,
+        use_mmap=USE_MMAP,
+        use_mlock=USE_MLOCK,
         verbose=False,
     )
 
+    if batching:
+        scheduler = BatchScheduler(
+            llm,
+            max_size=BATCH_MAX_SIZE,
+            max_wait_s=BATCH_MAX_WAIT_MS / 1000.0,
+            n_ctx=n_ctx,
+            n_threads=n_threads,
+            n_batch=n_batch,
+        )
+    else:
+        scheduler = SerialScheduler(llm)
+    return llm, scheduler
+
+def init_llm():
+    # 기본 모델 이름만 정한다. load는 acquire(요청) 또는 ensure_loaded(/health)에서 한다.
+    global MODEL_USED
+    model_path = pick_model_path()
+    MODEL_USED = model_path or "(none)"
+    if not model_path or not os.path.isfile(model_path):
+        return None
+    return model_name(model_path)
+
+
+class BatchJob:
+    def __init__(self, req: InferReq):
+        self.req = req
+        self.out = queue.Queue()
+        self.t_enqueue = time.time()
+        self.t_start = None
+        self.t_prompt_done = None
+        self.t_done = None
+        self.batch_size = 0
+        self.n_prompt = 0
+        self.n_tokens = 0
+        self.ok = True
+        # client가 끊으면 True. scheduler는 아직 시작 전이면 건너뛰고, decode 중이면 그 seq만 멈춘다.
+        self.cancelled = False
+
+
+class SerialScheduler:
+    # Llama 객체는 thread-safe가 아니므로 요청을 worker thread 하나에서 차례로 실행한다.
+    # 대기 요청은 q에 쌓이고(tinyllama_queue_depth), stream 여부와 상관없이 결과는 BatchJob.out으로 나온다.
+    ctx_bytes = 0
+
+    def __init__(self, llm, max_size: int = 1, max_wait_s: float = 0.0):
+        self.llm = llm
+        self.max_size = max_size
+        self.max_wait_s = max_wait_s
+        self.q = queue.Queue()
+        self.batch_sizes = Counter()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.q.put(None)
+        self.thread.join(timeout=5)
+
+    def submit(self, req: InferReq) -> BatchJob:
+        job = BatchJob(req)
+        METRICS.begin()
+        self.q.put(job)
+        return job
+
+    def _collect(self):
+        first = self.q.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self.q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if job is None:
+                self.q.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                self._free()
+                return
+            for job in [j for j in batch if j.cancelled]:
+                METRICS.end(False, 0, 0, 0.0, 0.0, time.time() - job.t_enqueue)
+                job.out.put(None)
+            batch = [j for j in batch if not j.cancelled]
+            if not batch:
+                continue
+            self.batch_sizes[len(batch)] += 1
+            t_start = time.time()
+            for job in batch:
+                job.batch_size = len(batch)
+                job.t_start = t_start
+            try:
+                self._run(batch)
+            except Exception as e:
+                for job in batch:
+                    job.ok = False
+                    job.out.put(e)
+            finally:
+                t_end = time.time()
+                for job in batch:
+                    t_done = job.t_done or t_end
+                    t_prompt_done = job.t_prompt_done or t_done
+                    METRICS.end(
+                        job.ok,
+                        job.n_prompt,
+                        job.n_tokens,
+                        t_prompt_done - job.t_start,
+                        t_done - t_prompt_done,
+                        t_done - job.t_enqueue,
+                    )
+                    job.out.put(None)
+
+    def _free(self):
+        pass
+
+    def _run(self, jobs):
+        # stream으로 받아 첫 chunk까지를 prompt eval, 이후를 decode로 나눈다.
+        job = jobs[0]
+        req = job.req
+        job.n_prompt = len(self.llm.tokenize(req.prompt.encode("utf-8"), add_bos=True))
+        for chunk in self.llm(
+            req.prompt,
+            max_tokens=req.n_predict,
+            temperature=req.temperature,
+            top_k=req.top_k,
+            top_p=req.top_p,
+            min_p=req.min_p,
+            repeat_penalty=req.repeat_penalty,
+            stop=[],
+            stream=True,
+        ):
+            if job.t_prompt_done is None:
+                job.t_prompt_done = time.time()
+            if job.cancelled:
+                break
+            job.n_tokens += 1
+            piece = chunk.get("choices", [{}])[0].get("text", "")
+            if piece:
+                job.out.put(piece)
+        job.t_done = time.time()
+
+
+class BatchScheduler(SerialScheduler):
+    # 창(max_wait) 안에 도착한 요청을 최대 max_size개까지 모아
+    # llama.cpp multi-sequence batch decode(seq_id별 KV)로 한 번에 생성한다.
+    def __init__(self, llm, max_size: int, max_wait_s: float, n_ctx: int, n_threads: int, n_batch: int):
+        self.llm = llm
+        self.max_size = max_size
+        self.n_ctx_seq = n_ctx
+        self.n_threads = n_threads
+        self.n_batch = max(n_batch, max_size)
+        self.ctx = None
+        # batch context(n_ctx * max_size 칸의 KV cache)는 load 때 만들고, 그만큼 늘어난 RSS를
+        # ctx_bytes로 남겨 /memory와 tinyllama_batch_context_bytes로 보고한다.
+        rss0 = read_rss_bytes()
+        self._context()
+        self.ctx_bytes = max(0, read_rss_bytes() - rss0)
+        super().__init__(llm, max_size, max_wait_s)
+
+    def _free(self):
+        if self.ctx is not None:
+            import llama_cpp
+
+            llama_cpp.llama_free(self.ctx)
+            self.ctx = None
+
+    def _context(self):
+        import llama_cpp
+
+        if self.ctx is None:
+            cparams = llama_cpp.llama_context_default_params()
+            cparams.n_ctx = self.n_ctx_seq * self.max_size
+            cparams.n_batch = self.n_batch
+            cparams.n_seq_max = self.max_size
+            cparams.n_threads = self.n_threads
+            cparams.n_threads_batch = self.n_threads
+            self.ctx = llama_cpp.llama_new_context_with_model(self.llm.model, cparams)
+            if not self.ctx:
+                raise RuntimeError("failed to create batch context")
+        return self.ctx
+
+    def _clear_kv(self, ctx):
+        import llama_cpp
+
+        if hasattr(llama_cpp, "llama_memory_clear"):
+            llama_cpp.llama_memory_clear(llama_cpp.llama_get_memory(ctx), True)
+        elif hasattr(llama_cpp, "llama_kv_self_clear"):
+            llama_cpp.llama_kv_self_clear(ctx)
+        else:
+            llama_cpp.llama_kv_cache_clear(ctx)
+
+    def _decode(self, ctx, batch, items, n_vocab):
+        # items: (token, pos, seq_id, want_logits) -> {seq_id: logits}
+        import numpy as np
+        import llama_cpp
+
+        logits = {}
+        for off in range(0, len(items), self.n_batch):
+            chunk = items[off:off + self.n_batch]
+            for i, (tok, pos, seq, want) in enumerate(chunk):
+                batch.token[i] = tok
+                batch.pos[i] = pos
+                batch.n_seq_id[i] = 1
+                batch.seq_id[i][0] = seq
+                batch.logits[i] = 1 if want else 0
+            batch.n_tokens = len(chunk)
+            rc = llama_cpp.llama_decode(ctx, batch)
+            if rc != 0:
+                raise RuntimeError(f"llama_decode failed rc={rc}")
+            for i, (_, _, seq, want) in enumerate(chunk):
+                if want:
+                    ptr = llama_cpp.llama_get_logits_ith(ctx, i)
+                    logits[seq] = np.ctypeslib.as_array(ptr, shape=(n_vocab,)).copy()
+        return logits
+
+    def _sample(self, logits, req: InferReq, history) -> int:
+        # llama_cpp 단일 경로와 같은 순서: repeat penalty -> top_k -> top_p -> min_p -> temperature
+        import numpy as np
+
+        z = logits.astype(np.float64)
+        if req.repeat_penalty != 1.0 and history:
+            prev = np.unique(np.asarray(history[-REPEAT_LAST_N:]))
+            v = z[prev]
+            z[prev] = np.where(v > 0, v / req.repeat_penalty, v * req.repeat_penalty)
+        if req.temperature <= 0:
+            return int(np.argmax(z))
+        if 0 < req.top_k < len(z):
+            idx = np.argpartition(-z, req.top_k)[:req.top_k]
+        else:
+            idx = np.arange(len(z))
+        idx = idx[np.argsort(-z[idx], kind="stable")]
+        p = np.exp(z[idx] - z[idx[0]])
+        p /= p.sum()
+        if req.top_p < 1.0:
+            keep = int(np.searchsorted(np.cumsum(p), req.top_p)) + 1
+            idx, p = idx[:keep], p[:keep]
+        if req.min_p > 0:
+            idx = idx[p >= req.min_p * p[0]]
+        zt = z[idx] / req.temperature
+        q = np.exp(zt - zt.max())
+        q /= q.sum()
+        return int(idx[np.random.choice(len(idx), p=q)])
+
+    def _run(self, jobs):
+        import llama_cpp
+
+        ctx = self._context()
+        self._clear_kv(ctx)
+
+        n_vocab = self.llm.n_vocab()
+        eos = self.llm.token_eos()
+
+        prompts = []
+        items = []
+        for seq, job in enumerate(jobs):
+            toks = self.llm.tokenize(job.req.prompt.encode("utf-8"), add_bos=True)
+            keep = max(1, self.n_ctx_seq - max(job.req.n_predict, 1))
+            toks = toks[-keep:]
+            job.n_prompt = len(toks)
+            prompts.append(toks)
+            for pos, tok in enumerate(toks):
+                items.append((tok, pos, seq, pos == len(toks) - 1))
+
+        batch = llama_cpp.llama_batch_init(self.n_batch, 0, len(jobs))
+        try:
+            logits = self._decode(ctx, batch, items, n_vocab)
+            t_prompt_done = time.time()
+            for job in jobs:
+                job.t_prompt_done = t_prompt_done
+            pos = {seq: len(toks) for seq, toks in enumerate(prompts)}
+            hist = {seq: list(toks) for seq, toks in enumerate(prompts)}
+            dec = {seq: codecs.getincrementaldecoder("utf-8")(errors="ignore") for seq in range(len(jobs))}
+            active = set(range(len(jobs)))
+
+            while active:
+                step = []
+                for seq in sorted(active):
+                    job = jobs[seq]
+                    if job.cancelled:
+                        job.t_done = time.time()
+                        active.discard(seq)
+                        continue
+                    tok = self._sample(logits[seq], job.req, hist[seq])
+                    hist[seq].append(tok)
+                    if tok == eos:
+                        job.t_done = time.time()
+                        active.discard(seq)
+                        continue
+                    job.n_tokens += 1
+                    piece = dec[seq].decode(self.llm.detokenize([tok]))
+                    if piece:
+                        job.out.put(piece)
+                    if job.n_tokens >= job.req.n_predict or pos[seq] >= self.n_ctx_seq:
+                        job.t_done = time.time()
+                        active.discard(seq)
+                        continue
+                    step.append((tok, pos[seq], seq, True))
+                    pos[seq] += 1
+                if step:
+                    logits = self._decode(ctx, batch, step, n_vocab)
+        finally:
+            llama_cpp.llama_batch_free(batch)
+
+
+class LoadedModel:
+    def __init__(self, name: str, path: str, llm, scheduler, load_seconds: float):
+        self.name = name
+        self.path = path
+        self.llm = llm
+        self.scheduler = scheduler
+        self.load_seconds = load_seconds
+        self.size_bytes = os.path.getsize(path)
+        self.inflight = 0
+        self.last_used = time.time()
+
+
+class ModelRegistry:
+    # MODELS_DIR의 *.gguf를 파일 이름(stem)으로 서비스한다.
+    # 요청 시 mmap으로 lazy load 하고, RSS + 새 모델 크기가 budget을 넘으면
+    # 사용 중이 아닌 모델을 LRU 순서로 evict 한다. (budget <= 0 이면 evict 안 함)
+    # lock은 loaded/loading bookkeeping에만 잡고, 몇 초씩 걸리는 load/evict는 그 밖에서
+    # load_lock으로 직렬화한다. 같은 모델을 load 중이면 그 load의 Future를 기다린다.
+    def __init__(self, models_dir: str, budget_bytes: int):
+        self.models_dir = models_dir
+        self.budget_bytes = budget_bytes
+        self.loaded = OrderedDict()
+        self.loading = {}
+        self.lock = threading.RLock()
+        self.load_lock = threading.Lock()
+        self.events = deque(maxlen=64)
+
+    def available(self) -> dict:
+        out = {model_name(p): p for p in sorted(glob.glob(os.path.join(self.models_dir, "*.gguf")))}
+        env = os.getenv("MODEL_PATH", "").strip()
+        if env and os.path.isfile(env):
+            out.setdefault(model_name(env), env)
+        return out
+
+    def _load(self, name: str, path: str, fut: Future):
+        try:
+            with self.load_lock:
+                self._make_room(name, os.path.getsize(path))
+                t0 = time.time()
+                llm, scheduler = load_llm(path)
+                dt = time.time() - t0
+            entry = LoadedModel(name, path, llm, scheduler, dt)
+            with self.lock:
+                self.loaded[name] = entry
+                del self.loading[name]
+                self.events.append({"event": "load", "model": name, "seconds": dt, "rss_bytes": read_rss_bytes(), "epoch": time.time()})
+            METRICS.model_event("load", dt)
+            fut.set_result(entry)
+        except BaseException as e:
+            with self.lock:
+                self.loading.pop(name, None)
+            fut.set_exception(e)
+
+    def _get(self, name: str, use: bool) -> LoadedModel:
+        while True:
+            with self.lock:
+                entry = self.loaded.get(name)
+                if entry is not None:
+                    if use:
+                        self.loaded.move_to_end(name)
+                        entry.inflight += 1
+                        entry.last_used = time.time()
+                    return entry
+                fut = self.loading.get(name)
+                mine = fut is None
+                if mine:
+                    path = self.available().get(name)
+                    if path is None:
+                        raise KeyError(name)
+                    fut = self.loading[name] = Future()
+            if mine:
+                self._load(name, path, fut)
+            # load 실패는 기다리던 요청에도 그대로 올린다. 성공이면 lock 안에서 다시 잡는다
+            # (그 사이 evict 됐으면 다시 load).
+            fut.result()
+
+    def acquire(self, name: str) -> LoadedModel:
+        return self._get(name, use=True)
+
+    def ensure_loaded(self, name: str) -> bool:
+        # readinessProbe용: 아무 모델도 없을 때만 기본 모델을 load 하고, LRU 순서/last_used는 건드리지 않는다.
+        with self.lock:
+            if self.loaded:
+                return True
+        self._get(name, use=False)
+        return True
+
+    def release(self, entry: LoadedModel):
+        with self.lock:
+            entry.inflight -= 1
+
+    def _make_room(self, name: str, need_bytes: int):
+        # load_lock 안에서만 호출된다. victim은 lock 안에서 빼고 close는 lock 밖에서 한다.
+        if self.budget_bytes <= 0:
+            return
+        while read_rss_bytes() + need_bytes > self.budget_bytes:
+            with self.lock:
+                if not self.loaded:
+                    return
+                victim = next((n for n, e in self.loaded.items() if e.inflight == 0), None)
+                if victim is None:
+                    # 모두 사용 중이면 budget을 넘겨서라도 load 한다 (요청을 실패시키지 않음).
+                    rss = read_rss_bytes()
+                    METRICS.model_event("over_budget", 0.0)
+                    self.events.append({"event": "over_budget", "model": name, "seconds": 0.0, "rss_bytes": rss,
+                                        "need_bytes": need_bytes, "epoch": time.time()})
+                    print(f"MODEL_OVER_BUDGET model={name} rss_bytes={rss} need_bytes={need_bytes} "
+                          f"budget_bytes={self.budget_bytes}", flush=True)
+                    return
+                entry = self.loaded.pop(victim)
+            self._evict(entry)
+
+    def _evict(self, entry: LoadedModel):
+        t0 = time.time()
+        if entry.scheduler is not None:
+            entry.scheduler.close()
+        if hasattr(entry.llm, "close"):
+            entry.llm.close()
+        entry.llm = None
+        entry.scheduler = None
+        gc.collect()
+        dt = time.time() - t0
+        METRICS.model_event("evict", dt)
+        with self.lock:
+            self.events.append({"event": "evict", "model": entry.name, "seconds": dt, "rss_bytes": read_rss_bytes(), "epoch": time.time()})
+
+    def models_loaded(self) -> int:
+        with self.lock:
+            return len(self.loaded)
+
+    def schedulers(self):
+        with self.lock:
+            return [e.scheduler for e in self.loaded.values() if e.scheduler is not None]
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "models_dir": self.models_dir,
+                "rss_budget_bytes": self.budget_bytes,
+                "available": sorted(self.available()),
+                "loading": sorted(self.loading),
+                "loaded": [
+                    {
+                        "model": e.name,
+                        "path": e.path,
+                        "size_bytes": e.size_bytes,
+                        "load_seconds": e.load_seconds,
+                        "batch_context_bytes": e.scheduler.ctx_bytes if e.scheduler is not None else 0,
+                        "inflight": e.inflight,
+                        "last_used_epoch": e.last_used,
+                    }
+                    for e in self.loaded.values()
+                ],
+                "events": list(self.events),
+            }
+
+
+REGISTRY = ModelRegistry(MODELS_DIR, int(MODEL_RSS_BUDGET_MB * 1024 * 1024))
+
+
+def iter_job(job: BatchJob):
+    while True:
+        item = job.out.get()
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+class JobStreamingResponse(StreamingResponse):
+    # scheduler job stream. generator의 finally는 generator가 한 번이라도 시작돼야 실행되므로
+    # (첫 chunk 전에 client가 끊으면 실행되지 않음) release는 response가 끝나는 경로에서 한 번만 한다.
+    def __init__(self, job: BatchJob, entry: LoadedModel):
+        super().__init__(iter_job(job), media_type="text/plain")
+        self.job = job
+        self.entry = entry
+
+    def _finish(self):
+        REGISTRY.release(self.entry)
+        DRAIN.leave()
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # 정상 종료면 job은 이미 끝났다. 끊긴 경우 남은 decode를 멈춘다.
+            self.job.cancelled = True
+            # registry/drain lock은 worker thread에서 잡으므로 event loop에서 기다리지 않는다.
+            # (SIGTERM handler도 이 loop thread에서 돈다.) task가 cancel 돼도 release는 끝까지 한다.
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(self._finish)
+
 @app.get("/health")
-def health():
-    models_dir_ok = os.path.isdir("/models")
+def health(response: Response):
+    # readinessProbe용: 모델이 없거나 drain 중이면 503
+    models_dir_ok = os.path.isdir(MODELS_DIR)
     preview = []
     if models_dir_ok:
         try:
-            preview = sorted(os.listdir("/models"))[:20]
+            preview = sorted(os.listdir(MODELS_DIR))[:20]
         except Exception:
             preview = ["(list failed)"]
 
     llm_ok = False
     err = None
     try:
-        init_llm()
-        llm_ok = (LLM is not None)
+        name = init_llm()
+        llm_ok = name is not None and REGISTRY.ensure_loaded(name)
     except Exception as e:
         err = str(e)
 
+    batch_sizes = Counter()
+    for sched in REGISTRY.schedulers():
+        batch_sizes.update(sched.batch_sizes)
+
+    drain = DRAIN.snapshot()
+    ok = models_dir_ok and llm_ok and not drain["draining"]
+    if not ok:
+        response.status_code = 503
     return {
-        "ok": models_dir_ok and llm_ok,
-        "models_dir": "/models",
+        "ok": ok,
+        "models_dir": MODELS_DIR,
         "files_preview": preview,
         "model_used": MODEL_USED,
         "llm_loaded": llm_ok,
         "error": err,
+        "batching": {
+            "enabled": BATCH_MAX_SIZE > 1,
+            "max_size": BATCH_MAX_SIZE,
+            "max_wait_ms": BATCH_MAX_WAIT_MS,
+            "batch_sizes": dict(batch_sizes),
+        },
+        "drain": drain,
+    }
+
+@app.get("/drain")
+def drain_state():
+    return DRAIN.snapshot()
+
+@app.get("/models")
+def models():
+    return REGISTRY.snapshot()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    scheds = REGISTRY.schedulers()
+    queue_depth = sum(sc.q.qsize() for sc in scheds)
+    context_bytes = sum(sc.ctx_bytes for sc in scheds)
+    return METRICS.render(queue_depth, read_rss_bytes(), REGISTRY.models_loaded(), context_bytes, read_smaps_rollup()) + DRAIN.render()
+
+@app.get("/memory")
+def memory():
+    snap = REGISTRY.snapshot()
+    maps = read_mapping_smaps([os.path.realpath(m["path"]) for m in snap["loaded"]])
+    keys = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+    return {
+        "use_mmap": USE_MMAP,
+        "use_mlock": USE_MLOCK,
+        "process": {k: read_smaps_rollup().get(k, 0) for k in keys},
+        "models": [
+            {"model": m["model"], "path": m["path"], "size_bytes": m["size_bytes"],
+             "batch_context_bytes": m["batch_context_bytes"],
+             **{k: maps.get(os.path.realpath(m["path"]), {}).get(k, 0) for k in keys}}
+            for m in snap["loaded"]
+        ],
     }
 
 @app.post("/infer")
 def infer(req: InferReq):
-    init_llm()
-    if LLM is None:
+    if not DRAIN.enter():
+        raise HTTPException(status_code=503, detail="server is draining")
+    streaming = False
+    try:
+        resp = run_infer(req)
+        streaming = isinstance(resp, StreamingResponse)
+        return resp
+    finally:
+        if not streaming:
+            DRAIN.leave()
+
+@app.get("/v1/models")
+def v1_models():
+    return {"object": "list", "data": [{"id": n, "object": "model", "owned_by": "local"} for n in sorted(REGISTRY.available())]}
+
+@app.post("/v1/chat/completions")
+def v1_chat_completions(req: ChatReq):
+    # llama_cpp.server 대신 이 server로 steps 15/16을 돌릴 때(DEPLOY_YAML=tinyllama-drain-deployment.yaml, opt-in)
+    # client를 바꾸지 않도록 하는 비-stream 호환 경로. chat template은 적용하지 않으므로
+    # 그 결과는 llama_cpp.server로 잰 결과와 직접 비교하지 않는다.
+    # model이 registry에 없는 이름(예: "tinyllama")이면 기본 모델을 쓴다.
+    if not DRAIN.enter():
+        raise HTTPException(status_code=503, detail="server is draining")
+    try:
+        prompt = "\n".join(f"{m.get('role', 'user')}: {m.get('content', '')}" for m in req.messages) + "\nassistant:"
+        model = req.model if req.model in REGISTRY.available() else None
+        out = run_infer(InferReq(prompt=prompt, n_predict=req.max_tokens, temperature=req.temperature, model=model))
+    finally:
+        DRAIN.leave()
+    return {
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": out["model"],
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": out["text"]},
+            "finish_reason": "length" if out["n_tokens"] >= req.max_tokens else "stop",
+        }],
+        "usage": {"completion_tokens": out["n_tokens"]},
+    }
+
+def run_infer(req: InferReq):
+    name = req.model or init_llm()
+    if name is None:
         raise HTTPException(status_code=500, detail=f"model not loaded (model_used={MODEL_USED})")
+    try:
+        entry = REGISTRY.acquire(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"unknown model: {name}")
 
-    t0 = time.time()
-    out = LLM(
-        req.prompt,
-        max_tokens=req.n_predict,
-        temperature=req.temperature,
-        stop=[],
-    )
+    job = entry.scheduler.submit(req)
+    if req.stream:
+        return JobStreamingResponse(job, entry)
+    try:
+        text = "".join(iter_job(job))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"decode failed: {e}")
+    finally:
+        REGISTRY.release(entry)
     t1 = time.time()
-
-    text = out.get("choices", [{}])[0].get("text", "")
     return {
         "text": text,
-        "latency_ms": int((t1 - t0) * 1000),
+        "latency_ms": int((t1 - job.t_enqueue) * 1000),
+        "queue_ms": int((job.t_start - job.t_enqueue) * 1000),
+        "batch_size": job.batch_size,
+        "n_tokens": job.n_tokens,
         "n_predict": req.n_predict,
         "temperature": req.temperature,
-        "model_used": MODEL_USED,
+        "model": entry.name,
+        "model_used": entry.path,
     }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+
+    class DrainingServer(uvicorn.Server):
+        # 첫 SIGTERM은 drain을 시작하고, drain이 끝나면 uvicorn 종료 절차로 넘긴다.
+        # 두 번째 signal(또는 SIGINT)은 기존 동작대로 즉시 처리한다.
+        # handler는 main(event loop) thread에서 도므로 DRAIN lock이나 print 없이 drain thread만 띄운다.
+        drain_requested = False
+
+        def handle_exit(self, sig, frame):
+            if sig == signal.SIGTERM and not self.drain_requested:
+                self.drain_requested = True
+                threading.Thread(target=self._drain_then_exit, args=(sig, frame), daemon=True).start()
+                return
+            super().handle_exit(sig, frame)
+
+        def _drain_then_exit(self, sig, frame):
+            DRAIN.start()
+            DRAIN.wait(DRAIN_TIMEOUT_SEC)
+            super().handle_exit(sig, frame)
+
+    DrainingServer(uvicorn.Config(app, host="0.0.0.0", port=8080)).run()
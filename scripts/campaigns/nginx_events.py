@@ -0,0 +1,22 @@
+# nginx deployment event step(04/06/07/10)을 block마다 섞어 실행하는 campaign.
+# 각 step spec의 prepare/teardown이 앞 run이 남긴 상태와 상관없이 시작 상태를 맞춘다.
+#
+# 사용:
+#   python3 scripts/utils/campaign.py scripts/campaigns/nginx_events.py --dry-run
+#   python3 scripts/utils/campaign.py scripts/campaigns/nginx_events.py
+#   -> logs/redacted/_campaign/nginx_events/schedule.csv
+#   -> python3 analysis/drift.py --campaign nginx_events
+
+CAMPAIGN = {
+    "name": "nginx_events",
+    "runs": 10,
+    "order": "blocked",
+    "seed": 20260301,
+    "cooldown": {"mode": "adaptive", "sec": 10, "baseline_step": "step05_deployment_idle"},
+    "steps": [
+        {"spec": "scripts/step04_apply_deployment/spec.py"},
+        {"spec": "scripts/step06_scale_up_down/spec.py"},
+        {"spec": "scripts/step07_rollout_restart/spec.py"},
+        {"spec": "scripts/step10_delete_deployment/spec.py"},
+    ],
+}
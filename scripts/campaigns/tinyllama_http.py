@@ -0,0 +1,39 @@
+# TinyLlama HTTP step(12/14/17)을 block마다 섞어 실행하는 campaign (기존 run_experiment.sh 사용).
+# step12는 스스로 deployment를 지우고 다시 만들고, step14는 없으면 만든다.
+# step17은 Ready pod가 있어야 하므로 setup에서 deployment/service를 맞춘다.
+# 모든 run이 끝나면 step마다 analyze(plot_step*.py, 분포 그림)를 campaign에서 done 된 run에 대해 돌린다.
+#
+# 사용:
+#   python3 scripts/utils/campaign.py scripts/campaigns/tinyllama_http.py --dry-run
+#   python3 scripts/utils/campaign.py scripts/campaigns/tinyllama_http.py --order random --seed 7
+#   -> logs/redacted/_campaign/tinyllama_http/schedule.csv
+
+TINYLLAMA_YAML = ('-f "${REPO_ROOT}/scripts/step12_apply_tinyllama_http/tinyllama-deployment.yaml" '
+                  '-f "${REPO_ROOT}/scripts/step12_apply_tinyllama_http/tinyllama-service.yaml"')
+
+CAMPAIGN = {
+    "name": "tinyllama_http",
+    "runs": 10,
+    "order": "blocked",
+    "seed": 20260301,
+    "cooldown": {"mode": "adaptive", "sec": 5, "baseline_step": "step13_tinyllama_idle"},
+    "steps": [
+        {"step": "step12_apply_tinyllama_http",
+         "script": "scripts/step12_apply_tinyllama_http/run_experiment.sh",
+         "log": "${REPO_ROOT}/scripts/${STEP}/logs/redacted/run_${RUN}.log",
+         "analyze": ['python3 "${REPO_ROOT}/analysis/plot_step12_tinyllama.py" ${RUN_LIST}',
+                     'python3 "${REPO_ROOT}/analysis/plot_step12_tinyllama_distribution.py"']},
+        {"step": "step14_scale_up_down_tinyllama_http",
+         "script": "scripts/step14_scale_up_down_tinyllama_http/run_experiment.sh",
+         "analyze": ['python3 "${REPO_ROOT}/analysis/plot_step14_tinyllama_scale.py" ${RUN_LIST}',
+                     'python3 "${REPO_ROOT}/analysis/plot_step14_tinyllama_scale_distribution.py"']},
+        {"step": "step17_infer_load_1rps_tinyllama_http",
+         "script": "scripts/step17_infer_load_1rps_tinyllama_http/run_experiment.sh",
+         "setup": [f"kubectl apply {TINYLLAMA_YAML}",
+                   "kubectl rollout status deploy/tinyllama-server --timeout=600s"],
+         "analyze": ['for r in ${RUN_LIST}; do '
+                     'python3 "${REPO_ROOT}/analysis/plot_step17_tinyllama_infer_load.py" --step "${STEP}" --run "$r"; done',
+                     'python3 "${REPO_ROOT}/analysis/plot_step17_tinyllama_infer_load_distribution.py" '
+                     '--step "${STEP}" --runs "${RUNS}"']},
+    ],
+}
@@ -18,6 +18,7 @@
 #
 # Epoch definition:
 # - START_EPOCH = date +%s (측정 시작 시각, seconds since epoch)
+#                 START_EPOCH_NS / START_MONO_NS도 함께 기록 (scripts/utils/marker.sh)
 # - END_EPOCH   = START_EPOCH + DURATION_SEC (측정 종료 시각)
 # - export_csv는 [START_EPOCH, END_EPOCH] 구간 Netdata CSV export
 set -euo pipefail
@@ -28,6 +29,7 @@ WORKER_HOST="${WORKER_HOST:-}"
 NETDATA_URL="${NETDATA_URL:-http://127.0.0.1:19999}"
 
 source scripts/utils/netdata_export.sh
+source scripts/utils/marker.sh
 
 step="step01_system_idle"
 
@@ -59,10 +61,12 @@ for i in $(seq 1 "$RUNS"); do
   stop_cluster
 
   echo "[2] mark start/end epoch" | tee -a "$run_log"
-  START_EPOCH=$(date +%s)
+  marks_reset
+  mark START
   END_EPOCH=$(( START_EPOCH + DURATION_SEC ))
   echo "START_EPOCH=${START_EPOCH}" | tee -a "$run_log"
   echo "END_EPOCH=${END_EPOCH}" | tee -a "$run_log"
+  marks_log | tee -a "$run_log"
 
   echo "[3] sleep (collect baseline window)" | tee -a "$run_log"
   sleep "$DURATION_SEC"
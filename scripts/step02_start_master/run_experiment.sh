@@ -20,11 +20,15 @@
 # - NETDATA_URL       : Netdata base URL (default: http://127.0.0.1:19999)
 # - DISK_DEV          : disk metric 대상 device (default: mmcblk0)
 # - READY_TIMEOUT_SEC : master READY 대기 timeout (default: 180)
+# - READY_WAIT        : watch = k8s watch API(scripts/utils/k8s_watch.py), poll = 1초 kubectl polling (default: watch)
+# - K3S_KUBECONFIG    : watch 모드에서 읽을 kubeconfig (default: /etc/rancher/k3s/k3s.yaml)
 
 # Epoch definition:
 # - START_EPOCH : k3s master start 직전 timestamp
 # - READY_EPOCH : kubectl get nodes 상태 Ready 감지 시점
+#                 (watch 모드: NODE_READY_EPOCH(소수 초, event 수신 시각)의 정수 부분)
 # - END_EPOCH   : READY_EPOCH + POST_SEC
+# - START/READY는 *_EPOCH_NS(/ *_MONO_NS)도 기록, T_READY_SEC는 그 차이(소수 3자리, scripts/utils/marker.sh)
 # - EXPORT_START = START_EPOCH - PRE_SEC
 set -euo pipefail
 
@@ -39,9 +43,12 @@ NETDATA_URL="${NETDATA_URL:-http://127.0.0.1:19999}"
 DISK_DEV="${DISK_DEV:-mmcblk0}"
 
 READY_TIMEOUT_SEC="${READY_TIMEOUT_SEC:-180}"
+READY_WAIT="${READY_WAIT:-watch}"
+K3S_KUBECONFIG="${K3S_KUBECONFIG:-/etc/rancher/k3s/k3s.yaml}"
 
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
 source "${ROOT_DIR}/scripts/utils/netdata_export.sh"
+source "${ROOT_DIR}/scripts/utils/marker.sh"
 
 step="step02_start_master"
 
@@ -74,6 +81,25 @@ wait_master_ready() {
   return 1
 }
 
+# k3s 기동 전에 띄워 두면 API server가 뜨는 즉시 LIST/WATCH를 시작한다.
+# NODE_READY_EPOCH는 run_log에 직접 append 된다.
+start_ready_watch() {
+  sudo python3 "${ROOT_DIR}/scripts/utils/k8s_watch.py" \
+    --watch nodes --until NODE_READY \
+    --since "${START_EPOCH}" --timeout "${READY_TIMEOUT_SEC}" \
+    --kubectl "k3s kubectl" --kubeconfig "${K3S_KUBECONFIG}" \
+    --log "$run_log" >/dev/null &
+  WATCH_PID=$!
+}
+
+wait_ready_watch() {
+  wait "${WATCH_PID}" || return 1
+  local t
+  t="$(grep '^NODE_READY_EPOCH=' "$run_log" | tail -n 1 | cut -d= -f2 || true)"
+  [[ -n "$t" ]] || return 1
+  mark_at READY "$t"
+}
+
 for i in $(seq 1 "$RUNS"); do
   echo "=== [$step] run_${i} / $RUNS ==="
 
@@ -98,14 +124,18 @@ for i in $(seq 1 "$RUNS"); do
   stop_cluster
 
   echo "[2] start master + mark START_EPOCH" | tee -a "$run_log"
-  START_EPOCH="$(date +%s)"
+  marks_reset
+  mark START
   echo "START_EPOCH=${START_EPOCH}" | tee -a "$run_log"
+  [[ "$READY_WAIT" == "watch" ]] && start_ready_watch
 
   sudo systemctl start k3s | tee -a "$run_log" || true
 
   echo "[3] wait master READY + mark READY_EPOCH" | tee -a "$run_log"
-  if wait_master_ready; then
-    READY_EPOCH="$(date +%s)"
+  if [[ "$READY_WAIT" == "watch" ]] && wait_ready_watch; then
+    echo "READY_EPOCH=${READY_EPOCH}" | tee -a "$run_log"
+  elif [[ "$READY_WAIT" != "watch" ]] && wait_master_ready; then
+    mark READY
     echo "READY_EPOCH=${READY_EPOCH}" | tee -a "$run_log"
   else
     echo "ERROR: master not READY within ${READY_TIMEOUT_SEC}s" | tee -a "$run_log"
@@ -129,8 +159,9 @@ for i in $(seq 1 "$RUNS"); do
   export_csv "disk.${DISK_DEV}"       "$EXPORT_START" "$END_EPOCH" "${run_dir_data}/disk_io_${DISK_DEV}.csv"
 
   echo "[6] write durations + copy redacted.log into results" | tee -a "$run_log"
-  echo "T_READY_SEC=$(( READY_EPOCH - START_EPOCH ))" | tee -a "$run_log"
   echo "T_TOTAL_SEC=$(( END_EPOCH - START_EPOCH ))" | tee -a "$run_log"
+  mark_span T_READY_SEC START READY
+  marks_log | tee -a "$run_log"
   cp "$run_log" "${run_dir_res}/redacted.log"
 
   echo "[done] run_${i} complete" | tee -a "$run_log"
@@ -22,6 +22,7 @@
 # - START_EPOCH = date +%s (측정 시작 시각, seconds since epoch)
 # - END_EPOCH   = date +%s (sleep DURATION_SEC 이후 측정 종료 시각)
 # - T_total     = END_EPOCH - START_EPOCH
+# - START/END는 *_EPOCH_NS / *_MONO_NS도 기록, T_total은 monotonic 차이(소수 3자리)로 한 번만 기록 (scripts/utils/marker.sh)
 # - export_csv [START_EPOCH, END_EPOCH] 구간 Netdata API로 5초 평균(group=average, points=ceil(dur/5)) export
 set -euo pipefail
 
@@ -30,6 +31,7 @@ RUNS="${RUNS:-10}"
 DURATION_SEC="${DURATION_SEC:-300}"
 
 REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+source "${REPO_ROOT}/scripts/utils/marker.sh"
 LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP}"
 DATA_DIR="${REPO_ROOT}/data/netdata/${STEP}"
 RES_DIR="${REPO_ROOT}/results/${STEP}"
@@ -111,18 +113,19 @@ for i in $(seq 1 "${RUNS}"); do
   RUN_DATA="${DATA_DIR}/run_${i}"
   mkdir -p "${RUN_DATA}"
 
-  START_EPOCH="$(date +%s)"
+  marks_reset
+  mark START
   sleep "${DURATION_SEC}"
-  END_EPOCH="$(date +%s)"
-  T_TOTAL="$((END_EPOCH - START_EPOCH))"
+  mark END
+  mark_span T_total START END
 
   cat > "${RUN_LOG}" <<EOF
 STEP=${STEP}
 RUN=${i}
 START_EPOCH=${START_EPOCH}
 END_EPOCH=${END_EPOCH}
-T_total=${T_TOTAL}
 EOF
+  marks_log >> "${RUN_LOG}"
 
   export_csv "${CPU_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/system_cpu.csv"
   export_csv "${RAM_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/system_ram.csv"
@@ -0,0 +1,48 @@
+# step04_apply_deployment: scripts/utils/runner.py용 spec (run_experiment.sh는 이 spec으로 runner.py를 exec 한다)
+# - START_EPOCH : kubectl apply -f MANIFEST 직전
+# - READY_EPOCH : kubectl rollout status deployment/nginx 완료 직후
+# - END_EPOCH   : READY_EPOCH (본 step에서는 END=READY)
+#
+# 사용:
+#   python3 scripts/utils/runner.py scripts/step04_apply_deployment/spec.py
+SPEC = {
+    "step": "step04_apply_deployment",
+    "runs": 10,
+    "env": {
+        "NETDATA_URL": "http://127.0.0.1:19999",
+        "MANIFEST": "${REPO_ROOT}/scripts/step04_apply_deployment/nginx-deployment.yaml",
+    },
+    "prepare": [
+        {"run": 'kubectl delete -f "${MANIFEST}" --ignore-not-found', "check": False},
+        {"run": "kubectl delete deployment nginx --ignore-not-found", "check": False},
+        {"run": "kubectl wait --for=delete deployment/nginx --timeout=120s", "check": False},
+        # node가 Ready가 아니면 현재 상태를 stderr로 남기고 중단
+        {"run": "kubectl wait --for=condition=Ready nodes --all --timeout=120s >/dev/null"
+                " || { kubectl get nodes -o wide >&2; exit 1; }", "quiet": False},
+    ],
+    "actions": [
+        {"mark": "START"},
+        {"run": 'kubectl apply -f "${MANIFEST}"'},
+        {"wait": "kubectl rollout status deployment/nginx --timeout=600s", "interval": 0, "mark": ["READY", "END"]},
+    ],
+    "teardown": [
+        # T_ready 단계 분해용 (analysis/pod_startup.py), pod를 지우기 전에
+        {"run": 'python3 "${REPO_ROOT}/scripts/utils/pod_timeline.py" --selector app=nginx --out-dir "${RUN_DATA}"',
+         "check": False},
+        {"run": 'kubectl delete -f "${MANIFEST}" --ignore-not-found', "check": False},
+        {"run": "kubectl wait --for=delete deployment/nginx --timeout=120s", "check": False},
+    ],
+    "log": ["START", "READY", "END"],
+    "durations": {"T_ready": ["START", "READY"], "T_total": ["START", "END"]},
+    "export": {"from": "START", "to": "END"},
+    "charts": [
+        {"file": "system_cpu.csv", "chart": "system.cpu"},
+        {"file": "system_ram.csv", "chart": "system.ram"},
+        {"file": "disk_util_mmcblk0.csv", "chart": "disk_util.mmcblk0"},
+        # run_experiment.sh의 pick_io_chart와 같은 후보 순서
+        {"file": "disk_io_mmcblk0.csv", "chart": ["disk.io.mmcblk0", "disk_io.mmcblk0", "disk.io_mmcblk0"]},
+    ],
+    "samplers": ["diskstats", "thermal"],
+    "cooldown": {"mode": "adaptive", "sec": 10, "baseline_step": "step03_cluster_idle"},
+    "analyze": ['python3 "${REPO_ROOT}/analysis/plot_step04.py" --step "${STEP}"'],
+}
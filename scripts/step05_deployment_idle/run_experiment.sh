@@ -30,6 +30,7 @@
 # - END_EPOCH   : START_EPOCH + DURATION_SEC 관찰 후 timestamp
 # - T_ready = 0
 # - T_total = END_EPOCH - START_EPOCH
+# - START/READY/END는 *_EPOCH_NS / *_MONO_NS도 기록, T_total은 monotonic 차이(소수 3자리)로 한 번만 기록 (scripts/utils/marker.sh)
 # - export_csv는 [START_EPOCH, END_EPOCH] 구간을 Netdata API로 5초 평균(group=average, points=ceil(dur/5))으로 export
 set -euo pipefail
 
@@ -38,6 +39,7 @@ RUNS="${RUNS:-10}"
 DURATION_SEC="${DURATION_SEC:-300}"
 
 REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+source "${REPO_ROOT}/scripts/utils/marker.sh"
 LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP}"
 DATA_DIR="${REPO_ROOT}/data/netdata/${STEP}"
 RES_DIR="${REPO_ROOT}/results/${STEP}"
@@ -109,13 +111,14 @@ for i in $(seq 1 "${RUNS}"); do
   RUN_DATA="${DATA_DIR}/run_${i}"
   mkdir -p "${RUN_DATA}"
 
-  READY_EPOCH="$(date +%s)"
-  START_EPOCH="${READY_EPOCH}"
+  marks_reset
+  mark READY
+  mark_copy START READY
   sleep "${DURATION_SEC}"
-  END_EPOCH="$(date +%s)"
+  mark END
+  mark_span T_total START END
 
   T_READY=0
-  T_TOTAL="$((END_EPOCH - START_EPOCH))"
 
   cat > "${RUN_LOG}" <<EOL
 STEP=${STEP}
@@ -124,8 +127,8 @@ START_EPOCH=${START_EPOCH}
 READY_EPOCH=${READY_EPOCH}
 END_EPOCH=${END_EPOCH}
 T_ready=${T_READY}
-T_total=${T_TOTAL}
 EOL
+  marks_log >> "${RUN_LOG}"
 
   export_csv "${CPU_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/system_cpu.csv"
   export_csv "${RAM_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/system_ram.csv"
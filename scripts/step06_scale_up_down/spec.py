@@ -0,0 +1,47 @@
+# step06_scale_up_down: scripts/utils/runner.py용 spec (run_experiment.sh는 이 spec으로 runner.py를 exec 한다)
+# - 1 run = scale down(REPLICAS_HIGH -> REPLICAS_LOW) + scale up(REPLICAS_LOW -> REPLICAS_HIGH)
+# - START = DOWN_START, READY = DOWN_END, END = UP_END
+#
+# 사용:
+#   python3 scripts/utils/runner.py scripts/step06_scale_up_down/spec.py
+SPEC = {
+    "step": "step06_scale_up_down",
+    "runs": 10,
+    "env": {
+        "DEPLOY": "nginx",
+        "REPLICAS_HIGH": "3",
+        "REPLICAS_LOW": "1",
+        "NETDATA_URL": "http://127.0.0.1:19999",
+        "CPU_CHART": "system.cpu",
+        "RAM_CHART": "system.ram",
+        "DISK_UTIL_CHART": "disk_util.mmcblk0",
+        "IO_CHART": "system.io",
+        "MANIFEST": "${REPO_ROOT}/scripts/step04_apply_deployment/nginx-deployment.yaml",
+    },
+    "prepare": [
+        {"run": "kubectl wait --for=condition=Ready nodes --all --timeout=180s"},
+        {"run": 'kubectl get deploy/"${DEPLOY}" || { [[ -f "${MANIFEST}" ]] && kubectl apply -f "${MANIFEST}"; }'},
+        {"run": 'kubectl scale deploy/"${DEPLOY}" --replicas="${REPLICAS_HIGH}"', "check": False},
+        {"run": 'kubectl rollout status deploy/"${DEPLOY}" --timeout=300s'},
+    ],
+    "actions": [
+        {"mark": ["DOWN_START", "START"]},
+        {"run": 'kubectl scale deploy/"${DEPLOY}" --replicas="${REPLICAS_LOW}"'},
+        {"wait": 'kubectl rollout status deploy/"${DEPLOY}" --timeout=300s', "interval": 0, "mark": ["DOWN_END", "READY"]},
+        {"mark": "UP_START"},
+        {"run": 'kubectl scale deploy/"${DEPLOY}" --replicas="${REPLICAS_HIGH}"'},
+        {"wait": 'kubectl rollout status deploy/"${DEPLOY}" --timeout=300s', "interval": 0, "mark": ["UP_END", "END"]},
+    ],
+    "log": ["START", "READY", "END", "DOWN_START", "DOWN_END", "UP_START", "UP_END"],
+    "durations": {"T_down": ["DOWN_START", "DOWN_END"], "T_up": ["UP_START", "UP_END"], "T_total": ["START", "END"]},
+    "export": {"from": "START", "to": "END"},
+    "charts": [
+        {"file": "system_cpu.csv", "chart": "${CPU_CHART}"},
+        {"file": "system_ram.csv", "chart": "${RAM_CHART}"},
+        {"file": "disk_util_mmcblk0.csv", "chart": "${DISK_UTIL_CHART}"},
+        {"file": "disk_io_mmcblk0.csv", "chart": "${IO_CHART}"},
+    ],
+    "samplers": ["diskstats", "thermal"],
+    "cooldown": {"mode": "adaptive", "sec": 10, "baseline_step": "step05_deployment_idle"},
+    "analyze": ['python3 "${REPO_ROOT}/analysis/plot_step06.py" --step "${STEP}"'],
+}
@@ -4,12 +4,16 @@
 #
 # Artifacts (per run):
 # - logs/redacted/step07_rollout_restart/run_<i>.log
-#     STEP/RUN/START_EPOCH/END_EPOCH/T_total 기록
+#     STEP/RUN/START_EPOCH/END_EPOCH/T_total (+ DEPLOY_AVAILABLE_EPOCH) 기록
 # - data/netdata/step07_rollout_restart/run_<i>/
 #     system_cpu.csv
 #     system_ram.csv
 #     disk_util_mmcblk0.csv
 #     disk_io_mmcblk0.csv
+#     diskstats_mmcblk0.csv (DISKSTATS=1, runner sampler)
+#     thermal_temp.csv / cpu_freq.csv / cpu_throttled.csv (THERMAL=1, runner sampler)
+#     <node>/*.csv, nodes.csv (MULTINODE=1, 모든 node export, scripts/utils/nodes_export.py)
+#     clock_offset.csv (run 시작/끝 node별 clock offset, CLOCK_SYNC=1)
 # - results/step07_rollout_restart/
 #     (analysis/plot_step07.py가 생성하는 산출물: fig/stats 등)
 #
@@ -23,102 +27,24 @@
 # - IO_CHART      : IO chart id (default: system.io)
 # - MANIFEST      : DEPLOY가 없을 때 apply할 manifest 경로
 #                  (default: scripts/step04_apply_deployment/nginx-deployment.yaml)
+# - COOLDOWN_MODE / COOLDOWN_SEC : run 사이 대기 (default: spec의 adaptive 10초, scripts/utils/runner.py)
 #
 # Epoch definition:
 # - START_EPOCH : `kubectl rollout restart deploy/$DEPLOY` 실행 직전 timestamp
 # - END_EPOCH   : `kubectl rollout status deploy/$DEPLOY` 완료 직후 timestamp
 # - T_total     : END_EPOCH - START_EPOCH
-# - export_csv  : [START_EPOCH, END_EPOCH] 구간을 Netdata API로 5초 평균(group=average, points=ceil(dur/5))으로 export
+# - DEPLOY_AVAILABLE_EPOCH : watch API(scripts/utils/k8s_watch.py)로 본 rollout 완료 시각 (소수 초, 참고용)
+# - 모든 marker는 *_EPOCH_NS / *_MONO_NS도 기록, T_*는 monotonic 차이(소수 3자리)로 한 번만 기록
+# - Netdata export는 [START_EPOCH, END_EPOCH] 구간 5초 평균(group=average, points=ceil(dur/5))
+#
+# 실제 절차(prepare / actions / teardown / charts)는 scripts/step07_rollout_restart/spec.py에 있고,
+# 이 script는 scripts/utils/runner.py로 넘기기만 한다. 인자는 runner.py로 그대로 전달된다.
+#
+# 사용:
+#   bash scripts/step07_rollout_restart/run_experiment.sh
+#   RUNS=3 bash scripts/step07_rollout_restart/run_experiment.sh --start-run 4
+#   bash scripts/step07_rollout_restart/run_experiment.sh --dry-run
 set -euo pipefail
 
-STEP="step07_rollout_restart"
-RUNS="${RUNS:-10}"
-DEPLOY="${DEPLOY:-nginx}"
-
 REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
-LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP}"
-DATA_DIR="${REPO_ROOT}/data/netdata/${STEP}"
-RES_DIR="${REPO_ROOT}/results/${STEP}"
-
-NETDATA_URL="${NETDATA_URL:-http://127.0.0.1:19999}"
-
-CPU_CHART="${CPU_CHART:-system.cpu}"
-RAM_CHART="${RAM_CHART:-system.ram}"
-DISK_UTIL_CHART="${DISK_UTIL_CHART:-disk_util.mmcblk0}"
-IO_CHART="${IO_CHART:-system.io}"
-
-MANIFEST="${MANIFEST:-${REPO_ROOT}/scripts/step04_apply_deployment/nginx-deployment.yaml}"
-
-mkdir -p "${LOG_DIR}" "${DATA_DIR}" "${RES_DIR}"
-
-require_cmd() { command -v "$1" >/dev/null 2>&1 || { echo "missing command: $1" >&2; exit 1; }; }
-require_cmd date
-require_cmd kubectl
-require_cmd curl
-require_cmd python3
-
-calc_points() {
-  local after="$1" before="$2"
-  local dur=$((before - after))
-  local p=$(( (dur + 4) / 5 ))
-  if (( p < 2 )); then p=2; fi
-  echo "${p}"
-}
-
-export_csv() {
-  local chart="$1" after="$2" before="$3" out="$4"
-  local points; points="$(calc_points "${after}" "${before}")"
-  curl -sS -G "${NETDATA_URL}/api/v1/data" \
-    --data-urlencode "chart=${chart}" \
-    --data-urlencode "after=${after}" \
-    --data-urlencode "before=${before}" \
-    --data-urlencode "group=average" \
-    --data-urlencode "points=${points}" \
-    --data-urlencode "format=csv" \
-    --data-urlencode "options=seconds,flip" \
-    > "${out}"
-}
-
-prep_rollout() {
-  kubectl wait --for=condition=Ready nodes --all --timeout=180s >/dev/null
-  if ! kubectl get deploy/"${DEPLOY}" >/dev/null 2>&1; then
-    [[ -f "${MANIFEST}" ]] && kubectl apply -f "${MANIFEST}" >/dev/null
-  fi
-  kubectl rollout status deploy/"${DEPLOY}" --timeout=300s >/dev/null
-}
-
-echo "[${STEP}] RUNS=${RUNS}, deploy=${DEPLOY}"
-echo "[${STEP}] charts cpu=${CPU_CHART} ram=${RAM_CHART} disk_util=${DISK_UTIL_CHART} io=${IO_CHART}"
-
-for i in $(seq 1 "${RUNS}"); do
-  echo "== [${STEP}] run_${i}/${RUNS} =="
-
-  prep_rollout
-
-  RUN_LOG="${LOG_DIR}/run_${i}.log"
-  RUN_DATA="${DATA_DIR}/run_${i}"
-  mkdir -p "${RUN_DATA}"
-
-  START_EPOCH="$(date +%s)"
-  kubectl rollout restart deploy/"${DEPLOY}" >/dev/null
-  kubectl rollout status deploy/"${DEPLOY}" --timeout=300s >/dev/null
-  END_EPOCH="$(date +%s)"
-
-  T_TOTAL="$((END_EPOCH - START_EPOCH))"
-
-  cat > "${RUN_LOG}" <<EOL
-STEP=${STEP}
-RUN=${i}
-START_EPOCH=${START_EPOCH}
-END_EPOCH=${END_EPOCH}
-T_total=${T_TOTAL}
-EOL
-
-  export_csv "${CPU_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/system_cpu.csv"
-  export_csv "${RAM_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/system_ram.csv"
-  export_csv "${DISK_UTIL_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/disk_util_mmcblk0.csv"
-  export_csv "${IO_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/disk_io_mmcblk0.csv"
-done
-
-python3 "${REPO_ROOT}/analysis/plot_step07.py" --step "${STEP}"
-echo "[DONE] ${STEP}"
+exec python3 "${REPO_ROOT}/scripts/utils/runner.py" "${REPO_ROOT}/scripts/step07_rollout_restart/spec.py" "$@"
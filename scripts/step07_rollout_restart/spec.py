@@ -0,0 +1,45 @@
+# step07_rollout_restart: scripts/utils/runner.py용 spec (run_experiment.sh는 이 spec으로 runner.py를 exec 한다)
+# - START_EPOCH : `kubectl rollout restart` 직전
+# - END_EPOCH   : `kubectl rollout status` 완료 직후
+# - DEPLOY_AVAILABLE_EPOCH : watch API로 본 rollout 완료 시각 (소수 초, 참고용)
+#
+# 사용:
+#   python3 scripts/utils/runner.py scripts/step07_rollout_restart/spec.py
+SPEC = {
+    "step": "step07_rollout_restart",
+    "runs": 10,
+    "env": {
+        "DEPLOY": "nginx",
+        "NETDATA_URL": "http://127.0.0.1:19999",
+        "CPU_CHART": "system.cpu",
+        "RAM_CHART": "system.ram",
+        "DISK_UTIL_CHART": "disk_util.mmcblk0",
+        "IO_CHART": "system.io",
+        "MANIFEST": "${REPO_ROOT}/scripts/step04_apply_deployment/nginx-deployment.yaml",
+    },
+    "prepare": [
+        {"run": "kubectl wait --for=condition=Ready nodes --all --timeout=180s"},
+        {"run": 'kubectl get deploy/"${DEPLOY}" || { [[ -f "${MANIFEST}" ]] && kubectl apply -f "${MANIFEST}"; }'},
+        {"run": 'kubectl rollout status deploy/"${DEPLOY}" --timeout=300s'},
+    ],
+    "actions": [
+        {"watch": "rollout", "args": ["--watch", "deployments", "--deploy", "${DEPLOY}"],
+         "until": ["DEPLOY_AVAILABLE"], "timeout": 300},
+        {"mark": "START"},
+        {"run": 'kubectl rollout restart deploy/"${DEPLOY}"'},
+        {"wait": 'kubectl rollout status deploy/"${DEPLOY}" --timeout=300s', "interval": 0, "mark": "END"},
+        {"join": "rollout", "on_timeout": "skip"},
+    ],
+    "log": ["START", "END"],
+    "durations": {"T_total": ["START", "END"]},
+    "export": {"from": "START", "to": "END"},
+    "charts": [
+        {"file": "system_cpu.csv", "chart": "${CPU_CHART}"},
+        {"file": "system_ram.csv", "chart": "${RAM_CHART}"},
+        {"file": "disk_util_mmcblk0.csv", "chart": "${DISK_UTIL_CHART}"},
+        {"file": "disk_io_mmcblk0.csv", "chart": "${IO_CHART}"},
+    ],
+    "samplers": ["diskstats", "thermal"],
+    "cooldown": {"mode": "adaptive", "sec": 10, "baseline_step": "step05_deployment_idle"},
+    "analyze": ['python3 "${REPO_ROOT}/analysis/plot_step07.py" --step "${STEP}"'],
+}
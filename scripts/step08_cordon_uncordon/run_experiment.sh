@@ -31,6 +31,8 @@
 # - IO_CHART        : IO chart id (default: system.io)
 # - MANIFEST        : DEPLOY가 없을 때 apply할 manifest 경로
 #                    (default: scripts/step04_apply_deployment/nginx-deployment.yaml)
+# - WAIT_MODE       : watch = k8s watch API(scripts/utils/k8s_watch.py), poll = 1초 kubectl polling (default: watch)
+#                    watch 모드는 segment B/C에 POD_PENDING/POD_SCHEDULED/POD_RUNNING/PODS_RUNNING_EPOCH(소수 초)를 추가 기록
 #
 # Epoch definition:
 # - Segment A (cordon window)
@@ -45,6 +47,8 @@
 #   - START_EPOCH = C_START (uncordon 실행 시각)
 #   - END_EPOCH   = C_END   (Running >= 3 도달 시각; 아니면 timeout 시각)
 # - T_total은 각 segment에서 (END_EPOCH - START_EPOCH)로 기록
+# - segment마다 START/READY/END의 *_EPOCH_NS / *_MONO_NS도 기록, T_ready/T_total은 monotonic 차이로 한 번만 기록
+#   (scripts/utils/marker.sh, watch 모드의 B_READY/B_END/C_END는 watch가 잰 소수 초 wall clock)
 set -euo pipefail
 
 STEP="step08_cordon_uncordon"
@@ -57,6 +61,7 @@ WINDOW_SEC="${WINDOW_SEC:-60}"
 PENDING_TIMEOUT="${PENDING_TIMEOUT:-300}"
 
 REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+source "${REPO_ROOT}/scripts/utils/marker.sh"
 LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP}"
 DATA_DIR="${REPO_ROOT}/data/netdata/${STEP}"
 RES_DIR="${REPO_ROOT}/results/${STEP}"
@@ -69,6 +74,7 @@ DISK_UTIL_CHART="${DISK_UTIL_CHART:-disk_util.mmcblk0}"
 IO_CHART="${IO_CHART:-system.io}"
 
 MANIFEST="${MANIFEST:-${REPO_ROOT}/scripts/step04_apply_deployment/nginx-deployment.yaml}"
+WAIT_MODE="${WAIT_MODE:-watch}"
 
 mkdir -p "${LOG_DIR}" "${DATA_DIR}" "${RES_DIR}"
 
@@ -115,6 +121,44 @@ wait_all_running_replicas() {
   return 1
 }
 
+# start_pod_watch <out_file> <timeout> <until...>
+# watch가 LIST까지 끝난 뒤 돌아온다 (그 전의 event를 놓치지 않게).
+start_pod_watch() {
+  local out="$1" timeout="$2"; shift 2
+  local ready="${out}.ready"
+  rm -f "${out}" "${ready}"
+  python3 "${REPO_ROOT}/scripts/utils/k8s_watch.py" \
+    --watch pods --selector "app=${DEPLOY}" --replicas 3 \
+    --timeout "${timeout}" --until "$@" --ready-file "${ready}" > "${out}" &
+  WATCH_PID=$!
+  local n=0
+  while [[ ! -e "${ready}" ]] && (( n < 100 )); do sleep 0.1; n=$((n + 1)); done
+  rm -f "${ready}"
+}
+
+# watch_mark <NAME> <file> <KEY>  -> watch가 잰 소수 초를 NAME marker로 (없으면 0 아닌 status)
+watch_mark() {
+  local t
+  t="$(grep "^$3_EPOCH=" "$2" 2>/dev/null | tail -n 1 | cut -d= -f2 || true)"
+  [[ -n "${t}" ]] || return 1
+  mark_at "$1" "${t}"
+}
+
+# seg_marks <START> <READY|""> <END>  -> segment 블록에 넣을 START/READY/END의 *_NS 줄과 T_ready/T_total
+seg_marks() {
+  marks_reset
+  mark_copy START "$1"
+  if [[ -n "$2" ]]; then
+    mark_copy READY "$2"
+    mark_span T_ready START READY
+  fi
+  mark_copy END "$3"
+  mark_span T_total START END
+  marks_log
+  # READY가 없는 segment도 T_ready key는 (빈 값으로) 남긴다
+  [[ -n "$2" ]] || echo "T_ready="
+}
+
 prep() {
   kubectl wait --for=condition=Ready nodes --all --timeout=180s >/dev/null
   if ! kubectl get deploy/"${DEPLOY}" >/dev/null 2>&1; then
@@ -139,11 +183,11 @@ for i in $(seq 1 "${RUNS}"); do
   mkdir -p "${RUN_DATA}"
 
   ######## Segment A: cordon (전후 60초씩 관찰) ########
-  A_START="$(date +%s)"
+  mark A_START
   kubectl cordon "${WORKER}" >/dev/null
-  A_END="$(date +%s)"
-  A_AFTER=$((A_START - WINDOW_SEC))
-  A_BEFORE=$((A_END + WINDOW_SEC))
+  mark A_END
+  A_AFTER=$((A_START_EPOCH - WINDOW_SEC))
+  A_BEFORE=$((A_END_EPOCH + WINDOW_SEC))
 
   mkdir -p "${RUN_DATA}/segA_cordon"
   export_csv "${CPU_CHART}" "${A_AFTER}" "${A_BEFORE}" "${RUN_DATA}/segA_cordon/system_cpu.csv"
@@ -153,71 +197,87 @@ for i in $(seq 1 "${RUNS}"); do
 
   ######## Segment B: deploy/scale=3 시도 -> pending 관찰 ########
   # start = scale 실행 시각
-  B_START="$(date +%s)"
+  mkdir -p "${RUN_DATA}/segB_pending"
+  B_WATCH="${RUN_DATA}/segB_pending/watch_markers.log"
+  if [[ "${WAIT_MODE}" == "watch" ]]; then
+    start_pod_watch "${B_WATCH}" "${PENDING_TIMEOUT}" PODS_RUNNING
+  fi
+  B_READY_EPOCH=""
+  mark B_START
   kubectl scale deploy/"${DEPLOY}" --replicas=3 >/dev/null
 
-  B_READY=""
-  end_deadline=$((B_START + PENDING_TIMEOUT))
-  while (( $(date +%s) < end_deadline )); do
-    if kubectl get pod -l app="${DEPLOY}" --no-headers 2>/dev/null | awk '$3=="Pending"{found=1} END{exit !found}'; then
-      B_READY="$(date +%s)"
-      break
-    fi
-    sleep 1
-  done
-
-  if wait_all_running_replicas 3 "${PENDING_TIMEOUT}"; then
-    B_END="$(date +%s)"
+  if [[ "${WAIT_MODE}" == "watch" ]]; then
+    wait "${WATCH_PID}" || true
+    watch_mark B_READY "${B_WATCH}" POD_PENDING || true
+    watch_mark B_END "${B_WATCH}" PODS_RUNNING || mark B_END
   else
-    B_END="$(date +%s)"
+    end_deadline=$((B_START_EPOCH + PENDING_TIMEOUT))
+    while (( $(date +%s) < end_deadline )); do
+      if kubectl get pod -l app="${DEPLOY}" --no-headers 2>/dev/null | awk '$3=="Pending"{found=1} END{exit !found}'; then
+        mark B_READY
+        break
+      fi
+      sleep 1
+    done
+
+    if wait_all_running_replicas 3 "${PENDING_TIMEOUT}"; then
+      mark B_END
+    else
+      mark B_END
+    fi
   fi
 
-  mkdir -p "${RUN_DATA}/segB_pending"
-  export_csv "${CPU_CHART}" "${B_START}" "${B_END}" "${RUN_DATA}/segB_pending/system_cpu.csv"
-  export_csv "${RAM_CHART}" "${B_START}" "${B_END}" "${RUN_DATA}/segB_pending/system_ram.csv"
-  export_csv "${DISK_UTIL_CHART}" "${B_START}" "${B_END}" "${RUN_DATA}/segB_pending/disk_util_mmcblk0.csv"
-  export_csv "${IO_CHART}" "${B_START}" "${B_END}" "${RUN_DATA}/segB_pending/disk_io_mmcblk0.csv"
+  export_csv "${CPU_CHART}" "${B_START_EPOCH}" "${B_END_EPOCH}" "${RUN_DATA}/segB_pending/system_cpu.csv"
+  export_csv "${RAM_CHART}" "${B_START_EPOCH}" "${B_END_EPOCH}" "${RUN_DATA}/segB_pending/system_ram.csv"
+  export_csv "${DISK_UTIL_CHART}" "${B_START_EPOCH}" "${B_END_EPOCH}" "${RUN_DATA}/segB_pending/disk_util_mmcblk0.csv"
+  export_csv "${IO_CHART}" "${B_START_EPOCH}" "${B_END_EPOCH}" "${RUN_DATA}/segB_pending/disk_io_mmcblk0.csv"
 
   ######## Segment C: uncordon → pending Running ########
-  C_START="$(date +%s)"
+  mkdir -p "${RUN_DATA}/segC_uncordon"
+  C_WATCH="${RUN_DATA}/segC_uncordon/watch_markers.log"
+  if [[ "${WAIT_MODE}" == "watch" ]]; then
+    start_pod_watch "${C_WATCH}" "${PENDING_TIMEOUT}" PODS_RUNNING
+  fi
+  mark C_START
   kubectl uncordon "${WORKER}" >/dev/null
 
-  if wait_all_running_replicas 3 "${PENDING_TIMEOUT}"; then
-    C_END="$(date +%s)"
+  if [[ "${WAIT_MODE}" == "watch" ]]; then
+    wait "${WATCH_PID}" || true
+    watch_mark C_END "${C_WATCH}" PODS_RUNNING || mark C_END
+  elif wait_all_running_replicas 3 "${PENDING_TIMEOUT}"; then
+    mark C_END
   else
-    C_END="$(date +%s)"
+    mark C_END
   fi
 
-  mkdir -p "${RUN_DATA}/segC_uncordon"
-  export_csv "${CPU_CHART}" "${C_START}" "${C_END}" "${RUN_DATA}/segC_uncordon/system_cpu.csv"
-  export_csv "${RAM_CHART}" "${C_START}" "${C_END}" "${RUN_DATA}/segC_uncordon/system_ram.csv"
-  export_csv "${DISK_UTIL_CHART}" "${C_START}" "${C_END}" "${RUN_DATA}/segC_uncordon/disk_util_mmcblk0.csv"
-  export_csv "${IO_CHART}" "${C_START}" "${C_END}" "${RUN_DATA}/segC_uncordon/disk_io_mmcblk0.csv"
+  export_csv "${CPU_CHART}" "${C_START_EPOCH}" "${C_END_EPOCH}" "${RUN_DATA}/segC_uncordon/system_cpu.csv"
+  export_csv "${RAM_CHART}" "${C_START_EPOCH}" "${C_END_EPOCH}" "${RUN_DATA}/segC_uncordon/system_ram.csv"
+  export_csv "${DISK_UTIL_CHART}" "${C_START_EPOCH}" "${C_END_EPOCH}" "${RUN_DATA}/segC_uncordon/disk_util_mmcblk0.csv"
+  export_csv "${IO_CHART}" "${C_START_EPOCH}" "${C_END_EPOCH}" "${RUN_DATA}/segC_uncordon/disk_io_mmcblk0.csv"
 
   cat > "${RUN_LOG}" <<EOL
 STEP=${STEP}
 RUN=${i}
 
 SEG_A=cordon
-START_EPOCH=${A_START}
+START_EPOCH=${A_START_EPOCH}
 READY_EPOCH=
-END_EPOCH=${A_END}
-T_ready=
-T_total=$((A_END - A_START))
+END_EPOCH=${A_END_EPOCH}
+$(seg_marks A_START "" A_END)
 
 SEG_B=pending
-START_EPOCH=${B_START}
-READY_EPOCH=${B_READY}
-END_EPOCH=${B_END}
-T_ready=$([[ -n "${B_READY}" ]] && echo $((B_READY - B_START)) || echo "")
-T_total=$((B_END - B_START))
+START_EPOCH=${B_START_EPOCH}
+READY_EPOCH=${B_READY_EPOCH}
+END_EPOCH=${B_END_EPOCH}
+$(seg_marks B_START "${B_READY_EPOCH:+B_READY}" B_END)
+$(cat "${B_WATCH}" 2>/dev/null || true)
 
 SEG_C=uncordon
-START_EPOCH=${C_START}
+START_EPOCH=${C_START_EPOCH}
 READY_EPOCH=
-END_EPOCH=${C_END}
-T_ready=
-T_total=$((C_END - C_START))
+END_EPOCH=${C_END_EPOCH}
+$(seg_marks C_START "" C_END)
+$(cat "${C_WATCH}" 2>/dev/null || true)
 EOL
 
 done
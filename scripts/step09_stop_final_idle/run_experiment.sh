@@ -24,6 +24,7 @@
 # - START_EPOCH : `sudo systemctl stop k3s` 실행 시각 (stop 명령 시점)
 # - END_EPOCH   : stop 이후 WINDOW_SEC 관찰이 끝난 시각
 # - T_total     : END_EPOCH - START_EPOCH
+# - START/END는 *_EPOCH_NS / *_MONO_NS도 기록, T_total은 monotonic 차이(소수 3자리)로 한 번만 기록 (scripts/utils/marker.sh)
 # - export_csv  : [START_EPOCH, END_EPOCH] 구간을 Netdata API로 5초 평균(group=average, points=ceil(dur/5))으로 export
 set -euo pipefail
 
@@ -34,6 +35,7 @@ RUNS="${RUNS:-1}"
 WINDOW_SEC="${WINDOW_SEC:-60}"   # stop 직후 관찰 구간(초) - 기본 60초
 
 REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
+source "${REPO_ROOT}/scripts/utils/marker.sh"
 LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP}"
 DATA_DIR="${REPO_ROOT}/data/netdata/${STEP}"
 RES_DIR="${REPO_ROOT}/results/${STEP}"
@@ -90,7 +92,8 @@ for i in $(seq 1 "${RUNS}"); do
   mkdir -p "${RUN_DATA}"
 
   # start: k3s stop 실행 시각
-  START_EPOCH="$(date +%s)"
+  marks_reset
+  mark START
 
   # (선택) 워커도 같이 내리려면 아래 SSH 라인 추가해서 사용
   # ssh <worker_user>@<worker_host> "sudo systemctl stop k3s-agent" || true
@@ -100,16 +103,16 @@ for i in $(seq 1 "${RUNS}"); do
   # stop 직후 WINDOW_SEC 동안 관찰(리소스 하강)
   sleep "${WINDOW_SEC}"
 
-  END_EPOCH="$(date +%s)"
-  T_TOTAL="$((END_EPOCH - START_EPOCH))"
+  mark END
+  mark_span T_total START END
 
   cat > "${RUN_LOG}" <<EOL
 STEP=${STEP}
 RUN=${i}
 START_EPOCH=${START_EPOCH}
 END_EPOCH=${END_EPOCH}
-T_total=${T_TOTAL}
 EOL
+  marks_log >> "${RUN_LOG}"
 
   # netdata는 k3s랑 무관하게 떠있으니 export 가능해야 정상
   export_csv "${CPU_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${RUN_DATA}/system_cpu.csv"
@@ -0,0 +1,42 @@
+# step10_delete_deployment: scripts/utils/runner.py용 spec (run_experiment.sh는 이 spec으로 runner.py를 exec 한다)
+# - START_EPOCH : `kubectl delete deployment nginx` 직전
+# - END_EPOCH   : `kubectl get deploy nginx`가 실패하는 첫 시각 (TIMEOUT_SEC 초과 시 그 시각)
+#
+# 사용:
+#   python3 scripts/utils/runner.py scripts/step10_delete_deployment/spec.py
+SPEC = {
+    "step": "step10_delete_deployment",
+    "runs": 10,
+    "env": {
+        "TIMEOUT_SEC": "180",
+        "NETDATA_URL": "http://127.0.0.1:19999",
+        "CPU_CHART": "system.cpu",
+        "RAM_CHART": "system.ram",
+        "DISK_UTIL_CHART": "disk_util.mmcblk0",
+        "IO_CHART": "system.io",
+        "MANIFEST": "${REPO_ROOT}/scripts/step04_apply_deployment/nginx-deployment.yaml",
+    },
+    "prepare": [
+        {"run": "kubectl wait --for=condition=Ready nodes --all --timeout=180s"},
+        {"run": 'kubectl get deploy nginx || kubectl apply -f "${MANIFEST}"'},
+        {"run": 'kubectl rollout status deploy/nginx --timeout="${TIMEOUT_SEC}s"'},
+    ],
+    "actions": [
+        {"mark": "START"},
+        {"run": "kubectl delete deployment nginx --ignore-not-found", "check": False},
+        {"wait": "! kubectl get deploy nginx", "interval": 1, "timeout": "${TIMEOUT_SEC}",
+         "mark": "END", "on_timeout": "mark"},
+    ],
+    "log": ["START", "END"],
+    "durations": {"T_total": ["START", "END"]},
+    "export": {"from": "START", "to": "END"},
+    "charts": [
+        {"file": "system_cpu.csv", "chart": "${CPU_CHART}"},
+        {"file": "system_ram.csv", "chart": "${RAM_CHART}"},
+        {"file": "disk_util_mmcblk0.csv", "chart": "${DISK_UTIL_CHART}"},
+        {"file": "disk_io_mmcblk0.csv", "chart": "${IO_CHART}"},
+    ],
+    "samplers": ["diskstats", "thermal"],
+    "cooldown": {"mode": "adaptive", "sec": 10, "baseline_step": "step05_deployment_idle"},
+    "analyze": ['python3 "${REPO_ROOT}/analysis/plot_step10.py" --step "${STEP}"'],
+}
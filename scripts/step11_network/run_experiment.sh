@@ -9,6 +9,7 @@
 # - data/network/step11_network/run_<RUN_IDX>/
 #     ping_master_to_<name>.txt
 #     iperf_master_to_<name>_tcp.json
+#     clock_offset.csv   (run 시작/끝 worker clock offset, scripts/utils/nodes.sh nodes_clock)
 #
 # Env variables / Params:
 # - RUN_IDX: 첫 번째 인자($1)로 받는 run index (필수)
@@ -18,11 +19,13 @@
 # - IPERF_STREAMS  : iperf3 parallel streams(-P) (default: 1)
 # - COOLDOWN       : 각 worker 측정 후 cooldown 초 (default: 30)
 # - WORKERS        : "name ip" 배열 (각 worker는 iperf3 서버 떠있기)
+# - CLOCK_SYNC     : 1이면 run 시작/끝에 worker clock offset 측정 (default: 1, CLOCK_METHOD=ssh|udp)
 #
 # Epoch definition:
 # - START_EPOCH : run 시작 시각 (WORKERS 순회 전)
 # - END_EPOCH   : 모든 worker 측정 완료 후 시각
 # - T_total     : END_EPOCH - START_EPOCH
+# - START/END는 *_EPOCH_NS / *_MONO_NS도 기록, T_total은 monotonic 차이(소수 3자리)로 한 번만 기록 (scripts/utils/marker.sh)
 set -euo pipefail
 
 PING_COUNT=20
@@ -46,12 +49,20 @@ if [[ -z "${RUN_IDX}" ]]; then
   exit 1
 fi
 
+source "$(cd "$(dirname "$0")/../.." && pwd)/scripts/utils/nodes.sh"
+source "$(cd "$(dirname "$0")/../.." && pwd)/scripts/utils/marker.sh"
+CLOCK_NODES=()
+for w in "${WORKERS[@]}"; do
+  CLOCK_NODES+=("$(echo "${w}" | awk '{print $1 "=" $2}')")
+done
+
 RUN_DIR_DATA="data/network/${STEP_NAME}/run_${RUN_IDX}"
 RUN_LOG="logs/redacted/${STEP_NAME}/run_${RUN_IDX}.log"
 mkdir -p "${RUN_DIR_DATA}"
 mkdir -p "$(dirname "${RUN_LOG}")"
 
-START_EPOCH="$(date +%s)"
+nodes_clock "${RUN_DIR_DATA}" start "${CLOCK_NODES[@]}"
+mark START
 {
   echo "STEP=${STEP_NAME}"
   echo "RUN_IDX=${RUN_IDX}"
@@ -87,11 +98,12 @@ for w in "${WORKERS[@]}"; do
   sleep "${COOLDOWN}"
 done
 
-END_EPOCH="$(date +%s)"
-T_TOTAL="$(( END_EPOCH - START_EPOCH ))"
+mark END
+mark_span T_total START END
+nodes_clock "${RUN_DIR_DATA}" end "${CLOCK_NODES[@]}"
 
 {
   echo
   echo "END_EPOCH=${END_EPOCH}"
-  echo "T_total=${T_TOTAL}"
+  marks_log
 } | tee -a "${RUN_LOG}"
@@ -8,6 +8,10 @@ ALL_LOG="${BASE_DIR}/scripts/${STEP}/logs/redacted/run_all_summary.log"
 
 mkdir -p "${BASE_DIR}/scripts/${STEP}/logs/redacted"
 
+# run 사이 cooldown: idle(step03) 수준으로 돌아와 안정될 때까지 (COOLDOWN_MODE=fixed 이면 sleep 30)
+COOLDOWN_BASELINE_STEP="${COOLDOWN_BASELINE_STEP:-step03_cluster_idle}"
+source "${BASE_DIR}/scripts/utils/cooldown.sh"
+
 echo "========================================" | tee "${ALL_LOG}"
 echo "STEP: ${STEP}" | tee -a "${ALL_LOG}"
 echo "RUNS: ${RUNS}" | tee -a "${ALL_LOG}"
@@ -18,11 +22,13 @@ for i in $(seq 1 ${RUNS}); do
   echo "" | tee -a "${ALL_LOG}"
   echo "--- RUN ${i}/${RUNS} START: $(date '+%Y-%m-%d %H:%M:%S') ---" | tee -a "${ALL_LOG}"
   bash "${SCRIPT_DIR}/run_experiment.sh" "${i}" 2>&1 | tee -a "${ALL_LOG}"
+  cooldown_record "${BASE_DIR}/scripts/${STEP}/logs/redacted/run_${i}.log"
   echo "--- RUN ${i}/${RUNS} END: $(date '+%Y-%m-%d %H:%M:%S') ---" | tee -a "${ALL_LOG}"
   if [ "${i}" -lt "${RUNS}" ]; then
     kubectl delete deployment tinyllama-server --ignore-not-found=true 2>/dev/null
     kubectl delete service tinyllama-service --ignore-not-found=true 2>/dev/null
-    sleep 30
+    cooldown_wait
+    echo "${COOLDOWN_LINES}" | tee -a "${ALL_LOG}"
   fi
 done
 
@@ -15,6 +15,12 @@ NETDATA_PORT="19999"
 
 mkdir -p "${DATA_DIR}" "${RESULT_DIR}" "${LOG_DIR}"
 
+# worker 포함 모든 node의 chart -> ${DATA_DIR}/<node>/ (MULTINODE=0이면 끔)
+# START 직전 / END 직후 node별 clock offset -> clock_offset.csv (CLOCK_SYNC=0이면 끔)
+source "${BASE_DIR}/scripts/utils/nodes.sh"
+# 각 *_EPOCH와 같은 순간의 *_EPOCH_NS / *_MONO_NS, monotonic T_ready/T_load/T_total을 log 끝에 붙임
+source "${BASE_DIR}/scripts/utils/marker.sh"
+
 fetch_csv() {
   local chart="$1"
   local after="$2"
@@ -30,7 +36,42 @@ kubectl delete deployment tinyllama-server --ignore-not-found=true
 kubectl delete service tinyllama-service --ignore-not-found=true
 sleep 10
 
-START_EPOCH=$(date +%s)
+# T_ready 단계 분해용 (analysis/pod_startup.py)
+# - k8s watch로 POD_SCHEDULED / POD_RUNNING / POD_READY 소수 초 marker -> log
+# - READY 직후 condition 전이 시각 + scheduler/kubelet event -> ${DATA_DIR}/pod_timeline.csv
+WATCH_LOG="${DATA_DIR}/watch_markers.log"
+rm -f "${WATCH_LOG}.ready"
+python3 "${BASE_DIR}/scripts/utils/k8s_watch.py" --watch pods --selector app=tinyllama \
+  --until POD_READY --timeout 330 --ready-file "${WATCH_LOG}.ready" > "${WATCH_LOG}" &
+WATCH_PID=$!
+for _ in $(seq 1 100); do
+  [ -e "${WATCH_LOG}.ready" ] && break
+  sleep 0.1
+done
+rm -f "${WATCH_LOG}.ready"
+
+# SERVE_PROBE=1: readinessProbe(periodSeconds 10)와 아래 5초 polling과 별개로 pod IP:8080에 0.2초 간격으로
+# /v1/models, completion을 보내 실제 serving 시작 시각(SERVE_*) -> log, ${DATA_DIR}/serve_probe.csv
+# 요청이 측정 중인 node에 부하를 더하므로 기본은 끔
+SERVE_PROBE="${SERVE_PROBE:-0}"
+# prober는 --until marker를 모두 받으면 스스로 끝난다. READY 뒤 최대 SERVE_WAIT_SEC초 기다린다.
+SERVE_WAIT_SEC="${SERVE_WAIT_SEC:-60}"
+SERVE_LOG="${DATA_DIR}/serve_probe.log"
+if [ "${SERVE_PROBE}" = "1" ]; then
+  rm -f "${SERVE_LOG}.ready"
+  python3 "${BASE_DIR}/scripts/utils/serve_probe.py" --selector app=tinyllama --port 8080 --interval 0.2 \
+    --until SERVE_MODELS SERVE_COMPLETION --timeout 330 --ready-file "${SERVE_LOG}.ready" \
+    --out-dir "${DATA_DIR}" > "${SERVE_LOG}" &
+  SERVE_PID=$!
+  for _ in $(seq 1 100); do
+    [ -e "${SERVE_LOG}.ready" ] && break
+    sleep 0.1
+  done
+  rm -f "${SERVE_LOG}.ready"
+fi
+
+nodes_clock "${DATA_DIR}" start
+mark START
 echo "START_EPOCH=${START_EPOCH}" | tee "${LOG_FILE}"
 
 kubectl apply -f "${YAML_DIR}/tinyllama-deployment.yaml" -f "${YAML_DIR}/tinyllama-service.yaml"
@@ -64,10 +105,24 @@ while [ "${ELAPSED}" -lt "${TIMEOUT}" ]; do
   fi
 done
 
-READY_EPOCH=$(date +%s)
+mark READY
 echo "READY_EPOCH=${READY_EPOCH}" | tee -a "${LOG_FILE}"
-
-LOAD_START_EPOCH=$(date +%s)
+kill "${WATCH_PID}" 2>/dev/null || true
+wait "${WATCH_PID}" 2>/dev/null || true
+tee -a "${LOG_FILE}" < "${WATCH_LOG}"
+if [ "${SERVE_PROBE}" = "1" ]; then
+  # completion 200은 보통 READY 전에 이미 받았다. 아니면 기한까지 기다리고, 남아 있으면 CSV를 쓰고 끝나게 SIGTERM
+  serve_deadline="$(( $(date +%s) + SERVE_WAIT_SEC ))"
+  while kill -0 "${SERVE_PID}" 2>/dev/null && [ "$(date +%s)" -lt "${serve_deadline}" ]; do
+    sleep 0.2
+  done
+  kill "${SERVE_PID}" 2>/dev/null || true
+  wait "${SERVE_PID}" 2>/dev/null || true
+  tee -a "${LOG_FILE}" < "${SERVE_LOG}"
+fi
+python3 "${BASE_DIR}/scripts/utils/pod_timeline.py" --selector app=tinyllama --out-dir "${DATA_DIR}" || true
+
+mark LOAD_START
 echo "LOAD_START_EPOCH=${LOAD_START_EPOCH}" | tee -a "${LOG_FILE}"
 
 mapfile -t PROMPTS_ARR < "${PROMPTS}"
@@ -82,20 +137,26 @@ for PROMPT in "${PROMPTS_ARR[@]}"; do
   sleep 1
 done
 
-LOAD_END_EPOCH=$(date +%s)
+mark LOAD_END
 echo "LOAD_END_EPOCH=${LOAD_END_EPOCH}" | tee -a "${LOG_FILE}"
 
 STABILIZE_REMAINING=$((START_EPOCH + 300 - $(date +%s)))
 
 [ "${STABILIZE_REMAINING}" -gt 0 ] && sleep "${STABILIZE_REMAINING}"
 
-END_EPOCH=$(date +%s)
+mark END
 echo "END_EPOCH=${END_EPOCH}" | tee -a "${LOG_FILE}"
+mark_span T_ready START READY
+mark_span T_load LOAD_START LOAD_END
+mark_span T_total START END
+marks_log | tee -a "${LOG_FILE}"
+nodes_clock "${DATA_DIR}" end
 
 fetch_csv "system.cpu" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/system_cpu.csv"
 fetch_csv "system.ram" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/system_ram.csv"
 fetch_csv "disk_util.mmcblk0" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/disk_util_mmcblk0.csv"
 fetch_csv "net.eth0" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/net_eth0.csv"
+nodes_export "${DATA_DIR}" "${START_EPOCH}" "${END_EPOCH}"
 
 cp "${LOG_FILE}" "${RESULT_DIR}/redacted.log"
 
@@ -9,14 +9,22 @@ echo "=================================================="
 
 chmod +x ./run_experiment.sh
 
+# run 사이 cooldown: metric이 안정될 때까지 (COOLDOWN_MODE=fixed 이면 sleep 5)
+COOLDOWN_FIXED_SEC="${COOLDOWN_FIXED_SEC:-5}"
+source ../utils/cooldown.sh
+
 for i in {1..10}
 do
     echo "--------------------------------------------------"
     echo "Starting Run #$i at $(print_kst)"
     ./run_experiment.sh $i
+    cooldown_record "../../logs/redacted/step13_tinyllama_idle/run_${i}.log"
     echo "Finished Run #$i at $(print_kst)"
     echo "--------------------------------------------------"
-    sleep 5
+    if [ "$i" -lt 10 ]; then
+        cooldown_wait
+        echo "${COOLDOWN_LINES}"
+    fi
 done
 
 echo "=================================================="
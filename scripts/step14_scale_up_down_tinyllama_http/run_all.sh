@@ -11,6 +11,11 @@ LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP}"
 ALL_LOG="${LOG_DIR}/run_all_summary.log"
 mkdir -p "${LOG_DIR}"
 
+# run 사이 cooldown: idle(step13) 수준으로 돌아와 안정될 때까지 (COOLDOWN_MODE=fixed 이면 sleep 5)
+COOLDOWN_FIXED_SEC="${COOLDOWN_FIXED_SEC:-5}"
+COOLDOWN_BASELINE_STEP="${COOLDOWN_BASELINE_STEP:-step13_tinyllama_idle}"
+source "${REPO_ROOT}/scripts/utils/cooldown.sh"
+
 print_kst() { TZ="Asia/Seoul" date "+%Y-%m-%d %H:%M:%S KST"; }
 
 echo "========================================" | tee "${ALL_LOG}"
@@ -23,8 +28,12 @@ for i in $(seq 1 "${RUNS}"); do
   echo "" | tee -a "${ALL_LOG}"
   echo "--- RUN ${i}/${RUNS} START(KST): $(print_kst) ---" | tee -a "${ALL_LOG}"
   bash "${SCRIPT_DIR}/run_experiment.sh" "${i}" 2>&1 | tee -a "${ALL_LOG}"
+  cooldown_record "${LOG_DIR}/run_${i}.log"
   echo "--- RUN ${i}/${RUNS} END(KST): $(print_kst) ---" | tee -a "${ALL_LOG}"
-  sleep 5
+  if [[ "${i}" -lt "${RUNS}" ]]; then
+    cooldown_wait
+    echo "${COOLDOWN_LINES}" | tee -a "${ALL_LOG}"
+  fi
 done
 
 echo "" | tee -a "${ALL_LOG}"
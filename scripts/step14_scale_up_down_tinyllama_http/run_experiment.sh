@@ -12,6 +12,12 @@ RESULT_DIR="${REPO_ROOT}/results/${STEP}/run_${RUN_ID}"
 
 mkdir -p "${LOG_DIR}" "${DATA_DIR}" "${RESULT_DIR}"
 
+# worker 포함 모든 node의 chart -> ${DATA_DIR}/<node>/ (MULTINODE=0이면 끔)
+# START 직전 / END 직후 node별 clock offset -> clock_offset.csv (CLOCK_SYNC=0이면 끔)
+source "${REPO_ROOT}/scripts/utils/nodes.sh"
+# 각 *_EPOCH와 같은 순간의 *_EPOCH_NS / *_MONO_NS, monotonic T_* 구간을 log 끝에 붙임
+source "${REPO_ROOT}/scripts/utils/marker.sh"
+
 LOG_FILE="${LOG_DIR}/run_${RUN_ID}.log"
 REQ_CSV="${LOG_DIR}/run_${RUN_ID}_requests.csv"
 
@@ -39,6 +45,13 @@ SVC_YAML="${SVC_YAML:-${STEP12_DIR}/tinyllama-service.yaml}"
 PROMPTS_FILE="${PROMPTS_FILE:-${STEP12_DIR}/prompts_10.txt}"
 
 NETDATA_URL="${NETDATA_URL:-http://127.0.0.1:19999}"
+
+# SERVE_PROBE=1: wait_http_200(5초 간격)과 별개로 scale up으로 새로 뜬 pod IP:CONTAINER_PORT에 0.2초 간격으로
+# /v1/models, completion을 보내 실제 serving 시작 시각(SERVE_* / SERVES_*) -> log, ${DATA_DIR}/serve_probe.csv
+SERVE_PROBE="${SERVE_PROBE:-0}"
+# prober는 --until marker(SERVES_*)를 모두 받으면 스스로 끝난다. READY 뒤 최대 SERVE_WAIT_SEC초 기다린다.
+SERVE_WAIT_SEC="${SERVE_WAIT_SEC:-60}"
+CONTAINER_PORT="${CONTAINER_PORT:-8080}"
 CPU_CHART="${CPU_CHART:-system.cpu}"
 RAM_CHART="${RAM_CHART:-system.ram}"
 DISK_UTIL_CHART="${DISK_UTIL_CHART:-disk_util.mmcblk0}"
@@ -150,7 +163,24 @@ kubectl -n "${NAMESPACE}" rollout status deploy "${DEPLOY}" --timeout=600s >/dev
 
 BASE_IP="$(wait_http_200 "${HTTP_TIMEOUT_SEC}")" || { echo "HTTP not ready at replicas=${REPLICAS_LOW}" >&2; exit 1; }
 
-START_EPOCH="$(date +%s)"
+SERVE_LOG="${DATA_DIR}/serve_probe.log"
+if [[ "${SERVE_PROBE}" == "1" ]]; then
+  # 지금 이후 만든 pod만 본다 (REPLICAS_LOW개 기존 pod 제외)
+  rm -f "${SERVE_LOG}.ready"
+  python3 "${REPO_ROOT}/scripts/utils/serve_probe.py" --namespace "${NAMESPACE}" --selector "${SELECTOR}" \
+    --port "${CONTAINER_PORT}" --model "${MODEL_NAME}" --interval 0.2 --pods "$((REPLICAS_HIGH - REPLICAS_LOW))" \
+    --until SERVES_MODELS SERVES_COMPLETION --timeout "$((HTTP_TIMEOUT_SEC + 600))" \
+    --ready-file "${SERVE_LOG}.ready" --out-dir "${DATA_DIR}" > "${SERVE_LOG}" &
+  SERVE_PID=$!
+  for _ in $(seq 1 100); do
+    [[ -e "${SERVE_LOG}.ready" ]] && break
+    sleep 0.1
+  done
+  rm -f "${SERVE_LOG}.ready"
+fi
+
+nodes_clock "${DATA_DIR}" start
+mark START
 END_TARGET_EPOCH="$((START_EPOCH + DURATION_SEC))"
 
 {
@@ -167,23 +197,34 @@ END_TARGET_EPOCH="$((START_EPOCH + DURATION_SEC))"
   echo "NETDATA_URL=${NETDATA_URL}"
 } > "${LOG_FILE}"
 
-SCALE_UP_START_EPOCH="${START_EPOCH}"
+mark_copy SCALE_UP_START START
 kubectl -n "${NAMESPACE}" scale deploy "${DEPLOY}" --replicas="${REPLICAS_HIGH}" >/dev/null
 kubectl -n "${NAMESPACE}" rollout status deploy "${DEPLOY}" --timeout=600s >/dev/null
+mark SCALE_UP_ROLLOUT
 
 BASE_IP="$(wait_http_200 "${HTTP_TIMEOUT_SEC}")" || { echo "HTTP not ready after scale up" >&2; exit 1; }
-READY_EPOCH="$(date +%s)"
+mark READY
+if [[ "${SERVE_PROBE}" == "1" ]]; then
+  # READY는 Service 경유 첫 200이라 새 pod 일부는 아직 serving 전일 수 있다: prober 종료(--until)를 기다리고
+  # 기한까지 남아 있으면 SIGTERM (serve_probe.csv는 그래도 쓴다)
+  serve_deadline="$(( $(date +%s) + SERVE_WAIT_SEC ))"
+  while kill -0 "${SERVE_PID}" 2>/dev/null && (( $(date +%s) < serve_deadline )); do
+    sleep 0.2
+  done
+  kill "${SERVE_PID}" 2>/dev/null || true
+  wait "${SERVE_PID}" 2>/dev/null || true
+  cat "${SERVE_LOG}" >> "${LOG_FILE}"
+fi
 
 {
   echo "SCALE_UP_START_EPOCH=${SCALE_UP_START_EPOCH}"
   echo "READY_EPOCH=${READY_EPOCH}"
   echo "READY_KST=$(epoch_to_kst "${READY_EPOCH}")"
-  echo "T_scale_up=$((READY_EPOCH - SCALE_UP_START_EPOCH))"
 } >> "${LOG_FILE}"
 
 echo "idx,epoch,kst,http_code,time_total,remote_ip,remote_port" > "${REQ_CSV}"
 
-LOAD_START_EPOCH="$(date +%s)"
+mark LOAD_START
 echo "LOAD_START_EPOCH=${LOAD_START_EPOCH}" >> "${LOG_FILE}"
 echo "LOAD_START_KST=$(epoch_to_kst "${LOAD_START_EPOCH}")" >> "${LOG_FILE}"
 
@@ -215,47 +256,50 @@ for i in $(seq 1 "${REQS_TOTAL}"); do
   sleep 1
 done
 
-LOAD_END_EPOCH="$(date +%s)"
+mark LOAD_END
 {
   echo "LOAD_END_EPOCH=${LOAD_END_EPOCH}"
   echo "LOAD_END_KST=$(epoch_to_kst "${LOAD_END_EPOCH}")"
-  echo "T_load=$((LOAD_END_EPOCH - LOAD_START_EPOCH))"
 } >> "${LOG_FILE}"
 
-SCALE_DOWN_START_EPOCH="$(date +%s)"
+mark SCALE_DOWN_START
 kubectl -n "${NAMESPACE}" scale deploy "${DEPLOY}" --replicas="${REPLICAS_LOW}" >/dev/null
 kubectl -n "${NAMESPACE}" rollout status deploy "${DEPLOY}" --timeout=600s >/dev/null
 BASE_IP="$(wait_http_200 "${HTTP_TIMEOUT_SEC}")" || { echo "HTTP not ready after scale down" >&2; exit 1; }
-SCALE_DOWN_END_EPOCH="$(date +%s)"
+mark SCALE_DOWN_END
 
 {
   echo "SCALE_DOWN_START_EPOCH=${SCALE_DOWN_START_EPOCH}"
   echo "SCALE_DOWN_END_EPOCH=${SCALE_DOWN_END_EPOCH}"
-  echo "T_scale_down=$((SCALE_DOWN_END_EPOCH - SCALE_DOWN_START_EPOCH))"
 } >> "${LOG_FILE}"
 
 now_epoch="$(date +%s)"
 if (( now_epoch < END_TARGET_EPOCH )); then
   sleep "$((END_TARGET_EPOCH - now_epoch))"
-  END_EPOCH="${END_TARGET_EPOCH}"
   OVERRUN=0
 else
-  END_EPOCH="${now_epoch}"
   OVERRUN=1
 fi
+mark END
+mark_span T_scale_up SCALE_UP_START READY
+mark_span T_load LOAD_START LOAD_END
+mark_span T_scale_down SCALE_DOWN_START SCALE_DOWN_END
+mark_span T_total START END
+mark_span T_ready START READY
 
 {
   echo "END_EPOCH=${END_EPOCH}"
   echo "END_KST=$(epoch_to_kst "${END_EPOCH}")"
   echo "OVERRUN=${OVERRUN}"
-  echo "T_total=$((END_EPOCH - START_EPOCH))"
-  echo "T_ready=$((READY_EPOCH - START_EPOCH))"
+  marks_log
 } >> "${LOG_FILE}"
+nodes_clock "${DATA_DIR}" end
 
 export_csv "${CPU_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/system_cpu.csv"
 export_csv "${RAM_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/system_ram.csv"
 export_csv "${DISK_UTIL_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/disk_util_mmcblk0.csv"
 export_csv "${NET_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/net_eth0.csv"
+nodes_export "${DATA_DIR}" "${START_EPOCH}" "${END_EPOCH}"
 
 cp "${LOG_FILE}" "${RESULT_DIR}/redacted.log"
 
@@ -12,6 +12,11 @@ STEP_NAME="step15_rollout_restart_tinyllama_http"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "${SCRIPT_DIR}/../.." && pwd)"
 
+# 각 *_EPOCH와 같은 순간의 *_EPOCH_NS / *_MONO_NS, monotonic T_*_SEC를 log 끝에 붙임
+source "${REPO_ROOT}/scripts/utils/marker.sh"
+# 옛 pod log의 server.py DRAIN_START/END_EPOCH -> log (DRAIN_*)
+source "${REPO_ROOT}/scripts/utils/drain_logs.sh"
+
 LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP_NAME}"
 DATA_DIR="${REPO_ROOT}/data/netdata/${STEP_NAME}/run_${RUN_ID}"
 RESULT_DIR="${REPO_ROOT}/results/${STEP_NAME}/run_${RUN_ID}"
@@ -23,6 +28,10 @@ REQ_CSV="${LOG_DIR}/run_${RUN_ID}_requests.csv"
 
 NAMESPACE="${NAMESPACE:-default}"
 DEPLOYMENT_NAME="${DEPLOYMENT_NAME:-}"
+# 지정하면 START 전에 apply 한다. 기본(빈 값)은 이미 있는 DEPLOYMENT_NAME(llama_cpp.server)을 그대로 쓴다.
+# server.py(SIGTERM drain)로 재려면 DEPLOY_YAML=${REPO_ROOT}/scripts/step12_apply_tinyllama_http/tinyllama-drain-deployment.yaml
+# (chat template 없이 prompt를 만들므로 그 결과는 기존 step15/다른 tinyllama step과 비교하지 않는다.)
+DEPLOY_YAML="${DEPLOY_YAML:-}"
 SVC="${SVC:-tinyllama-service}"
 SELECTOR="${SELECTOR:-app=tinyllama}"
 
@@ -189,7 +198,15 @@ log_kv "STEP" "${STEP_NAME}"
 log_kv "RUN_ID" "${RUN_ID}"
 log_kv "NAMESPACE" "${NAMESPACE}"
 
+if [[ -n "${DEPLOY_YAML}" ]]; then
+  log_kv "DEPLOY_YAML" "${DEPLOY_YAML}"
+  kubectl -n "${NAMESPACE}" apply -f "${DEPLOY_YAML}" >> "${LOG_FILE}" 2>&1
+  [[ -z "${DEPLOYMENT_NAME}" ]] && \
+    DEPLOYMENT_NAME="$(kubectl -n "${NAMESPACE}" get -f "${DEPLOY_YAML}" -o jsonpath='{.metadata.name}' 2>/dev/null || true)"
+  kubectl -n "${NAMESPACE}" rollout status "deployment/${DEPLOYMENT_NAME}" --timeout=600s >> "${LOG_FILE}" 2>&1 || true
+fi
 require_nonempty "DEPLOYMENT_NAME" "${DEPLOYMENT_NAME}"
+log_kv "DEPLOYMENT_NAME" "${DEPLOYMENT_NAME}"
 
 NODEPORT_EFFECTIVE="$(get_nodeport)"
 log_kv "SVC" "${SVC}"
@@ -198,13 +215,14 @@ log_kv "NODEPORT" "${NODEPORT_EFFECTIVE}"
 log_kv "ENDPOINT_PATH" "${ENDPOINT_PATH}"
 log_kv "MODEL_NAME" "${MODEL_NAME}"
 
-START_EPOCH="$(date +%s)"
+mark START
 END_TARGET_EPOCH="$((START_EPOCH + DURATION_SEC))"
 log_kv "START_EPOCH" "${START_EPOCH}"
 log_kv "START_KST" "$(epoch_to_kst "${START_EPOCH}")"
 log_kv "END_TARGET_EPOCH" "${END_TARGET_EPOCH}"
 log_kv "END_TARGET_KST" "$(epoch_to_kst "${END_TARGET_EPOCH}")"
 
+drain_logs_start "${NAMESPACE}" "${SELECTOR}" "${DATA_DIR}"
 kubectl -n "${NAMESPACE}" rollout restart "deployment/${DEPLOYMENT_NAME}" >> "${LOG_FILE}" 2>&1
 kubectl -n "${NAMESPACE}" rollout status "deployment/${DEPLOYMENT_NAME}" --timeout=600s >> "${LOG_FILE}" 2>&1 || true
 
@@ -215,18 +233,17 @@ BASE_IP="$(wait_http_200_after_restart "${NODEPORT_EFFECTIVE}" "${READY_TIMEOUT_
   exit 1
 }
 
-READY_EPOCH="$(date +%s)"
+mark READY
 log_kv "BASE_IP" "${BASE_IP}"
 log_kv "READY_EPOCH" "${READY_EPOCH}"
 log_kv "READY_KST" "$(epoch_to_kst "${READY_EPOCH}")"
-log_kv "T_READY_SEC" "$((READY_EPOCH - START_EPOCH))"
 
 REQS_TOTAL="$((LOAD_DURATION_SEC * LOAD_RPS))"
 (( REQS_TOTAL < 1 )) && REQS_TOTAL=1
 
 echo "seq,prompt_idx,start_epoch_ms,end_epoch_ms,latency_ms,http_code,time_total_sec,openai_processing_ms" > "${REQ_CSV}"
 
-LOAD_START_EPOCH="$(date +%s)"
+mark LOAD_START
 log_kv "LOAD_START_EPOCH" "${LOAD_START_EPOCH}"
 log_kv "LOAD_START_KST" "$(epoch_to_kst "${LOAD_START_EPOCH}")"
 log_kv "LOAD_DURATION_SEC" "${LOAD_DURATION_SEC}"
@@ -254,25 +271,27 @@ for i in $(seq 1 "${REQS_TOTAL}"); do
   sleep "${RPS_INTERVAL_SEC}"
 done
 
-LOAD_END_EPOCH="$(date +%s)"
+mark LOAD_END
 log_kv "LOAD_END_EPOCH" "${LOAD_END_EPOCH}"
 log_kv "LOAD_END_KST" "$(epoch_to_kst "${LOAD_END_EPOCH}")"
-log_kv "T_LOAD_SEC" "$((LOAD_END_EPOCH - LOAD_START_EPOCH))"
 
 now_epoch="$(date +%s)"
 if (( now_epoch < END_TARGET_EPOCH )); then
   sleep "$((END_TARGET_EPOCH - now_epoch))"
-  END_EPOCH="${END_TARGET_EPOCH}"
   OVERRUN=0
 else
-  END_EPOCH="${now_epoch}"
   OVERRUN=1
 fi
+mark END
+mark_span T_READY_SEC START READY
+mark_span T_LOAD_SEC LOAD_START LOAD_END
+mark_span T_TOTAL_SEC START END
 
 log_kv "END_EPOCH" "${END_EPOCH}"
 log_kv "END_KST" "$(epoch_to_kst "${END_EPOCH}")"
 log_kv "OVERRUN" "${OVERRUN}"
-log_kv "T_TOTAL_SEC" "$((END_EPOCH - START_EPOCH))"
+marks_log >> "${LOG_FILE}"
+drain_logs_stop | tee -a "${LOG_FILE}"
 
 export_csv "${CPU_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/system_cpu.csv"
 export_csv "${RAM_CHART}" "${START_EPOCH}" "${END_EPOCH}" "${DATA_DIR}/system_ram.csv"
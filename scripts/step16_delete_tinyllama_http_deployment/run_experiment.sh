@@ -13,6 +13,11 @@ NS="${NS:-default}"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "${SCRIPT_DIR}/../.." && pwd)"
 
+# READY/START/DELETE_COMPLETE의 *_EPOCH_NS / *_MONO_NS, monotonic T_delete를 log에 남김
+source "${REPO_ROOT}/scripts/utils/marker.sh"
+# 지워지는 pod log의 server.py DRAIN_START/END_EPOCH -> log (DRAIN_*)
+source "${REPO_ROOT}/scripts/utils/drain_logs.sh"
+
 SCRIPTS_DIR="${REPO_ROOT}/scripts"
 LOG_DIR="${REPO_ROOT}/logs/redacted/${STEP}"
 DATA_DIR="${REPO_ROOT}/data/netdata/${STEP}/run_${RUN_ID}"
@@ -23,6 +28,8 @@ mkdir -p "${LOG_DIR}" "${DATA_DIR}" "${RESULT_DIR}"
 RUN_LOG="${LOG_DIR}/run_${RUN_ID}.log"
 exec > >(tee -a "${RUN_LOG}") 2>&1
 
+# 기본은 llama_cpp.server 배포. server.py(SIGTERM drain)로 재려면 DEPLOY_YAML=.../tinyllama-drain-deployment.yaml
+# (chat template 없이 prompt를 만들므로 그 결과는 기존 step16/다른 tinyllama step과 비교하지 않는다.)
 DEPLOY_YAML="${DEPLOY_YAML:-${SCRIPTS_DIR}/step12_apply_tinyllama_http/tinyllama-deployment.yaml}"
 SVC_YAML="${SVC_YAML:-${SCRIPTS_DIR}/step12_apply_tinyllama_http/tinyllama-service.yaml}"
 
@@ -61,7 +68,7 @@ fi
 
 echo "=== WAIT: rollout ready ==="
 kubectl rollout status -n "${NS}" "${DEPLOY_RES}" --timeout=600s
-READY_EPOCH="$(date +%s)"
+mark READY
 echo "READY_EPOCH=${READY_EPOCH}"
 
 echo "=== SELECTOR: derive from deployment.spec.selector.matchLabels (no hardcoded app=...) ==="
@@ -83,7 +90,8 @@ fi
 echo "=== HTTP CHECK: service clusterIP:port (inference ready) ==="
 SVC_IP="$(kubectl get -n "${NS}" "${SVC_RES}" -o jsonpath='{.spec.clusterIP}' 2>/dev/null || true)"
 SVC_PORT="$(kubectl get -n "${NS}" "${SVC_RES}" -o jsonpath='{.spec.ports[0].port}' 2>/dev/null || true)"
-HEALTH_PATH="${HEALTH_PATH:-/}"
+# llama_cpp.server / server.py 둘 다 응답하는 path
+HEALTH_PATH="${HEALTH_PATH:-/v1/models}"
 if [[ -n "${SVC_IP}" && "${SVC_IP}" != "None" && -n "${SVC_PORT}" ]]; then
   URL="http://${SVC_IP}:${SVC_PORT}${HEALTH_PATH}"
   HTTP_CODE="$(curl -s -o /dev/null -w "%{http_code}" --max-time 5 "${URL}" || echo "curl_failed")"
@@ -94,7 +102,8 @@ else
 fi
 
 echo "=== DELETE: START_EPOCH at delete command ==="
-START_EPOCH="$(date +%s)"
+drain_logs_start "${NS}" "${SELECTOR}" "${DATA_DIR}"
+mark START
 echo "START_EPOCH=${START_EPOCH}"
 kubectl delete -n "${NS}" -f "${DEPLOY_YAML}" --ignore-not-found=true
 
@@ -105,11 +114,14 @@ fi
 
 echo "=== WAIT: deployment delete complete ==="
 kubectl wait -n "${NS}" --for=delete "${DEPLOY_RES}" --timeout=600s || true
-DELETE_COMPLETE_EPOCH="$(date +%s)"
+mark DELETE_COMPLETE
 echo "DELETE_COMPLETE_EPOCH=${DELETE_COMPLETE_EPOCH}"
 
 END_EPOCH="$((DELETE_COMPLETE_EPOCH + 60))"
 echo "END_EPOCH=${END_EPOCH}"
+mark_span T_delete START DELETE_COMPLETE
+marks_log
+drain_logs_stop
 
 echo "=== ORPHAN PROCESS CHECK (grep) ==="
 ps aux | grep -E 'llama|tinyllama|server\.py' | head -n 50 || true
@@ -24,6 +24,13 @@ NETDATA_CHART_NET="${NETDATA_CHART_NET:-net.eth0}"
 RPS="${RPS:-1}"
 LOAD_DURATION_SEC="${LOAD_DURATION_SEC:-60}"
 COOLDOWN_SEC="${COOLDOWN_SEC:-60}"
+# adaptive: load 이후 metric이 idle(step13) 수준으로 돌아와 안정되면 END (COOLDOWN_MIN_SEC ~ COOLDOWN_MAX_SEC)
+# fixed   : 기존처럼 LOAD_END + COOLDOWN_SEC
+COOLDOWN_MODE="${COOLDOWN_MODE:-adaptive}"
+COOLDOWN_MIN_SEC="${COOLDOWN_MIN_SEC:-10}"
+COOLDOWN_MAX_SEC="${COOLDOWN_MAX_SEC:-180}"
+COOLDOWN_STABLE_SEC="${COOLDOWN_STABLE_SEC:-20}"
+COOLDOWN_BASELINE_STEP="${COOLDOWN_BASELINE_STEP:-step13_tinyllama_idle}"
 N_PREDICT="${N_PREDICT:-32}"
 TEMPERATURE="${TEMPERATURE:-0.1}"
 REQUEST_TIMEOUT_SEC="${REQUEST_TIMEOUT_SEC:-120}"
@@ -37,10 +44,20 @@ LOG_DIR="$REPO_ROOT/logs/redacted/$STEP_NAME"
 NETDATA_DIR="$REPO_ROOT/data/netdata/$STEP_NAME/run_${RUN_ID}"
 mkdir -p "$LOG_DIR" "$NETDATA_DIR"
 
+# 온도 / CPU clock / throttle (analysis/thermal.py 입력, THERMAL=0이면 끔)
+source "$REPO_ROOT/scripts/utils/thermal.sh"
+# worker 포함 모든 node의 chart -> $NETDATA_DIR/<node>/ (MULTINODE=0이면 끔)
+# START 직전 / END 직후 node별 clock offset -> clock_offset.csv (CLOCK_SYNC=0이면 끔)
+source "$REPO_ROOT/scripts/utils/nodes.sh"
+# 각 *_EPOCH와 같은 순간의 *_EPOCH_NS / *_MONO_NS, monotonic T_* 구간을 log 끝에 붙임
+source "$REPO_ROOT/scripts/utils/marker.sh"
+
 LOG_FILE="$LOG_DIR/run_${RUN_ID}.log"
 REQ_CSV="$LOG_DIR/run_${RUN_ID}_requests.csv"
 
-START_EPOCH="$(date +%s)"
+nodes_clock "$NETDATA_DIR" start
+thermal_start "$NETDATA_DIR"
+mark START
 
 SVC_JSON="$(kubectl -n "$NS" get svc "$SERVICE_NAME" -o json)"
 NODEPORT="$(echo "$SVC_JSON" | jq -r '.spec.ports[0].nodePort')"
@@ -78,7 +95,7 @@ if [[ "$READY_CODE" != "200" ]]; then
   echo "ERROR: GET $BASE_URL/v1/models http_code=$READY_CODE"
   exit 2
 fi
-READY_EPOCH="$(date +%s)"
+mark READY
 
 ENDPOINT_PATH="/v1/completions"
 
@@ -92,7 +109,8 @@ if [[ "$TEST_CODE" != 2* ]]; then
   exit 2
 fi
 
-LOAD_START_EPOCH="$(( $(date +%s) + 1 ))"
+# load_1rps.py가 이 정수 초 경계에서 첫 요청을 보낸다
+mark_at LOAD_START "$(( $(date +%s) + 1 ))"
 
 python3 "$SCRIPT_DIR/load_1rps.py" \
   --base-url "$BASE_URL" \
@@ -107,8 +125,33 @@ python3 "$SCRIPT_DIR/load_1rps.py" \
   --temperature "$TEMPERATURE" \
   --request-timeout-sec "$REQUEST_TIMEOUT_SEC"
 
-LOAD_END_EPOCH="$(date +%s)"
-END_EPOCH="$(( LOAD_END_EPOCH + COOLDOWN_SEC ))"
+mark LOAD_END
+COOLDOWN_SETTLED=""
+if [[ "$COOLDOWN_MODE" == "adaptive" ]]; then
+  COOLDOWN_OUT="$(python3 "$REPO_ROOT/scripts/utils/cooldown.py" \
+    --netdata-url "${NETDATA_URL%/}" \
+    --key COOLDOWN \
+    --baseline-step "$COOLDOWN_BASELINE_STEP" \
+    --min-sec "$COOLDOWN_MIN_SEC" \
+    --stable-sec "$COOLDOWN_STABLE_SEC" \
+    --timeout "$COOLDOWN_MAX_SEC" || true)"
+  COOLDOWN_SETTLED="$(grep '^COOLDOWN_SETTLED=' <<<"$COOLDOWN_OUT" | cut -d= -f2 || true)"
+  mark END
+  COOLDOWN_SEC="$(( END_EPOCH - LOAD_END_EPOCH ))"
+else
+  END_EPOCH="$(( LOAD_END_EPOCH + COOLDOWN_SEC ))"
+  NOW="$(date +%s)"
+  if (( NOW < END_EPOCH )); then
+    sleep "$(( END_EPOCH - NOW ))"
+  fi
+  mark END
+fi
+mark_span T_ready START READY
+mark_span T_load LOAD_START LOAD_END
+mark_span T_cooldown LOAD_END END
+mark_span T_total START END
+thermal_stop
+nodes_clock "$NETDATA_DIR" end
 
 {
   echo "STEP_NAME=$STEP_NAME"
@@ -130,16 +173,17 @@ END_EPOCH="$(( LOAD_END_EPOCH + COOLDOWN_SEC ))"
   echo "RPS=$RPS"
   echo "LOAD_DURATION_SEC=$LOAD_DURATION_SEC"
   echo "COOLDOWN_SEC=$COOLDOWN_SEC"
+  echo "COOLDOWN_MODE=$COOLDOWN_MODE"
+  if [[ "$COOLDOWN_MODE" == "adaptive" ]]; then
+    echo "COOLDOWN_MAX_SEC=$COOLDOWN_MAX_SEC"
+    echo "COOLDOWN_SETTLED=${COOLDOWN_SETTLED:-0}"
+  fi
   echo "N_PREDICT=$N_PREDICT"
   echo "TEMPERATURE=$TEMPERATURE"
   echo "PROMPTS_FILE=$PROMPTS_FILE"
+  marks_log
 } > "$LOG_FILE"
 
-NOW="$(date +%s)"
-if (( NOW < END_EPOCH )); then
-  sleep "$(( END_EPOCH - NOW ))"
-fi
-
 export_chart() {
   local chart="$1"
   local after="$2"
@@ -160,5 +204,6 @@ export_chart "$NETDATA_CHART_CPU" "$START_EPOCH" "$END_EPOCH" "$NETDATA_DIR/syst
 export_chart "$NETDATA_CHART_RAM" "$START_EPOCH" "$END_EPOCH" "$NETDATA_DIR/system_ram.csv" || true
 export_chart "$NETDATA_CHART_DISK_UTIL" "$START_EPOCH" "$END_EPOCH" "$NETDATA_DIR/disk_util_mmcblk0.csv" || true
 export_chart "$NETDATA_CHART_NET" "$START_EPOCH" "$END_EPOCH" "$NETDATA_DIR/net_eth0.csv" || true
+nodes_export "$NETDATA_DIR" "$START_EPOCH" "$END_EPOCH"
 
 echo "DONE run=$RUN_ID"
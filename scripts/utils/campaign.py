@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# campaign scheduler: 여러 step의 run을 한 step씩 10회 연속이 아니라 섞어서 실행한다.
+# (발열 / SD 카드 wear-leveling / datastore 증가 같은 시간 drift가 step 차이에 섞이지 않도록)
+#
+# order
+#   sequential : step마다 runs회 연속 (기존 run_all.sh와 같은 순서)
+#   blocked    : block r마다 모든 step을 한 번씩, block 안의 순서는 seed로 섞음 (randomized complete block)
+#   random     : 전체 (step, run)을 seed로 섞음
+# run 번호는 step별 실행 순서대로 붙인다 (data/netdata/<step>/run_<i> layout 유지).
+#
+# campaign 파일 (CAMPAIGN dict)
+#   name     : campaign 이름
+#   runs     : step별 run 수 (--runs로 덮어씀)
+#   order    : sequential | blocked | random (--order)
+#   seed     : 난수 seed (--seed)
+#   cooldown : run 사이 대기 (runner.py spec의 cooldown과 같은 형식)
+#   steps    : [{"spec": "scripts/<step>/spec.py"},                         runner.py로 실행 (prepare/teardown 포함)
+#               {"step": "<step>", "script": "scripts/<step>/run_experiment.sh",
+#                "setup": [<bash>], "teardown": [<bash>], "log": "<run log 경로>",
+#                "analyze": [<bash>]}]                                      shell step
+#              shell step의 log 기본값: ${REPO_ROOT}/logs/redacted/${STEP}/run_${RUN}.log
+#   analyze  : 모든 run이 끝나면 step마다 실행 (spec step은 spec의 analyze, shell step은 entry의 analyze).
+#              STEP, RUNS(그 step의 가장 큰 run 번호), RUN_LIST(done인 run 번호, 공백 구분)가 env로 들어간다.
+#              --no-analyze로 건너뛴다.
+#
+# run이 실패(StepError)하면 schedule.csv에 status=failed와 그 log(spec step은 failed_run_<i>.log)를 남기고
+# 다음 run으로 넘어간다. 모든 run 뒤 analyze는 done인 run만 대상으로 하고, 실패가 있으면 exit 1.
+# --resume은 failed도 다시 실행한다.
+#
+# 각 run의 log 끝에 CAMPAIGN=, SEQ=(campaign 전체 순번), BLOCK=, PRE_COOLDOWN_SEC= 를 덧붙이고
+# 실행 계획/상태는 schedule.csv에 남긴다 (analysis/drift.py가 SEQ로 drift를 추정하고,
+# START_EPOCH가 [start_epoch, end_epoch] 안에 있는지로 run 결과가 이 campaign의 것인지 확인한다).
+#   logs/redacted/_campaign/<name>/schedule.csv   (seq, block, step, run, status, start_epoch, end_epoch, log)
+#
+# 사용:
+#   python3 scripts/utils/campaign.py scripts/campaigns/nginx_events.py --dry-run
+#   python3 scripts/utils/campaign.py scripts/campaigns/nginx_events.py --order random --seed 7
+#   python3 scripts/utils/campaign.py scripts/campaigns/nginx_events.py --resume   # done 이 아닌 run부터
+from __future__ import annotations
+
+import argparse
+import csv
+import importlib.util
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from runner import REPO_ROOT, Run, StepError, base_env, cool_down, cooldown_config, expand, load_spec, run_log_path
+
+ORDERS = ("sequential", "blocked", "random")
+FIELDS = ["seq", "block", "step", "run", "status", "start_epoch", "end_epoch", "log"]
+
+DEFAULT_LOG = "${REPO_ROOT}/logs/redacted/${STEP}/run_${RUN}.log"
+
+
+def load_campaign(path: Path) -> Dict[str, Any]:
+    mod_spec = importlib.util.spec_from_file_location(f"campaign_{path.stem}", path)
+    if mod_spec is None or mod_spec.loader is None:
+        raise StepError(f"cannot load campaign: {path}")
+    mod = importlib.util.module_from_spec(mod_spec)
+    mod_spec.loader.exec_module(mod)
+    return mod.CAMPAIGN
+
+
+def resolve_steps(campaign: Dict[str, Any]) -> List[Dict[str, Any]]:
+    steps = []
+    for entry in campaign["steps"]:
+        entry = dict(entry)
+        if "spec" in entry:
+            entry["spec_dict"] = load_spec((REPO_ROOT / entry["spec"]).resolve())
+            entry.setdefault("step", entry["spec_dict"]["step"])
+        elif "script" not in entry or "step" not in entry:
+            raise StepError(f"campaign step needs 'spec' or 'step'+'script': {entry}")
+        steps.append(entry)
+    names = [s["step"] for s in steps]
+    if len(set(names)) != len(names):
+        raise StepError(f"duplicated step in campaign: {names}")
+    return steps
+
+
+def make_schedule(steps: List[str], runs: int, order: str, seed: int, start_run: int = 1) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    if order == "sequential":
+        slots = [(r, s) for s in steps for r in range(runs)]
+    elif order == "blocked":
+        slots = []
+        for r in range(runs):
+            block = list(steps)
+            rng.shuffle(block)
+            slots += [(r, s) for s in block]
+    elif order == "random":
+        slots = [(r, s) for r in range(runs) for s in steps]
+        rng.shuffle(slots)
+    else:
+        raise StepError(f"unknown order: {order} (expected one of {ORDERS})")
+
+    count: Dict[str, int] = {s: 0 for s in steps}
+    plan = []
+    for seq, (block, step) in enumerate(slots, start=1):
+        count[step] += 1
+        plan.append({"seq": seq, "block": block + 1 if order == "blocked" else "", "step": step,
+                     "run": start_run + count[step] - 1, "status": "pending", "start_epoch": "", "end_epoch": ""})
+    return plan
+
+
+def read_schedule(path: Path) -> List[Dict[str, Any]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    for r in rows:
+        r["seq"], r["run"] = int(r["seq"]), int(r["run"])
+    return rows
+
+
+def write_schedule(path: Path, plan: List[Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS)
+        w.writeheader()
+        w.writerows({k: r.get(k, "") for k in FIELDS} for r in plan)
+    tmp.replace(path)
+
+
+def sh(cmds: List[str], env: Dict[str, str]) -> None:
+    for cmd in cmds:
+        rc = subprocess.run(["bash", "-c", cmd], env=env).returncode
+        if rc != 0:
+            raise StepError(f"command failed (rc={rc}): {cmd}")
+
+
+def run_entry(entry: Dict[str, Any], run: int, env: Dict[str, str], dry_run: bool) -> Path:
+    # 실행한 run의 log 경로를 돌려준다.
+    if "spec_dict" in entry:
+        r = Run(entry["spec_dict"], run, env, dry_run=dry_run)
+        r.execute_run()
+        return r.log_path
+
+    step_env = dict(env, STEP=entry["step"], RUN=str(run))
+    script = str(REPO_ROOT / entry["script"])
+    log_path = Path(expand(entry.get("log", DEFAULT_LOG), step_env))
+    if dry_run:
+        for cmd in entry.get("setup", []) + [f"bash {script} {run}"] + entry.get("teardown", []):
+            print(f"  $ {cmd}")
+        return log_path
+    try:
+        sh(entry.get("setup", []), step_env)
+        # run_experiment.sh는 스크립트 위치 기준 상대 경로를 쓰는 것이 있어 cwd를 맞춘다.
+        rc = subprocess.run(["bash", script, str(run)], env=step_env, cwd=str(Path(script).parent)).returncode
+        if rc != 0:
+            raise StepError(f"{entry['script']} {run} failed (rc={rc})")
+    except StepError:
+        # 실패해도 teardown은 한다 (teardown 실패는 원래 이유를 덮지 않게 경고만).
+        try:
+            sh(entry.get("teardown", []), step_env)
+        except StepError as e:
+            print(f"[WARN] {entry['step']} run_{run} teardown: {e}", file=sys.stderr)
+        raise
+    sh(entry.get("teardown", []), step_env)
+    return log_path
+
+
+def failed_log(entry: Dict[str, Any], run: int, env: Dict[str, str], since: float) -> Optional[Path]:
+    # 실패한 run이 남긴 log (spec step: runner의 failed_run_<i>.log, shell step: 스크립트가 쓴 만큼).
+    # 이전 시도의 log를 이 run 것으로 잡지 않게 since 이후에 쓰인 것만.
+    if "spec_dict" in entry:
+        path = run_log_path(entry["step"], run, failed=True)
+    else:
+        path = Path(expand(entry.get("log", DEFAULT_LOG), dict(env, STEP=entry["step"], RUN=str(run))))
+    return path if path.exists() and path.stat().st_mtime >= since else None
+
+
+def rel(path: Path) -> str:
+    return str(path.relative_to(REPO_ROOT)) if path.is_relative_to(REPO_ROOT) else str(path)
+
+
+def tag_log(log_path: Path, name: str, row: Dict[str, Any], pre: Optional[Tuple[float, Optional[bool]]]) -> None:
+    lines = [f"CAMPAIGN={name}", f"SEQ={row['seq']}", f"BLOCK={row['block']}"]
+    if pre is not None:
+        lines.append(f"PRE_COOLDOWN_SEC={pre[0]:.1f}")
+        if pre[1] is not None:
+            lines.append(f"PRE_COOLDOWN_SETTLED={int(pre[1])}")
+    if not log_path.exists():
+        print(f"[WARN] run log not found, tags only in schedule.csv: {log_path}", file=sys.stderr)
+        return
+    with log_path.open("a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def analyze(steps: Dict[str, Dict[str, Any]], plan: List[Dict[str, Any]], env: Dict[str, str],
+            dry_run: bool) -> None:
+    # step마다 한 번, campaign에서 done 된 run 전체를 대상으로
+    for step, entry in steps.items():
+        cmds = entry["spec_dict"].get("analyze", []) if "spec_dict" in entry else entry.get("analyze", [])
+        runs = sorted(r["run"] for r in plan if r["step"] == step and r["status"] == "done")
+        if not cmds or (not runs and not dry_run):
+            continue
+        step_env = dict(env, STEP=step, RUNS=str(max(runs, default=0)), RUN_LIST=" ".join(map(str, runs)))
+        for k, v in entry.get("spec_dict", {}).get("env", {}).items():
+            step_env.setdefault(k, expand(str(v), step_env))
+        print(f"== analyze {step} (runs: {step_env['RUN_LIST'] or '-'}) ==")
+        for cmd in cmds:
+            if dry_run:
+                print(f"  $ {cmd}")
+                continue
+            rc = subprocess.run(["bash", "-c", cmd], env=step_env, cwd=str(REPO_ROOT)).returncode
+            if rc != 0:
+                print(f"[WARN] analyze failed (rc={rc}): {cmd}", file=sys.stderr)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("campaign")
+    ap.add_argument("--runs", type=int, default=None, help="runs per step (default: campaign['runs'])")
+    ap.add_argument("--order", choices=ORDERS, default=None)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--start-run", type=int, default=1)
+    ap.add_argument("--cooldown", type=float, default=None)
+    ap.add_argument("--resume", action="store_true", help="reuse schedule.csv and skip runs marked done")
+    ap.add_argument("--no-analyze", action="store_true", help="skip the per-step analyze after the last run")
+    ap.add_argument("--dry-run", action="store_true", help="print the schedule and actions without executing")
+    args = ap.parse_args()
+
+    campaign = load_campaign(Path(args.campaign).resolve())
+    name = campaign["name"]
+    steps = {s["step"]: s for s in resolve_steps(campaign)}
+    env = base_env({"env": campaign.get("env", {})})
+    cooldown = cooldown_config(campaign, env, args.cooldown)
+    baseline: Dict[str, float] = {}
+    if cooldown["mode"] == "adaptive" and cooldown["baseline_step"] and not args.dry_run:
+        from cooldown import baseline_from_step
+
+        baseline = baseline_from_step(cooldown["baseline_step"])
+
+    sched_path = REPO_ROOT / "logs" / "redacted" / "_campaign" / name / "schedule.csv"
+    if args.resume and sched_path.exists():
+        plan = read_schedule(sched_path)
+        unknown = {r["step"] for r in plan} - set(steps)
+        if unknown:
+            raise SystemExit(f"[ERROR] schedule.csv has steps not in campaign: {sorted(unknown)}")
+    else:
+        order = args.order or campaign.get("order", "blocked")
+        seed = args.seed if args.seed is not None else int(campaign.get("seed", 0))
+        plan = make_schedule(list(steps), args.runs or int(campaign.get("runs", 10)), order, seed, args.start_run)
+        print(f"[{name}] order={order} seed={seed}")
+    todo = [r for r in plan if r["status"] != "done"]
+    print(f"[{name}] {len(plan)} runs, {len(todo)} to do -> {sched_path}")
+    if args.dry_run:
+        for r in todo:
+            print(f"  seq={r['seq']:>3} block={r['block'] or '-':>2} {r['step']} run_{r['run']}")
+        print(f"== first run: {todo[0]['step']} run_{todo[0]['run']} ==" if todo else "(nothing to do)")
+        if todo:
+            run_entry(steps[todo[0]["step"]], todo[0]["run"], env, dry_run=True)
+        if not args.no_analyze:
+            analyze(steps, plan, env, dry_run=True)
+        return
+
+    write_schedule(sched_path, plan)
+    pre: Optional[Tuple[float, Optional[bool]]] = None
+    failed: List[Dict[str, Any]] = []
+    for k, row in enumerate(todo):
+        print(f"== [{name}] seq {row['seq']}/{len(plan)}: {row['step']} run_{row['run']} ==")
+        row["start_epoch"] = int(time.time())
+        row["status"] = "running"
+        write_schedule(sched_path, plan)
+        run_env = dict(env, CAMPAIGN=name, SEQ=str(row["seq"]))
+        try:
+            log_path: Optional[Path] = run_entry(steps[row["step"]], row["run"], run_env, dry_run=False)
+            row["status"] = "done"
+        except StepError as e:
+            print(f"[ERROR] {row['step']} run_{row['run']}: {e}", file=sys.stderr)
+            log_path = failed_log(steps[row["step"]], row["run"], run_env, row["start_epoch"])
+            row["status"] = "failed"
+            failed.append(row)
+        row["end_epoch"] = int(time.time())
+        row["log"] = rel(log_path) if log_path is not None else ""
+        write_schedule(sched_path, plan)
+        if log_path is not None:
+            tag_log(log_path, name, row, pre)
+
+        pre = None
+        if k < len(todo) - 1 and (cooldown["mode"] == "adaptive" or cooldown["sec"] > 0):
+            pre = cool_down(cooldown, env, baseline)
+            print(f"  cooldown {pre[0]:.1f}s" + ("" if pre[1] is None else f" settled={int(pre[1])}"))
+    if not args.no_analyze:
+        analyze(steps, plan, env, dry_run=False)
+    if failed:
+        runs = ", ".join(f"{r['step']} run_{r['run']}" for r in failed)
+        print(f"[DONE] {name} with {len(failed)} failed run(s): {runs} (--resume to retry)", file=sys.stderr)
+        raise SystemExit(1)
+    print(f"[DONE] {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# master 기준 node별 clock offset 추정 (NTP 방식 왕복 timestamp 교환, 표준 라이브러리만 사용).
+# - epoch marker는 master의 시계, worker 쪽 데이터(Netdata export 등)는 worker 시계로 찍힌다.
+#   몇 초짜리 event를 node 사이에서 맞추려면 offset을 재서 보정해야 한다.
+# - 교환 한 번: t0(master 송신) -> t1(node 시각) -> t3(master 수신)
+#     offset = t1 - (t0 + t3) / 2     (node 시계 - master 시계, 초)
+#     rtt    = t3 - t0
+#   --samples 번 중 rtt가 가장 작은 교환을 쓴다 (경로 지연이 대칭에 가장 가까운 값).
+# - method
+#     ssh : ssh 세션 하나를 열어 두고 stdin 한 줄마다 node의 time.time()을 받는다
+#           (접속 시간은 교환에 들어가지 않음, node에 python3 필요)
+#     udp : node에서 --serve로 띄운 UDP echo에 timestamp를 보낸다 (ssh보다 rtt가 작다)
+# - run 시작(--phase start)과 끝(--phase end)에 한 번씩 재서 <out-dir>/clock_offset.csv에 붙인다.
+#   end에서는 같은 node의 start 값으로 drift(ppm)를 계산한다.
+#   master(role=master 또는 local 주소)는 기준이므로 offset 0으로 기록한다.
+#
+# node inventory는 nodes_export.py와 같다 (--nodes / NETDATA_NODES / kubectl). url의 host로 접속한다.
+#
+# 사용:
+#   python3 scripts/utils/clock_offset.py --phase start --out-dir data/netdata/<step>/run_<i>
+#   python3 scripts/utils/clock_offset.py --phase end --out-dir data/netdata/<step>/run_<i> --method udp
+#   python3 scripts/utils/clock_offset.py --serve --port 19123        # 각 worker에서 (udp method)
+#   -> <out-dir>/clock_offset.csv  (node, phase, time, offset_sec, rtt_sec, samples, method, drift_ppm)
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import socket
+import struct
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from nodes_export import Node, inventory
+
+FIELDS = ["node", "phase", "time", "offset_sec", "rtt_sec", "samples", "method", "drift_ppm"]
+UDP_FMT = "!dd"  # 요청: (seq, t0) / 응답: (seq, t1)
+
+# node에서 실행: stdin 한 줄마다 현재 시각 한 줄
+REMOTE_LOOP = "import sys,time\nfor _ in sys.stdin: print(repr(time.time()), flush=True)"
+
+
+def node_host(node: Node) -> str:
+    return urlparse(node.url).hostname or node.url
+
+
+def is_local(node: Node) -> bool:
+    if node.role == "master":
+        return True
+    host = node_host(node)
+    if host in ("localhost", socket.gethostname()) or host.startswith("127."):
+        return True
+    try:
+        # 이 주소로 bind 되면 master 자신
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.bind((host, 0))
+        return True
+    except OSError:
+        return False
+
+
+def best_exchange(pairs: List[Tuple[float, float, float]]) -> Optional[Tuple[float, float, float]]:
+    # (t0, t1, t3) 중 rtt 최소 -> (master 시각, offset, rtt)
+    if not pairs:
+        return None
+    t0, t1, t3 = min(pairs, key=lambda p: p[2] - p[0])
+    mid = (t0 + t3) / 2.0
+    return mid, t1 - mid, t3 - t0
+
+
+def measure_ssh(host: str, samples: int, timeout: float) -> List[Tuple[float, float, float]]:
+    cmd = ["ssh", "-o", "BatchMode=yes", "-o", "StrictHostKeyChecking=no", "-o", f"ConnectTimeout={int(timeout)}",
+           host, "python3", "-u", "-c", REMOTE_LOOP]
+    try:
+        p = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return []
+    pairs = []
+    try:
+        # 첫 교환은 원격 python 기동을 기다리므로 버린다.
+        for i in range(samples + 1):
+            t0 = time.time()
+            p.stdin.write("\n")
+            p.stdin.flush()
+            line = p.stdout.readline()
+            t3 = time.time()
+            if not line:
+                break
+            if i > 0:
+                pairs.append((t0, float(line), t3))
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            p.stdin.close()
+        except OSError:
+            pass
+        try:
+            p.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            p.kill()
+    return pairs
+
+
+def measure_udp(host: str, port: int, samples: int, timeout: float) -> List[Tuple[float, float, float]]:
+    pairs = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.settimeout(timeout)
+        for seq in range(samples):
+            t0 = time.time()
+            try:
+                s.sendto(struct.pack(UDP_FMT, seq, t0), (host, port))
+                while True:
+                    data, _ = s.recvfrom(64)
+                    t3 = time.time()
+                    rseq, t1 = struct.unpack(UDP_FMT, data[:struct.calcsize(UDP_FMT)])
+                    if int(rseq) == seq:
+                        break
+            except (OSError, struct.error):
+                continue
+            pairs.append((t0, t1, t3))
+            time.sleep(0.05)
+    return pairs
+
+
+def serve(port: int) -> None:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("0.0.0.0", port))
+        print(f"[clock] udp echo on :{port}", flush=True)
+        while True:
+            data, addr = s.recvfrom(64)
+            t1 = time.time()
+            try:
+                seq, _ = struct.unpack(UDP_FMT, data[:struct.calcsize(UDP_FMT)])
+            except struct.error:
+                continue
+            s.sendto(struct.pack(UDP_FMT, seq, t1), addr)
+
+
+def read_rows(path: Path) -> List[Dict[str, str]]:
+    if not path.exists() or path.stat().st_size == 0:
+        return []
+    with path.open(newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def drift_ppm(prev: List[Dict[str, str]], node: str, t: float, offset: float) -> Optional[float]:
+    starts = [r for r in prev if r["node"] == node and r["phase"] == "start" and r["offset_sec"] != ""]
+    if not starts:
+        return None
+    t0, off0 = float(starts[-1]["time"]), float(starts[-1]["offset_sec"])
+    if t - t0 <= 0:
+        return None
+    return (offset - off0) / (t - t0) * 1e6
+
+
+def measure_node(node: Node, args: argparse.Namespace) -> Dict[str, object]:
+    row: Dict[str, object] = {"node": node.name, "phase": args.phase, "time": f"{time.time():.3f}",
+                              "offset_sec": "", "rtt_sec": "", "samples": 0, "method": args.method, "drift_ppm": ""}
+    if is_local(node):
+        row.update(offset_sec="0.000000", rtt_sec="0.000000", method="local")
+        return row
+    host = node_host(node)
+    if args.method == "udp":
+        pairs = measure_udp(host, args.port, args.samples, args.timeout)
+    else:
+        pairs = measure_ssh(f"{args.ssh_user}@{host}" if args.ssh_user else host, args.samples, args.timeout)
+    best = best_exchange(pairs)
+    if best is not None:
+        mid, offset, rtt = best
+        row.update(time=f"{mid:.3f}", offset_sec=f"{offset:.6f}", rtt_sec=f"{rtt:.6f}", samples=len(pairs))
+    return row
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", nargs="*", default=[], help="name=url|host ... (default: NETDATA_NODES env or kubectl)")
+    ap.add_argument("--kubectl", default=os.environ.get("KUBECTL", "kubectl"))
+    ap.add_argument("--phase", default="start", help="start | end (end row gets drift_ppm)")
+    ap.add_argument("--out-dir")
+    ap.add_argument("--method", choices=["ssh", "udp"], default=os.environ.get("CLOCK_METHOD", "ssh"))
+    ap.add_argument("--ssh-user", default=os.environ.get("CLOCK_SSH_USER", ""))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("CLOCK_UDP_PORT", "19123")))
+    ap.add_argument("--samples", type=int, default=8)
+    ap.add_argument("--timeout", type=float, default=5.0)
+    ap.add_argument("--serve", action="store_true", help="run the UDP echo server (on each worker)")
+    args = ap.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+    if not args.out_dir:
+        ap.error("--out-dir is required")
+
+    nodes = inventory(args.nodes, args.kubectl)
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "clock_offset.csv"
+    prev = read_rows(path)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(nodes))) as pool:
+        rows = list(pool.map(lambda n: measure_node(n, args), nodes))
+    for r in rows:
+        if r["offset_sec"] != "":
+            d = drift_ppm(prev, str(r["node"]), float(r["time"]), float(r["offset_sec"]))
+            if d is not None and args.phase == "end":
+                r["drift_ppm"] = f"{d:.2f}"
+        shown = f"offset={float(r['offset_sec']) * 1000:+.1f}ms rtt={float(r['rtt_sec']) * 1000:.1f}ms" \
+            if r["offset_sec"] != "" else "<unreachable>"
+        print(f"  [clock {args.phase}] {r['node']}: {shown}" + (f" drift={r['drift_ppm']}ppm" if r["drift_ppm"] else ""))
+
+    new = not prev
+    with path.open("a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS)
+        if new:
+            w.writeheader()
+        w.writerows(rows)
+    print("Saved:", path)
+
+
+if __name__ == "__main__":
+    main()
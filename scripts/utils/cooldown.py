@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# run 사이 adaptive cooldown: 고정 sleep 대신 live metric이 idle 수준으로 돌아와
+# --stable-sec 동안 안정될 때까지 기다린다 (표준 라이브러리만 사용).
+#
+# 판정 (최근 --stable-sec 초, netdata 1초 샘플)
+# - drift    : metric마다 |뒤 절반 평균 - 앞 절반 평균| <= tol   (cpu / ram / disk_util)
+# - baseline : cpu, disk_util 평균 <= baseline + tol              (baseline이 있을 때만)
+#              RAM은 page cache 때문에 idle 값으로 돌아오지 않으므로 drift만 본다.
+# - baseline : --baseline cpu=4.1 disk_util=0.8 로 직접 주거나,
+#              --baseline-step <idle step> 이면 analysis/run_table의 run 평균 median을 쓴다.
+#
+# 결과는 KEY=VALUE 줄로 stdout(과 --log append)에 남긴다.
+#   <KEY>_SEC=<실제 대기 초>  <KEY>_SETTLED=1|0 (0 = --timeout)
+# timeout이어도 exit 0 (다음 run은 진행하고 settled=0으로 기록만 한다).
+#
+# 사용:
+#   python3 scripts/utils/cooldown.py --baseline-step step13_tinyllama_idle --stable-sec 20 --timeout 300
+#   python3 scripts/utils/cooldown.py --baseline cpu=3.5 disk_util=1.0 --key PRE_COOLDOWN --log run_3.log
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# metric -> (env var, 기본 chart)
+CHARTS = {
+    "cpu": ("NETDATA_CHART_CPU", "system.cpu"),
+    "ram": ("NETDATA_CHART_RAM", "system.ram"),
+    "disk_util": ("NETDATA_CHART_DISK_UTIL", "disk_util.mmcblk0"),
+}
+
+DEFAULT_TOL = {"cpu": 2.0, "ram": 16.0, "disk_util": 3.0}
+
+# baseline과 비교하는 metric (RAM 제외)
+BASELINE_METRICS = ("cpu", "disk_util")
+
+
+def fetch_values(url: str, chart: str, seconds: int, timeout: float = 3.0) -> List[Tuple[float, Dict[str, float]]]:
+    qs = urllib.parse.urlencode({"chart": chart, "after": -seconds, "format": "json", "options": "seconds"})
+    with urllib.request.urlopen(f"{url.rstrip('/')}/api/v1/data?{qs}", timeout=timeout) as r:
+        js = json.loads(r.read().decode("utf-8"))
+    labels = js.get("labels") or []
+    rows = sorted(js.get("data") or [], key=lambda row: row[0])
+    return [(float(row[0]), dict(zip(labels[1:], row[1:]))) for row in rows]
+
+
+def metric_value(metric: str, dims: Dict[str, float]) -> Optional[float]:
+    # analysis/netdata_io의 대표 series 규칙과 같다.
+    vals = {k.lower(): v for k, v in dims.items() if v is not None}
+    if not vals:
+        return None
+    if metric == "cpu":
+        return 100.0 - vals["idle"] if "idle" in vals else sum(vals.values())
+    if metric == "ram":
+        return vals["used"] if "used" in vals else max(vals.values())
+    for k, v in vals.items():
+        if any(p in k for p in ("util", "busy")):
+            return v
+    return next(iter(vals.values()))
+
+
+def mean(xs: List[float]) -> float:
+    return sum(xs) / len(xs)
+
+
+def check_settled(window: Dict[str, List[float]], baseline: Dict[str, float], tol: Dict[str, float],
+                  min_samples: int) -> Tuple[bool, List[str]]:
+    reasons: List[str] = []
+    for m, ys in window.items():
+        if len(ys) < min_samples:
+            reasons.append(f"{m}:samples({len(ys)})")
+            continue
+        h = len(ys) // 2
+        drift = mean(ys[h:]) - mean(ys[:h])
+        if abs(drift) > tol[m]:
+            reasons.append(f"{m}:drift({drift:+.1f})")
+        if m in baseline and m in BASELINE_METRICS and mean(ys) > baseline[m] + tol[m]:
+            reasons.append(f"{m}:above_baseline({mean(ys):.1f}>{baseline[m]:.1f})")
+    return not reasons, reasons
+
+
+def baseline_from_step(step: str) -> Dict[str, float]:
+    # analysis/ 의 pandas 기반 helper를 쓰므로 필요할 때만 import
+    sys.path.insert(0, str(REPO_ROOT / "analysis"))
+    try:
+        from run_table import load_step_table, raw_run_means
+    except ImportError as e:
+        print(f"[cooldown] baseline-step ignored ({e})", file=sys.stderr)
+        return {}
+    out: Dict[str, float] = {}
+    for df in (load_step_table(REPO_ROOT / "results", step), raw_run_means(REPO_ROOT, step)):
+        if df is None:
+            continue
+        for m in BASELINE_METRICS:
+            col = f"{m}_mean"
+            if m not in out and col in df.columns and df[col].notna().any():
+                out[m] = float(df[col].median())
+    return out
+
+
+def wait_settled(netdata_url: str, baseline: Dict[str, float], stable_sec: int = 20, timeout: float = 300.0,
+                 min_sec: float = 0.0, poll: float = 2.0, tol: Optional[Dict[str, float]] = None,
+                 charts: Optional[Dict[str, str]] = None, verbose: bool = True) -> Tuple[float, bool]:
+    tol = dict(DEFAULT_TOL, **(tol or {}))
+    charts = charts or {m: os.environ.get(env, default) for m, (env, default) in CHARTS.items()}
+    t0 = time.monotonic()
+    last_reason: List[str] = []
+    while True:
+        elapsed = time.monotonic() - t0
+        if elapsed >= min_sec:
+            window: Dict[str, List[float]] = {}
+            for m, chart in charts.items():
+                try:
+                    rows = fetch_values(netdata_url, chart, stable_sec)
+                except (urllib.error.URLError, OSError, ValueError):
+                    continue
+                window[m] = [v for v in (metric_value(m, dims) for _, dims in rows) if v is not None]
+            if window:
+                ok, last_reason = check_settled(window, baseline, tol, min_samples=max(3, int(0.8 * stable_sec)))
+                if ok:
+                    return time.monotonic() - t0, True
+            else:
+                last_reason = ["netdata:unreachable"]
+        if elapsed >= timeout:
+            if verbose:
+                print(f"[cooldown] timeout {timeout:.0f}s: {' '.join(last_reason)}", file=sys.stderr)
+            return time.monotonic() - t0, False
+        time.sleep(min(poll, max(0.0, timeout - elapsed)) or poll)
+
+
+def parse_kv(items: List[str]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for it in items:
+        k, _, v = it.partition("=")
+        out[k.strip()] = float(v)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--netdata-url", default=os.environ.get("NETDATA_URL", "http://127.0.0.1:19999"))
+    ap.add_argument("--baseline", nargs="*", default=[], help="metric=value (cpu %, disk_util %)")
+    ap.add_argument("--baseline-step", default=None, help="idle step whose run means are the baseline")
+    ap.add_argument("--tol", nargs="*", default=[], help=f"metric=value (default: {DEFAULT_TOL})")
+    ap.add_argument("--stable-sec", type=int, default=20)
+    ap.add_argument("--min-sec", type=float, default=0.0)
+    ap.add_argument("--timeout", type=float, default=300.0)
+    ap.add_argument("--poll", type=float, default=2.0)
+    ap.add_argument("--key", default="COOLDOWN", help="output key prefix")
+    ap.add_argument("--log", default=None, help="append KEY=VALUE lines to this file")
+    args = ap.parse_args()
+
+    baseline = baseline_from_step(args.baseline_step) if args.baseline_step else {}
+    baseline.update(parse_kv(args.baseline))
+    elapsed, ok = wait_settled(args.netdata_url, baseline, args.stable_sec, args.timeout, args.min_sec,
+                               args.poll, parse_kv(args.tol))
+
+    lines = [f"{args.key}_SEC={elapsed:.1f}", f"{args.key}_SETTLED={int(ok)}"]
+    print("\n".join(lines), flush=True)
+    if args.log:
+        with open(args.log, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env bash
+# run 사이 cooldown helper (cooldown.py). run_all.sh에서 source 한다.
+#
+# Env variables:
+# - COOLDOWN_MODE          : adaptive | fixed (default: adaptive, fixed면 기존처럼 COOLDOWN_FIXED_SEC 만큼 sleep)
+# - COOLDOWN_FIXED_SEC     : fixed 모드 sleep 초 / adaptive 모드의 최소 대기 초
+# - COOLDOWN_STABLE_SEC    : metric이 안정돼야 하는 연속 구간(초) (default: 20)
+# - COOLDOWN_TIMEOUT       : adaptive 최대 대기 초 (default: 300)
+# - COOLDOWN_BASELINE_STEP : baseline으로 쓸 idle step (비우면 drift만 본다)
+#
+# 사용:
+#   source "${REPO_ROOT}/scripts/utils/cooldown.sh"
+#   cooldown_wait                               # run 사이 (다음 run 시작 전)
+#   cooldown_record "${LOG_DIR}/run_${i}.log"   # 다음 run의 log가 써진 뒤
+#   -> run log에 PRE_COOLDOWN_SEC=<실제 대기 초>, PRE_COOLDOWN_SETTLED=1|0 append (fixed는 SEC만)
+
+COOLDOWN_MODE="${COOLDOWN_MODE:-adaptive}"
+COOLDOWN_FIXED_SEC="${COOLDOWN_FIXED_SEC:-30}"
+COOLDOWN_STABLE_SEC="${COOLDOWN_STABLE_SEC:-20}"
+COOLDOWN_TIMEOUT="${COOLDOWN_TIMEOUT:-300}"
+COOLDOWN_BASELINE_STEP="${COOLDOWN_BASELINE_STEP:-}"
+COOLDOWN_PY="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/cooldown.py"
+COOLDOWN_LINES=""
+
+# cooldown_wait: 결과 KEY=VALUE 줄은 COOLDOWN_LINES에 남는다 (subshell/pipe로 부르지 말 것).
+cooldown_wait() {
+  if [[ "${COOLDOWN_MODE}" == "fixed" ]]; then
+    sleep "${COOLDOWN_FIXED_SEC}"
+    COOLDOWN_LINES="PRE_COOLDOWN_SEC=${COOLDOWN_FIXED_SEC}"
+    return 0
+  fi
+  local args=(--key PRE_COOLDOWN --min-sec "${COOLDOWN_FIXED_SEC}"
+              --stable-sec "${COOLDOWN_STABLE_SEC}" --timeout "${COOLDOWN_TIMEOUT}")
+  [[ -n "${COOLDOWN_BASELINE_STEP}" ]] && args+=(--baseline-step "${COOLDOWN_BASELINE_STEP}")
+  COOLDOWN_LINES="$(python3 "${COOLDOWN_PY}" "${args[@]}" || true)"
+}
+
+# cooldown_record <run_log>: 직전 cooldown_wait 결과를 다음 run의 log에 붙인다.
+cooldown_record() {
+  [[ -n "${COOLDOWN_LINES}" && -f "$1" ]] || return 0
+  echo "${COOLDOWN_LINES}" >> "$1"
+  COOLDOWN_LINES=""
+}
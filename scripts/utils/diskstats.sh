@@ -0,0 +1,44 @@
+#!/usr/bin/env bash
+# /proc/diskstats sampler(diskstats_sampler.py) 시작/종료 helper. run_experiment.sh에서 source 한다.
+#
+# Env variables:
+# - DISKSTATS          : 1이면 run마다 sampler 실행 (default: 1, 0이면 아무것도 하지 않음)
+# - DISKSTATS_DEV      : 대상 block device (default: mmcblk0)
+# - DISKSTATS_INTERVAL : 샘플 간격(초) (default: 1)
+#
+# 사용:
+#   source "${REPO_ROOT}/scripts/utils/diskstats.sh"
+#   diskstats_start "${RUN_DATA}"     # START_EPOCH 직전
+#   ...
+#   diskstats_stop                    # END_EPOCH 직후
+#   -> ${RUN_DATA}/diskstats_<dev>.csv
+
+DISKSTATS="${DISKSTATS:-1}"
+DISKSTATS_DEV="${DISKSTATS_DEV:-mmcblk0}"
+DISKSTATS_INTERVAL="${DISKSTATS_INTERVAL:-1}"
+DISKSTATS_SAMPLER="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/diskstats_sampler.py"
+DISKSTATS_PID=""
+
+# diskstats_start <run_data_dir>
+diskstats_start() {
+  [[ "${DISKSTATS}" == "1" ]] || return 0
+  diskstats_stop
+  python3 "${DISKSTATS_SAMPLER}" \
+    --device "${DISKSTATS_DEV}" \
+    --interval "${DISKSTATS_INTERVAL}" \
+    --out "$1/diskstats_${DISKSTATS_DEV}.csv" >/dev/null &
+  DISKSTATS_PID=$!
+  # START 이전 샘플이 최소 1개 있어야 phase 경계에서 보간할 수 있다.
+  sleep "${DISKSTATS_INTERVAL}"
+}
+
+diskstats_stop() {
+  [[ -n "${DISKSTATS_PID}" ]] || return 0
+  kill -TERM "${DISKSTATS_PID}" 2>/dev/null || true
+  wait "${DISKSTATS_PID}" 2>/dev/null || true
+  DISKSTATS_PID=""
+}
+
+# 먼저 source 된 EXIT trap(thermal.sh, run_experiment.sh의 정리 등)을 덮어쓰지 않고 이어 붙인다.
+_diskstats_prev_trap="$(trap -p EXIT | sed -E "s/^trap -- '(.*)' EXIT$/\1/")"
+trap "diskstats_stop${_diskstats_prev_trap:+; ${_diskstats_prev_trap}}" EXIT
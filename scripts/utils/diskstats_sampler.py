@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# /proc/diskstats 누적 counter를 일정 간격으로 CSV에 기록한다 (표준 라이브러리만 사용).
+# - netdata export는 5초 평균 rate라 phase 경계에서 byte 수가 뭉개지므로,
+#   원시 누적 counter를 남겨 두고 analysis/diskio.py에서 phase 경계 시각으로 보간해 차분한다.
+# - 컬럼: time(epoch, 소수), device, /proc/diskstats 필드 1~11
+#     reads, reads_merged, sectors_read, ms_reading,
+#     writes, writes_merged, sectors_written, ms_writing,
+#     in_progress, ms_io, weighted_ms
+#   (sector는 항상 512 byte 단위)
+# - SIGINT/SIGTERM 또는 --duration 경과 시 마지막 샘플을 한 번 더 쓰고 종료
+#
+# 사용:
+#   python3 scripts/utils/diskstats_sampler.py --device mmcblk0 --interval 1 \
+#     --out data/netdata/<step>/run_<i>/diskstats_mmcblk0.csv
+from __future__ import annotations
+
+import argparse
+import csv
+import signal
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FIELDS = [
+    "reads", "reads_merged", "sectors_read", "ms_reading",
+    "writes", "writes_merged", "sectors_written", "ms_writing",
+    "in_progress", "ms_io", "weighted_ms",
+]
+
+
+def read_diskstats(devices: List[str], path: Path = Path("/proc/diskstats")) -> Dict[str, List[int]]:
+    out: Dict[str, List[int]] = {}
+    for line in path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) < 3 + len(FIELDS) or parts[2] not in devices:
+            continue
+        out[parts[2]] = [int(x) for x in parts[3:3 + len(FIELDS)]]
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--device", nargs="+", default=["mmcblk0"])
+    ap.add_argument("--interval", type=float, default=1.0)
+    ap.add_argument("--duration", type=float, default=0.0, help="0 = until SIGINT/SIGTERM")
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args()
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    stop = {"flag": False}
+
+    def on_signal(signum, frame):
+        stop["flag"] = True
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    t_end: Optional[float] = time.time() + args.duration if args.duration > 0 else None
+    missing_reported = False
+    with out_path.open("w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["time", "device"] + FIELDS)
+        next_t = time.monotonic()
+        while True:
+            now = time.time()
+            stats = read_diskstats(args.device)
+            if not stats and not missing_reported:
+                print(f"[diskstats] device not found: {' '.join(args.device)}", flush=True)
+                missing_reported = True
+            for dev, vals in stats.items():
+                w.writerow([f"{now:.3f}", dev] + vals)
+            f.flush()
+
+            if stop["flag"] or (t_end is not None and now >= t_end):
+                break
+            # 간격이 밀리지 않게 monotonic 기준으로 다음 시각을 잡는다.
+            next_t += args.interval
+            time.sleep(max(0.0, next_t - time.monotonic()))
+
+    print("Saved:", out_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env bash
+# 종료될 pod의 log를 따라가며 server.py drain 줄(DRAIN_START_EPOCH / DRAIN_END_EPOCH)을 받는 helper.
+# run_experiment.sh에서 source 한다 (steps 15/16, tinyllama-drain-deployment.yaml).
+# pod가 지워지면 kubectl logs로 다시 읽을 수 없으므로 rollout restart / delete 전에 시작한다.
+# llama_cpp.server 배포(drain 없음)면 drain 줄이 없어 drain_logs_stop은 아무 key도 출력하지 않는다.
+#
+# 사용:
+#   source "${REPO_ROOT}/scripts/utils/drain_logs.sh"
+#   drain_logs_start "${NAMESPACE}" "${SELECTOR}" "${DATA_DIR}"   # restart/delete 직전
+#   ...
+#   drain_logs_stop >> "${LOG_FILE}"                               # 옛 pod가 모두 사라진 뒤
+#   -> ${DATA_DIR}/pod_<name>.log
+#      DRAIN_START_EPOCH (가장 이른 pod), DRAIN_END_EPOCH (가장 늦은 pod), DRAIN_ABANDONED (합), DRAIN_PODS
+
+# drain_logs_stop이 옛 pod 종료(kubectl logs -f 종료)를 기다리는 최대 시간(초).
+# terminationGracePeriodSeconds(40)보다 길게 둔다.
+DRAIN_LOG_WAIT_SEC="${DRAIN_LOG_WAIT_SEC:-60}"
+DRAIN_LOG_PIDS=()
+DRAIN_LOG_FILES=()
+
+# drain_logs_start <namespace> <selector> <out_dir>
+drain_logs_start() {
+  local ns="$1" selector="$2" out_dir="$3" pod f
+  drain_logs_stop >/dev/null
+  DRAIN_LOG_FILES=()
+  for pod in $(kubectl -n "${ns}" get pods -l "${selector}" -o jsonpath='{.items[*].metadata.name}' 2>/dev/null); do
+    f="${out_dir}/pod_${pod}.log"
+    kubectl -n "${ns}" logs -f --tail=-1 "${pod}" > "${f}" 2>/dev/null &
+    DRAIN_LOG_PIDS+=("$!")
+    DRAIN_LOG_FILES+=("${f}")
+  done
+}
+
+drain_logs_stop() {
+  local pid deadline=$(( $(date +%s) + DRAIN_LOG_WAIT_SEC ))
+  for pid in "${DRAIN_LOG_PIDS[@]+"${DRAIN_LOG_PIDS[@]}"}"; do
+    # pod가 끝나면 kubectl logs -f도 스스로 끝난다. 기한까지 남아 있으면 정리
+    while kill -0 "${pid}" 2>/dev/null && (( $(date +%s) < deadline )); do
+      sleep 0.5
+    done
+    kill "${pid}" 2>/dev/null || true
+    wait "${pid}" 2>/dev/null || true
+  done
+  DRAIN_LOG_PIDS=()
+  [[ ${#DRAIN_LOG_FILES[@]} -gt 0 ]] || return 0
+  { cat "${DRAIN_LOG_FILES[@]}" 2>/dev/null || true; } | awk '
+    { for (i = 1; i <= NF; i++) { split($i, kv, "="); v[kv[1]] = kv[2] } }
+    /^DRAIN_START_EPOCH=/ { n++; if (s == "" || v["DRAIN_START_EPOCH"] < s) s = v["DRAIN_START_EPOCH"] }
+    /^DRAIN_END_EPOCH=/ { if (e == "" || v["DRAIN_END_EPOCH"] > e) e = v["DRAIN_END_EPOCH"]; a += v["ABANDONED"] }
+    END {
+      if (n == 0) exit
+      print "DRAIN_START_EPOCH=" s
+      if (e != "") { print "DRAIN_END_EPOCH=" e; print "DRAIN_ABANDONED=" a }
+      print "DRAIN_PODS=" n
+    }'
+}
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+# Kubernetes watch API로 readiness 전이를 감지해 소수 초 epoch marker를 남긴다 (표준 라이브러리만 사용).
+# - 1초 polling(kubectl get ...)은 매번 kubectl process를 fork 해 측정 대상인 CPU를 쓰고,
+#   timestamp 정밀도도 polling 간격에 묶인다. watch 연결 하나로 event 수신 시각을 그대로 기록한다.
+# - resource마다 LIST(resourceVersion 확보) -> WATCH(stream) thread 하나. 연결 실패(API server 기동 전 등)나
+#   410 Gone이면 --retry 간격으로 다시 LIST 한다.
+#
+# Markers (처음 만족한 시각, KEY_EPOCH=<epoch.ms>; --prefix로 앞에 붙일 수 있음)
+# - NODE_READY       : Ready=True 이고 heartbeat/transition이 --since 이후인 node가 --min-nodes 개 이상
+#                      (k3s 재시작 직후 남아 있는 stale Ready는 세지 않는다)
+# - POD_PENDING      : 새로 관찰된 unschedulable(PodScheduled=False) pod
+# - POD_SCHEDULED    : PodScheduled가 True로 바뀐 첫 pod
+# - POD_RUNNING      : phase가 Running으로 바뀐 첫 pod
+# - POD_READY        : Ready가 True로 바뀐 첫 pod
+# - PODS_RUNNING     : Running pod 수가 --replicas 이상 (삭제 중인 pod 제외)
+# - PODS_READY       : Ready pod 수가 --replicas 이상 (삭제 중인 pod 제외)
+#                      PODS_* 는 polling wait와 같은 level 조건이라 시작 시점에 이미 만족하면 LIST 시각이 된다.
+# - DEPLOY_AVAILABLE : `kubectl rollout status`와 같은 완료 조건을 watch 시작 시점보다 새 generation에서 만족
+# - DEPLOY_DELETED   : Deployment DELETED event
+# "바뀐" = watch 중 이전 상태에서 전이를 관찰했거나, 처음 본 object의 lastTransitionTime이 --since 이후.
+#
+# 접속 정보
+# - --server (http://... 이면 인증 없이; fake API server 테스트용)
+# - 아니면 --kubeconfig (default: $KUBECONFIG, ~/.kube/config)를 `<kubectl> config view --raw --minify -o json`으로 읽는다.
+#   k3s: --kubectl "k3s kubectl" --kubeconfig /etc/rancher/k3s/k3s.yaml (root 권한 필요)
+#
+# --ready-file: 모든 resource의 첫 LIST가 끝나면 만드는 파일 (script가 START 전에 기다릴 수 있게)
+# --until의 marker가 모두 기록되면 exit 0, --timeout이면 exit 1.
+# marker 줄은 stdout(과 --log 파일 append)으로 나온다.
+# --self-test: 같은 process 안에 fake API server(LIST + watch stream, 410 ERROR 포함)를 띄우고
+#   `--server http://127.0.0.1:<port>`로 이 script를 실행해 marker를 확인한다 (cluster 불필요, exit 0 = 통과).
+#
+# 사용:
+#   python3 scripts/utils/k8s_watch.py --self-test
+#   python3 scripts/utils/k8s_watch.py --watch nodes --until NODE_READY --since "${START_EPOCH}" \
+#     --kubectl "k3s kubectl" --kubeconfig /etc/rancher/k3s/k3s.yaml --timeout 180 --log "${RUN_LOG}"
+#   python3 scripts/utils/k8s_watch.py --watch pods deployments --selector app=nginx --deploy nginx \
+#     --until DEPLOY_AVAILABLE --timeout 300 > "${RUN_DATA}/watch_markers.log"
+from __future__ import annotations
+
+import argparse
+import base64
+import http.server
+import json
+import os
+import queue
+import shlex
+import signal
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+Obj = Dict[str, Any]
+
+RESOURCES = {
+    "nodes": ("/api/v1", "nodes", False),
+    "pods": ("/api/v1", "pods", True),
+    "deployments": ("/apis/apps/v1", "deployments", True),
+}
+
+
+def parse_time(s: Optional[str]) -> float:
+    if not s:
+        return float("nan")
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+def condition(obj: Obj, ctype: str) -> Optional[Obj]:
+    for c in (obj.get("status") or {}).get("conditions") or []:
+        if c.get("type") == ctype:
+            return c
+    return None
+
+
+def is_true(obj: Obj, ctype: str) -> bool:
+    c = condition(obj, ctype)
+    return c is not None and c.get("status") == "True"
+
+
+# ---------------------------------------------------------------------------
+# 상태 추적 (네트워크와 분리: LIST/event를 넣으면 새 marker를 돌려준다)
+# ---------------------------------------------------------------------------
+class Tracker:
+    def __init__(self, since: float, min_nodes: int = 1, replicas: Optional[int] = None, deploy: Optional[str] = None):
+        # API 시각은 초 단위로 잘려 오므로 1초 여유를 둔다.
+        self.since = float(since) - 1.0
+        self.min_nodes = min_nodes
+        self.replicas = replicas
+        self.deploy = deploy
+        self.markers: Dict[str, float] = {}
+        self.fresh_nodes: set = set()
+        self.pods: Dict[str, Obj] = {}
+        self.deploy_base_gen: Optional[int] = None
+
+    def _mark(self, key: str, t: float, out: List[Tuple[str, float]]) -> None:
+        if key not in self.markers:
+            self.markers[key] = t
+            out.append((key, t))
+
+    # --- nodes
+    def _node(self, obj: Obj, t: float, out: List[Tuple[str, float]]) -> None:
+        name = obj["metadata"]["name"]
+        c = condition(obj, "Ready")
+        fresh = c is not None and c.get("status") == "True" and max(
+            parse_time(c.get("lastHeartbeatTime")) if c.get("lastHeartbeatTime") else -1.0,
+            parse_time(c.get("lastTransitionTime")) if c.get("lastTransitionTime") else -1.0,
+        ) >= self.since
+        if fresh:
+            self.fresh_nodes.add(name)
+        else:
+            self.fresh_nodes.discard(name)
+        if len(self.fresh_nodes) >= self.min_nodes:
+            self._mark("NODE_READY", t, out)
+
+    # --- pods
+    def _pod_flags(self, obj: Obj) -> Dict[str, bool]:
+        st = obj.get("status") or {}
+        sched = condition(obj, "PodScheduled")
+        return {
+            "POD_PENDING": sched is not None and sched.get("status") == "False",
+            "POD_SCHEDULED": is_true(obj, "PodScheduled"),
+            "POD_RUNNING": st.get("phase") == "Running",
+            "POD_READY": is_true(obj, "Ready"),
+        }
+
+    def _pod_first_seen_fresh(self, obj: Obj, key: str) -> bool:
+        # 처음 보는 pod: 조건이 --since 이후에 생겼는지로 판단
+        if key == "POD_PENDING":
+            return parse_time(obj["metadata"].get("creationTimestamp")) >= self.since
+        if key == "POD_RUNNING":
+            started = [
+                parse_time(((cs.get("state") or {}).get("running") or {}).get("startedAt"))
+                for cs in (obj.get("status") or {}).get("containerStatuses") or []
+            ]
+            return any(s >= self.since for s in started)
+        ctype = {"POD_SCHEDULED": "PodScheduled", "POD_READY": "Ready"}[key]
+        return parse_time((condition(obj, ctype) or {}).get("lastTransitionTime")) >= self.since
+
+    @staticmethod
+    def _pod_uid(obj: Obj) -> str:
+        return obj["metadata"].get("uid") or obj["metadata"]["name"]
+
+    def _pod(self, etype: str, obj: Obj, t: float, out: List[Tuple[str, float]]) -> None:
+        uid = self._pod_uid(obj)
+        prev = self.pods.get(uid)
+        if etype == "DELETED":
+            self.pods.pop(uid, None)
+        else:
+            self.pods[uid] = obj
+            now = self._pod_flags(obj)
+            before = self._pod_flags(prev) if prev is not None else None
+            for key, v in now.items():
+                if not v:
+                    continue
+                if (before is not None and not before[key]) or (before is None and self._pod_first_seen_fresh(obj, key)):
+                    self._mark(key, t, out)
+        if self.replicas is not None:
+            live = [p for p in self.pods.values() if not p["metadata"].get("deletionTimestamp")]
+            if sum(1 for p in live if (p.get("status") or {}).get("phase") == "Running") >= self.replicas:
+                self._mark("PODS_RUNNING", t, out)
+            if sum(1 for p in live if is_true(p, "Ready")) >= self.replicas:
+                self._mark("PODS_READY", t, out)
+
+    # --- deployments
+    @staticmethod
+    def _rollout_complete(obj: Obj) -> bool:
+        # kubectl rollout status와 같은 조건
+        meta, spec, st = obj["metadata"], obj.get("spec") or {}, obj.get("status") or {}
+        want = spec.get("replicas", 1)
+        return (
+            st.get("observedGeneration", 0) >= meta.get("generation", 0)
+            and st.get("updatedReplicas", 0) >= want
+            and st.get("replicas", 0) <= st.get("updatedReplicas", 0)
+            and st.get("availableReplicas", 0) >= st.get("updatedReplicas", 0)
+        )
+
+    def _deployment(self, etype: str, obj: Obj, t: float, out: List[Tuple[str, float]]) -> None:
+        if self.deploy and obj["metadata"]["name"] != self.deploy:
+            return
+        if etype == "DELETED":
+            self._mark("DEPLOY_DELETED", t, out)
+            return
+        gen = (obj.get("status") or {}).get("observedGeneration", 0)
+        if self._rollout_complete(obj) and (self.deploy_base_gen is None or gen > self.deploy_base_gen):
+            self._mark("DEPLOY_AVAILABLE", t, out)
+
+    # --- entry points
+    def on_list(self, kind: str, items: List[Obj], t: float) -> List[Tuple[str, float]]:
+        out: List[Tuple[str, float]] = []
+        # LIST(reconnect 후 relist 포함)가 현재 전체 상태다. 끊긴 동안 지워진 object는 DELETED event가
+        # 오지 않으므로, 추적 중인 집합을 목록에 있는 것으로 바꾼 뒤 변화를 비교한다.
+        if kind == "pods":
+            listed = {self._pod_uid(obj) for obj in items}
+            self.pods = {uid: p for uid, p in self.pods.items() if uid in listed}
+        elif kind == "nodes":
+            self.fresh_nodes &= {obj["metadata"]["name"] for obj in items}
+        for obj in items:
+            if kind == "deployments" and (not self.deploy or obj["metadata"]["name"] == self.deploy):
+                # 이미 완료 상태인 generation은 기준으로만 쓰고 marker로 치지 않는다.
+                if self._rollout_complete(obj) and self.deploy_base_gen is None:
+                    self.deploy_base_gen = (obj.get("status") or {}).get("observedGeneration", 0)
+                    continue
+            self.on_event(kind, "ADDED", obj, t, out)
+        return out
+
+    def on_event(self, kind: str, etype: str, obj: Obj, t: float,
+                 out: Optional[List[Tuple[str, float]]] = None) -> List[Tuple[str, float]]:
+        out = [] if out is None else out
+        if kind == "nodes":
+            if etype != "DELETED":
+                self._node(obj, t, out)
+        elif kind == "pods":
+            self._pod(etype, obj, t, out)
+        elif kind == "deployments":
+            self._deployment(etype, obj, t, out)
+        return out
+
+
+# ---------------------------------------------------------------------------
+# API 접속
+# ---------------------------------------------------------------------------
+class Api:
+    def __init__(self, server: str, ctx: Optional[ssl.SSLContext] = None, token: Optional[str] = None):
+        self.server = server.rstrip("/")
+        self.token = token
+        handlers = [urllib.request.HTTPSHandler(context=ctx)] if ctx is not None else []
+        self.opener = urllib.request.build_opener(*handlers)
+
+    def open(self, path: str, params: Dict[str, Any], timeout: Optional[float]):
+        url = f"{self.server}{path}?{urllib.parse.urlencode(params)}" if params else f"{self.server}{path}"
+        req = urllib.request.Request(url, headers={"Accept": "application/json"})
+        if self.token:
+            req.add_header("Authorization", f"Bearer {self.token}")
+        return self.opener.open(req, timeout=timeout)
+
+
+def api_from_kubeconfig(kubectl: str, kubeconfig: Optional[str]) -> Api:
+    cmd = shlex.split(kubectl) + ["config", "view", "--raw", "--minify", "-o", "json"]
+    if kubeconfig:
+        cmd[len(shlex.split(kubectl)):len(shlex.split(kubectl))] = ["--kubeconfig", kubeconfig]
+    cfg = json.loads(subprocess.run(cmd, check=True, capture_output=True, text=True).stdout)
+    cluster = cfg["clusters"][0]["cluster"]
+    user = (cfg.get("users") or [{}])[0].get("user") or {}
+
+    # *-data는 ssl이 파일 경로로만 받으므로 임시 디렉터리에 풀고, context에 읽어 들인 뒤 바로 지운다.
+    with tempfile.TemporaryDirectory(prefix="k8s_watch_") as tmp:
+        def data_file(data_key: str, path_key: str, src: Obj) -> Optional[str]:
+            if src.get(data_key):
+                p = Path(tmp) / data_key
+                p.write_bytes(base64.b64decode(src[data_key]))
+                return str(p)
+            return src.get(path_key)
+
+        ctx = ssl.create_default_context(cafile=data_file("certificate-authority-data", "certificate-authority", cluster))
+        if cluster.get("insecure-skip-tls-verify"):
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+        cert = data_file("client-certificate-data", "client-certificate", user)
+        key = data_file("client-key-data", "client-key", user)
+        if cert and key:
+            ctx.load_cert_chain(cert, key)
+    return Api(cluster["server"], ctx, user.get("token"))
+
+
+def watch_loop(api: Api, kind: str, namespace: str, params: Dict[str, str], events: "queue.Queue",
+               stop: threading.Event, retry: float) -> None:
+    prefix, plural, namespaced = RESOURCES[kind]
+    path = f"{prefix}/namespaces/{namespace}/{plural}" if namespaced else f"{prefix}/{plural}"
+    while not stop.is_set():
+        try:
+            with api.open(path, params, timeout=10) as r:
+                lst = json.loads(r.read().decode("utf-8"))
+            events.put((kind, "LIST", lst.get("items") or [], time.time()))
+            rv = lst["metadata"]["resourceVersion"]
+            while not stop.is_set():
+                w = dict(params, watch="1", resourceVersion=rv, allowWatchBookmarks="true", timeoutSeconds="300")
+                with api.open(path, w, timeout=330) as r:
+                    for line in r:
+                        t = time.time()
+                        if not line.strip():
+                            continue
+                        ev = json.loads(line)
+                        obj = ev.get("object") or {}
+                        if ev.get("type") == "ERROR":
+                            # 410 Gone 등: 다시 LIST
+                            raise urllib.error.URLError(obj.get("message", "watch error"))
+                        rv = (obj.get("metadata") or {}).get("resourceVersion", rv)
+                        if ev.get("type") != "BOOKMARK":
+                            events.put((kind, ev.get("type"), obj, t))
+                        if stop.is_set():
+                            return
+        except (urllib.error.URLError, OSError, ValueError, KeyError):
+            # API server 기동 전 / 연결 끊김 / 410
+            stop.wait(retry)
+
+
+# ---------------------------------------------------------------------------
+# --self-test: fake API server
+# ---------------------------------------------------------------------------
+def _iso(t: float) -> str:
+    return datetime.fromtimestamp(t, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _fake_objects(now: float) -> Tuple[Dict[str, List[Obj]], Dict[str, List[Obj]]]:
+    # resource -> LIST items, resource -> watch events
+    def node(heartbeat: float) -> Obj:
+        return {"metadata": {"name": "w1", "resourceVersion": "2"},
+                "status": {"conditions": [{"type": "Ready", "status": "True", "lastHeartbeatTime": _iso(heartbeat),
+                                           "lastTransitionTime": _iso(now - 3600)}]}}
+
+    def pod(phase: str, ready: bool) -> Obj:
+        st: Obj = {"phase": phase, "conditions": [
+            {"type": "PodScheduled", "status": "True", "lastTransitionTime": _iso(now)},
+            {"type": "Ready", "status": "True" if ready else "False", "lastTransitionTime": _iso(now)}]}
+        if phase == "Running":
+            st["containerStatuses"] = [{"state": {"running": {"startedAt": _iso(now)}}}]
+        return {"metadata": {"name": "web-1", "uid": "u1", "creationTimestamp": _iso(now), "resourceVersion": "12"},
+                "status": st}
+
+    def deploy(gen: int, updated: int) -> Obj:
+        return {"metadata": {"name": "web", "generation": gen, "resourceVersion": "22"},
+                "spec": {"replicas": 1},
+                "status": {"observedGeneration": gen, "replicas": 1, "updatedReplicas": updated,
+                           "availableReplicas": updated}}
+
+    lists = {"nodes": [node(now - 600)], "pods": [], "deployments": [deploy(1, 1)]}
+    events = {
+        # stale Ready(LIST) -> heartbeat 갱신
+        "nodes": [{"type": "MODIFIED", "object": node(now + 1)}],
+        "pods": [{"type": "ADDED", "object": pod("Pending", False)},
+                 {"type": "MODIFIED", "object": pod("Running", False)},
+                 {"type": "MODIFIED", "object": pod("Running", True)}],
+        # 첫 watch는 410 -> 다시 LIST, 이후 새 generation rollout 완료
+        "deployments": [{"type": "ERROR", "object": {"code": 410, "message": "too old resource version"}},
+                        {"type": "MODIFIED", "object": deploy(2, 0)},
+                        {"type": "MODIFIED", "object": deploy(2, 1)}],
+    }
+    return lists, events
+
+
+def self_test() -> None:
+    now = time.time()
+    lists, events = _fake_objects(now)
+    errors: List[str] = []
+    # LIST에 있는 stale Ready node는 NODE_READY가 아니다
+    if Tracker(now).on_list("nodes", lists["nodes"], now):
+        errors.append("stale Ready node counted on LIST")
+    # relist에 없는 pod(끊긴 동안 삭제)는 추적에서 빠진다
+    tr = Tracker(now)
+    tr.on_list("pods", lists["pods"] + [{"metadata": {"name": "gone", "uid": "gone"}, "status": {}}], now)
+    tr.on_list("pods", lists["pods"], now)
+    if "gone" in tr.pods:
+        errors.append("pod deleted during disconnect kept after relist")
+    by_path = {(f"{prefix}/namespaces/default/{plural}" if ns else f"{prefix}/{plural}"): kind
+               for kind, (prefix, plural, ns) in RESOURCES.items()}
+    sent: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, fmt, *a):
+            pass
+
+        def do_GET(self):
+            u = urllib.parse.urlparse(self.path)
+            kind = by_path.get(u.path)
+            if kind is None:
+                self.send_error(404)
+                return
+            q = urllib.parse.parse_qs(u.query)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            if "watch" not in q:
+                body = {"metadata": {"resourceVersion": "100"}, "items": lists[kind]}
+                self.wfile.write(json.dumps(body).encode("utf-8"))
+                return
+            # watch: 아직 안 보낸 event를 ERROR까지(포함) 또는 끝까지 한 줄씩 보낸다.
+            with lock:
+                i = sent.get(kind, 0)
+                batch = []
+                for ev in events[kind][i:]:
+                    batch.append(ev)
+                    if ev["type"] == "ERROR":
+                        break
+                sent[kind] = i + len(batch)
+            for ev in batch:
+                self.wfile.write((json.dumps(ev) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(0.05)
+            if not batch:
+                time.sleep(0.5)
+
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    until = ["NODE_READY", "POD_SCHEDULED", "POD_RUNNING", "POD_READY", "PODS_RUNNING", "PODS_READY",
+             "DEPLOY_AVAILABLE"]
+    got: Dict[str, str] = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="k8s_watch_test_") as tmp:
+            ready = Path(tmp) / "ready"
+            p = subprocess.run([sys.executable, os.path.abspath(__file__),
+                                "--server", f"http://127.0.0.1:{srv.server_address[1]}",
+                                "--watch", "nodes", "pods", "deployments", "--selector", "app=web", "--deploy", "web",
+                                "--replicas", "1", "--since", f"{now:.3f}", "--until", *until, "--timeout", "20",
+                                "--ready-file", str(ready)],
+                               capture_output=True, text=True, timeout=30)
+            got = dict(line.split("_EPOCH=", 1) for line in p.stdout.split() if "_EPOCH=" in line)
+            if p.returncode != 0:
+                errors.append(f"exit {p.returncode}: {p.stderr.strip()}")
+            errors += [f"missing {k}" for k in until if k not in got]
+            errors += [f"unexpected {k}" for k in got if k not in until]
+            if not ready.exists():
+                errors.append("--ready-file not created")
+            if all(k in got for k in ("POD_SCHEDULED", "POD_RUNNING", "POD_READY")) and not (
+                    float(got["POD_SCHEDULED"]) <= float(got["POD_RUNNING"]) <= float(got["POD_READY"])):
+                errors.append("pod markers out of order")
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    for k in until:
+        print(f"[self-test] {k}_EPOCH={got.get(k, '')}")
+    if errors:
+        raise SystemExit("[self-test] FAIL: " + "; ".join(errors))
+    print("[self-test] OK")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--watch", nargs="+", choices=sorted(RESOURCES))
+    ap.add_argument("--until", nargs="*", default=[], help="marker keys (without _EPOCH) to wait for")
+    ap.add_argument("--since", type=float, default=None, help="epoch; default = now")
+    ap.add_argument("--timeout", type=float, default=0.0, help="0 = until SIGINT/SIGTERM")
+    ap.add_argument("--namespace", default="default")
+    ap.add_argument("--selector", default=None, help="pod label selector, e.g. app=nginx")
+    ap.add_argument("--node", default=None, help="watch only this node")
+    ap.add_argument("--deploy", default=None, help="deployment name")
+    ap.add_argument("--min-nodes", type=int, default=1)
+    ap.add_argument("--replicas", type=int, default=None, help="PODS_READY threshold")
+    ap.add_argument("--prefix", default="", help="marker key prefix, e.g. B_")
+    ap.add_argument("--log", default=None, help="append marker lines to this file")
+    ap.add_argument("--ready-file", default=None, help="touched after the first LIST of every resource")
+    ap.add_argument("--server", default=None)
+    ap.add_argument("--kubeconfig", default=os.environ.get("KUBECONFIG"))
+    ap.add_argument("--kubectl", default="kubectl")
+    ap.add_argument("--retry", type=float, default=0.2, help="seconds between reconnects")
+    ap.add_argument("--self-test", action="store_true", help="run against a built-in fake API server and exit")
+    args = ap.parse_args()
+    if args.self_test:
+        self_test()
+        return
+    if not args.watch:
+        ap.error("--watch is required")
+
+    since = args.since if args.since is not None else time.time()
+    api = Api(args.server) if args.server else api_from_kubeconfig(args.kubectl, args.kubeconfig)
+    tracker = Tracker(since, args.min_nodes, args.replicas, args.deploy)
+
+    params: Dict[str, Dict[str, str]] = {k: {} for k in args.watch}
+    if "pods" in params and args.selector:
+        params["pods"]["labelSelector"] = args.selector
+    if "nodes" in params and args.node:
+        params["nodes"]["fieldSelector"] = f"metadata.name={args.node}"
+    if "deployments" in params and args.deploy:
+        params["deployments"]["fieldSelector"] = f"metadata.name={args.deploy}"
+
+    stop = threading.Event()
+    events: "queue.Queue" = queue.Queue()
+    for kind in args.watch:
+        threading.Thread(target=watch_loop, args=(api, kind, args.namespace, params[kind], events, stop, args.retry),
+                         daemon=True).start()
+
+    def on_signal(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    log = Path(args.log) if args.log else None
+    ready_file = Path(args.ready_file) if args.ready_file else None
+    listed: set = set()
+    until = set(args.until)
+    t_end = time.time() + args.timeout if args.timeout > 0 else None
+    while not stop.is_set():
+        if until and until <= set(tracker.markers):
+            break
+        if t_end is not None and time.time() >= t_end:
+            break
+        try:
+            kind, etype, payload, t = events.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        new = tracker.on_list(kind, payload, t) if etype == "LIST" else tracker.on_event(kind, etype, payload, t)
+        if etype == "LIST" and ready_file is not None and kind not in listed:
+            listed.add(kind)
+            if listed == set(args.watch):
+                ready_file.touch()
+        for key, tm in new:
+            line = f"{args.prefix}{key}_EPOCH={tm:.3f}"
+            print(line, flush=True)
+            if log is not None:
+                with log.open("a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+    stop.set()
+
+    missing = sorted(until - set(tracker.markers))
+    if missing:
+        print(f"[k8s_watch] timeout waiting for: {' '.join(missing)}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
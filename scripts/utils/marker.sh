@@ -0,0 +1,136 @@
+#!/usr/bin/env bash
+# 소수 초 wall clock + CLOCK_MONOTONIC epoch marker helper. run_experiment.sh에서 source 한다.
+# date +%s(1초 단위)로는 몇 초짜리 event(step04 apply, step10 delete)에서 양자화 오차가 측정값의 큰 부분이 된다.
+#
+# mark NAME 은 같은 순간의 값을 변수로 잡는다.
+#   NAME_EPOCH    : 정수 초 (기존 log 형식 / bash 산술 그대로)
+#   NAME_EPOCH_NS : wall clock (ns)
+#   NAME_MONO_NS  : CLOCK_MONOTONIC (ns, NTP 보정으로 wall clock이 튀어도 간격이 정확)
+# 시각은 source 할 때 한 번 띄운 python3 coprocess에서 받는다 (marker마다 fork 하지 않음).
+# 요청마다 번호를 보내고 응답의 번호가 같을 때만 쓴다 (2초 안에 응답이 없던 요청의 늦은 응답이
+# pipe에 남아 다음 marker 값으로 읽히지 않도록, 번호가 다른 줄은 버린다).
+# python3가 없거나 응답이 없으면 date +%s%N 으로 wall clock만 남긴다.
+#
+# marks_log는 기존 KEY=VALUE 줄 뒤에 붙일 블록을 출력한다.
+#   NAME_EPOCH_NS=..., NAME_MONO_NS=...     (mark 순서대로)
+#   T_xxx=6.812                              (mark_span으로 등록한 구간, monotonic 차이 소수 3자리)
+# mark_span으로 등록한 T_xxx는 script에서 정수로 따로 쓰지 않는다 (key마다 한 줄).
+# parser(analysis/phases.py precise_kv)는 *_EPOCH_NS가 있는 marker는 *_EPOCH 대신 소수 초를 쓴다.
+#
+# 사용:
+#   source "${REPO_ROOT}/scripts/utils/marker.sh"
+#   marks_reset                       # run마다 (loop 안에서 여러 run을 돌 때)
+#   mark START
+#   ...
+#   mark READY
+#   mark_copy END READY               # END_EPOCH="${READY_EPOCH}" 대신
+#   mark_at READY 1769150012.345      # k8s_watch.py 등 다른 process가 잰 소수 초 (monotonic 없음)
+#   mark_span T_ready START READY
+#   { echo "START_EPOCH=${START_EPOCH}"; ...; marks_log; } > "${RUN_LOG}"
+
+MARK_NAMES=()
+MARK_SPANS=()
+MARK_SEQ=0
+
+coproc MARK_CLOCK {
+  exec python3 -u -c 'import sys, time
+for line in sys.stdin:
+    print(line.strip(), time.time_ns(), time.monotonic_ns(), flush=True)' 2>/dev/null
+}
+
+marks_reset() {
+  MARK_NAMES=()
+  MARK_SPANS=()
+}
+
+_mark_names_add() {
+  local n
+  for n in "${MARK_NAMES[@]+"${MARK_NAMES[@]}"}"; do
+    [[ "${n}" == "$1" ]] && return 0
+  done
+  MARK_NAMES+=("$1")
+}
+
+# mark NAME  -> NAME_EPOCH, NAME_EPOCH_NS, NAME_MONO_NS
+mark() {
+  local wall="" mono="" seq="" ok=0
+  MARK_SEQ=$(( MARK_SEQ + 1 ))
+  if [[ -n "${MARK_CLOCK[1]:-}" ]] && { echo "${MARK_SEQ}" >&"${MARK_CLOCK[1]}"; } 2>/dev/null; then
+    # 앞선 요청의 늦은 응답은 번호가 달라 버린다.
+    while read -r -t 2 seq wall mono <&"${MARK_CLOCK[0]}"; do
+      if [[ "${seq}" == "${MARK_SEQ}" && -n "${wall}" ]]; then
+        ok=1
+        break
+      fi
+    done
+  fi
+  if (( ! ok )); then
+    wall="$(date +%s%N)"
+    mono=""
+  fi
+  printf -v "$1_EPOCH" '%s' "$(( wall / 1000000000 ))"
+  printf -v "$1_EPOCH_NS" '%s' "${wall}"
+  printf -v "$1_MONO_NS" '%s' "${mono}"
+  _mark_names_add "$1"
+}
+
+# mark_copy DST SRC  -> DST_* = SRC_*
+mark_copy() {
+  local src_epoch="$2_EPOCH" src_ns="$2_EPOCH_NS" src_mono="$2_MONO_NS"
+  printf -v "$1_EPOCH" '%s' "${!src_epoch}"
+  printf -v "$1_EPOCH_NS" '%s' "${!src_ns:-}"
+  printf -v "$1_MONO_NS" '%s' "${!src_mono:-}"
+  _mark_names_add "$1"
+}
+
+# mark_at NAME <epoch[.frac]>  -> 외부에서 받은 wall clock 값 (NAME_MONO_NS는 비움)
+mark_at() {
+  local sec="${2%%.*}" frac=""
+  if [[ "$2" == *.* ]]; then
+    frac="${2#*.}"
+  fi
+  frac="${frac}000000000"
+  printf -v "$1_EPOCH" '%s' "${sec}"
+  printf -v "$1_EPOCH_NS" '%s' "${sec}${frac:0:9}"
+  printf -v "$1_MONO_NS" '%s' ""
+  _mark_names_add "$1"
+}
+
+# mark_span KEY FROM TO  -> marks_log에 KEY=<TO - FROM 초>
+mark_span() {
+  MARK_SPANS+=("$1 $2 $3")
+}
+
+# mark_sec FROM TO  -> 두 marker 간격(초, 소수 3자리). monotonic이 없으면 wall clock 차이
+mark_sec() {
+  local a_mono="$1_MONO_NS" b_mono="$2_MONO_NS" a_ns="$1_EPOCH_NS" b_ns="$2_EPOCH_NS" d
+  if [[ -n "${!a_mono:-}" && -n "${!b_mono:-}" ]]; then
+    d=$(( ${!b_mono} - ${!a_mono} ))
+  elif [[ -n "${!a_ns:-}" && -n "${!b_ns:-}" ]]; then
+    d=$(( ${!b_ns} - ${!a_ns} ))
+  else
+    return 1
+  fi
+  local sign=""
+  if (( d < 0 )); then
+    sign="-"
+    d=$(( -d ))
+  fi
+  printf '%s%d.%03d\n' "${sign}" "$(( d / 1000000000 ))" "$(( d % 1000000000 / 1000000 ))"
+}
+
+marks_log() {
+  local n ns mono span key a b sec
+  for n in "${MARK_NAMES[@]+"${MARK_NAMES[@]}"}"; do
+    ns="${n}_EPOCH_NS"
+    mono="${n}_MONO_NS"
+    echo "${n}_EPOCH_NS=${!ns:-}"
+    echo "${n}_MONO_NS=${!mono:-}"
+  done
+  for span in "${MARK_SPANS[@]+"${MARK_SPANS[@]}"}"; do
+    read -r key a b <<< "${span}"
+    if sec="$(mark_sec "${a}" "${b}")"; then
+      echo "${key}=${sec}"
+    fi
+  done
+}
@@ -0,0 +1,44 @@
+#!/usr/bin/env bash
+# 모든 node의 Netdata chart export helper (nodes_export.py). run_experiment.sh에서 source 한다.
+# master 기준 export(NETDATA_URL)는 그대로 두고, node별 CSV를 run 디렉터리 아래 <node>/ 에 추가로 남긴다.
+# run 시작/끝에 node별 clock offset(clock_offset.py)도 재서 analysis가 worker 시각을 master 시각으로 보정한다.
+#
+# Env variables:
+# - MULTINODE     : 1이면 run마다 모든 node export (default: 1, 0이면 아무것도 하지 않음)
+# - NETDATA_NODES : "master=http://10.0.0.10:19999 worker1=http://10.0.0.11:19999" (없으면 kubectl get nodes)
+# - NETDATA_PORT  : kubectl로 찾을 때 쓸 Netdata port (default: 19999)
+# - CLOCK_SYNC    : 1이면 run 시작/끝에 clock offset 측정 (default: MULTINODE 값)
+# - CLOCK_METHOD  : ssh | udp (default: ssh, udp는 worker에서 clock_offset.py --serve 필요)
+# - CLOCK_SSH_USER: ssh 접속 user (default: 현재 user / ~/.ssh/config)
+#
+# 사용:
+#   source "${REPO_ROOT}/scripts/utils/nodes.sh"
+#   nodes_clock "${RUN_DATA}" start     # START_EPOCH 직전
+#   ...
+#   nodes_clock "${RUN_DATA}" end       # END_EPOCH 직후
+#   nodes_export "${RUN_DATA}" "${START_EPOCH}" "${END_EPOCH}"
+#   -> ${RUN_DATA}/<node>/system_cpu.csv ..., ${RUN_DATA}/nodes.csv, ${RUN_DATA}/clock_offset.csv
+
+MULTINODE="${MULTINODE:-1}"
+CLOCK_SYNC="${CLOCK_SYNC:-${MULTINODE}}"
+NODES_EXPORT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/nodes_export.py"
+CLOCK_OFFSET="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/clock_offset.py"
+
+# nodes_clock <run_data_dir> <start|end> [name=host ...]
+nodes_clock() {
+  [[ "${CLOCK_SYNC}" == "1" ]] || return 0
+  local dir="$1" phase="$2"
+  shift 2
+  if [[ $# -gt 0 ]]; then
+    set -- --nodes "$@"
+  fi
+  python3 "${CLOCK_OFFSET}" --phase "${phase}" --out-dir "${dir}" "$@" \
+    || echo "[WARN] clock offset (${phase}) failed" >&2
+}
+
+# nodes_export <run_data_dir> <after_epoch> <before_epoch>
+nodes_export() {
+  [[ "${MULTINODE}" == "1" ]] || return 0
+  python3 "${NODES_EXPORT}" --after "$2" --before "$3" --out-dir "$1" \
+    || echo "[WARN] multi-node export failed (master export only)" >&2
+}
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# 모든 node(master + worker)의 Netdata chart를 동시에 export 한다 (표준 라이브러리만 사용).
+# - pod scheduling / image pull / llama.cpp 추론은 worker에서 일어나므로 master(NETDATA_URL)만으로는 부족하다.
+# - export 방식은 run_experiment.sh의 export_csv와 같다 (5초 평균, options=seconds,flip).
+#
+# node inventory (앞의 것이 우선)
+#   1) --nodes master=http://10.0.0.10:19999 worker1=http://10.0.0.11:19999 ...
+#   2) NETDATA_NODES env (같은 형식, 공백/쉼표 구분)
+#   3) kubectl get nodes 의 InternalIP + NETDATA_PORT(default 19999)
+#
+# chart (node마다 disk/NIC 이름이 다를 수 있어 후보 -> /api/v1/charts 탐색 순으로 고른다)
+#   system_cpu.csv, system_ram.csv, disk_util_<dev>.csv, disk_io_<dev>.csv, net_<iface>.csv
+#
+# <out-dir>/clock_offset.csv (clock_offset.py)가 있으면 node마다 요청 구간을 그 node 시계로 옮긴다.
+# CSV의 time은 node 시계 그대로이고, master 시각으로의 보정은 analysis(analysis/clock.py)에서 한다.
+#
+# 결과
+#   <out-dir>/<node>/*.csv
+#   <out-dir>/nodes.csv   (node, role, url, cores, charts)  cores = /api/v1/info 의 cores_total
+#
+# 사용:
+#   python3 scripts/utils/nodes_export.py --list
+#   python3 scripts/utils/nodes_export.py --after 1769150000 --before 1769150060 --out-dir data/netdata/<step>/run_<i>
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from runner import export_csv
+
+# (파일 이름 prefix, chart id 후보, 후보가 모두 없을 때 탐색할 chart id prefix)
+CHARTS: List[Tuple[str, List[str], Optional[str]]] = [
+    ("system_cpu", ["system.cpu"], None),
+    ("system_ram", ["system.ram"], None),
+    ("disk_util", ["disk_util.mmcblk0", "disk_util.nvme0n1", "disk_util.sda"], "disk_util."),
+    ("disk_io", ["disk.mmcblk0", "disk.io.mmcblk0", "disk_io.mmcblk0", "disk.nvme0n1", "disk.sda"], "disk."),
+    ("net", ["net.eth0", "net.end0", "net.wlan0"], "net."),
+]
+
+# 탐색에서 제외할 가상 device
+SKIP_DEV = re.compile(r"^(loop|ram|zram|dm-|lo$|veth|cni|flannel|docker|kube)")
+
+
+class Node:
+    def __init__(self, name: str, url: str, role: str = ""):
+        self.name = name
+        self.url = url.rstrip("/")
+        self.role = role
+
+
+def parse_nodes(items: Sequence[str]) -> List[Node]:
+    nodes = []
+    for it in items:
+        for tok in re.split(r"[,\s]+", it.strip()):
+            if not tok:
+                continue
+            name, _, url = tok.partition("=")
+            if not url:
+                raise SystemExit(f"[ERROR] node must be name=url: {tok}")
+            nodes.append(Node(name, url))
+    return nodes
+
+
+def kubectl_nodes(kubectl: str, port: int) -> List[Node]:
+    try:
+        out = subprocess.run(kubectl.split() + ["get", "nodes", "-o", "json"],
+                             capture_output=True, text=True, timeout=20, check=True).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        raise SystemExit(f"[ERROR] node inventory: set NETDATA_NODES or fix kubectl ({e})")
+    nodes = []
+    for item in json.loads(out).get("items", []):
+        meta = item.get("metadata", {})
+        labels = meta.get("labels", {})
+        ip = next((a["address"] for a in item.get("status", {}).get("addresses", []) if a.get("type") == "InternalIP"), None)
+        if ip is None:
+            continue
+        master = any(k in labels for k in ("node-role.kubernetes.io/control-plane", "node-role.kubernetes.io/master"))
+        nodes.append(Node(meta["name"], f"http://{ip}:{port}", "master" if master else "worker"))
+    return nodes
+
+
+def inventory(args_nodes: Sequence[str], kubectl: str) -> List[Node]:
+    if args_nodes:
+        return parse_nodes(args_nodes)
+    if os.environ.get("NETDATA_NODES"):
+        return parse_nodes([os.environ["NETDATA_NODES"]])
+    return kubectl_nodes(kubectl, int(os.environ.get("NETDATA_PORT", "19999")))
+
+
+def get_json(url: str, timeout: float = 8.0) -> Optional[dict]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as r:
+            return json.loads(r.read().decode("utf-8"))
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+
+def chart_ids(node: Node) -> List[str]:
+    js = get_json(f"{node.url}/api/v1/charts") or {}
+    return sorted((js.get("charts") or {}).keys())
+
+
+def start_offsets(out_dir: Path) -> Dict[str, float]:
+    # node -> run 시작 때 잰 offset (node 시계 - master 시계, 초)
+    p = out_dir / "clock_offset.csv"
+    if not p.exists():
+        return {}
+    with p.open(newline="", encoding="utf-8") as f:
+        return {r["node"]: float(r["offset_sec"]) for r in csv.DictReader(f)
+                if r.get("phase") == "start" and r.get("offset_sec")}
+
+
+def export_node(node: Node, after: int, before: int, out_dir: Path) -> Dict[str, object]:
+    row: Dict[str, object] = {"node": node.name, "role": node.role, "url": node.url, "cores": "", "charts": ""}
+    # 응답 없는 node에서 chart 후보마다 timeout을 기다리지 않도록 먼저 확인한다.
+    info = get_json(f"{node.url}/api/v1/info", timeout=3.0)
+    if info is None:
+        return row
+    row["cores"] = info.get("cores_total", "")
+    node_dir = out_dir / node.name
+    node_dir.mkdir(parents=True, exist_ok=True)
+    known: Optional[List[str]] = None
+    saved = []
+    for prefix, cands, discover in CHARTS:
+        chart = None
+        for c in cands:
+            if export_csv(node.url, c, after, before, node_dir / "_probe.csv"):
+                chart = c
+                break
+        if chart is None and discover:
+            if known is None:
+                known = chart_ids(node)
+            found = [c for c in known if c.startswith(discover) and c.count(".") == 1
+                     and not SKIP_DEV.match(c[len(discover):])]
+            if found and export_csv(node.url, found[0], after, before, node_dir / "_probe.csv"):
+                chart = found[0]
+        if chart is None:
+            continue
+        dev = chart.split(".")[-1]
+        name = f"{prefix}.csv" if prefix.startswith("system_") else f"{prefix}_{dev}.csv"
+        (node_dir / "_probe.csv").replace(node_dir / name)
+        saved.append(f"{chart}->{name}")
+    (node_dir / "_probe.csv").unlink(missing_ok=True)
+    row["charts"] = " ".join(saved)
+    return row
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", nargs="*", default=[], help="name=url ... (default: NETDATA_NODES env or kubectl)")
+    ap.add_argument("--kubectl", default=os.environ.get("KUBECTL", "kubectl"))
+    ap.add_argument("--after", type=int)
+    ap.add_argument("--before", type=int)
+    ap.add_argument("--out-dir")
+    ap.add_argument("--list", action="store_true", help="print the node inventory and exit")
+    args = ap.parse_args()
+
+    nodes = inventory(args.nodes, args.kubectl)
+    if args.list:
+        for n in nodes:
+            print(f"{n.name}\t{n.role or '-'}\t{n.url}")
+        return
+    if args.after is None or args.before is None or not args.out_dir:
+        ap.error("--after, --before and --out-dir are required")
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    shift = {n: int(round(v)) for n, v in start_offsets(out_dir).items()}
+    # node 간에는 독립이므로 동시에, node 안의 chart는 후보 탐색 순서 때문에 차례로 받는다.
+    with ThreadPoolExecutor(max_workers=max(1, len(nodes))) as pool:
+        rows = list(pool.map(lambda n: export_node(n, args.after + shift.get(n.name, 0),
+                                                   args.before + shift.get(n.name, 0), out_dir), nodes))
+
+    with (out_dir / "nodes.csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["node", "role", "url", "cores", "charts"])
+        w.writeheader()
+        w.writerows(rows)
+    for r in rows:
+        print(f"  [{r['node']}] {r['charts'] or '<no charts>'}")
+    print("Saved:", out_dir / "nodes.csv")
+
+
+if __name__ == "__main__":
+    main()
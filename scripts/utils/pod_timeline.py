@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# pod 기동 timeline dump (condition 전이 시각 + scheduler/kubelet event, 표준 라이브러리만 사용).
+# - T_ready(apply -> HTTP 200 / rollout 완료)에는 scheduling, image 확인, container 생성, app 기동(model load),
+#   readinessProbe 지연(initialDelaySeconds / periodSeconds)이 모두 들어 있다.
+#   READY 직후(다음 run에서 pod를 지우기 전) 이 script로 구간별 시각을 남기고 analysis/pod_startup.py가 나눈다.
+# - 기록하는 key
+#     CREATED                 : metadata.creationTimestamp                 (API server, master 시계)
+#     COND_<type>             : status.conditions[].lastTransitionTime      (PodScheduled는 scheduler, 나머지는 kubelet)
+#     CONTAINER_STARTED       : containerStatuses[].state.running.startedAt (container마다 한 줄, kubelet)
+#     EV_<reason>             : Scheduled / Pulling / Pulled / Created / Started / Unhealthy / BackOff ...
+#                               (eventTime이 있으면 소수 초, 없으면 firstTimestamp; count는 반복 횟수)
+#     PROBE_READINESS         : readinessProbe 설정 (time 없음, detail=initialDelaySeconds=.. periodSeconds=..)
+# - clock 컬럼: master = master 시계, node = pod가 뜬 node(kubelet) 시계.
+#   node 시각은 analysis에서 clock_offset.csv(analysis/clock.py)로 master 시각에 맞춘다.
+# - API 시각은 대부분 초 단위로 잘려 온다. 소수 초가 필요하면 k8s_watch.py의 POD_* marker를 같이 쓴다.
+#
+# 사용:
+#   python3 scripts/utils/pod_timeline.py --selector app=tinyllama --out-dir data/netdata/<step>/run_<i>
+#   -> <out-dir>/pod_timeline.csv  (pod, node, key, time, clock, count, detail)
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import shlex
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+Obj = Dict[str, Any]
+
+FIELDS = ["pod", "node", "key", "time", "clock", "count", "detail"]
+PROBE_FIELDS = ["initialDelaySeconds", "periodSeconds", "timeoutSeconds", "successThreshold", "failureThreshold"]
+# 이 component가 낸 event는 master 시계
+MASTER_COMPONENTS = ("default-scheduler", "scheduler", "deployment-controller", "replicaset-controller")
+
+
+def parse_time(s: Optional[str]) -> Optional[float]:
+    if not s:
+        return None
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def kubectl_json(kubectl: str, args: List[str]) -> Obj:
+    try:
+        out = subprocess.run(shlex.split(kubectl) + args + ["-o", "json"],
+                             capture_output=True, text=True, timeout=30, check=True).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        raise SystemExit(f"[ERROR] kubectl {' '.join(args)}: {e}")
+    return json.loads(out)
+
+
+def pod_rows(pod: Obj) -> List[Dict[str, object]]:
+    meta, spec, st = pod["metadata"], pod.get("spec") or {}, pod.get("status") or {}
+    base = {"pod": meta["name"], "node": spec.get("nodeName", "")}
+    rows = [dict(base, key="CREATED", time=parse_time(meta.get("creationTimestamp")), clock="master")]
+    for c in st.get("conditions") or []:
+        rows.append(dict(base, key=f"COND_{c.get('type')}", time=parse_time(c.get("lastTransitionTime")),
+                         clock="master" if c.get("type") == "PodScheduled" else "node", detail=c.get("status", "")))
+    for cs in st.get("containerStatuses") or []:
+        running = (cs.get("state") or {}).get("running") or {}
+        if running.get("startedAt"):
+            rows.append(dict(base, key="CONTAINER_STARTED", time=parse_time(running["startedAt"]), clock="node",
+                             count=cs.get("restartCount", 0), detail=cs.get("name", "")))
+    for c in spec.get("containers") or []:
+        probe = c.get("readinessProbe")
+        if probe:
+            detail = " ".join(f"{k}={probe[k]}" for k in PROBE_FIELDS if k in probe)
+            rows.append(dict(base, key="PROBE_READINESS", time=None, clock="", detail=f"{c.get('name', '')} {detail}"))
+    return rows
+
+
+def event_row(ev: Obj, pod_name: str, node: str) -> Dict[str, object]:
+    source = (ev.get("source") or {}).get("component") or ev.get("reportingComponent") or ""
+    t = parse_time(ev.get("eventTime")) or parse_time(ev.get("firstTimestamp")) \
+        or parse_time((ev.get("metadata") or {}).get("creationTimestamp"))
+    count = ev.get("count") or (ev.get("series") or {}).get("count") or 1
+    return {"pod": pod_name, "node": node, "key": f"EV_{ev.get('reason', '')}", "time": t,
+            "clock": "master" if source in MASTER_COMPONENTS else "node", "count": count,
+            "detail": " ".join(str(ev.get("message", "")).split())[:300]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--selector", required=True, help="pod label selector, e.g. app=tinyllama")
+    ap.add_argument("--namespace", default="default")
+    ap.add_argument("--kubectl", default=os.environ.get("KUBECTL", "kubectl"))
+    ap.add_argument("--out-dir", required=True)
+    args = ap.parse_args()
+
+    ns = ["-n", args.namespace]
+    pods = kubectl_json(args.kubectl, ["get", "pods"] + ns + ["-l", args.selector]).get("items") or []
+    # 이전 run의 같은 이름 pod event가 섞이지 않게 uid로 거른다.
+    by_uid = {p["metadata"]["uid"]: p for p in pods}
+    events = kubectl_json(args.kubectl, ["get", "events"] + ns + ["--field-selector", "involvedObject.kind=Pod"])
+
+    rows: List[Dict[str, object]] = []
+    for p in pods:
+        rows += pod_rows(p)
+    for ev in events.get("items") or []:
+        p = by_uid.get((ev.get("involvedObject") or {}).get("uid"))
+        if p is not None:
+            rows.append(event_row(ev, p["metadata"]["name"], (p.get("spec") or {}).get("nodeName", "")))
+    rows.sort(key=lambda r: (r["pod"], r["time"] is None, r["time"] or 0.0))
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "pod_timeline.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS)
+        w.writeheader()
+        for r in rows:
+            w.writerow({**{k: "" for k in FIELDS}, **r, "time": f"{r['time']:.6f}" if r.get("time") else ""})
+    print(f"  [pod_timeline] {len(pods)} pod(s), {len(rows)} row(s)")
+    print("Saved:", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+# 선언형 experiment runner: step은 spec(action / wait 조건 / export 구간 / chart 목록)만 정의하고,
+# log 작성 / epoch marker / Netdata export / sampler / run 반복은 여기서 공통으로 처리한다.
+# 결과 layout은 기존 run_experiment.sh와 같다.
+#   logs/redacted/<step>/run_<i>.log   (KEY=VALUE, *_EPOCH는 정수 초, T_*는 monotonic 차이(소수 3자리),
+#                                       marker마다 *_EPOCH_NS(wall clock ns) / *_MONO_NS(CLOCK_MONOTONIC ns) 쌍)
+#   logs/redacted/<step>/failed_run_<i>.log  실패(StepError)한 run. 그때까지의 marker + FAILED=1 / ERROR=
+#                                       (run_*.log glob에 걸리지 않아 analysis 대상에서 빠진다)
+#   data/netdata/<step>/run_<i>/*.csv
+#
+# 시각: run 시작 때 (time.time_ns(), time.monotonic_ns())를 한 번 잡고, 이후 marker는
+#       anchor_wall + (monotonic - anchor_mono)로 계산한다 (NTP 보정으로 wall clock이 튀어도 간격은 정확).
+#       log에는 정수 *_EPOCH(기존 형식)와 함께 *_EPOCH_NS / *_MONO_NS를 남긴다 (analysis/phases.py가 우선 사용).
+#
+# spec (scripts/<step>/spec.py 의 SPEC dict)
+#   step        : step 이름
+#   runs        : 기본 반복 횟수 (RUNS env / --runs로 덮어씀)
+#   env         : 변수 기본값 (같은 이름의 환경변수가 있으면 그 값). 명령에는 환경변수로 전달되고
+#                 그 밖의 문자열 필드에서는 ${VAR} / ${VAR:-default}로 치환된다.
+#                 run마다 STEP, RUN, REPO_ROOT, RUN_DATA, RUN_LOG, <MARK>_EPOCH 도 들어간다.
+#   prepare     : run마다 측정 전에 실행할 action (marker/log 없음)
+#   actions     : 측정 action (순서대로)
+#   teardown    : export 후 실행할 action (run이 실패해도 실행)
+#   log         : log에 쓸 marker 이름 순서 (없는 marker는 빈 값)
+#   durations   : {"T_total": ["START", "END"], ...}
+#   export      : {"from": "START", "to": "END", "pre": 0, "post": 0}  -> Netdata export 구간
+#                 실패한 run은 "to" marker가 없으면 실패 시각까지 받는다 ("from"이 없으면 export 안 함)
+#                 MULTINODE=1(default)이면 같은 구간을 모든 node에서도 받는다 (data/netdata/<step>/run_<i>/<node>/)
+#                 CLOCK_SYNC=1(default: MULTINODE)이면 action 전후로 node별 clock offset을 잰다 (clock_offset.csv)
+#   charts      : [{"file": "system_cpu.csv", "chart": "${CPU_CHART}"}, ...]
+#                 chart가 list면 CSV가 나오는 첫 후보를 쓴다.
+#   samplers    : ["diskstats", "thermal"]  (DISKSTATS=1 / THERMAL=1일 때 run 동안 /proc/diskstats,
+#                 온도/cpufreq/throttle sampler 실행)
+#                 LIVE_STATS=1이면 spec과 무관하게 analysis/live_stats.py도 돈다 (기본 off, netdata를
+#                 LIVE_STATS_INTERVAL초마다 읽음). phase는 마지막 marker 이름 (START 전은 PRE),
+#                 결과는 <RUN_DATA>/live_stats.csv
+#   cooldown    : run 사이 대기. 숫자면 고정 초, dict면 scripts/utils/cooldown.py의 adaptive 대기
+#                 {"mode": "adaptive", "sec": <최소 초>, "stable": 20, "timeout": 300, "baseline_step": "<idle step>"}
+#                 (COOLDOWN_MODE / COOLDOWN_SEC / COOLDOWN_BASELINE_STEP env로 덮어씀)
+#                 실제 대기 시간은 다음 run log에 PRE_COOLDOWN_SEC(, PRE_COOLDOWN_SETTLED)로 남는다.
+#   analyze     : 모든 run 뒤 실행할 명령
+#
+# action (dict 하나에 종류 key 하나)
+#   {"mark": "START"} / {"mark": ["DOWN_START", "START"]}     지금 시각을 marker로
+#   {"run": "kubectl apply -f ${MANIFEST}", "check": True}    bash 명령 (check=False면 실패 무시)
+#   {"sleep": 300}                                            관찰 window
+#   {"wait": "<bash 조건>", "interval": 1, "timeout": 300,     조건 명령이 exit 0 될 때까지
+#    "mark": "END", "on_timeout": "fail"|"mark"|"skip"}        interval=0이면 한 번만 (blocking 명령)
+#   {"http": "<url>", "status": 200, "method": "GET", "body": "...", "interval": 1, "timeout": 300, "mark": ...}
+#   {"watch": "<id>", "args": ["--watch", "deployments", ...], "until": [...], "timeout": 300}
+#       scripts/utils/k8s_watch.py를 background로 시작 (LIST 완료까지 기다림)
+#   {"join": "<id>", "as": {"READY": "DEPLOY_AVAILABLE"}, "on_timeout": ...}
+#       watcher 종료를 기다리고 소수 초 marker를 run marker로 합친다 (as: 별칭)
+#
+# 사용:
+#   python3 scripts/utils/runner.py scripts/step07_rollout_restart/spec.py
+#   RUNS=3 python3 scripts/utils/runner.py scripts/step04_apply_deployment/spec.py --start-run 4
+#   python3 scripts/utils/runner.py scripts/step06_scale_up_down/spec.py --dry-run
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import math
+import os
+import re
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Spec = Dict[str, Any]
+Action = Dict[str, Any]
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+UTILS = Path(__file__).resolve().parent
+
+VAR_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}")
+
+
+class StepError(RuntimeError):
+    pass
+
+
+def expand(value: Any, env: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return VAR_RE.sub(lambda m: env.get(m.group(1)) or (m.group(2) if m.group(2) is not None else ""), value)
+    if isinstance(value, list):
+        return [expand(v, env) for v in value]
+    if isinstance(value, dict):
+        return {k: expand(v, env) for k, v in value.items()}
+    return value
+
+
+def load_spec(path: Path) -> Spec:
+    mod_spec = importlib.util.spec_from_file_location(f"spec_{path.parent.name}", path)
+    if mod_spec is None or mod_spec.loader is None:
+        raise StepError(f"cannot load spec: {path}")
+    mod = importlib.util.module_from_spec(mod_spec)
+    mod_spec.loader.exec_module(mod)
+    return mod.SPEC
+
+
+def calc_points(after: int, before: int) -> int:
+    # run_experiment.sh의 calc_points와 동일 (5초 평균)
+    return max(2, (before - after + 4) // 5)
+
+
+def export_csv(netdata_url: str, chart: str, after: int, before: int, out: Path, timeout: float = 30.0) -> bool:
+    qs = urllib.parse.urlencode({
+        "chart": chart, "after": after, "before": before, "group": "average",
+        "points": calc_points(after, before), "format": "csv", "options": "seconds,flip",
+    })
+    try:
+        with urllib.request.urlopen(f"{netdata_url}/api/v1/data?{qs}", timeout=timeout) as r:
+            body = r.read()
+    except (urllib.error.URLError, OSError):
+        return False
+    if not body.startswith(b"time"):
+        return False
+    out.write_bytes(body)
+    return True
+
+
+def run_log_path(step: str, run: int, failed: bool = False) -> Path:
+    return REPO_ROOT / "logs" / "redacted" / step / f"{'failed_' if failed else ''}run_{run}.log"
+
+
+class Run:
+    def __init__(self, spec: Spec, run: int, base_env: Dict[str, str], dry_run: bool = False,
+                 pre_cooldown: Optional[Tuple[float, Optional[bool]]] = None):
+        self.spec = spec
+        self.step = spec["step"]
+        self.run = run
+        self.dry_run = dry_run
+        self.pre_cooldown = pre_cooldown
+        self.log_path = run_log_path(self.step, run)
+        self.data_dir = REPO_ROOT / "data" / "netdata" / self.step / f"run_{run}"
+        self.env = dict(base_env)
+        self.env.update({
+            "STEP": self.step, "RUN": str(run), "REPO_ROOT": str(REPO_ROOT),
+            "RUN_DATA": str(self.data_dir), "RUN_LOG": str(self.log_path),
+        })
+        # spec env 기본값은 RUN_DATA 등을 참조할 수 있으므로 run마다 다시 치환한다.
+        for k, v in spec.get("env", {}).items():
+            if k not in os.environ:
+                self.env[k] = expand(str(v), self.env)
+        self.markers: Dict[str, float] = {}
+        self.watchers: Dict[str, Dict[str, Any]] = {}
+        self.samplers: List[subprocess.Popen] = []
+        self.phase_file: Optional[Path] = None
+        self.marker_ns: Dict[str, Tuple[int, int]] = {}  # name -> (wall ns, monotonic ns)
+        self.anchor_wall_ns = time.time_ns()
+        self.anchor_mono_ns = time.monotonic_ns()
+        self.error: Optional[str] = None
+
+    # --- 시각 / marker
+    def mark(self, names: Any, t: Optional[float] = None) -> None:
+        if t is None:
+            mono = time.monotonic_ns()
+            wall = self.anchor_wall_ns + (mono - self.anchor_mono_ns)
+        else:
+            # watcher 등 외부 wall clock 값은 anchor 기준으로 monotonic에 옮긴다.
+            wall = int(round(t * 1e9))
+            mono = self.anchor_mono_ns + (wall - self.anchor_wall_ns)
+        t = wall / 1e9
+        for name in [names] if isinstance(names, str) else names:
+            self.markers[name] = t
+            self.marker_ns[name] = (wall, mono)
+            self.env[f"{name}_EPOCH"] = str(int(math.floor(t)))
+            print(f"  {name}_EPOCH={t:.3f}")
+        # live_stats sampler: 이후 샘플은 이 marker 이름의 phase로 (같은 시각 marker 여러 개면 첫 이름)
+        if self.phase_file is not None:
+            self.phase_file.write_text(([names] if isinstance(names, str) else list(names))[0] + "\n")
+
+    # --- action 실행
+    def sh(self, cmd: str, check: bool = True, quiet: bool = True, timeout: Optional[float] = None) -> int:
+        if self.dry_run:
+            print(f"  $ {cmd}")
+            return 0
+        out = subprocess.DEVNULL if quiet else None
+        try:
+            rc = subprocess.run(["bash", "-c", cmd], env=self.env, stdout=out, stderr=out, timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            rc = 124
+        if check and rc != 0:
+            raise StepError(f"command failed ({rc}): {cmd}")
+        return rc
+
+    def poll(self, probe: Callable[[], bool], a: Action) -> None:
+        interval = float(a.get("interval", 1))
+        timeout = float(a.get("timeout", 300))
+        deadline = time.monotonic() + timeout
+        ok = False
+        while True:
+            if probe():
+                ok = True
+                break
+            if interval <= 0 or time.monotonic() >= deadline:
+                break
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+        if ok or a.get("on_timeout", "fail") == "mark":
+            if a.get("mark"):
+                self.mark(a["mark"])
+        elif a.get("on_timeout", "fail") == "fail":
+            raise StepError(f"timeout after {timeout:.0f}s: {a}")
+
+    def do_mark(self, a: Action) -> None:
+        self.mark(a["mark"])
+
+    def do_run(self, a: Action) -> None:
+        self.sh(a["run"], check=a.get("check", True), quiet=a.get("quiet", True))
+
+    def do_sleep(self, a: Action) -> None:
+        sec = float(a["sleep"])
+        if self.dry_run:
+            print(f"  sleep {sec:g}")
+            return
+        # monotonic 기준으로 정확히 sec만큼
+        end = time.monotonic() + sec
+        while (left := end - time.monotonic()) > 0:
+            time.sleep(min(left, 1.0))
+
+    def do_wait(self, a: Action) -> None:
+        interval = float(a.get("interval", 1))
+        timeout = float(a.get("timeout", 300))
+        if self.dry_run:
+            self.sh(a["wait"])
+            if a.get("mark"):
+                self.mark(a["mark"])
+            return
+        # interval=0: 명령 자체가 blocking (kubectl rollout status 등)
+        self.poll(lambda: self.sh(a["wait"], check=False, timeout=timeout if interval <= 0 else None) == 0, a)
+
+    def do_http(self, a: Action) -> None:
+        url = a["http"]
+        want = int(a.get("status", 200))
+        body = a.get("body")
+        data = body.encode("utf-8") if isinstance(body, str) else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+
+        def probe() -> bool:
+            req = urllib.request.Request(url, data=data, method=a.get("method", "POST" if data else "GET"), headers=headers)
+            try:
+                with urllib.request.urlopen(req, timeout=float(a.get("request_timeout", 10))) as r:
+                    return r.status == want
+            except urllib.error.HTTPError as e:
+                return e.code == want
+            except (urllib.error.URLError, OSError):
+                return False
+
+        if self.dry_run:
+            print(f"  http {url} == {want}")
+            if a.get("mark"):
+                self.mark(a["mark"])
+            return
+        self.poll(probe, a)
+
+    def do_watch(self, a: Action) -> None:
+        wid = a["watch"]
+        out = self.data_dir / f"watch_{wid}.log"
+        ready = out.with_suffix(".ready")
+        cmd = [sys.executable, str(UTILS / "k8s_watch.py")] + list(a.get("args", []))
+        if a.get("until"):
+            cmd += ["--until"] + list(a["until"])
+        cmd += ["--timeout", str(a.get("timeout", 300)), "--ready-file", str(ready)]
+        if self.dry_run:
+            print("  $ " + " ".join(cmd) + " &")
+            return
+        ready.unlink(missing_ok=True)
+        f = out.open("w", encoding="utf-8")
+        proc = subprocess.Popen(cmd, stdout=f, env=self.env)
+        self.watchers[wid] = {"proc": proc, "out": out, "file": f}
+        # LIST가 끝나기 전 event를 놓치지 않게 기다린다.
+        deadline = time.monotonic() + float(a.get("ready_timeout", 10))
+        while not ready.exists() and proc.poll() is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        ready.unlink(missing_ok=True)
+
+    def do_join(self, a: Action) -> None:
+        w = self.watchers.pop(a["join"], None)
+        if w is None:
+            if self.dry_run:
+                for name, key in (a.get("as") or {}).items():
+                    self.mark(name)
+            return
+        rc = w["proc"].wait()
+        w["file"].close()
+        got: Dict[str, float] = {}
+        for line in w["out"].read_text(encoding="utf-8").splitlines():
+            k, _, v = line.partition("=")
+            if k.endswith("_EPOCH") and v:
+                got[k[: -len("_EPOCH")]] = float(v)
+        for k, v in got.items():
+            self.mark(k, v)
+        for name, key in (a.get("as") or {}).items():
+            if key in got:
+                self.mark(name, got[key])
+            elif a.get("on_timeout", "fail") == "mark":
+                self.mark(name)
+            elif a.get("on_timeout", "fail") == "fail":
+                raise StepError(f"watch {a['join']} ended without {key} (rc={rc})")
+
+    # "mark"는 wait/http의 옵션으로도 쓰이므로 마지막에 본다.
+    ACTIONS = ["run", "sleep", "wait", "http", "watch", "join", "mark"]
+
+    def execute(self, actions: Sequence[Action]) -> None:
+        for a in actions:
+            # 명령 문자열은 bash가 환경변수로 치환한다.
+            a = {k: v if k in ("run", "wait") else expand(v, self.env) for k, v in a.items()}
+            kind = next((k for k in self.ACTIONS if k in a), None)
+            if kind is None:
+                raise StepError(f"unknown action: {a}")
+            getattr(self, f"do_{kind}")(a)
+
+    # --- sampler (run 동안 background)
+    def start_samplers(self) -> None:
+        if "diskstats" in self.spec.get("samplers", []) and self.env.get("DISKSTATS", "1") == "1" and not self.dry_run:
+            dev = self.env.get("DISKSTATS_DEV", "mmcblk0")
+            self.samplers.append(subprocess.Popen(
+                [sys.executable, str(UTILS / "diskstats_sampler.py"), "--device", dev,
+                 "--interval", self.env.get("DISKSTATS_INTERVAL", "1"),
+                 "--out", str(self.data_dir / f"diskstats_{dev}.csv")],
+                stdout=subprocess.DEVNULL,
+            ))
+            # START 이전 샘플이 최소 1개 있도록
+            time.sleep(float(self.env.get("DISKSTATS_INTERVAL", "1")))
+        if "thermal" in self.spec.get("samplers", []) and self.env.get("THERMAL", "1") == "1" and not self.dry_run:
+            self.samplers.append(subprocess.Popen(
+                [sys.executable, str(UTILS / "thermal_sampler.py"),
+                 "--interval", self.env.get("THERMAL_INTERVAL", "1"), "--out-dir", str(self.data_dir)],
+                stdout=subprocess.DEVNULL,
+            ))
+        if self.env.get("LIVE_STATS", "0") == "1" and not self.dry_run:
+            self.phase_file = self.data_dir / "live_stats.phase"
+            self.phase_file.write_text("PRE\n")
+            self.samplers.append(subprocess.Popen(
+                [sys.executable, str(REPO_ROOT / "analysis" / "live_stats.py"), "--step", self.step,
+                 "--run", str(self.run), "--interval", self.env.get("LIVE_STATS_INTERVAL", "5"),
+                 "--phase-file", str(self.phase_file), "--out-dir", str(self.data_dir)],
+                env=self.env, stdout=subprocess.DEVNULL,
+            ))
+            # 첫 poll(START 이전 lookback 샘플)이 PRE phase로 들어가도록
+            time.sleep(float(self.env.get("LIVE_STATS_INTERVAL", "5")))
+
+    def stop_samplers(self) -> None:
+        for p in self.samplers:
+            p.terminate()
+        for p in self.samplers:
+            p.wait()
+        self.samplers = []
+        if self.phase_file is not None:
+            self.phase_file.unlink(missing_ok=True)
+            self.phase_file = None
+
+    def clock(self, phase: str) -> None:
+        # node별 clock offset (scripts/utils/clock_offset.py) -> <RUN_DATA>/clock_offset.csv
+        if self.env.get("CLOCK_SYNC", self.env.get("MULTINODE", "1")) != "1":
+            return
+        cmd = [sys.executable, str(UTILS / "clock_offset.py"), "--phase", phase, "--out-dir", str(self.data_dir)]
+        if self.dry_run:
+            print(f"  clock: {' '.join(cmd[1:])}")
+        elif subprocess.run(cmd, env=self.env).returncode != 0:
+            print(f"[WARN] clock offset ({phase}) failed", file=sys.stderr)
+
+    def stop_watchers(self) -> None:
+        for w in self.watchers.values():
+            w["proc"].terminate()
+            w["proc"].wait()
+            w["file"].close()
+        self.watchers = {}
+
+    # --- 산출물
+    def write_log(self) -> None:
+        lines = [f"STEP={self.step}", f"RUN={self.run}"]
+        if self.error is not None:
+            lines += ["FAILED=1", "ERROR=" + " ".join(self.error.split())]
+        names = list(self.spec.get("log", ["START", "END"]))
+        for name in names:
+            t = self.markers.get(name)
+            lines.append(f"{name}_EPOCH={int(math.floor(t)) if t is not None else ''}")
+        for key, (a, b) in self.spec.get("durations", {}).items():
+            if a in self.marker_ns and b in self.marker_ns:
+                lines.append(f"{key}={(self.marker_ns[b][1] - self.marker_ns[a][1]) / 1e9:.3f}")
+            else:
+                lines.append(f"{key}=")
+        # 그 밖의 marker (watcher 등)는 소수 초로 덧붙인다.
+        for name, t in self.markers.items():
+            if name not in names:
+                lines.append(f"{name}_EPOCH={t:.3f}")
+        for name, (wall, mono) in self.marker_ns.items():
+            lines.append(f"{name}_EPOCH_NS={wall}")
+            lines.append(f"{name}_MONO_NS={mono}")
+        if self.pre_cooldown is not None:
+            sec, settled = self.pre_cooldown
+            lines.append(f"PRE_COOLDOWN_SEC={sec:.1f}")
+            if settled is not None:
+                lines.append(f"PRE_COOLDOWN_SETTLED={int(settled)}")
+        text = "\n".join(lines) + "\n"
+        if self.dry_run:
+            print(text, end="")
+            return
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.log_path.write_text(text, encoding="utf-8")
+
+    def export(self) -> None:
+        ex = self.spec.get("export", {})
+        a, b = ex.get("from", "START"), ex.get("to", "END")
+        if a not in self.markers or (b not in self.markers and self.error is None):
+            raise StepError(f"export window needs {a}/{b} markers")
+        after = int(math.floor(self.markers[a])) - int(ex.get("pre", 0))
+        if b in self.markers:
+            before = int(math.floor(self.markers[b])) + int(ex.get("post", 0))
+        else:
+            before = int(math.ceil(time.time()))
+        url = self.env.get("NETDATA_URL", "http://127.0.0.1:19999")
+
+        def one(c: Dict[str, Any]) -> str:
+            out = self.data_dir / expand(c["file"], self.env)
+            cands = expand(c["chart"], self.env)
+            for chart in [cands] if isinstance(cands, str) else cands:
+                if self.dry_run:
+                    return f"{chart} -> {out.name}"
+                if export_csv(url, chart, after, before, out):
+                    return f"{chart} -> {out.name}"
+            return f"<not found> -> {out.name} (skip)"
+
+        # chart export는 서로 독립이라 동시에 요청한다.
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for msg in pool.map(one, self.spec.get("charts", [])):
+                print(f"  export {msg}")
+
+        # worker 포함 모든 node -> <RUN_DATA>/<node>/ (scripts/utils/nodes_export.py)
+        if self.env.get("MULTINODE", "1") == "1":
+            cmd = [sys.executable, str(UTILS / "nodes_export.py"), "--after", str(after), "--before", str(before),
+                   "--out-dir", str(self.data_dir)]
+            if self.dry_run:
+                print(f"  export nodes: {' '.join(cmd[1:])}")
+            elif subprocess.run(cmd, env=self.env).returncode != 0:
+                print("[WARN] multi-node export failed (master export only)", file=sys.stderr)
+
+    def execute_run(self) -> None:
+        if not self.dry_run:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self.execute(self.spec.get("prepare", []))
+            self.clock("start")
+            self.start_samplers()
+            try:
+                self.execute(self.spec.get("actions", []))
+            finally:
+                self.stop_samplers()
+                self.stop_watchers()
+            self.clock("end")
+        except StepError as e:
+            # 실패한 run도 그때까지의 marker / 이유를 failed_run_<i>.log로 남기고,
+            # 받을 수 있는 구간은 export, teardown까지 한 뒤 다시 올린다.
+            self.error = str(e)
+            self.log_path = run_log_path(self.step, self.run, failed=True)
+            self.finish()
+            raise
+        self.finish()
+
+    def finish(self) -> None:
+        self.write_log()
+        try:
+            try:
+                self.export()
+            finally:
+                self.execute(self.spec.get("teardown", []))
+        except StepError as e:
+            if self.error is None:
+                raise
+            # 원래 실패 이유를 덮지 않는다.
+            print(f"[WARN] {self.step} run_{self.run} cleanup: {e}", file=sys.stderr)
+
+
+def base_env(spec: Spec) -> Dict[str, str]:
+    env = dict(os.environ, REPO_ROOT=str(REPO_ROOT))
+    for k, v in spec.get("env", {}).items():
+        if k not in os.environ:
+            env[k] = expand(str(v), env)
+    return env
+
+
+def cooldown_config(spec: Spec, env: Dict[str, str], sec: Optional[float]) -> Dict[str, Any]:
+    raw = spec.get("cooldown", 0)
+    cfg: Dict[str, Any] = dict(raw) if isinstance(raw, dict) else {"mode": "fixed", "sec": raw}
+    cfg["mode"] = env.get("COOLDOWN_MODE", cfg.get("mode", "adaptive"))
+    cfg["sec"] = sec if sec is not None else float(env.get("COOLDOWN_SEC", cfg.get("sec", 0)))
+    cfg["baseline_step"] = env.get("COOLDOWN_BASELINE_STEP", cfg.get("baseline_step", ""))
+    return cfg
+
+
+def cool_down(cfg: Dict[str, Any], env: Dict[str, str], baseline: Dict[str, float]) -> Tuple[float, Optional[bool]]:
+    if cfg["mode"] != "adaptive":
+        time.sleep(cfg["sec"])
+        return cfg["sec"], None
+    from cooldown import wait_settled
+
+    return wait_settled(env.get("NETDATA_URL", "http://127.0.0.1:19999"), baseline,
+                        stable_sec=int(cfg.get("stable", 20)), timeout=float(cfg.get("timeout", 300)),
+                        min_sec=cfg["sec"])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("spec")
+    ap.add_argument("--runs", type=int, default=None, help="default: RUNS env or spec['runs']")
+    ap.add_argument("--start-run", type=int, default=1)
+    ap.add_argument("--cooldown", type=float, default=None,
+                    help="fixed seconds / adaptive minimum (default: COOLDOWN_SEC env or spec['cooldown'])")
+    ap.add_argument("--no-analyze", action="store_true")
+    ap.add_argument("--dry-run", action="store_true", help="print actions without executing")
+    args = ap.parse_args()
+
+    spec = load_spec(Path(args.spec).resolve())
+    env = base_env(spec)
+    runs = args.runs or int(env.get("RUNS", spec.get("runs", 10)))
+    cooldown = cooldown_config(spec, env, args.cooldown)
+    step = spec["step"]
+    baseline: Dict[str, float] = {}
+    if cooldown["mode"] == "adaptive" and cooldown["baseline_step"] and not args.dry_run:
+        from cooldown import baseline_from_step
+
+        baseline = baseline_from_step(cooldown["baseline_step"])
+
+    print(f"[{step}] RUNS={runs} (from run_{args.start_run}), "
+          f"cooldown={cooldown['mode']} {cooldown['sec']:g}s baseline={baseline or '-'}")
+    last = args.start_run + runs - 1
+    pre: Optional[Tuple[float, Optional[bool]]] = None
+    for i in range(args.start_run, last + 1):
+        print(f"== [{step}] run_{i}/{last} ==")
+        run = Run(spec, i, env, dry_run=args.dry_run, pre_cooldown=pre)
+        try:
+            run.execute_run()
+        except StepError as e:
+            print(f"[ERROR] {step} run_{i}: {e} (log: {run.log_path})", file=sys.stderr)
+            raise SystemExit(1)
+        pre = None
+        if i < last and not args.dry_run and (cooldown["mode"] == "adaptive" or cooldown["sec"] > 0):
+            pre = cool_down(cooldown, env, baseline)
+            print(f"  cooldown {pre[0]:.1f}s" + ("" if pre[1] is None else f" settled={int(pre[1])}"))
+
+    if not args.no_analyze and not args.dry_run:
+        for cmd in spec.get("analyze", []):
+            subprocess.run(["bash", "-c", cmd], env=dict(env, STEP=step), check=False)
+    print(f"[DONE] {step}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# kubelet readinessProbe와 별개로 pod가 실제로 응답하기 시작한 시각을 잰다 (표준 라이브러리만 사용).
+# - tinyllama readinessProbe는 periodSeconds: 10 이라 Ready condition은 실제 serving 시점보다 최대 10초 늦고,
+#   script의 HTTP polling(step12 5초, step14 wait_http_200 5초)이 그 위에 또 붙는다.
+#   여기서는 pod IP:containerPort로 직접(Service endpoint는 Ready 전에는 비어 있음) --interval 마다 요청해
+#   처음 성공한 시각을 남긴다.
+# - pod마다 thread 두 개, 각자 keep-alive HTTPConnection 하나를 재사용한다 (요청마다 TCP handshake 없음).
+#     models     : GET  /v1/models             (readinessProbe와 같은 path)
+#     completion : POST /v1/chat/completions   (max_tokens 1, 이전 요청이 끝난 뒤 --interval 후 다음 요청)
+#   kind마다 첫 200을 받으면 그 thread는 멈춘다 (측정 대상 node에 부하를 계속 주지 않도록).
+# - pod는 k8s_watch.py의 pods watch(LIST + WATCH 연결 하나)로 찾는다. 주기적으로 kubectl을 fork 하지 않고,
+#   podIP가 붙는 MODIFIED event를 받은 즉시 probe를 시작한다. 접속 정보는 k8s_watch.py와 같다
+#   (--server http://... 또는 --kubectl / --kubeconfig).
+#   creationTimestamp가 --since 이전인 pod(이미 떠 있던 replica)는 제외한다. --target host:port를 주면 찾지 않는다.
+#
+# Markers (KEY_EPOCH=<epoch.ms>, 응답을 다 받은 시각; --prefix로 앞에 붙일 수 있음)
+# - SERVE_LISTEN      : 첫 pod에 TCP 연결이 처음 성공
+# - SERVE_MODELS      : 첫 pod의 /v1/models 200
+# - SERVE_COMPLETION  : 첫 pod의 completion 200
+# - SERVES_MODELS / SERVES_COMPLETION : --pods 개 pod가 모두 200 (마지막 pod의 200 시각)
+# --until의 marker가 모두 기록되면 exit 0, --timeout이면 exit 1. marker 줄은 stdout(과 --log 파일 append).
+#
+# --out-dir/serve_probe.csv : pod, target, kind, first_ok, last_fail, resolution_sec, attempts, failures,
+#                             first_connect, latency_sec
+#   resolution_sec = first_ok - last_fail (serving 시작 시각의 불확실 구간 상한)
+#
+# 사용:
+#   python3 scripts/utils/serve_probe.py --selector app=tinyllama --port 8080 --interval 0.2 \
+#     --until SERVE_COMPLETION --timeout 330 --ready-file "${DATA_DIR}/serve_probe.ready" \
+#     --out-dir "${DATA_DIR}" > "${DATA_DIR}/serve_probe.log"
+from __future__ import annotations
+
+import argparse
+import csv
+import http.client
+import json
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from k8s_watch import Api, api_from_kubeconfig, watch_loop
+
+KINDS = ("models", "completion")
+FIELDS = ["pod", "target", "kind", "first_ok", "last_fail", "resolution_sec", "attempts", "failures",
+          "first_connect", "latency_sec"]
+
+
+class Probe:
+    # 한 pod의 한 kind. keep-alive 연결 하나로 성공할 때까지 반복한다.
+    def __init__(self, pod: str, host: str, port: int, kind: str, model: str, interval: float, timeout: float):
+        self.pod, self.host, self.port, self.kind = pod, host, port, kind
+        self.interval, self.timeout = interval, timeout
+        if kind == "models":
+            self.method, self.path, self.body = "GET", "/v1/models", None
+        else:
+            self.method, self.path = "POST", "/v1/chat/completions"
+            self.body = json.dumps({"model": model, "messages": [{"role": "user", "content": "hi"}],
+                                    "max_tokens": 1}).encode("utf-8")
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.on_connect = None
+        self.attempts = 0
+        self.failures = 0
+        self.first_connect: Optional[float] = None
+        self.last_fail: Optional[float] = None
+        self.first_ok: Optional[float] = None
+        self.latency: Optional[float] = None
+
+    def _close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def once(self) -> bool:
+        self.attempts += 1
+        t0 = time.time()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                self.conn.connect()
+                if self.first_connect is None:
+                    self.first_connect = time.time()
+                    if self.on_connect is not None:
+                        self.on_connect(self)
+            headers = {"Content-Type": "application/json"} if self.body else {}
+            self.conn.request(self.method, self.path, body=self.body, headers=headers)
+            r = self.conn.getresponse()
+            r.read()
+            t = time.time()
+            if r.will_close:
+                self._close()
+            if r.status == 200:
+                self.first_ok, self.latency = t, t - t0
+                return True
+        except (OSError, http.client.HTTPException):
+            self._close()
+        self.failures += 1
+        self.last_fail = time.time()
+        return False
+
+    def run(self, stop: threading.Event, on_ok) -> None:
+        while not stop.is_set():
+            t0 = time.monotonic()
+            if self.once():
+                self._close()
+                on_ok(self)
+                return
+            stop.wait(max(0.0, self.interval - (time.monotonic() - t0)))
+        self._close()
+
+    def row(self) -> Dict[str, object]:
+        def f(x: Optional[float]) -> str:
+            return f"{x:.3f}" if x is not None else ""
+        res = self.first_ok - self.last_fail if self.first_ok is not None and self.last_fail is not None else None
+        return {"pod": self.pod, "target": f"{self.host}:{self.port}", "kind": self.kind,
+                "first_ok": f(self.first_ok), "last_fail": f(self.last_fail), "resolution_sec": f(res),
+                "attempts": self.attempts, "failures": self.failures, "first_connect": f(self.first_connect),
+                "latency_sec": f(self.latency)}
+
+
+class Markers:
+    def __init__(self, n_pods: int, prefix: str, log: Optional[Path]):
+        self.n_pods, self.prefix, self.log = n_pods, prefix, log
+        self.markers: Dict[str, float] = {}
+        self.ok: Dict[str, set] = {k: set() for k in KINDS}
+        self.lock = threading.Lock()
+
+    def _mark(self, key: str, t: float) -> None:
+        if key in self.markers:
+            return
+        self.markers[key] = t
+        line = f"{self.prefix}{key}_EPOCH={t:.3f}"
+        print(line, flush=True)
+        if self.log is not None:
+            with self.log.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def on_connect(self, p: Probe) -> None:
+        with self.lock:
+            self._mark("SERVE_LISTEN", p.first_connect)
+
+    def on_ok(self, p: Probe) -> None:
+        with self.lock:
+            self._mark(f"SERVE_{p.kind.upper()}", p.first_ok)
+            self.ok[p.kind].add(p.pod)
+            if len(self.ok[p.kind]) >= self.n_pods:
+                self._mark(f"SERVES_{p.kind.upper()}", p.first_ok)
+
+
+def parse_time(s: Optional[str]) -> Optional[float]:
+    if not s:
+        return None
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def pod_target(obj: Dict[str, Any], since: float) -> Optional[Tuple[str, str]]:
+    # (pod name, podIP). IP가 아직 없거나 삭제 중이거나 --since 이전에 만든 pod는 None
+    meta, st = obj.get("metadata") or {}, obj.get("status") or {}
+    created = parse_time(meta.get("creationTimestamp"))
+    # creationTimestamp는 초 단위라 1초 여유
+    if meta.get("deletionTimestamp") or not st.get("podIP") or created is None or created < since - 1:
+        return None
+    return meta["name"], st["podIP"]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--selector", default=None, help="pod label selector, e.g. app=tinyllama")
+    ap.add_argument("--target", nargs="*", default=[], help="host:port (skip pod discovery)")
+    ap.add_argument("--port", type=int, default=8080, help="containerPort for discovered pods")
+    ap.add_argument("--namespace", default="default")
+    ap.add_argument("--kubectl", default=os.environ.get("KUBECTL", "kubectl"))
+    ap.add_argument("--kubeconfig", default=os.environ.get("KUBECONFIG"))
+    ap.add_argument("--server", default=None, help="API server URL (http://... = no auth), else from kubeconfig")
+    ap.add_argument("--model", default="tinyllama")
+    ap.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    ap.add_argument("--interval", type=float, default=0.2, help="seconds between requests per probe")
+    ap.add_argument("--request-timeout", type=float, default=30.0)
+    ap.add_argument("--retry", type=float, default=1.0, help="seconds between API reconnects")
+    ap.add_argument("--since", type=float, default=None, help="ignore pods created before this epoch; default = now")
+    ap.add_argument("--pods", type=int, default=1, help="number of new pods to probe")
+    ap.add_argument("--until", nargs="*", default=[], help="marker keys (without _EPOCH) to wait for")
+    ap.add_argument("--timeout", type=float, default=0.0, help="0 = until SIGINT/SIGTERM")
+    ap.add_argument("--prefix", default="")
+    ap.add_argument("--log", default=None, help="append marker lines to this file")
+    ap.add_argument("--ready-file", default=None, help="touched once probing started / the first pod LIST is done")
+    ap.add_argument("--out-dir", default=None, help="write serve_probe.csv here")
+    args = ap.parse_args()
+    if not args.selector and not args.target:
+        ap.error("--selector or --target is required")
+
+    since = args.since if args.since is not None else time.time()
+    n_pods = len(args.target) if args.target else args.pods
+    markers = Markers(n_pods, args.prefix, Path(args.log) if args.log else None)
+    stop = threading.Event()
+
+    def on_signal(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    probes: List[Probe] = []
+
+    def start(pod: str, host: str, port: int) -> None:
+        for kind in args.kinds:
+            p = Probe(pod, host, port, kind, args.model, args.interval, args.request_timeout)
+            p.on_connect = markers.on_connect
+            probes.append(p)
+            threading.Thread(target=p.run, args=(stop, markers.on_ok), daemon=True).start()
+
+    for tg in args.target:
+        host, _, port = tg.rpartition(":")
+        start(tg, host, int(port))
+
+    events: "queue.Queue" = queue.Queue()
+    if args.target:
+        if args.ready_file:
+            Path(args.ready_file).touch()
+    else:
+        api = Api(args.server) if args.server else api_from_kubeconfig(args.kubectl, args.kubeconfig)
+        threading.Thread(target=watch_loop, args=(api, "pods", args.namespace, {"labelSelector": args.selector},
+                                                  events, stop, args.retry), daemon=True).start()
+
+    seen: Dict[str, str] = {}
+    listed = False
+    until = set(args.until)
+    t_end = time.time() + args.timeout if args.timeout > 0 else None
+    while not stop.is_set():
+        if until and until <= set(markers.markers):
+            break
+        if t_end is not None and time.time() >= t_end:
+            break
+        try:
+            _, etype, payload, _ = events.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        if etype == "LIST" and not listed:
+            listed = True
+            if args.ready_file:
+                Path(args.ready_file).touch()
+        for obj in payload if etype == "LIST" else [payload] if etype in ("ADDED", "MODIFIED") else []:
+            t = pod_target(obj, since)
+            if t is not None and t[0] not in seen and len(seen) < n_pods:
+                seen[t[0]] = t[1]
+                start(t[0], t[1], args.port)
+    stop.set()
+
+    if args.out_dir:
+        out_dir = Path(args.out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with (out_dir / "serve_probe.csv").open("w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=FIELDS)
+            w.writeheader()
+            for p in probes:
+                w.writerow(p.row())
+
+    missing = sorted(until - set(markers.markers))
+    if missing:
+        print(f"[serve_probe] timeout waiting for: {' '.join(missing)}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env bash
+# 온도 / CPU clock / throttle sampler(thermal_sampler.py) 시작/종료 helper. run_experiment.sh에서 source 한다.
+#
+# Env variables:
+# - THERMAL          : 1이면 run마다 sampler 실행 (default: 1, 0이면 아무것도 하지 않음)
+# - THERMAL_INTERVAL : 샘플 간격(초) (default: 1)
+#
+# 사용:
+#   source "${REPO_ROOT}/scripts/utils/thermal.sh"
+#   thermal_start "${RUN_DATA}"     # START_EPOCH 직전
+#   ...
+#   thermal_stop                    # END_EPOCH 직후
+#   -> ${RUN_DATA}/thermal_temp.csv, cpu_freq.csv, cpu_throttled.csv (있는 source만)
+
+THERMAL="${THERMAL:-1}"
+THERMAL_INTERVAL="${THERMAL_INTERVAL:-1}"
+THERMAL_SAMPLER="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/thermal_sampler.py"
+THERMAL_PID=""
+
+# thermal_start <run_data_dir>
+thermal_start() {
+  [[ "${THERMAL}" == "1" ]] || return 0
+  thermal_stop
+  python3 "${THERMAL_SAMPLER}" \
+    --interval "${THERMAL_INTERVAL}" \
+    --out-dir "$1" >/dev/null &
+  THERMAL_PID=$!
+}
+
+thermal_stop() {
+  [[ -n "${THERMAL_PID}" ]] || return 0
+  kill -TERM "${THERMAL_PID}" 2>/dev/null || true
+  wait "${THERMAL_PID}" 2>/dev/null || true
+  THERMAL_PID=""
+}
+
+# 먼저 source 된 EXIT trap(diskstats.sh 등)을 덮어쓰지 않고 이어 붙인다.
+_thermal_prev_trap="$(trap -p EXIT | sed -E "s/^trap -- '(.*)' EXIT$/\1/")"
+trap "thermal_stop${_thermal_prev_trap:+; ${_thermal_prev_trap}}" EXIT
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# 온도 / CPU clock / throttle 상태를 일정 간격으로 CSV에 기록한다 (표준 라이브러리만 사용).
+# - Raspberry Pi급 ARM board는 발열로 clock이 내려가므로 같은 CPU %라도 한 일의 양이 다르다.
+# - netdata export CSV와 같은 형식 (time(epoch 초) + 값 컬럼, 시간순)으로 남긴다.
+#     thermal_temp.csv  : time, <zone type>...      (°C, /sys/class/thermal/thermal_zone*/temp)
+#     cpu_freq.csv      : time, cpu0..cpuN, max     (MHz, cpufreq/scaling_cur_freq, max = cpuinfo_max_freq)
+#     cpu_throttled.csv : time, under_voltage, freq_capped, throttled, soft_temp_limit   (0/1, 현재 상태)
+#                         Pi firmware get_throttled (sysfs, 없으면 vcgencmd get_throttled). 둘 다 없으면 만들지 않는다.
+# - SIGINT/SIGTERM 또는 --duration 경과 시 마지막 샘플을 한 번 더 쓰고 종료
+#
+# 사용:
+#   python3 scripts/utils/thermal_sampler.py --interval 1 --out-dir data/netdata/<step>/run_<i>
+from __future__ import annotations
+
+import argparse
+import csv
+import signal
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+THERMAL_ROOT = Path("/sys/class/thermal")
+CPU_ROOT = Path("/sys/devices/system/cpu")
+THROTTLED_SYSFS = Path("/sys/devices/platform/soc/soc:firmware/get_throttled")
+
+# get_throttled bit 0~3 (현재 상태). 16~19는 부팅 이후 발생 여부라 쓰지 않는다.
+THROTTLE_BITS = ["under_voltage", "freq_capped", "throttled", "soft_temp_limit"]
+
+
+def read_int(p: Path) -> Optional[int]:
+    try:
+        return int(p.read_text().strip(), 0)
+    except (OSError, ValueError):
+        return None
+
+
+def thermal_zones() -> Dict[str, Path]:
+    zones: Dict[str, Path] = {}
+    for z in sorted(THERMAL_ROOT.glob("thermal_zone*"), key=lambda p: int(p.name[len("thermal_zone"):] or 0)):
+        try:
+            name = (z / "type").read_text().strip() or z.name
+        except OSError:
+            name = z.name
+        if name in zones:
+            name = f"{name}_{z.name[len('thermal_zone'):]}"
+        zones[name] = z / "temp"
+    return zones
+
+
+def cpufreq_files() -> Dict[str, Path]:
+    cpus = sorted(CPU_ROOT.glob("cpu[0-9]*/cpufreq/scaling_cur_freq"), key=lambda p: int(p.parent.parent.name[3:]))
+    return {p.parent.parent.name: p for p in cpus}
+
+
+def cpu_max_mhz() -> Optional[float]:
+    vals = [read_int(p) for p in CPU_ROOT.glob("cpu[0-9]*/cpufreq/cpuinfo_max_freq")]
+    vals = [v for v in vals if v is not None]
+    return max(vals) / 1000.0 if vals else None
+
+
+def throttle_reader() -> Optional[Callable[[], Optional[int]]]:
+    if read_int(THROTTLED_SYSFS) is not None:
+        return lambda: read_int(THROTTLED_SYSFS)
+    try:
+        subprocess.run(["vcgencmd", "get_throttled"], capture_output=True, timeout=2, check=True)
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    def vcgencmd() -> Optional[int]:
+        try:
+            out = subprocess.run(["vcgencmd", "get_throttled"], capture_output=True, text=True, timeout=2).stdout
+            return int(out.strip().split("=")[-1], 16)
+        except (OSError, subprocess.SubprocessError, ValueError):
+            return None
+
+    return vcgencmd
+
+
+class Writer:
+    def __init__(self, path: Path, header: List[str]):
+        self.f = path.open("w", newline="")
+        self.w = csv.writer(self.f)
+        self.w.writerow(header)
+        self.path = path
+
+    def row(self, now: float, vals: List[object]) -> None:
+        self.w.writerow([f"{now:.3f}"] + ["" if v is None else v for v in vals])
+        self.f.flush()
+
+    def close(self) -> None:
+        self.f.close()
+        print("Saved:", self.path)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--interval", type=float, default=1.0)
+    ap.add_argument("--duration", type=float, default=0.0, help="0 = until SIGINT/SIGTERM")
+    ap.add_argument("--out-dir", required=True)
+    args = ap.parse_args()
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    stop = {"flag": False}
+
+    def on_signal(signum, frame):
+        stop["flag"] = True
+
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    zones = thermal_zones()
+    cpus = cpufreq_files()
+    max_mhz = cpu_max_mhz()
+    throttled = throttle_reader()
+    if not zones and not cpus and throttled is None:
+        print("[thermal] no thermal zone / cpufreq / get_throttled source", flush=True)
+        return
+
+    writers: Dict[str, Writer] = {}
+    if zones:
+        writers["temp"] = Writer(out_dir / "thermal_temp.csv", ["time"] + list(zones))
+    if cpus:
+        writers["freq"] = Writer(out_dir / "cpu_freq.csv", ["time"] + list(cpus) + ["max"])
+    if throttled is not None:
+        writers["throttled"] = Writer(out_dir / "cpu_throttled.csv", ["time"] + THROTTLE_BITS)
+
+    t_end: Optional[float] = time.time() + args.duration if args.duration > 0 else None
+    next_t = time.monotonic()
+    try:
+        while True:
+            now = time.time()
+            if "temp" in writers:
+                temps = [read_int(p) for p in zones.values()]
+                writers["temp"].row(now, [None if v is None else round(v / 1000.0, 1) for v in temps])
+            if "freq" in writers:
+                freqs = [read_int(p) for p in cpus.values()]
+                writers["freq"].row(now, [None if v is None else v / 1000.0 for v in freqs] + [max_mhz])
+            if "throttled" in writers:
+                v = throttled()
+                writers["throttled"].row(now, [None if v is None else (v >> b) & 1 for b in range(len(THROTTLE_BITS))])
+
+            if stop["flag"] or (t_end is not None and now >= t_end):
+                break
+            # 간격이 밀리지 않게 monotonic 기준으로 다음 시각을 잡는다.
+            next_t += args.interval
+            time.sleep(max(0.0, next_t - time.monotonic()))
+    finally:
+        for w in writers.values():
+            w.close()
+
+
+if __name__ == "__main__":
+    main()